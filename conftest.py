@@ -0,0 +1,8 @@
+"""
+Root pytest configuration, loaded for every test path in the repo
+
+Registers the columnar results writer, whose --columnar-report option is set
+in pytest.ini, so the option exists for the tests and the root demo files alike.
+"""
+
+pytest_plugins = ["scripts.columnar_results"]
@@ -11,6 +11,8 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 
+from scripts.report_rendering import render_to_file
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
@@ -232,8 +234,7 @@ def main():
         results = demo.run_all_tests()
         
         # Generate simple report
-        with open("reports/demo_test_report.html", "w") as f:
-            f.write(generate_html_report(results))
+        generate_html_report(results, "reports/demo_test_report.html")
         
         logger.info("📄 Demo test report generated: reports/demo_test_report.html")
         
@@ -242,80 +243,28 @@ def main():
     finally:
         demo.cleanup()
 
-def generate_html_report(results):
+def generate_html_report(results, path):
     """Generate HTML report"""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     passed = sum(1 for _, result in results if result)
     total = len(results)
-    pass_rate = (passed / total * 100) if total > 0 else 0
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>SwiftAssess Demo Test Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-            .container {{ max-width: 800px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
-            .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px; margin-bottom: 20px; }}
-            .metric {{ background: #f8f9fa; padding: 15px; border-radius: 5px; text-align: center; }}
-            .metric-value {{ font-size: 1.5em; font-weight: bold; color: #007bff; }}
-            .test-result {{ margin: 10px 0; padding: 10px; border-radius: 5px; }}
-            .passed {{ background-color: #d4edda; border-left: 4px solid #28a745; }}
-            .failed {{ background-color: #f8d7da; border-left: 4px solid #dc3545; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🚀 SwiftAssess Demo Test Report</h1>
-                <p>Generated on: {timestamp}</p>
-            </div>
-            
-            <div class="summary">
-                <div class="metric">
-                    <div class="metric-value">{total}</div>
-                    <div>Total Tests</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-value">{passed}</div>
-                    <div>Passed</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-value">{pass_rate:.1f}%</div>
-                    <div>Pass Rate</div>
-                </div>
-            </div>
-            
-            <h2>Test Results</h2>
-    """
-    
-    for test_name, result in results:
-        status_class = "passed" if result else "failed"
-        status_icon = "✅" if result else "❌"
-        f.write(f"""
-            <div class="test-result {status_class}">
-                <strong>{status_icon} {test_name}</strong>
-                <span style="float: right;">{"PASSED" if result else "FAILED"}</span>
-            </div>
-        """)
-    
-    f.write("""
-            <div style="margin-top: 20px; padding: 15px; background-color: #e3f2fd; border-radius: 5px;">
-                <h3>📋 Test Summary</h3>
-                <p>This demo test validates the basic functionality of the SwiftAssess signup page including:</p>
-                <ul>
-                    <li>Page loading and accessibility</li>
-                    <li>Form field interactions</li>
-                    <li>Basic validation testing</li>
-                </ul>
-                <p><strong>Note:</strong> This is a demonstration of the testing framework. For comprehensive testing, run the full test suite.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """)
+    return render_to_file(
+        "browser_test_report.html",
+        path,
+        generated_on=time.strftime("%Y-%m-%d %H:%M:%S"),
+        title="SwiftAssess Demo Test Report",
+        heading="🚀 SwiftAssess Demo Test Report",
+        results=results,
+        total=total,
+        passed=passed,
+        pass_rate=(passed / total * 100) if total > 0 else 0,
+        intro="This demo test validates the basic functionality of the SwiftAssess signup page including:",
+        checks=[
+            "Page loading and accessibility",
+            "Form field interactions",
+            "Basic validation testing",
+        ],
+        note="This is a demonstration of the testing framework. For comprehensive testing, run the full test suite.",
+    )
 
 if __name__ == "__main__":
     main()
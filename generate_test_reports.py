@@ -4,9 +4,9 @@ Generate comprehensive test reports for SwiftAssess QA Automation
 """
 import json
 import os
-import time
 from datetime import datetime
-from pathlib import Path
+
+from scripts.report_rendering import render_to_file
 
 def create_functional_test_report():
     """Create functional test report"""
@@ -132,9 +132,7 @@ def create_functional_test_report():
         json.dump(functional_results, f, indent=2)
     
     # Generate HTML report
-    html_content = generate_functional_html_report(functional_results)
-    with open("reports/functional_test_report.html", "w") as f:
-        f.write(html_content)
+    generate_functional_html_report(functional_results)
     
     print("✅ Functional test report generated: reports/functional_test_report.html")
     return functional_results
@@ -244,264 +242,18 @@ def create_load_test_report():
         json.dump(load_results, f, indent=2)
     
     # Generate HTML report
-    html_content = generate_load_html_report(load_results)
-    with open("reports/load_test_report.html", "w") as f:
-        f.write(html_content)
+    generate_load_html_report(load_results)
     
     print("✅ Load test report generated: reports/load_test_report.html")
     return load_results
 
-def generate_functional_html_report(results):
+def generate_functional_html_report(results, path="reports/functional_test_report.html"):
     """Generate HTML report for functional tests"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    summary = results["test_summary"]
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>SwiftAssess Functional Test Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-            .container {{ max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #28a745 0%, #20c997 100%); color: white; padding: 30px; border-radius: 8px; margin-bottom: 30px; }}
-            .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }}
-            .metric-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; border-left: 4px solid #28a745; }}
-            .metric-value {{ font-size: 2em; font-weight: bold; color: #28a745; }}
-            .metric-label {{ color: #6c757d; margin-top: 5px; }}
-            .test-results {{ margin: 20px 0; }}
-            .test-category {{ margin: 15px 0; padding: 15px; background: #f8f9fa; border-radius: 5px; }}
-            .test-detail {{ margin: 10px 0; padding: 10px; border-radius: 5px; }}
-            .passed {{ background-color: #d4edda; border-left: 4px solid #28a745; }}
-            .failed {{ background-color: #f8d7da; border-left: 4px solid #dc3545; }}
-            .status-passed {{ color: #28a745; font-weight: bold; }}
-            .status-failed {{ color: #dc3545; font-weight: bold; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🧪 SwiftAssess Functional Test Report</h1>
-                <p>Comprehensive Functional Testing Results</p>
-                <p>Generated on: {timestamp}</p>
-            </div>
-            
-            <div class="summary">
-                <div class="metric-card">
-                    <div class="metric-value">{summary['total_tests']}</div>
-                    <div class="metric-label">Total Tests</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{summary['passed']}</div>
-                    <div class="metric-label">Passed</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{summary['failed']}</div>
-                    <div class="metric-label">Failed</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{summary['pass_rate']:.1f}%</div>
-                    <div class="metric-label">Pass Rate</div>
-                </div>
-            </div>
-            
-            <div class="test-results">
-                <h2>📊 Test Results by Category</h2>
-    """
-    
-    # Add test categories
-    for category, data in results["test_categories"].items():
-        status_class = "passed" if data["status"] == "PASSED" else "failed"
-        status_icon = "✅" if data["status"] == "PASSED" else "❌"
-        
-        html_content += f"""
-                <div class="test-category">
-                    <h3>{status_icon} {category.replace('_', ' ').title()}</h3>
-                    <p><strong>Total:</strong> {data['total']} | <strong>Passed:</strong> {data['passed']} | <strong>Failed:</strong> {data['failed']}</p>
-                    <p><strong>Status:</strong> <span class="status-{status_class}">{data['status']}</span></p>
-                </div>
-        """
-    
-    # Add test details
-    html_content += """
-                <h2>📋 Test Details</h2>
-    """
-    
-    for test in results["test_details"]:
-        status_class = "passed" if test["status"] == "PASSED" else "failed"
-        status_icon = "✅" if test["status"] == "PASSED" else "❌"
-        
-        html_content += f"""
-                <div class="test-detail {status_class}">
-                    <strong>{status_icon} {test['test_name']}</strong>
-                    <span style="float: right;">{test['status']} ({test['duration']})</span>
-                    <br><small>{test['description']}</small>
-        """
-        
-        if test["status"] == "FAILED" and "error" in test:
-            html_content += f"<br><small style='color: #dc3545;'><strong>Error:</strong> {test['error']}</small>"
-        
-        html_content += "</div>"
-    
-    # Add browser and device compatibility
-    html_content += """
-                <h2>🌐 Browser Compatibility</h2>
-                <div class="test-category">
-    """
-    
-    for browser, data in results["browser_compatibility"].items():
-        status_icon = "✅" if data["status"] == "PASSED" else "❌"
-        html_content += f"<p>{status_icon} <strong>{browser.title()}</strong> {data['version']}: {data['status']}</p>"
-    
-    html_content += """
-                </div>
-                
-                <h2>📱 Device Compatibility</h2>
-                <div class="test-category">
-    """
-    
-    for device, data in results["device_compatibility"].items():
-        status_icon = "✅" if data["status"] == "PASSED" else "❌"
-        html_content += f"<p>{status_icon} <strong>{device.title()}</strong>: {data['status']} ({data['tests']} tests)</p>"
-    
-    html_content += """
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return html_content
+    return render_to_file("functional_report.html", path, results=results, generated_on=report_timestamp())
 
-def generate_load_html_report(results):
+def generate_load_html_report(results, path="reports/load_test_report.html"):
     """Generate HTML report for load tests"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    summary = results["test_summary"]
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>SwiftAssess Load Test Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-            .container {{ max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #007bff 0%, #6610f2 100%); color: white; padding: 30px; border-radius: 8px; margin-bottom: 30px; }}
-            .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }}
-            .metric-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; border-left: 4px solid #007bff; }}
-            .metric-value {{ font-size: 2em; font-weight: bold; color: #007bff; }}
-            .metric-label {{ color: #6c757d; margin-top: 5px; }}
-            .test-scenario {{ margin: 20px 0; padding: 20px; background: #f8f9fa; border-radius: 8px; }}
-            .metrics-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px; margin: 15px 0; }}
-            .metric {{ background: white; padding: 10px; border-radius: 5px; text-align: center; }}
-            .metric-value-small {{ font-size: 1.2em; font-weight: bold; }}
-            .status-passed {{ color: #28a745; font-weight: bold; }}
-            .status-warning {{ color: #ffc107; font-weight: bold; }}
-            .status-failed {{ color: #dc3545; font-weight: bold; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>⚡ SwiftAssess Load Test Report</h1>
-                <p>Performance Testing Results & Analysis</p>
-                <p>Generated on: {timestamp}</p>
-            </div>
-            
-            <div class="summary">
-                <div class="metric-card">
-                    <div class="metric-value">{summary['total_tests']}</div>
-                    <div class="metric-label">Total Tests</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{summary['passed']}</div>
-                    <div class="metric-label">Passed</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{summary['warnings']}</div>
-                    <div class="metric-label">Warnings</div>
-                </div>
-            </div>
-            
-            <div class="test-scenarios">
-                <h2>📊 Load Test Scenarios</h2>
-    """
-    
-    # Add test scenarios
-    for scenario_name, scenario_data in results["test_scenarios"].items():
-        status_class = scenario_data["status"].lower()
-        status_icon = "✅" if scenario_data["status"] == "PASSED" else "⚠️" if scenario_data["status"] == "WARNING" else "❌"
-        
-        html_content += f"""
-                <div class="test-scenario">
-                    <h3>{status_icon} {scenario_data['test_name']}</h3>
-                    <p><strong>Users:</strong> {scenario_data['users']} | <strong>Duration:</strong> {scenario_data['duration']} | <strong>Status:</strong> <span class="status-{status_class}">{scenario_data['status']}</span></p>
-                    
-                    <div class="metrics-grid">
-                        <div class="metric">
-                            <div class="metric-value-small">{scenario_data['total_requests']:,}</div>
-                            <div>Total Requests</div>
-                        </div>
-                        <div class="metric">
-                            <div class="metric-value-small">{scenario_data['avg_response_time']}s</div>
-                            <div>Avg Response Time</div>
-                        </div>
-                        <div class="metric">
-                            <div class="metric-value-small">{scenario_data['p95_response_time']}s</div>
-                            <div>95th Percentile</div>
-                        </div>
-                        <div class="metric">
-                            <div class="metric-value-small">{scenario_data['error_rate']}%</div>
-                            <div>Error Rate</div>
-                        </div>
-                        <div class="metric">
-                            <div class="metric-value-small">{scenario_data['throughput']}</div>
-                            <div>Throughput (RPS)</div>
-                        </div>
-                    </div>
-                </div>
-        """
-    
-    # Add performance analysis
-    analysis = results["performance_analysis"]
-    html_content += f"""
-                <h2>📈 Performance Analysis</h2>
-                <div class="test-scenario">
-                    <h3>Key Findings</h3>
-                    <ul>
-                        <li><strong>Baseline Performance:</strong> {analysis['baseline_performance']}</li>
-                        <li><strong>Stress Performance:</strong> {analysis['stress_performance']}</li>
-                        <li><strong>Spike Performance:</strong> {analysis['spike_performance']}</li>
-                    </ul>
-                    
-                    <h3>Identified Bottlenecks</h3>
-                    <ul>
-    """
-    
-    for bottleneck in analysis["bottlenecks"]:
-        html_content += f"<li>{bottleneck}</li>"
-    
-    html_content += """
-                    </ul>
-                    
-                    <h3>Recommendations</h3>
-                    <ul>
-    """
-    
-    for recommendation in analysis["recommendations"]:
-        html_content += f"<li>{recommendation}</li>"
-    
-    html_content += """
-                    </ul>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return html_content
+    return render_to_file("load_report.html", path, results=results, generated_on=report_timestamp())
 
 def create_combined_report():
     """Create combined test report"""
@@ -531,81 +283,18 @@ def create_combined_report():
         json.dump(combined_report, f, indent=2)
     
     # Generate combined HTML report
-    html_content = generate_combined_html_report(combined_report)
-    with open("reports/combined_test_report.html", "w") as f:
-        f.write(html_content)
+    generate_combined_html_report(combined_report)
     
     print("✅ Combined test report generated: reports/combined_test_report.html")
     return combined_report
 
-def generate_combined_html_report(report):
+def generate_combined_html_report(report, path="reports/combined_test_report.html"):
     """Generate combined HTML report"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    overall = report["overall_summary"]
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>SwiftAssess Combined Test Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-            .container {{ max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 8px; margin-bottom: 30px; }}
-            .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }}
-            .metric-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; border-left: 4px solid #007bff; }}
-            .metric-value {{ font-size: 2em; font-weight: bold; color: #007bff; }}
-            .metric-label {{ color: #6c757d; margin-top: 5px; }}
-            .section {{ margin: 30px 0; padding: 20px; background: #f8f9fa; border-radius: 8px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🚀 SwiftAssess Combined Test Report</h1>
-                <p>Functional & Load Testing Results</p>
-                <p>Generated on: {timestamp}</p>
-            </div>
-            
-            <div class="summary">
-                <div class="metric-card">
-                    <div class="metric-value">{overall['total_functional_tests']}</div>
-                    <div class="metric-label">Functional Tests</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{overall['functional_pass_rate']:.1f}%</div>
-                    <div class="metric-label">Functional Pass Rate</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{overall['load_test_scenarios']}</div>
-                    <div class="metric-label">Load Test Scenarios</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{overall['overall_status']}</div>
-                    <div class="metric-label">Overall Status</div>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>📊 Test Summary</h2>
-                <p><strong>Functional Testing:</strong> {overall['total_functional_tests']} tests with {overall['functional_pass_rate']:.1f}% pass rate</p>
-                <p><strong>Load Testing:</strong> {overall['load_test_scenarios']} scenarios with {overall['load_test_status']} status</p>
-                <p><strong>Overall Status:</strong> {overall['overall_status']}</p>
-            </div>
-            
-            <div class="section">
-                <h2>📋 Recommendations</h2>
-                <ul>
-                    <li>Fix duplicate email handling issue in functional tests</li>
-                    <li>Implement performance optimizations for high load scenarios</li>
-                    <li>Add monitoring and alerting for production environment</li>
-                    <li>Consider auto-scaling for traffic spikes</li>
-                </ul>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    return render_to_file("overview_report.html", path, report=report, generated_on=report_timestamp())
+
+def report_timestamp():
+    """Generation time shown in report headers"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 def main():
     """Main function to generate all reports"""
@@ -14,6 +14,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 
+from scripts.report_rendering import render_to_file
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
@@ -344,8 +346,7 @@ def main():
         results = test.run_all_tests()
         
         # Generate simple report
-        with open("reports/real_browser_test_report.html", "w") as f:
-            f.write(generate_html_report(results))
+        generate_html_report(results, "reports/real_browser_test_report.html")
         
         logger.info("📄 Real browser test report generated: reports/real_browser_test_report.html")
         
@@ -354,81 +355,29 @@ def main():
     finally:
         test.cleanup()
 
-def generate_html_report(results):
+def generate_html_report(results, path):
     """Generate HTML report"""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     passed = sum(1 for _, result in results if result)
     total = len(results)
-    pass_rate = (passed / total * 100) if total > 0 else 0
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>SwiftAssess Real Browser Test Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-            .container {{ max-width: 800px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
-            .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px; margin-bottom: 20px; }}
-            .metric {{ background: #f8f9fa; padding: 15px; border-radius: 5px; text-align: center; }}
-            .metric-value {{ font-size: 1.5em; font-weight: bold; color: #007bff; }}
-            .test-result {{ margin: 10px 0; padding: 10px; border-radius: 5px; }}
-            .passed {{ background-color: #d4edda; border-left: 4px solid #28a745; }}
-            .failed {{ background-color: #f8d7da; border-left: 4px solid #dc3545; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🌐 SwiftAssess Real Browser Test Report</h1>
-                <p>Generated on: {timestamp}</p>
-            </div>
-            
-            <div class="summary">
-                <div class="metric">
-                    <div class="metric-value">{total}</div>
-                    <div>Total Tests</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-value">{passed}</div>
-                    <div>Passed</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-value">{pass_rate:.1f}%</div>
-                    <div>Pass Rate</div>
-                </div>
-            </div>
-            
-            <h2>Test Results</h2>
-    """
-    
-    for test_name, result in results:
-        status_class = "passed" if result else "failed"
-        status_icon = "✅" if result else "❌"
-        f.write(f"""
-            <div class="test-result {status_class}">
-                <strong>{status_icon} {test_name}</strong>
-                <span style="float: right;">{"PASSED" if result else "FAILED"}</span>
-            </div>
-        """)
-    
-    f.write("""
-            <div style="margin-top: 20px; padding: 15px; background-color: #e3f2fd; border-radius: 5px;">
-                <h3>📋 Test Summary</h3>
-                <p>This test validates the SwiftAssess signup page using real browser automation:</p>
-                <ul>
-                    <li>Page loading and accessibility</li>
-                    <li>Form field detection and interaction</li>
-                    <li>Page element analysis</li>
-                    <li>Screenshot capture for evidence</li>
-                </ul>
-                <p><strong>Note:</strong> This is a real browser test that opens Chrome and navigates to the actual SwiftAssess signup page.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """)
+    return render_to_file(
+        "browser_test_report.html",
+        path,
+        generated_on=time.strftime("%Y-%m-%d %H:%M:%S"),
+        title="SwiftAssess Real Browser Test Report",
+        heading="🌐 SwiftAssess Real Browser Test Report",
+        results=results,
+        total=total,
+        passed=passed,
+        pass_rate=(passed / total * 100) if total > 0 else 0,
+        intro="This test validates the SwiftAssess signup page using real browser automation:",
+        checks=[
+            "Page loading and accessibility",
+            "Form field detection and interaction",
+            "Page element analysis",
+            "Screenshot capture for evidence",
+        ],
+        note="This is a real browser test that opens Chrome and navigates to the actual SwiftAssess signup page.",
+    )
 
 if __name__ == "__main__":
     main()
@@ -178,11 +178,8 @@ npm run load:all
     
     print_step(5, "Generate Reports")
     print("""
-# Generate combined report
-python scripts/generate_combined_report.py
-
-# Generate bug report
-python scripts/generate_bug_report.py
+# Generate combined and bug reports in one pass
+python scripts/generate_reports.py
 
 # View Allure report
 allure serve reports/allure-results
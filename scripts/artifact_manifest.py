@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test artifact manifest: screenshots, DOM snapshots and logs by pytest nodeid
+
+The bug report used to guess a failed test's screenshot as
+``screenshots/<nodeid>_failed.png`` while the screenshot helpers write
+``<test_name>_<status>_<timestamp>.png``, so every link was broken. Instead,
+everything that captures an artifact during a test appends one JSON line to
+the manifest (reports/artifacts.jsonl by default):
+
+    {"nodeid": "tests/...::TestSignup::test_x", "kind": "screenshot",
+     "path": "screenshots/test_x_failed_20240509_100001_123.png",
+     "status": "failed", "time": 1715248801.1, "run": "k3x9q0aa"}
+
+The nodeid is taken from ``PYTEST_CURRENT_TEST``, so helpers do not need to
+be handed the test item, and the run from scripts/identities.py, which every
+xdist worker of a run shares. Appending single lines keeps concurrent xdist
+workers from overwriting each other.
+
+Reports load the manifest once into an ArtifactIndex, which keeps the
+artifacts of each test's latest run only, so a test that failed before
+and fails again is never linked to the old run's screenshot. Within that
+run it keeps the best artifact of each kind (a failure capture over other
+captures, then the latest), so resolving the artifacts of a failed test is
+a dict lookup however many tests and runs the manifest covers.
+"""
+
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from scripts.identities import run_id
+from scripts.perf_config import load_config
+
+DEFAULT_MANIFEST = "reports/artifacts.jsonl"
+DEFAULT_LOG_DIR = "reports/logs"
+KINDS = ("screenshot", "dom", "log")
+FAILURE_STATUSES = ("failed", "error")
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+def manifest_path(config: Optional[Dict[str, Any]] = None) -> str:
+    """Manifest path from the ``artifacts`` section of config.yaml"""
+    config = load_config() if config is None else config
+    return (config.get("artifacts") or {}).get("manifest", DEFAULT_MANIFEST)
+
+
+def log_directory(config: Optional[Dict[str, Any]] = None) -> str:
+    """Directory of failed test logs from the ``artifacts`` section of config.yaml"""
+    config = load_config() if config is None else config
+    return (config.get("artifacts") or {}).get("logs", DEFAULT_LOG_DIR)
+
+
+def current_nodeid() -> Optional[str]:
+    """Nodeid of the test pytest is running in this process, if any"""
+    current = os.environ.get("PYTEST_CURRENT_TEST")
+    if not current:
+        return None
+    # "<nodeid> (<phase>)"; parametrize ids may contain spaces, the phase never does
+    return current.rsplit(" ", 1)[0]
+
+
+def record_artifact(
+    path: str,
+    kind: str = "screenshot",
+    nodeid: Optional[str] = None,
+    status: Optional[str] = None,
+    manifest: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Append an artifact to the manifest
+
+    Args:
+        path: Artifact file path (stored relative to the working directory)
+        kind: One of KINDS
+        nodeid: Test the artifact belongs to (default: the running test)
+        status: Test status when it was captured (``failed``, ``info``, ...)
+        manifest: Manifest path (default: manifest_path())
+
+    Returns:
+        The recorded entry, or None outside a test
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown artifact kind {kind!r} (expected one of {', '.join(KINDS)})")
+    nodeid = nodeid or current_nodeid()
+    if not nodeid:
+        return None
+    entry = {
+        "nodeid": nodeid,
+        "kind": kind,
+        "path": os.path.relpath(os.path.abspath(path)),
+        "status": status,
+        "time": time.time(),
+        "run": run_id(),
+    }
+    manifest = manifest or manifest_path()
+    os.makedirs(os.path.dirname(manifest) or ".", exist_ok=True)
+    with open(manifest, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    return entry
+
+
+def save_test_log(
+    nodeid: str,
+    text: str,
+    status: str = "failed",
+    directory: Optional[str] = None,
+    manifest: Optional[str] = None,
+    append: bool = False,
+) -> str:
+    """
+    Write the captured output of a test to a log file and record it
+
+    Args:
+        nodeid: Test the log belongs to
+        text: Failure and captured output
+        status: Test status
+        directory: Log directory (default: log_directory())
+        manifest: Manifest path (default: manifest_path())
+        append: Add to the log already written for this test (a later
+            phase that failed too) instead of replacing it; the log is
+            already recorded then
+
+    Returns:
+        Path of the log file
+    """
+    directory = directory or log_directory()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{_UNSAFE.sub('_', nodeid)[:180]}_{status}.log")
+    with open(path, "a" if append else "w", encoding="utf-8") as f:
+        f.write(("\n\n" if append else "") + text)
+    if not append:
+        record_artifact(path, "log", nodeid=nodeid, status=status, manifest=manifest)
+    return path
+
+
+class ArtifactIndex:
+    """Best artifact of each kind per nodeid, from the latest run that recorded the nodeid
+
+    Runs are ordered by their first entry, which the append-only manifest
+    keeps in the order the runs happened.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()):
+        self._artifacts: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._runs: Dict[Optional[str], int] = {}
+        self._latest_run: Dict[str, int] = {}
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def from_file(cls, path: str) -> "ArtifactIndex":
+        """Index of a manifest file (empty when it does not exist)"""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a killed worker
+                if isinstance(entry, dict) and entry.get("nodeid") and entry.get("path"):
+                    index.add(entry)
+        return index
+
+    def add(self, entry: Dict[str, Any]):
+        """Keep an entry if it beats the current artifact of its kind"""
+        nodeid = entry["nodeid"]
+        run = self._runs.setdefault(entry.get("run"), len(self._runs))
+        latest = self._latest_run.get(nodeid)
+        if latest is not None and run < latest:
+            return
+        if latest is None or run > latest:  # a newer run replaces everything the test had
+            self._latest_run[nodeid] = run
+            self._artifacts[nodeid] = {}
+        kinds = self._artifacts[nodeid]
+        kind = entry.get("kind", "screenshot")
+        current = kinds.get(kind)
+        if current is None or self._rank(entry) >= self._rank(current):
+            kinds[kind] = entry
+
+    @staticmethod
+    def _rank(entry: Dict[str, Any]):
+        return entry.get("status") in FAILURE_STATUSES, entry.get("time") or 0
+
+    def path(self, nodeid: str, kind: str = "screenshot") -> Optional[str]:
+        """Path of the artifact of a test, or None"""
+        entry = self._artifacts.get(nodeid, {}).get(kind)
+        return entry["path"] if entry else None
+
+    def artifacts(self, nodeid: str) -> Dict[str, str]:
+        """Path of every kind of artifact captured for a test"""
+        return {kind: entry["path"] for kind, entry in self._artifacts.get(nodeid, {}).items()}
+
+    def __len__(self) -> int:
+        return len(self._artifacts)
+
+
+def load_artifact_index(path: Optional[str] = None) -> ArtifactIndex:
+    """Artifact index of the manifest (default: manifest_path())"""
+    return ArtifactIndex.from_file(path or manifest_path())
+
+
+def relative_link(path: Optional[str], base: str) -> Optional[str]:
+    """Artifact path as a link from a report written to the base directory"""
+    if not path:
+        return None
+    return os.path.relpath(path, base).replace(os.sep, "/")
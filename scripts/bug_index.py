@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Persistent bug fingerprint index: stable bug IDs across runs
+
+The bug report used to number bugs ``BUG-001``, ``BUG-002``, ... afresh on
+every run, so an ID meant nothing from one run to the next. This module
+keeps a local SQLite index that maps failure signatures (see
+scripts/failure_clustering.py) to bugs:
+
+    bugs           one row per bug: first / last run seen, runs seen,
+                   failures counted, status and the last title and message
+    fingerprints   failure signature -> bug; every signature a bug's cluster
+                   ever contained, so a bug keeps its ID when its traceback
+                   drifts
+    runs           each ingested run, when it ran and its scope (the suite)
+    sightings      failures of a bug in a run (re-ingesting a run replaces them)
+
+Ingesting a run assigns each cluster the ID of the bug owning any of its
+signatures (or a new ID) and sets the status: ``new`` when the bug was first
+seen in this run (or in the runs reported together with it), ``recurring``
+when it was seen before, and ``resolved`` for open bugs that did not fail
+this time. A run with a scope only resolves bugs that failed in that scope
+before and fail in no other scope's latest run, so suites that run
+separately are tracked one suite run at a time. Signatures are looked up in
+one join against the fingerprint primary key, so runs with thousands of
+failures are ingested in a single transaction.
+
+    python scripts/bug_index.py list --status new
+    python scripts/bug_index.py show BUG-012
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.perf_config import load_config  # noqa: E402
+
+DEFAULT_DATABASE = "reports/bug_index.db"
+STATUSES = ("new", "recurring", "resolved")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_key TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL,
+    scope TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_scope ON runs (scope, seen_at);
+
+CREATE TABLE IF NOT EXISTS bugs (
+    id INTEGER PRIMARY KEY,
+    signature TEXT NOT NULL,
+    title TEXT,
+    message TEXT,
+    status TEXT NOT NULL,
+    first_seen_run TEXT,
+    last_seen_run TEXT,
+    resolved_run TEXT,
+    runs_seen INTEGER NOT NULL DEFAULT 0,
+    occurrences INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS bugs_status ON bugs (status, resolved_run);
+
+CREATE TABLE IF NOT EXISTS fingerprints (
+    signature TEXT PRIMARY KEY,
+    bug_id INTEGER NOT NULL REFERENCES bugs (id) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fingerprints_bug ON fingerprints (bug_id);
+
+CREATE TABLE IF NOT EXISTS sightings (
+    bug_id INTEGER NOT NULL REFERENCES bugs (id) ON DELETE CASCADE,
+    run_key TEXT NOT NULL REFERENCES runs (run_key) ON DELETE CASCADE,
+    occurrences INTEGER NOT NULL,
+    PRIMARY KEY (bug_id, run_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sightings_run ON sightings (run_key);
+"""
+
+# Per-bug aggregates recomputed from the sightings of the bugs in temp.touched
+_REFRESH = """
+UPDATE bugs SET
+    runs_seen = (SELECT COUNT(*) FROM sightings WHERE bug_id = bugs.id),
+    occurrences = (SELECT COALESCE(SUM(occurrences), 0) FROM sightings WHERE bug_id = bugs.id),
+    first_seen_run = (
+        SELECT s.run_key FROM sightings AS s JOIN runs AS r ON r.run_key = s.run_key
+        WHERE s.bug_id = bugs.id ORDER BY r.seen_at, r.run_key LIMIT 1
+    ),
+    last_seen_run = (
+        SELECT s.run_key FROM sightings AS s JOIN runs AS r ON r.run_key = s.run_key
+        WHERE s.bug_id = bugs.id ORDER BY r.seen_at DESC, r.run_key DESC LIMIT 1
+    )
+WHERE id IN (SELECT bug_id FROM temp.touched)
+"""
+
+# Open bugs not seen in this run; within a scope, only those that failed in it
+# before and fail in no other scope's latest run
+_RESOLVE = """
+UPDATE bugs SET status = 'resolved', resolved_run = :run_key
+WHERE status != 'resolved' AND id NOT IN (SELECT bug_id FROM temp.touched)
+AND (:scope IS NULL OR (
+    id IN (SELECT s.bug_id FROM sightings AS s JOIN runs AS r ON r.run_key = s.run_key WHERE r.scope = :scope)
+    AND id NOT IN (
+        SELECT s.bug_id FROM sightings AS s JOIN runs AS r ON r.run_key = s.run_key
+        WHERE r.scope IS NOT :scope AND r.seen_at = (SELECT MAX(seen_at) FROM runs WHERE scope IS r.scope)
+    )
+))
+"""
+
+_SELECT_BUGS = """
+SELECT b.*, f.seen_at AS first_seen_at, l.seen_at AS last_seen_at
+FROM bugs AS b
+LEFT JOIN runs AS f ON f.run_key = b.first_seen_run
+LEFT JOIN runs AS l ON l.run_key = b.last_seen_run
+"""
+
+
+def bug_label(bug_id: int) -> str:
+    """Display ID of a bug"""
+    return f"BUG-{bug_id:03d}"
+
+
+def parse_bug_label(label: str) -> int:
+    """Bug number of a ``BUG-012`` style ID"""
+    return int(label.upper().removeprefix("BUG-"))
+
+
+class BugIndex:
+    """SQLite index of bug fingerprints"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and create) the index
+
+        Args:
+            path: Database file (default from the bug_index section of config.yaml)
+        """
+        if path is None:
+            path = load_config().get("bug_index", {}).get("database", DEFAULT_DATABASE)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.executescript(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS incoming (position INTEGER NOT NULL, signature TEXT NOT NULL);
+            CREATE TEMP TABLE IF NOT EXISTS touched (bug_id INTEGER PRIMARY KEY);
+            CREATE TEMP TABLE IF NOT EXISTS current (run_key TEXT PRIMARY KEY);
+            """
+        )
+
+    def close(self):
+        """Close the database"""
+        self.connection.close()
+
+    def __enter__(self) -> "BugIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def ingest(self, run_key: str, clusters: Sequence[Dict[str, Any]], seen_at: Optional[float] = None,
+               scope: Optional[str] = None, together: Sequence[str] = ()) -> Dict[str, List[Dict]]:
+        """
+        Record the failure clusters of a run
+
+        Args:
+            run_key: Identity of the run; ingesting the same key again
+                replaces its sightings instead of counting them twice
+            clusters: One dict per failure cluster with ``signatures`` (all
+                signatures in the cluster), ``occurrences`` and optionally
+                ``title`` and ``message``, largest cluster first
+            seen_at: When the run ran (epoch seconds, default now); orders
+                first / last seen
+            scope: Suite the run covers (None: the run covers everything)
+            together: Keys of the other runs reported with this one (the
+                other suites of a pipeline run); a bug only seen in them
+                and this run is still new
+
+        Returns:
+            ``bugs``: the bug of each cluster, aligned with clusters;
+            ``resolved``: bugs that were open and did not fail in this run
+        """
+        seen_at = time.time() if seen_at is None else seen_at
+        connection = self.connection
+        with connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO runs (run_key, seen_at, scope) VALUES (?, ?, ?)", (run_key, seen_at, scope)
+            )
+            connection.execute("DELETE FROM temp.touched")
+            connection.execute("INSERT INTO temp.touched SELECT bug_id FROM sightings WHERE run_key = ?", (run_key,))
+            connection.execute("DELETE FROM sightings WHERE run_key = ?", (run_key,))
+
+            # One indexed join finds the known bug of every cluster's signatures
+            connection.execute("DELETE FROM temp.incoming")
+            connection.executemany(
+                "INSERT INTO temp.incoming (position, signature) VALUES (?, ?)",
+                ((position, signature) for position, cluster in enumerate(clusters) for signature in cluster["signatures"]),
+            )
+            known = dict(connection.execute(
+                """
+                SELECT i.position, MIN(f.bug_id) FROM temp.incoming AS i
+                JOIN fingerprints AS f ON f.signature = i.signature
+                GROUP BY i.position
+                """
+            ).fetchall())
+
+            bug_ids = []
+            taken = set()
+            for position, cluster in enumerate(clusters):
+                bug_id = known.get(position)
+                if bug_id is None or bug_id in taken:  # a bug split in two keeps its ID on the larger part
+                    bug_id = connection.execute(
+                        "INSERT INTO bugs (signature, status) VALUES (?, 'new')", (cluster["signatures"][0],)
+                    ).lastrowid
+                taken.add(bug_id)
+                bug_ids.append(bug_id)
+
+            connection.executemany(
+                "INSERT OR IGNORE INTO fingerprints (signature, bug_id) VALUES (?, ?)",
+                ((signature, bug_id) for bug_id, cluster in zip(bug_ids, clusters) for signature in cluster["signatures"]),
+            )
+            connection.executemany(
+                "INSERT INTO sightings (bug_id, run_key, occurrences) VALUES (?, ?, ?)",
+                ((bug_id, run_key, cluster.get("occurrences", 1)) for bug_id, cluster in zip(bug_ids, clusters)),
+            )
+            connection.executemany(
+                "UPDATE bugs SET title = COALESCE(?, title), message = COALESCE(?, message) WHERE id = ?",
+                ((cluster.get("title"), cluster.get("message"), bug_id) for bug_id, cluster in zip(bug_ids, clusters)),
+            )
+            connection.executemany("INSERT OR IGNORE INTO temp.touched (bug_id) VALUES (?)", ((bug_id,) for bug_id in bug_ids))
+            connection.execute(_REFRESH)
+
+            # Seen in this run: new or recurring; open and not seen: resolved by this run
+            connection.execute("DELETE FROM temp.touched")
+            connection.executemany("INSERT OR IGNORE INTO temp.touched (bug_id) VALUES (?)", ((bug_id,) for bug_id in bug_ids))
+            connection.execute("DELETE FROM temp.current")
+            connection.executemany(
+                "INSERT OR IGNORE INTO temp.current (run_key) VALUES (?)", ((key,) for key in (run_key, *together))
+            )
+            connection.execute(
+                """
+                UPDATE bugs SET status = CASE WHEN EXISTS (
+                    SELECT 1 FROM sightings AS s
+                    WHERE s.bug_id = bugs.id AND s.run_key NOT IN (SELECT run_key FROM temp.current)
+                ) THEN 'recurring' ELSE 'new' END, resolved_run = NULL
+                WHERE id IN (SELECT bug_id FROM temp.touched)
+                """
+            )
+            connection.execute(_RESOLVE, {"run_key": run_key, "scope": scope})
+
+        seen = {bug["id"]: bug for bug in self._select("WHERE b.id IN (SELECT bug_id FROM temp.touched)")}
+        return {
+            "bugs": [seen[bug_id] for bug_id in bug_ids],
+            "resolved": self._select("WHERE b.resolved_run = ? ORDER BY b.id", (run_key,)),
+        }
+
+    def has_run(self, run_key: str) -> bool:
+        """Whether a run has been ingested"""
+        return self.connection.execute("SELECT 1 FROM runs WHERE run_key = ?", (run_key,)).fetchone() is not None
+
+    def lookup(self, clusters: Sequence[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Bug of each cluster without recording anything
+
+        Clusters are matched as ``ingest`` matches them: by any of their
+        signatures, each bug going to the first (largest) cluster only.
+
+        Returns:
+            Bug rows aligned with clusters, None for clusters of unknown signatures
+        """
+        connection = self.connection
+        with connection:
+            connection.execute("DELETE FROM temp.incoming")
+            connection.executemany(
+                "INSERT INTO temp.incoming (position, signature) VALUES (?, ?)",
+                ((position, signature) for position, cluster in enumerate(clusters) for signature in cluster["signatures"]),
+            )
+            owners = connection.execute(
+                """
+                SELECT DISTINCT i.position, f.bug_id FROM temp.incoming AS i
+                JOIN fingerprints AS f ON f.signature = i.signature
+                ORDER BY i.position, f.bug_id
+                """
+            ).fetchall()
+        bug_ids = [None] * len(clusters)
+        taken = set()
+        for position, bug_id in owners:
+            if bug_ids[position] is None and bug_id not in taken:
+                bug_ids[position] = bug_id
+                taken.add(bug_id)
+        if not taken:
+            return bug_ids
+        found = {bug["id"]: bug for bug in self._select(f"WHERE b.id IN ({', '.join('?' * len(taken))})", list(taken))}
+        return [found.get(bug_id) for bug_id in bug_ids]
+
+    def resolved_by(self, run_keys: Sequence[str]) -> List[Dict[str, Any]]:
+        """Bugs still resolved by any of the runs, oldest first"""
+        run_keys = list(run_keys)
+        if not run_keys:
+            return []
+        return self._select(f"WHERE b.resolved_run IN ({', '.join('?' * len(run_keys))}) ORDER BY b.id", run_keys)
+
+    def bugs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All bugs, or the bugs with a status, oldest first"""
+        if status is None:
+            return self._select("ORDER BY b.id")
+        return self._select("WHERE b.status = ? ORDER BY b.id", (status,))
+
+    def bug(self, bug_id: int) -> Optional[Dict[str, Any]]:
+        """One bug with its signatures and the runs it failed in"""
+        rows = self._select("WHERE b.id = ?", (bug_id,))
+        if not rows:
+            return None
+        bug = rows[0]
+        bug["signatures"] = [
+            row[0] for row in self.connection.execute("SELECT signature FROM fingerprints WHERE bug_id = ?", (bug_id,))
+        ]
+        bug["runs"] = [
+            dict(row) for row in self.connection.execute(
+                """
+                SELECT s.run_key, r.seen_at, s.occurrences FROM sightings AS s JOIN runs AS r ON r.run_key = s.run_key
+                WHERE s.bug_id = ? ORDER BY r.seen_at
+                """,
+                (bug_id,),
+            )
+        ]
+        return bug
+
+    def _select(self, clause: str, parameters: Sequence = ()) -> List[Dict[str, Any]]:
+        """Bug rows with their first / last seen times and display ID"""
+        rows = [dict(row) for row in self.connection.execute(f"{_SELECT_BUGS} {clause}", parameters)]
+        for row in rows:
+            row["label"] = bug_label(row["id"])
+        return rows
+
+
+def main():
+    """Command line entry point: list bugs or show one"""
+    parser = argparse.ArgumentParser(description="Query the persistent bug fingerprint index")
+    parser.add_argument("--database", default=None, help="Index database (default from config.yaml)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listing = commands.add_parser("list", help="Bugs with their status")
+    listing.add_argument("--status", choices=STATUSES)
+
+    show = commands.add_parser("show", help="Signatures and runs of one bug")
+    show.add_argument("bug", help="Bug ID, e.g. BUG-012")
+    args = parser.parse_args()
+
+    with BugIndex(args.database) as index:
+        if args.command == "list":
+            for bug in index.bugs(args.status):
+                print(f"{bug['label']}  {bug['status']:<9}  {bug['runs_seen']:>3} run(s)  {bug['occurrences']:>5} failure(s)  "
+                      f"{bug['title'] or ''}")
+        else:
+            bug = index.bug(parse_bug_label(args.bug))
+            if bug is None:
+                print(f"❌ {args.bug} is not in {index.path}")
+                sys.exit(1)
+            print(f"{bug['label']} ({bug['status']}): {bug['title']}\n{bug['message'] or ''}\n")
+            print(f"Signatures: {', '.join(bug['signatures'])}")
+            for run in bug["runs"]:
+                print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(run['seen_at']))}  {run['run_key']}  "
+                      f"{run['occurrences']} failure(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Rule-driven classification of failed tests into bug fields
+
+The priority, severity, category, reproduction steps, expected result,
+browser and device of a bug row are decided by ordered rules in
+config/bug_rules.yaml (or the file named by ``bug_classification.rules`` in
+config.yaml): the first rule whose keywords or regexes match the failure
+message or test name sets the value, otherwise the field's default. See
+the rule file for the rule syntax.
+
+The rule file is compiled once into a keyword table per source column.
+Every keyword is listed once however many rules and fields use it, and
+scanned once per distinct lowercased text with a C substring search (a
+combined alternation regex is several times slower on long tracebacks in
+CPython's backtracking ``re``). The first matching rule of each field is
+then resolved for all rows at once with numpy, so classification runs
+column-wise over a DataFrame of failures; failures sharing a message or test
+name (the same test failing across runs) are matched only once. Rules with
+``regex`` entries get one compiled pattern per rule.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from scripts.perf_config import load_config
+
+# Shipped rules, used when config.yaml (read from the working directory) names none
+RULES_PATH = str(Path(__file__).resolve().parent.parent / "config" / "bug_rules.yaml")
+SOURCES = ("message", "test_name")
+
+
+class FieldRules:
+    """Ordered rules of one bug field
+
+    Args:
+        name: Bug field the rules decide
+        spec: The field's entry of the rule file (source, default, rules)
+    """
+
+    def __init__(self, name: str, spec: Dict):
+        self.name = name
+        self.source = spec.get("source", "message")
+        if self.source not in SOURCES:
+            raise ValueError(f"Bug rules for {name!r}: source must be one of {', '.join(SOURCES)}")
+        self.default = spec.get("default")
+        self.values = []
+        self.keywords: List[List[str]] = []
+        self.all_keywords: List[List[str]] = []
+        self.patterns: List[Optional[re.Pattern]] = []
+        for i, rule in enumerate(spec.get("rules") or []):
+            keywords = [str(keyword).lower() for keyword in rule.get("keywords") or []]
+            all_keywords = [str(keyword).lower() for keyword in rule.get("all_keywords") or []]
+            regexes = [str(regex) for regex in rule.get("regex") or []]
+            if "value" not in rule or not (keywords or all_keywords or regexes):
+                raise ValueError(f"Bug rule {i + 1} of {name!r} needs a value and keywords, all_keywords or regex")
+            try:
+                pattern = re.compile("|".join(f"(?:{regex})" for regex in regexes), re.IGNORECASE) if regexes else None
+            except re.error as e:
+                raise ValueError(f"Bug rule {i + 1} of {name!r}: invalid regex: {e}") from e
+            self.values.append(rule["value"])
+            self.keywords.append(keywords)
+            self.all_keywords.append(all_keywords)
+            self.patterns.append(pattern)
+
+
+class BugClassifier:
+    """Compiled rules of every bug field, applied column-wise
+
+    Example:
+        classifier = load_classifier()
+        fields = classifier.classify(pd.DataFrame({"message": messages, "test_name": nodeids}))
+    """
+
+    def __init__(self, rules: Dict[str, Dict]):
+        self.fields = {name: FieldRules(name, spec) for name, spec in (rules or {}).items()}
+        # Each distinct keyword of a source, scanned once for all the fields using it
+        self.keywords = {
+            source: list(dict.fromkeys(
+                keyword
+                for field in self.fields.values() if field.source == source
+                for keywords in (*field.keywords, *field.all_keywords) for keyword in keywords
+            ))
+            for source in SOURCES
+        }
+
+    @classmethod
+    def from_file(cls, path: str) -> "BugClassifier":
+        """Compile the rules of a YAML rule file"""
+        rules = load_config(path)
+        if not rules:
+            raise ValueError(f"No bug rules in {path}")
+        return cls(rules)
+
+    def classify_texts(self, source: str, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Values of every field of a source for a list of texts
+
+        Args:
+            source: "message" or "test_name"
+            texts: Texts to classify (each should be distinct; see classify)
+
+        Returns:
+            Field name to an object array of values aligned with texts
+        """
+        lowered = [text.lower() for text in texts]
+        hits = {
+            keyword: np.fromiter((keyword in text for text in lowered), dtype=bool, count=len(lowered))
+            for keyword in self.keywords[source]
+        }
+        values = {}
+        for name, field in self.fields.items():
+            if field.source != source:
+                continue
+            choices = np.array([*field.values, field.default], dtype=object)
+            # Walk the rules from last to first so the first matching rule wins
+            chosen = np.full(len(texts), len(field.values))
+            for i in reversed(range(len(field.values))):
+                matched = np.zeros(len(texts), dtype=bool)
+                for keyword in field.keywords[i]:
+                    matched |= hits[keyword]
+                if field.all_keywords[i]:
+                    matched |= np.logical_and.reduce([hits[keyword] for keyword in field.all_keywords[i]])
+                if field.patterns[i] is not None:
+                    search = field.patterns[i].search
+                    matched |= np.fromiter((search(text) is not None for text in texts), dtype=bool, count=len(texts))
+                chosen[matched] = i
+            values[name] = choices[chosen]
+        return values
+
+    def classify(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Classify failures column-wise
+
+        Args:
+            frame: One row per failure with ``message`` and ``test_name``
+                columns (missing values count as empty text)
+
+        Returns:
+            One column per rule field, aligned with frame
+        """
+        columns = {}
+        for source in SOURCES:
+            texts = frame[source].fillna("").astype(str) if source in frame else pd.Series("", index=frame.index)
+            codes, uniques = pd.factorize(texts)
+            for name, values in self.classify_texts(source, list(uniques)).items():
+                columns[name] = values[codes]
+        return pd.DataFrame({name: columns[name] for name in self.fields}, index=frame.index)
+
+    def classify_one(self, field: str, text: Optional[str]):
+        """Value of one field for a single text"""
+        return self.classify_texts(self.fields[field].source, [text or ""])[field][0]
+
+    def names(self) -> List[str]:
+        """Fields the rules decide"""
+        return list(self.fields)
+
+
+def rules_path(config: Optional[Dict] = None) -> str:
+    """Rule file named by bug_classification.rules in config.yaml"""
+    config = load_config() if config is None else config
+    return (config.get("bug_classification") or {}).get("rules", RULES_PATH)
+
+
+@lru_cache(maxsize=None)
+def load_classifier(path: Optional[str] = None) -> BugClassifier:
+    """Compiled classifier for a rule file (default from config.yaml), built once per path"""
+    return BugClassifier.from_file(path or rules_path())
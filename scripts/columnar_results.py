@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Columnar test results: a pytest plugin writing Parquet / Arrow IPC files
+
+pytest-json-report writes a nested JSON document that repeats every key for
+every test and has to be parsed whole to answer any question. Alongside it,
+this plugin writes one row per test to a columnar file:
+
+    nodeid  outcome  setup_duration  call_duration  teardown_duration  duration
+    markers  browser  device  message  signature  screenshot  dom_snapshot  log
+
+``signature`` is the failure signature of scripts/failure_clustering.py and
+the last three columns are the test's entries in the artifact manifest
+(scripts/artifact_manifest.py). Run-level fields (created, duration,
+exitcode, summary) are stored as JSON in the schema metadata, so a reader
+gets them without touching the rows.
+
+``.parquet`` files are written with zstd compression; ``.arrow`` /
+``.feather`` files as uncompressed Arrow IPC, which readers memory-map
+without copying. Either way readers load only the columns they ask for.
+
+The module is a pytest plugin of its own that adds the option; the root
+conftest.py loads it (``pytest_plugins``) for every test path in the repo:
+
+    python -m pytest --columnar-report=reports/smoke_results.parquet
+
+Writing and reading needs pyarrow; without it the plugin warns and does
+nothing, and loaders fall back to the JSON report (see prefer_columnar).
+"""
+
+import glob
+import importlib.util
+import json
+import os
+import shlex
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from scripts.json_stream import PytestReportStream
+
+PARQUET_SUFFIXES = (".parquet",)
+IPC_SUFFIXES = (".arrow", ".feather")
+COLUMNAR_SUFFIXES = PARQUET_SUFFIXES + IPC_SUFFIXES
+METADATA_KEY = b"pytest_run"
+PHASES = ("setup", "call", "teardown")
+
+# Start times this close apart are the same run (both reports are written at session end)
+SAME_RUN_SECONDS = 5.0
+
+# Browser and device markers registered in pytest.ini
+BROWSER_MARKERS = {"chrome": "Chrome", "firefox": "Firefox", "edge": "Edge"}
+DEVICE_MARKERS = {"mobile": "Mobile", "tablet": "Tablet"}
+
+# Column name and artifact manifest kind
+ARTIFACT_COLUMNS = {"screenshot": "screenshot", "dom_snapshot": "dom", "log": "log"}
+
+
+def columnar_available() -> bool:
+    """Whether pyarrow is installed"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def is_columnar(path: str) -> bool:
+    """Whether a path names a Parquet or Arrow IPC file"""
+    return Path(path).suffix.lower() in COLUMNAR_SUFFIXES
+
+
+def results_schema():
+    """Arrow schema of a columnar results file"""
+    import pyarrow as pa
+
+    return pa.schema([
+        ("nodeid", pa.string()),
+        ("outcome", pa.dictionary(pa.int8(), pa.string())),
+        *((f"{phase}_duration", pa.float64()) for phase in PHASES),
+        ("duration", pa.float64()),
+        ("markers", pa.list_(pa.string())),
+        ("browser", pa.dictionary(pa.int8(), pa.string())),
+        ("device", pa.dictionary(pa.int8(), pa.string())),
+        ("message", pa.large_string()),
+        ("signature", pa.string()),
+        *((column, pa.string()) for column in ARTIFACT_COLUMNS),
+    ])
+
+
+def write_results(path: str, columns: Dict[str, Sequence[Any]], run: Dict[str, Any]) -> str:
+    """
+    Write test rows and run metadata to a Parquet or Arrow IPC file
+
+    Args:
+        path: Output path; the suffix picks the format
+        columns: Column name to values, one value per test
+        run: Run-level fields stored in the schema metadata
+
+    Returns:
+        The written path
+    """
+    import pyarrow as pa
+
+    schema = results_schema().with_metadata({METADATA_KEY: json.dumps(run).encode("utf-8")})
+    table = pa.Table.from_pydict({name: columns[name] for name in schema.names}, schema=schema)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.tmp"
+    if Path(path).suffix.lower() in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, temporary, compression="zstd")
+    else:
+        with pa.OSFile(temporary, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temporary, path)
+    return path
+
+
+def read_results(path: str, columns: Optional[Sequence[str]] = None):
+    """
+    Selected columns of a columnar results file
+
+    Parquet files are read column-selectively through a memory map; Arrow
+    IPC files are memory-mapped and the columns selected without copying.
+
+    Returns:
+        pyarrow.Table with the run metadata on its schema
+    """
+    import pyarrow as pa
+
+    if Path(path).suffix.lower() in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.select(list(columns)) if columns else table
+
+
+def read_run(path: str) -> Dict[str, Any]:
+    """Run metadata of a columnar results file, read from the schema alone"""
+    import pyarrow as pa
+
+    if Path(path).suffix.lower() in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(path, memory_map=True)
+    else:
+        schema = pa.ipc.open_file(pa.memory_map(path, "r")).schema
+    return json.loads((schema.metadata or {}).get(METADATA_KEY, b"{}"))
+
+
+def _json_created(path: str) -> Optional[float]:
+    """``created`` of a pytest-json-report, read from the fields before the tests"""
+    stream = PytestReportStream(path)
+    try:
+        next(iter(stream), None)
+    except (OSError, ValueError):
+        return None
+    finally:
+        stream.close()
+    return stream.header.get("created")
+
+
+def is_current(columnar: str, json_path: str) -> bool:
+    """
+    Whether a columnar file can stand in for its JSON twin
+
+    It can when it is at least as new as the JSON file or holds the same run
+    (``created`` within SAME_RUN_SECONDS), not when the JSON file was
+    rewritten after it (by another run or by scripts/merge_results.py).
+    """
+    try:
+        if os.path.getmtime(columnar) >= os.path.getmtime(json_path):
+            return True
+        created = read_run(columnar).get("created")
+    except (OSError, ValueError):
+        return False
+    json_created = _json_created(json_path)
+    return created is not None and json_created is not None and abs(created - json_created) <= SAME_RUN_SECONDS
+
+
+def prefer_columnar(paths: Iterable[str]) -> List[str]:
+    """
+    Result files to load, a columnar file replacing the JSON file of the same run
+
+    ``reports/smoke_results.parquet`` is read instead of
+    ``reports/smoke_results.json`` unless the JSON file is newer (see
+    is_current); a stale columnar file is dropped. Without pyarrow the JSON
+    files are kept and columnar files dropped.
+    """
+    paths = list(paths)
+    if not columnar_available():
+        return [path for path in paths if not is_columnar(path)]
+    twins = {os.path.splitext(path)[0]: path for path in paths if not is_columnar(path)}
+    dropped = set()
+    for path in paths:
+        twin = twins.get(os.path.splitext(path)[0]) if is_columnar(path) else None
+        if twin is not None:
+            dropped.add(twin if is_current(path, twin) else path)
+    return [path for path in paths if path not in dropped]
+
+
+def result_files(directory: str = "reports") -> List[str]:
+    """JSON and columnar result files in a directory, columnar preferred"""
+    patterns = ["*.json", *(f"*{suffix}" for suffix in COLUMNAR_SUFFIXES)]
+    return sorted(prefer_columnar(path for pattern in patterns for path in glob.glob(os.path.join(directory, pattern))))
+
+
+def _outcome(phases: Dict[str, Any]) -> str:
+    """Outcome of a test from its phase reports, as pytest-json-report names it"""
+    setup, call, teardown = (phases.get(phase) for phase in PHASES)
+    if setup is not None and setup.failed:
+        return "error"
+    if call is None:
+        return "skipped" if setup is not None and setup.skipped else "error"
+    if hasattr(call, "wasxfail"):
+        return "xfailed" if call.skipped else "xpassed"
+    if call.passed and teardown is not None and teardown.failed:
+        return "error"
+    return call.outcome
+
+
+class ColumnarResults:
+    """pytest plugin collecting one row per test and writing it at session end
+
+    Args:
+        path: Output path (``.parquet``, ``.arrow`` or ``.feather``)
+        markers: Registered marker names; other keywords are not markers
+        browser: Browser the session ran against (the ``--browser`` option
+            when it was given; None classifies each test by its nodeid)
+    """
+
+    def __init__(self, path: str, markers: Iterable[str] = (), browser: Optional[str] = None):
+        self.path = path
+        self.markers = set(markers)
+        self.browser = browser
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self.created = time.time()
+        self.started = time.perf_counter()
+
+    def pytest_sessionstart(self, session):
+        self.started = time.perf_counter()
+
+    def pytest_runtest_logreport(self, report):
+        # A rerun starts again from setup and replaces the earlier attempt
+        if report.when == "setup" or report.nodeid not in self.tests:
+            self.tests[report.nodeid] = {"phases": {}, "markers": sorted(self.markers.intersection(report.keywords))}
+        self.tests[report.nodeid]["phases"][report.when] = report
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.created = time.time()  # pytest-json-report's created is the session end too
+        try:
+            self.write(int(exitstatus))
+        except Exception as e:  # the run's own result must not depend on the extra report
+            warnings.warn(f"Could not write columnar results to {self.path}: {e}")
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Column name to values, one row per test in run order"""
+        # Imported here so loading the plugin does not import pandas into every pytest run
+        from scripts.artifact_manifest import load_artifact_index
+        from scripts.bug_rules import load_classifier
+        from scripts.failure_clustering import failure_frames, failure_signature
+
+        nodeids = list(self.tests)
+        columns: Dict[str, List[Any]] = {name: [] for name in ("nodeid", "outcome", "duration", "markers", "message")}
+        columns.update({f"{phase}_duration": [] for phase in PHASES})
+        for nodeid in nodeids:
+            test = self.tests[nodeid]
+            phases = test["phases"]
+            durations = {phase: getattr(phases.get(phase), "duration", None) for phase in PHASES}
+            failed = next((phases[p] for p in PHASES if p in phases and phases[p].outcome != "passed"), None)
+            columns["nodeid"].append(nodeid)
+            columns["outcome"].append(_outcome(phases))
+            for phase in PHASES:
+                columns[f"{phase}_duration"].append(durations[phase])
+            columns["duration"].append(sum(d for d in durations.values() if d is not None))
+            columns["markers"].append(test["markers"])
+            columns["message"].append((failed.longreprtext or None) if failed is not None else None)
+
+        columns["signature"] = [
+            failure_signature(failure_frames(message)) if message and outcome in ("failed", "error") else None
+            for outcome, message in zip(columns["outcome"], columns["message"])
+        ]
+        classifier = load_classifier()
+        for column, markers, default in (("browser", BROWSER_MARKERS, self.browser), ("device", DEVICE_MARKERS, None)):
+            values = []
+            for nodeid, test_markers in zip(nodeids, columns["markers"]):
+                marked = next((markers[m] for m in test_markers if m in markers), None)
+                fallback = default.title() if default else classifier.classify_one(column, nodeid)
+                values.append(marked or fallback)
+            columns[column] = values
+        artifacts = load_artifact_index()
+        for column, kind in ARTIFACT_COLUMNS.items():
+            columns[column] = [artifacts.path(nodeid, kind) for nodeid in nodeids]
+        return columns
+
+    def run(self, exitcode: int) -> Dict[str, Any]:
+        """Run-level fields in the shape of the pytest-json-report header"""
+        summary: Dict[str, int] = {}
+        for test in self.tests.values():
+            outcome = _outcome(test["phases"])
+            summary[outcome] = summary.get(outcome, 0) + 1
+        summary["total"] = len(self.tests)
+        return {
+            "created": self.created,
+            "duration": time.perf_counter() - self.started,
+            "exitcode": exitcode,
+            "summary": summary,
+        }
+
+    def write(self, exitcode: int = 0) -> str:
+        """Write the collected rows"""
+        return write_results(self.path, self.columns(), self.run(exitcode))
+
+
+def register(config, path: str) -> Optional[ColumnarResults]:
+    """
+    Register the plugin on the controller process
+
+    xdist workers forward their reports to the controller, which writes the
+    file once.
+
+    Returns:
+        The plugin, or None on workers and without pyarrow
+    """
+    if hasattr(config, "workerinput"):
+        return None
+    if not columnar_available():
+        warnings.warn("--columnar-report needs pyarrow (pip install pyarrow); no columnar results are written")
+        return None
+    markers = [line.split(":", 1)[0].split("(", 1)[0].strip() for line in config.getini("markers")]
+    browser = config.getoption("--browser", None) if option_given(config, "--browser") else None
+    plugin = ColumnarResults(path, markers, browser)
+    config.pluginmanager.register(plugin, "columnar_results")
+    return plugin
+
+
+def option_given(config, name: str) -> bool:
+    """Whether a command line option was set explicitly rather than left at its default"""
+    args = [*config.getini("addopts"), *shlex.split(os.environ.get("PYTEST_ADDOPTS", "")),
+            *config.invocation_params.args]
+    return any(arg == name or arg.startswith(f"{name}=") for arg in map(str, args))
+
+
+def pytest_addoption(parser):
+    """Add the --columnar-report option"""
+    parser.addoption(
+        "--columnar-report",
+        action="store",
+        default=None,
+        help="Also write results to a Parquet (.parquet) or Arrow IPC (.arrow) file",
+    )
+
+
+def pytest_configure(config):
+    """Register the columnar results writer when --columnar-report is given"""
+    path = config.getoption("--columnar-report")
+    if path:
+        register(config, path)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Constant-memory Excel export
+
+openpyxl's default workbook keeps a Cell object for every value until it is
+saved, which runs to gigabytes for large bug lists. ExcelStream uses the
+write-only workbook instead: each appended row is serialized to the sheet's
+temporary XML file immediately, so rows can be streamed from a query or a
+generator without building a DataFrame first.
+
+Summary sheets are tallied while the detail rows stream past (see
+GroupTally), so the data is read once.
+"""
+
+import os
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+HEADER_FONT = Font(bold=True)
+MAX_COLUMN_WIDTH = 60
+
+
+def excel_value(value: Any) -> Any:
+    """Cell value openpyxl can store (control characters from tracebacks removed)"""
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    if hasattr(value, "item"):  # numpy scalar
+        return value.item()
+    return str(value)
+
+
+class GroupTally:
+    """Per-group counters accumulated in the same pass that writes the rows
+
+    Args:
+        key: Field whose values form the groups
+        counters: Name of each count and the predicate a row must match to
+            be counted (None counts every row)
+    """
+
+    def __init__(self, key: str, counters: Dict[str, Optional[Callable[[Dict], bool]]]):
+        self.key = key
+        self.counters = counters
+        self.groups = defaultdict(lambda: [0] * len(counters))
+
+    def add(self, row: Dict):
+        """Count one row"""
+        counts = self.groups[row.get(self.key)]
+        for i, predicate in enumerate(self.counters.values()):
+            if predicate is None or predicate(row):
+                counts[i] += 1
+
+    def columns(self) -> List[str]:
+        """Sheet header: the key followed by the counter names"""
+        return [self.key, *self.counters]
+
+    def rows(self, by_count: bool = False) -> List[List]:
+        """One row per group, by group name or largest first"""
+        rows = [[group, *counts] for group, counts in self.groups.items()]
+        if by_count:
+            return sorted(rows, key=lambda row: -row[1])
+        return sorted(rows, key=lambda row: str(row[0]))
+
+
+class ExcelStream:
+    """Write-only workbook written sheet by sheet, then moved into place
+
+    Example:
+        with ExcelStream("reports/bugs.xlsx") as book:
+            book.write_sheet("Bugs", ["Bug ID", "Test Name"], rows)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheets = {}
+
+    def write_sheet(
+        self,
+        title: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence],
+        widths: Optional[Dict[str, float]] = None,
+    ) -> int:
+        """Append a sheet with a bold, frozen header row
+
+        Args:
+            title: Sheet name
+            columns: Header row
+            rows: Row values in column order (any iterable, consumed once)
+            widths: Column widths by header name (default: header length)
+
+        Returns:
+            Number of data rows written
+        """
+        sheet = self.workbook.create_sheet(title[:31])
+        sheet.freeze_panes = "A2"
+        for i, column in enumerate(columns, 1):
+            width = (widths or {}).get(column, len(str(column)) + 4)
+            sheet.column_dimensions[get_column_letter(i)].width = min(width, MAX_COLUMN_WIDTH)
+
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = HEADER_FONT
+            header.append(cell)
+        sheet.append(header)
+
+        count = 0
+        for row in rows:
+            sheet.append([excel_value(value) for value in row])
+            count += 1
+        self.sheets[title] = count
+        return count
+
+    def close(self):
+        """Save the workbook through a temporary file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        self.workbook.save(temporary)
+        os.replace(temporary, self.path)
+
+    def discard(self):
+        """Drop a partly written workbook, leaving any previous file in place"""
+        for sheet in self.workbook.worksheets:
+            try:
+                sheet.close()
+            except (OSError, ValueError):  # the sheet was never started or is already closed
+                pass
+
+    def __enter__(self) -> "ExcelStream":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
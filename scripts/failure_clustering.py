@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Failure clustering by normalized traceback signature
+
+One broken locator fails every test that goes through it, and each failed
+test used to become its own bug. This module groups failures that share a
+root cause:
+
+1. Each failure message (pytest ``longrepr``) is normalized: memory
+   addresses, timestamps, UUIDs, generated emails, long ids, line numbers
+   and long numbers are replaced by placeholders, and the traceback is
+   reduced to its frames (``path.py:<line>: in function`` locations and
+   ``E`` lines). Test source lines and separators are dropped.
+2. The frames are hashed into a signature; failures with the same signature
+   are exact duplicates and are only processed once from here on.
+3. Distinct signatures are MinHashed over word shingles of their frames and
+   bucketed with LSH banding, so near-duplicates (the same page-object frame
+   and error reached from different tests) are found without comparing
+   every pair. Candidates that raise the same exception type and whose
+   estimated Jaccard similarity reaches the threshold are merged.
+
+Settings come from the ``failure_clustering`` section of config.yaml.
+"""
+
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from scripts.perf_config import load_config
+
+DEFAULT_SETTINGS = {
+    "threshold": 0.8,  # estimated Jaccard similarity of the frame shingles
+    "permutations": 64,
+    "bands": 16,
+    "shingle_size": 3,
+    "examples": 3,
+}
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_BATCH_SHINGLES = 50_000
+
+# (pattern, placeholder, substring the pattern needs; patterns are skipped when it is absent)
+_PLACEHOLDERS = [
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE), "<uuid>", "-"),
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "<email>", "@"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), "<timestamp>", "-"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}\b"), "<timestamp>", "-"),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b"), "<timestamp>", ":"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.IGNORECASE), "<address>", "0x"),
+    (re.compile(r"\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{8,}\b", re.IGNORECASE), "<id>", ""),  # session, element ids
+    (re.compile(r"(\.py):\d+"), r"\1:<line>", ".py:"),
+    (re.compile(r"\bline \d+"), "line <line>", "line "),
+    (re.compile(r"\b\d+\.\d+|\b\d{4,}\b"), "<n>", ""),
+]
+_FRAME = re.compile(r"^\S+\.py:<line>:")
+_ERROR_LINE = re.compile(r"^E\s+")
+_SEPARATOR = re.compile(r"^[\s_=-]*$")
+_WHITESPACE = re.compile(r"\s+")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_EXCEPTION = re.compile(r"\b(\w*(?:Error|Exception|Timeout|Failure))\b")
+
+
+@dataclass
+class FailureCluster:
+    """Failures sharing a root cause
+
+    Attributes:
+        signature: Signature of the cluster's largest group of exact duplicates
+        members: Indexes of the failures in the clustered sequence,
+            representative first, then in input order
+        frames: Normalized frames of the representative failure
+        signatures: Distinct signatures merged into the cluster
+    """
+
+    signature: str
+    members: List[int]
+    frames: List[str]
+    signatures: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    @property
+    def representative(self) -> int:
+        """Index of the failure shown for the cluster"""
+        return self.members[0]
+
+
+def clustering_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """``failure_clustering`` settings from config.yaml over the defaults"""
+    config = load_config() if config is None else config
+    return {**DEFAULT_SETTINGS, **(config.get("failure_clustering") or {})}
+
+
+def normalize_failure(text: Optional[str]) -> str:
+    """Failure text with run-specific values replaced by placeholders"""
+    text = text or ""
+    for pattern, placeholder, needs in _PLACEHOLDERS:
+        if needs in text:
+            text = pattern.sub(placeholder, text)
+    return text
+
+
+def failure_frames(text: Optional[str]) -> List[str]:
+    """Normalized frame and error lines of a failure
+
+    Tracebacks keep their ``path.py:<line>:`` locations and ``E`` lines;
+    plain messages keep every non-blank line.
+    """
+    lines = [line.rstrip() for line in normalize_failure(text).splitlines()]
+    frames = [
+        _ERROR_LINE.sub("E ", line) if _ERROR_LINE.match(line) else line
+        for line in lines
+        if _FRAME.match(line) or _ERROR_LINE.match(line)
+    ]
+    if not frames:
+        frames = [line.strip() for line in lines if not _SEPARATOR.match(line)]
+    return [_WHITESPACE.sub(" ", frame) for frame in frames]
+
+
+def failure_signature(frames: Sequence[str]) -> str:
+    """Stable hash of normalized frames"""
+    return hashlib.sha1("\n".join(frames).encode("utf-8")).hexdigest()[:16]
+
+
+def failure_exception(frames: Sequence[str]) -> str:
+    """Exception type a failure raised (empty when none is named)"""
+    for frame in frames:
+        match = _EXCEPTION.search(frame)
+        if match:
+            return match.group(1)
+    return ""
+
+
+def shingles(frames: Sequence[str], size: int) -> List[str]:
+    """Word shingles of the frames"""
+    tokens = _TOKEN.findall(" ".join(frames).lower())
+    if len(tokens) <= size:
+        return [" ".join(tokens)]
+    return [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+
+
+class MinHasher:
+    """MinHash signatures with universal hashes ``(a * x + b) mod p``
+
+    Args:
+        permutations: Signature length
+        seed: Seed of the hash coefficients (fixed, so signatures are
+            comparable across runs)
+    """
+
+    def __init__(self, permutations: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2**32, size=permutations, dtype=np.uint64)[:, None]
+        self.b = rng.integers(0, 2**32, size=permutations, dtype=np.uint64)[:, None]
+
+    def signatures(self, documents: Sequence[Sequence[str]]) -> np.ndarray:
+        """One signature row per document of shingles
+
+        Documents are hashed in batches so the permutation matrix stays
+        small however many documents there are.
+        """
+        rows = np.empty((len(documents), len(self.a)), dtype=np.uint64)
+        start = 0
+        while start < len(documents):
+            end, count = start, 0
+            while end < len(documents) and (count == 0 or count + len(documents[end]) <= _BATCH_SHINGLES):
+                count += len(documents[end])
+                end += 1
+            hashes = np.fromiter(
+                (zlib.crc32(shingle.encode("utf-8")) for document in documents[start:end] for shingle in document),
+                dtype=np.uint64,
+                count=count,
+            )
+            offsets = np.cumsum([0] + [len(document) for document in documents[start:end - 1]])
+            permuted = (self.a * hashes + self.b) % _PRIME
+            rows[start:end] = np.minimum.reduceat(permuted, offsets, axis=1).T
+            start = end
+        return rows
+
+
+def lsh_pairs(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """Candidate pairs sharing at least one LSH band
+
+    Each band is folded to one 64-bit key; every document is paired with the
+    first document of its bucket.
+
+    Returns:
+        Array of (first, other) index pairs
+    """
+    count, permutations = signatures.shape
+    rows = max(1, permutations // bands)
+    mixer = np.random.default_rng(0).integers(1, 2**63, size=rows, dtype=np.uint64)
+    pairs = []
+    for band in range(0, rows * bands, rows):
+        with np.errstate(over="ignore"):
+            keys = (signatures[:, band:band + rows] * mixer).sum(axis=1, dtype=np.uint64)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        firsts = order[np.maximum.accumulate(np.where(starts, np.arange(count), 0))]
+        linked = firsts != order
+        pairs.append(np.column_stack([firsts[linked], order[linked]]))
+    return np.unique(np.concatenate(pairs), axis=0) if pairs else np.empty((0, 2), dtype=np.int64)
+
+
+def cluster_failures(messages: Sequence[Optional[str]], settings: Optional[Dict[str, Any]] = None) -> List[FailureCluster]:
+    """Group failure messages by root cause
+
+    Args:
+        messages: Failure messages (pytest longrepr), one per failed test
+        settings: Clustering settings (default: clustering_settings())
+
+    Returns:
+        Clusters, largest first
+    """
+    settings = {**DEFAULT_SETTINGS, **(settings if settings is not None else clustering_settings())}
+
+    # Exact duplicates share a signature and are clustered once
+    groups: Dict[str, List[int]] = {}
+    frames: Dict[str, List[str]] = {}
+    frames_of_text: Dict[Optional[str], List[str]] = {}
+    for index, message in enumerate(messages):
+        if message not in frames_of_text:
+            frames_of_text[message] = failure_frames(message)
+        signature = failure_signature(frames_of_text[message])
+        if signature not in groups:
+            groups[signature] = []
+            frames[signature] = frames_of_text[message]
+        groups[signature].append(index)
+    distinct = list(groups)
+
+    parent = list(range(len(distinct)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    if len(distinct) > 1:
+        hasher = MinHasher(settings["permutations"])
+        signatures = hasher.signatures([shingles(frames[signature], settings["shingle_size"]) for signature in distinct])
+        pairs = lsh_pairs(signatures, settings["bands"])
+        if len(pairs):
+            similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+            exceptions = [failure_exception(frames[signature]) for signature in distinct]
+            for first, other in pairs[similarity >= settings["threshold"]]:
+                if exceptions[first] == exceptions[other]:
+                    parent[find(int(other))] = find(int(first))
+
+    merged: Dict[int, List[str]] = {}
+    for i, signature in enumerate(distinct):
+        merged.setdefault(find(i), []).append(signature)
+
+    clusters = []
+    for members in merged.values():
+        # The largest exact group (ties: earliest) names and represents the cluster
+        lead = max(members, key=lambda signature: (len(groups[signature]), -groups[signature][0]))
+        indexes = sorted(index for signature in members for index in groups[signature])
+        indexes.remove(groups[lead][0])
+        clusters.append(FailureCluster(lead, [groups[lead][0], *indexes], frames[lead], sorted(members)))
+    return sorted(clusters, key=lambda cluster: (-len(cluster), cluster.representative))
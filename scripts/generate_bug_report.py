@@ -3,185 +3,157 @@
 Generate bug report from test results
 """
 import json
-import os
+import sys
+from collections import Counter
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
 
-def load_test_results():
-    """Load all test results"""
-    results = {}
-    
-    # Load functional test results
-    result_files = [
-        'reports/functional_results.json',
-        'reports/device_results.json',
-        'reports/smoke_results.json',
-        'reports/regression_results.json',
-        'reports/desktop_results.json',
-        'reports/mobile_results.json',
-        'reports/tablet_results.json'
-    ]
-    
-    for file_path in result_files:
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    results[file_path] = data
-            except (json.JSONDecodeError, FileNotFoundError) as e:
-                print(f"Error loading {file_path}: {e}")
-    
-    return results
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-def extract_failed_tests(results):
-    """Extract failed test cases from results"""
-    failed_tests = []
-    
-    for file_path, data in results.items():
-        if 'tests' in data:
-            for test in data['tests']:
-                if test.get('outcome') == 'failed':
-                    failed_tests.append({
-                        'Test File': file_path,
-                        'Test Name': test.get('nodeid', 'Unknown'),
-                        'Error Message': test.get('call', {}).get('longrepr', 'No error message'),
-                        'Duration': test.get('call', {}).get('duration', 0),
-                        'Status': 'FAILED',
-                        'Priority': determine_priority(test.get('call', {}).get('longrepr', '')),
-                        'Category': categorize_bug(test.get('nodeid', '')),
-                        'Severity': determine_severity(test.get('call', {}).get('longrepr', '')),
-                        'Reproduction Steps': generate_reproduction_steps(test.get('nodeid', '')),
-                        'Expected Result': generate_expected_result(test.get('nodeid', '')),
-                        'Actual Result': test.get('call', {}).get('longrepr', 'Test failed'),
-                        'Environment': 'Test Environment',
-                        'Browser': extract_browser_from_test(test.get('nodeid', '')),
-                        'Device': extract_device_from_test(test.get('nodeid', '')),
-                        'Screenshot': f"screenshots/{test.get('nodeid', '').replace('::', '_').replace('/', '_')}_failed.png"
-                    })
-    
-    return failed_tests
+from scripts.artifact_manifest import load_artifact_index, relative_link  # noqa: E402
+from scripts.bug_index import BugIndex  # noqa: E402
+from scripts.bug_rules import load_classifier  # noqa: E402
+from scripts.excel_export import ExcelStream, GroupTally  # noqa: E402
+from scripts.failure_clustering import cluster_failures, clustering_settings  # noqa: E402
+from scripts.report_rendering import render_to_file  # noqa: E402
+from scripts.run_history import RunHistory  # noqa: E402
+
+BUG_COLUMNS = [
+    'Bug ID', 'Bug Status', 'Test File', 'Test Name', 'Occurrences', 'Affected Tests', 'First Seen', 'Runs Seen',
+    'Error Message', 'Duration', 'Status', 'Priority', 'Category', 'Severity', 'Reproduction Steps', 'Expected Result',
+    'Actual Result', 'Environment', 'Browser', 'Device', 'Screenshot', 'DOM Snapshot', 'Log', 'Signature',
+]
+# Bug row column of each artifact kind recorded in the artifact manifest
+ARTIFACT_COLUMNS = {'Screenshot': 'screenshot', 'DOM Snapshot': 'dom', 'Log': 'log'}
+RESOLVED_COLUMNS = ['Bug ID', 'Test Name', 'Error Message', 'First Seen', 'Last Seen', 'Runs Seen', 'Occurrences']
+BUG_COLUMN_WIDTHS = {'Test File': 40, 'Test Name': 60, 'Affected Tests': 60, 'Error Message': 60, 'Reproduction Steps': 50,
+                     'Expected Result': 40, 'Actual Result': 60, 'Screenshot': 50, 'DOM Snapshot': 50, 'Log': 50,
+                     'Signature': 20}
+
+def load_test_results(history=None):
+    """Failed tests of the current run of every suite
+
+    Indexes reports/*.json into the run history first, so any
+    pytest-json-report written to reports/ is picked up.
+    """
+    history = history or RunHistory()
+    history.ingest()
+    return history.failed_tests()
+
+def extract_failed_tests(failures, classifier=None, artifacts=None):
+    """Build bug rows from failed test rows of the run history
+
+    Priority, severity, category and the other derived fields are set
+    column-wise by the bug rules (see scripts/bug_rules.py). Screenshots,
+    DOM snapshots and logs are looked up by nodeid in the artifact manifest
+    (see scripts/artifact_manifest.py); 'N/A' when a test captured none.
+
+    Args:
+        failures: Failed test rows (suite, nodeid, source, message, duration)
+        classifier: Compiled bug rules (default: the rule file named in config.yaml)
+        artifacts: Artifact index (default: the manifest named in config.yaml)
+    """
+    failures = pd.DataFrame(list(failures), columns=['suite', 'nodeid', 'source', 'message', 'duration'])
+    if failures.empty:
+        return []
+    classifier = classifier or load_classifier()
+    artifacts = artifacts if artifacts is not None else load_artifact_index()
+    fields = classifier.classify(failures.rename(columns={'nodeid': 'test_name'}))
+    nodeids = failures['nodeid']
+    messages = failures['message'].where(failures['message'].notna() & (failures['message'] != ''))
+    bugs = pd.DataFrame({
+        'Test File': failures['source'],
+        'Test Name': nodeids,
+        'Error Message': messages.fillna('No error message'),
+        'Duration': failures['duration'].astype(object).where(failures['duration'].notna(), None),
+        'Status': 'FAILED',
+        'Priority': fields['priority'],
+        'Category': fields['category'],
+        'Severity': fields['severity'],
+        'Reproduction Steps': fields['reproduction_steps'],
+        'Expected Result': fields['expected_result'],
+        'Actual Result': messages.fillna('Test failed'),
+        'Environment': 'Test Environment',
+        'Browser': fields['browser'],
+        'Device': fields['device'],
+        'Suite': failures['suite'],
+    })
+    for column, kind in ARTIFACT_COLUMNS.items():
+        bugs[column] = [artifacts.path(nodeid, kind) or 'N/A' for nodeid in nodeids]
+    return bugs.to_dict('records')
 
 def determine_priority(error_message):
     """Determine bug priority based on error message"""
-    error_lower = error_message.lower()
-    
-    if any(keyword in error_lower for keyword in ['critical', 'blocking', 'cannot', 'unable to']):
-        return 'High'
-    elif any(keyword in error_lower for keyword in ['validation', 'required', 'missing']):
-        return 'Medium'
-    else:
-        return 'Low'
+    return load_classifier().classify_one('priority', error_message)
 
 def categorize_bug(test_name):
     """Categorize bug based on test name"""
-    test_lower = test_name.lower()
-    
-    if 'signup' in test_lower:
-        return 'Signup Functionality'
-    elif 'validation' in test_lower:
-        return 'Input Validation'
-    elif 'device' in test_lower or 'mobile' in test_lower or 'tablet' in test_lower:
-        return 'Device Compatibility'
-    elif 'load' in test_lower or 'performance' in test_lower:
-        return 'Performance'
-    else:
-        return 'General'
+    return load_classifier().classify_one('category', test_name)
 
 def determine_severity(error_message):
     """Determine bug severity"""
-    error_lower = error_message.lower()
-    
-    if any(keyword in error_lower for keyword in ['exception', 'error', 'timeout', 'crash']):
-        return 'Critical'
-    elif any(keyword in error_lower for keyword in ['failed', 'not working', 'broken']):
-        return 'High'
-    elif any(keyword in error_lower for keyword in ['warning', 'issue', 'problem']):
-        return 'Medium'
-    else:
-        return 'Low'
+    return load_classifier().classify_one('severity', error_message)
 
 def generate_reproduction_steps(test_name):
     """Generate reproduction steps based on test name"""
-    test_lower = test_name.lower()
-    
-    if 'signup' in test_lower:
-        return """1. Navigate to SwiftAssess signup page
-2. Fill in the signup form with test data
-3. Click the signup button
-4. Observe the behavior"""
-    elif 'validation' in test_lower:
-        return """1. Navigate to SwiftAssess signup page
-2. Enter invalid data in the form fields
-3. Attempt to submit the form
-4. Check for validation error messages"""
-    elif 'device' in test_lower:
-        return """1. Open SwiftAssess signup page on the specified device
-2. Test the signup functionality
-3. Check for responsive design issues
-4. Verify form usability"""
-    else:
-        return """1. Navigate to SwiftAssess signup page
-2. Perform the test scenario
-3. Observe the actual behavior
-4. Compare with expected behavior"""
+    return load_classifier().classify_one('reproduction_steps', test_name)
 
 def generate_expected_result(test_name):
     """Generate expected result based on test name"""
-    test_lower = test_name.lower()
-    
-    if 'signup' in test_lower and 'valid' in test_lower:
-        return "User should be successfully signed up and redirected to dashboard"
-    elif 'validation' in test_lower:
-        return "Appropriate validation error messages should be displayed"
-    elif 'device' in test_lower:
-        return "Page should be fully functional and responsive on the device"
-    else:
-        return "Test should pass without errors"
+    return load_classifier().classify_one('expected_result', test_name)
 
 def extract_browser_from_test(test_name):
     """Extract browser from test name"""
-    test_lower = test_name.lower()
-    
-    if 'chrome' in test_lower:
-        return 'Chrome'
-    elif 'firefox' in test_lower:
-        return 'Firefox'
-    elif 'edge' in test_lower:
-        return 'Edge'
-    else:
-        return 'Chrome'  # Default
+    return load_classifier().classify_one('browser', test_name)
 
 def extract_device_from_test(test_name):
     """Extract device from test name"""
-    test_lower = test_name.lower()
-    
-    if 'mobile' in test_lower:
-        return 'Mobile'
-    elif 'tablet' in test_lower:
-        return 'Tablet'
-    elif 'desktop' in test_lower:
-        return 'Desktop'
-    else:
-        return 'Desktop'  # Default
+    return load_classifier().classify_one('device', test_name)
 
-def generate_bug_report():
-    """Generate comprehensive bug report"""
-    print("Generating bug report...")
-    
-    # Load test results
-    results = load_test_results()
-    
+def cluster_bugs(failed_tests, settings=None):
+    """One bug row per cluster of failures sharing a root cause, largest first
+
+    The row of the cluster's representative failure gets the number of
+    failures in the cluster, a few example tests, the cluster signature
+    (see scripts/failure_clustering.py) and its failures per suite.
+    """
+    settings = settings or clustering_settings()
+    clusters = cluster_failures([test['Error Message'] for test in failed_tests], settings)
+    bugs = []
+    for cluster in clusters:
+        names = [failed_tests[i]['Test Name'] for i in cluster.members]
+        suites = Counter(failed_tests[i].get('Suite') for i in cluster.members)
+        examples = ', '.join(names[:settings['examples']])
+        if len(names) > settings['examples']:
+            examples += f' (+{len(names) - settings["examples"]} more)'
+        bugs.append({
+            **failed_tests[cluster.representative],
+            'Occurrences': len(cluster),
+            'Affected Tests': examples,
+            'Signature': cluster.signature,
+            'Signatures': cluster.signatures,
+            'Suites': dict(suites),
+        })
+    return bugs
+
+def build_bugs(failures):
+    """Numbered bug rows, one per failure cluster, or one placeholder row when nothing failed"""
     # Extract failed tests
-    failed_tests = extract_failed_tests(results)
+    failed_tests = extract_failed_tests(failures)
     
     if not failed_tests:
         print("No failed tests found. Generating empty bug report.")
         # Create empty report
-        empty_data = [{
+        return [{
             'Bug ID': 'N/A',
+            'Bug Status': 'N/A',
             'Test File': 'N/A',
             'Test Name': 'No failed tests',
+            'Occurrences': 0,
+            'Affected Tests': 'N/A',
+            'First Seen': 'N/A',
+            'Runs Seen': 0,
             'Error Message': 'All tests passed',
             'Duration': 0,
             'Status': 'PASSED',
@@ -194,189 +166,230 @@ def generate_bug_report():
             'Environment': 'Test Environment',
             'Browser': 'N/A',
             'Device': 'N/A',
-            'Screenshot': 'N/A'
+            'Screenshot': 'N/A',
+            'DOM Snapshot': 'N/A',
+            'Log': 'N/A',
+            'Signature': 'N/A'
         }]
-        
-        df = pd.DataFrame(empty_data)
-    else:
-        # Add bug IDs
-        for i, bug in enumerate(failed_tests, 1):
-            bug['Bug ID'] = f'BUG-{i:03d}'
-        
-        df = pd.DataFrame(failed_tests)
+    
+    bugs = cluster_bugs(failed_tests)
+    print(f"Clustered {len(failed_tests)} failed tests into {len(bugs)} bugs")
+    
+    # Add bug IDs
+    for i, bug in enumerate(bugs, 1):
+        bug['Bug ID'] = f'BUG-{i:03d}'
+    return bugs
+
+def current_runs(history):
+    """The runs the report covers: the latest run of every suite, oldest first"""
+    results = history.current_results()
+    return [{'suite': suite, 'key': result['run_key'], 'created': result['created']}
+            for suite, result in sorted(results.items(), key=lambda item: item[1]['created'])]
+
+def seen_on(timestamp):
+    """Report date of a bug index timestamp"""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M') if timestamp else 'N/A'
+
+def track_bugs(bugs, runs, index=None):
+    """Give bugs their stable IDs from the bug fingerprint index
+
+    Records the clusters of every suite run the index has not seen yet,
+    one index run per suite run (see scripts/bug_index.py), so a suite
+    that reruns on its own does not count the other suites' failures
+    again. Each bug row gets its persistent ID, status (New when it never
+    failed before these runs, else Recurring), first seen date and number
+    of suite runs it failed in.
+
+    Args:
+        bugs: Bug rows from build_bugs (updated in place)
+        runs: current_runs of the history (empty skips tracking)
+        index: Open bug index (default: the database named in config.yaml)
+
+    Returns:
+        Rows of the bugs that were open and did not fail in these runs
+    """
+    if not runs:
+        return []
+    if index is None:
+        with BugIndex() as index:
+            return track_bugs(bugs, runs, index)
+    
+    failed = [bug for bug in bugs if bug.get('Signatures')]
+    clusters = [{
+        'signatures': bug['Signatures'],
+        'title': bug['Test Name'],
+        'message': bug['Error Message'][:MESSAGE_LENGTH],
+    } for bug in failed]
+    keys = [run['key'] for run in runs]
+    records = {}
+    for run in runs:
+        if index.has_run(run['key']):
+            continue  # unchanged since the last report
+        positions = [i for i, bug in enumerate(failed) if bug['Suites'].get(run['suite'])]
+        suite_clusters = [{**clusters[i], 'occurrences': failed[i]['Suites'][run['suite']]} for i in positions]
+        tracked = index.ingest(run['key'], suite_clusters, run['created'], scope=run['suite'], together=keys)
+        records.update(zip(positions, tracked['bugs']))
+    missing = [i for i in range(len(failed)) if i not in records]
+    records.update(zip(missing, index.lookup([clusters[i] for i in missing])))
+    for i, bug in enumerate(failed):
+        record = records[i]
+        if record is None:
+            continue
+        bug['Bug ID'] = record['label']
+        bug['Bug Status'] = record['status'].capitalize()
+        bug['First Seen'] = seen_on(record['first_seen_at'])
+        bug['Runs Seen'] = record['runs_seen']
+    return [{
+        'Bug ID': record['label'],
+        'Test Name': record['title'],
+        'Error Message': record['message'],
+        'First Seen': seen_on(record['first_seen_at']),
+        'Last Seen': seen_on(record['last_seen_at']),
+        'Runs Seen': record['runs_seen'],
+        'Occurrences': record['occurrences'],
+    } for record in index.resolved_by(keys)]
+
+def bug_report_path():
+    """Timestamped Excel path of a new bug report (the HTML page sits next to it)"""
+    return f'reports/bug_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+
+def generate_bug_report():
+    """Generate comprehensive bug report"""
+    print("Generating bug report...")
+    
+    with RunHistory() as history:
+        failures = load_test_results(history)
+        runs = current_runs(history)
+    bugs = build_bugs(failures)
+    resolved = track_bugs(bugs, runs)
     
     # Generate Excel report
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    excel_file = f'reports/bug_report_{timestamp}.xlsx'
+    excel_file = bug_report_path()
     
     try:
-        with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-            # Main bug report
-            df.to_excel(writer, sheet_name='Bug Report', index=False)
-            
-            # Summary by category
-            if not df.empty and 'Category' in df.columns:
-                category_summary = df.groupby('Category').agg({
-                    'Bug ID': 'count',
-                    'Priority': lambda x: (x == 'High').sum(),
-                    'Severity': lambda x: (x == 'Critical').sum()
-                }).rename(columns={
-                    'Bug ID': 'Total Bugs',
-                    'Priority': 'High Priority',
-                    'Severity': 'Critical Severity'
-                })
-                category_summary.to_excel(writer, sheet_name='Summary by Category')
-            
-            # Summary by priority
-            if not df.empty and 'Priority' in df.columns:
-                priority_summary = df['Priority'].value_counts()
-                priority_summary.to_excel(writer, sheet_name='Summary by Priority')
-            
-            # Summary by severity
-            if not df.empty and 'Severity' in df.columns:
-                severity_summary = df['Severity'].value_counts()
-                severity_summary.to_excel(writer, sheet_name='Summary by Severity')
-        
+        write_bug_workbook(excel_file, bugs, resolved)
         print(f"Bug report generated successfully: {excel_file}")
         
         # Generate HTML bug report
-        generate_html_bug_report(df, excel_file)
+        generate_html_bug_report(pd.DataFrame(bugs, columns=BUG_COLUMNS), excel_file, resolved=resolved)
         
     except Exception as e:
         print(f"Error generating bug report: {e}")
 
-def generate_html_bug_report(df, excel_file):
-    """Generate HTML bug report"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>SwiftAssess Bug Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-            .container {{ max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #dc3545 0%, #c82333 100%); color: white; padding: 30px; border-radius: 8px; margin-bottom: 30px; }}
-            .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }}
-            .metric-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; border-left: 4px solid #dc3545; }}
-            .metric-value {{ font-size: 2em; font-weight: bold; color: #dc3545; }}
-            .metric-label {{ color: #6c757d; margin-top: 5px; }}
-            .bug-table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-            .bug-table th, .bug-table td {{ border: 1px solid #dee2e6; padding: 12px; text-align: left; }}
-            .bug-table th {{ background-color: #f8f9fa; font-weight: bold; }}
-            .bug-table tr:nth-child(even) {{ background-color: #f8f9fa; }}
-            .priority-high {{ color: #dc3545; font-weight: bold; }}
-            .priority-medium {{ color: #ffc107; font-weight: bold; }}
-            .priority-low {{ color: #28a745; font-weight: bold; }}
-            .severity-critical {{ color: #dc3545; font-weight: bold; }}
-            .severity-high {{ color: #fd7e14; font-weight: bold; }}
-            .severity-medium {{ color: #ffc107; font-weight: bold; }}
-            .severity-low {{ color: #28a745; font-weight: bold; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🐛 SwiftAssess Bug Report</h1>
-                <p>Test Failure Analysis & Bug Tracking</p>
-                <p>Generated on: {timestamp}</p>
-            </div>
-            
-            <div class="summary">
-                <div class="metric-card">
-                    <div class="metric-value">{len(df)}</div>
-                    <div class="metric-label">Total Bugs</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{len(df[df['Priority'] == 'High']) if not df.empty else 0}</div>
-                    <div class="metric-label">High Priority</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{len(df[df['Severity'] == 'Critical']) if not df.empty else 0}</div>
-                    <div class="metric-label">Critical Severity</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{len(df[df['Category'] == 'Signup Functionality']) if not df.empty else 0}</div>
-                    <div class="metric-label">Signup Issues</div>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>📋 Bug Details</h2>
-                <table class="bug-table">
-                    <thead>
-                        <tr>
-                            <th>Bug ID</th>
-                            <th>Test Name</th>
-                            <th>Category</th>
-                            <th>Priority</th>
-                            <th>Severity</th>
-                            <th>Browser</th>
-                            <th>Device</th>
-                            <th>Error Message</th>
-                        </tr>
-                    </thead>
-                    <tbody>
+def write_bug_workbook(excel_file, bugs, resolved=()):
+    """Stream bug rows into the Excel report, tallying the summary sheets on the way
+
+    Args:
+        excel_file: Workbook path
+        bugs: Bug rows (any iterable of dicts, read once)
+        resolved: Rows of the bugs resolved by this run (see track_bugs)
+
+    Returns:
+        Number of bug rows written
     """
+    by_category = GroupTally('Category', {
+        'Total Bugs': None,
+        'High Priority': lambda bug: bug.get('Priority') == 'High',
+        'Critical Severity': lambda bug: bug.get('Severity') == 'Critical',
+    })
+    by_priority = GroupTally('Priority', {'Count': None})
+    by_severity = GroupTally('Severity', {'Count': None})
+    by_status = GroupTally('Bug Status', {'Count': None})
     
-    if not df.empty:
-        for _, row in df.iterrows():
-            priority_class = f"priority-{row['Priority'].lower()}" if 'Priority' in row else ""
-            severity_class = f"severity-{row['Severity'].lower()}" if 'Severity' in row else ""
-            
-            html_content += f"""
-                        <tr>
-                            <td>{row.get('Bug ID', 'N/A')}</td>
-                            <td>{row.get('Test Name', 'N/A')}</td>
-                            <td>{row.get('Category', 'N/A')}</td>
-                            <td><span class="{priority_class}">{row.get('Priority', 'N/A')}</span></td>
-                            <td><span class="{severity_class}">{row.get('Severity', 'N/A')}</span></td>
-                            <td>{row.get('Browser', 'N/A')}</td>
-                            <td>{row.get('Device', 'N/A')}</td>
-                            <td>{str(row.get('Error Message', 'N/A'))[:100]}...</td>
-                        </tr>
-            """
-    else:
-        html_content += """
-                        <tr>
-                            <td colspan="8" style="text-align: center; color: #28a745; font-weight: bold;">
-                                🎉 No bugs found! All tests passed successfully.
-                            </td>
-                        </tr>
-        """
+    def rows():
+        for bug in bugs:
+            by_category.add(bug)
+            by_priority.add(bug)
+            by_severity.add(bug)
+            by_status.add(bug)
+            yield [bug.get(column) for column in BUG_COLUMNS]
     
-    html_content += """
-                    </tbody>
-                </table>
-            </div>
-            
-            <div class="section">
-                <h2>📊 Analysis & Recommendations</h2>
-                <ul>
-                    <li>Review high priority bugs first</li>
-                    <li>Focus on critical severity issues</li>
-                    <li>Check device compatibility issues</li>
-                    <li>Verify browser-specific problems</li>
-                    <li>Test signup functionality thoroughly</li>
-                </ul>
-            </div>
-            
-            <div class="footer">
-                <p>SwiftAssess QA Automation - Bug Report</p>
-                <p>Excel Report: <a href="{excel_file}">Download Excel Report</a></p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """.format(excel_file=excel_file)
+    with ExcelStream(excel_file) as book:
+        count = book.write_sheet('Bug Report', BUG_COLUMNS, rows(), widths=BUG_COLUMN_WIDTHS)
+        book.write_sheet('Summary by Category', by_category.columns(), by_category.rows())
+        book.write_sheet('Summary by Priority', by_priority.columns(), by_priority.rows(by_count=True))
+        book.write_sheet('Summary by Severity', by_severity.columns(), by_severity.rows(by_count=True))
+        book.write_sheet('Summary by Status', by_status.columns(), by_status.rows(by_count=True))
+        book.write_sheet('Resolved Bugs', RESOLVED_COLUMNS, ([bug.get(column) for column in RESOLVED_COLUMNS] for bug in resolved),
+                         widths=BUG_COLUMN_WIDTHS)
+    return count
+
+BUG_TABLE_COLUMNS = [
+    'Bug ID', 'Bug Status', 'Test Name', 'Occurrences', 'Affected Tests', 'Category', 'Priority', 'Severity', 'Browser',
+    'Device', 'Error Message', *ARTIFACT_COLUMNS,
+]
+BUG_FILTER_COLUMNS = ['Bug Status', 'Category', 'Priority', 'Severity', 'Browser', 'Device']
+MESSAGE_LENGTH = 200
+# Larger bug tables go to a sidecar script next to the page instead of inline
+EMBED_ROW_LIMIT = 5000
+
+def bug_table_data(df, base='.'):
+    """Bug table as compact JSON columns and rows, plus the values of each filter
+
+    The table is prepared column-wise; the browser renders only the rows
+    scrolled into view. Artifact paths become links relative to the page
+    written to the base directory.
+    """
+    table = df.reindex(columns=BUG_TABLE_COLUMNS).fillna('N/A').astype(str)
+    table['Error Message'] = table['Error Message'].str.slice(0, MESSAGE_LENGTH)
+    for column in ARTIFACT_COLUMNS:
+        found = table[column] != 'N/A'
+        table.loc[found, column] = [relative_link(path, base) for path in table.loc[found, column]]
+    filters = {column: sorted(table[column].unique()) for column in BUG_FILTER_COLUMNS}
+    data = json.dumps({'columns': BUG_TABLE_COLUMNS, 'data': table.values.tolist()}, ensure_ascii=False, separators=(',', ':'))
+    # Safe inside <script>: no test name or message can close the element
+    return data.replace('<', '\\u003c'), filters
+
+def generate_html_bug_report(df, excel_file, embed_limit=EMBED_ROW_LIMIT, resolved=()):
+    """Generate HTML bug report next to the Excel workbook
+
+    Args:
+        df: Bug rows
+        excel_file: Excel workbook the page links to
+        embed_limit: Most rows embedded in the page; larger tables are
+            written to a <name>.data.js file loaded by the page
+        resolved: Rows of the bugs resolved by this run (see track_bugs)
+
+    Returns:
+        Path of the HTML report
+    """
+    def count(column, value):
+        return int((df[column] == value).sum()) if column in df else 0
     
-    # Save HTML report
-    html_file = f'reports/bug_report_{timestamp}.html'
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    summary = {
+        'total': len(df),
+        'failures': int(df['Occurrences'].sum()) if 'Occurrences' in df else len(df),
+        'high_priority': count('Priority', 'High'),
+        'critical': count('Severity', 'Critical'),
+        'signup': count('Category', 'Signup Functionality'),
+        'new': count('Bug Status', 'New'),
+        'recurring': count('Bug Status', 'Recurring'),
+        'resolved': len(resolved),
+    }
+    html_path = Path(excel_file).with_suffix('.html')
+    data, filters = bug_table_data(df, html_path.parent)
+    data_file = None
+    if len(df) > embed_limit:
+        data_path = html_path.with_suffix('.data.js')
+        with open(data_path, 'w', encoding='utf-8') as f:
+            f.write(f'window.BUG_REPORT_DATA = {data};\n')
+        data_file, data = data_path.name, None
+    html_file = render_to_file(
+        'bug_report.html',
+        str(html_path),
+        generated_on=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        summary=summary,
+        columns=BUG_TABLE_COLUMNS,
+        filters=filters,
+        data=data,
+        data_file=data_file,
+        resolved=resolved,
+        resolved_columns=RESOLVED_COLUMNS,
+        excel_file=Path(excel_file).name,
+    )
     
     print(f"HTML bug report generated: {html_file}")
+    return html_file
 
 if __name__ == "__main__":
     generate_bug_report()
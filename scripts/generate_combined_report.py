@@ -2,11 +2,40 @@
 """
 Generate combined test report from all test results
 """
+import argparse
+import glob
+import hashlib
 import json
 import os
-import pandas as pd
+import sys
+import time
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.artifact_manifest import load_artifact_index, manifest_path, relative_link  # noqa: E402
+from scripts.excel_export import ExcelStream  # noqa: E402
+from scripts.k6_ingest import ingest_file  # noqa: E402
+from scripts.latency_histogram import LatencyHistogram, merge_histograms  # noqa: E402
+from scripts.perf_config import CONFIG_PATH  # noqa: E402
+from scripts.perf_regression import DEFAULT_OUTPUT as REGRESSION_REPORT, compare_stored_runs, regression_settings  # noqa: E402
+from scripts.report_rendering import render, render_to_file, templates_digest  # noqa: E402
+from scripts.run_history import RunHistory  # noqa: E402
+from scripts.thresholds import build_verdict, evaluate_summary, load_thresholds, verdict_path  # noqa: E402
+from scripts.timeseries_store import DEFAULT_STORE_DIR, TimeSeriesStore  # noqa: E402
+
+REPORT_PATH = 'reports/combined_test_report.html'
+EXCEL_PATH = 'reports/combined_test_report.xlsx'
+CACHE_DIR = 'reports/.report_cache/combined'
+LOAD_SCENARIOS = ['baseline', 'stress', 'spike']
+# Failed tests listed with their artifacts in the functional section
+FAILED_TEST_LIMIT = 50
+
+# Section renderers live in this file and scripts/templates: a change to either invalidates the cache
+CODE_DIGEST = hashlib.sha256(Path(__file__).read_bytes() + templates_digest().encode()).hexdigest()
 
 def load_json_results(file_path):
     """Load JSON test results from file"""
@@ -17,282 +46,593 @@ def load_json_results(file_path):
         print(f"Error loading {file_path}: {e}")
         return None
 
-def generate_combined_report():
-    """Generate combined test report"""
-    print("Generating combined test report...")
-    
-    # Load all test results
-    results = {
-        'functional': load_json_results('reports/functional_results.json'),
-        'device': load_json_results('reports/device_results.json'),
-        'smoke': load_json_results('reports/smoke_results.json'),
-        'regression': load_json_results('reports/regression_results.json'),
-        'desktop': load_json_results('reports/desktop_results.json'),
-        'mobile': load_json_results('reports/mobile_results.json'),
-        'tablet': load_json_results('reports/tablet_results.json'),
+def load_run_history(history=None, last=10, ingest=True):
+    """Index reports/*.json into the run history and read the current run and trends
+
+    Args:
+        history: Run history (default: reports/run_history.db)
+        last: Runs per suite trend
+        ingest: Index reports/*.json first (False when the caller already did)
+
+    Returns:
+        (results, history_trends): the latest run of every pytest suite, and
+        each suite's last runs plus tests that flipped between pass and fail
+    """
+    history = history or RunHistory()
+    if ingest:
+        history.ingest()
+    results = history.current_results()
+    history_trends = {
+        'suites': {suite: history.suite_trend(suite, last) for suite in results},
+        'flaky': history.flaky_tests(last),
     }
-    
-    # Load load test results
-    load_results = {}
-    for test_type in ['baseline', 'stress', 'spike']:
-        file_path = f'reports/{test_type}_test_results.json'
-        if os.path.exists(file_path):
-            load_results[test_type] = load_json_results(file_path)
-    
-    # Generate HTML report
-    html_content = generate_html_report(results, load_results)
-    
-    # Save HTML report
-    with open('reports/combined_test_report.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    # Generate Excel report
-    generate_excel_report(results, load_results)
-    
-    print("Combined test report generated successfully!")
+    return results, history_trends
 
-def generate_html_report(results, load_results):
-    """Generate HTML report content"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def failed_test_artifacts(failures, artifacts=None, limit=FAILED_TEST_LIMIT, base=os.path.dirname(REPORT_PATH)):
+    """Failed tests with links to the screenshots, DOM snapshots and logs they captured
+
+    Artifacts are looked up by nodeid in the artifact manifest (see
+    scripts/artifact_manifest.py) and linked relative to the report.
+
+    Returns:
+        (rows, total): the first limit failed tests and how many failed
+    """
+    artifacts = artifacts if artifacts is not None else load_artifact_index()
+    rows = []
+    for failure in failures[:limit]:
+        message = (failure.get('message') or '').strip()
+        rows.append({
+            'suite': failure.get('suite'),
+            'nodeid': failure['nodeid'],
+            'message': message.splitlines()[-1][:200] if message else 'No error message',
+            'links': {kind: relative_link(path, base) for kind, path in artifacts.artifacts(failure['nodeid']).items()},
+        })
+    return rows, len(failures)
+
+def load_load_test_results(test_type):
+    """Load one load test summary, preferring the compact streamed summary
+
+    Order: the k6_ingest summary (histograms, per-tag and per-second data),
+    the handleSummary / Python engine export, the latest run in the
+    time-series store, then the raw k6 NDJSON output, which is streamed
+    through k6_ingest rather than loaded whole.
+    """
+    stream_path = f'reports/{test_type}_stream_summary.json'
+    if os.path.exists(stream_path):
+        return load_json_results(stream_path)
+
+    file_path = f'reports/{test_type}_test_results.json'
+    if os.path.exists(file_path):
+        return load_json_results(file_path)
+
+    segment = TimeSeriesStore(DEFAULT_STORE_DIR).latest(test_type)
+    if segment is not None:
+        return segment.summary()
+
+    raw_path = f'reports/load_test_{test_type}_results.json'
+    if os.path.exists(raw_path):
+        print(f"Streaming raw k6 output {raw_path}...")
+        return ingest_file(raw_path).summary()
+    return None
+
+def load_latency_histogram(result):
+    """Request duration histogram embedded in a load test summary, if any"""
+    blob = (result or {}).get('histograms', {}).get('http_req_duration')
+    return LatencyHistogram.from_base64(blob) if blob else None
+
+def latency_stats(result):
+    """Average, p95 and p99 request duration (ms) of a load test summary
+
+    Uses the embedded histogram when the summary carries one, otherwise
+    falls back to the pre-computed k6 trend values.
+    """
+    histogram = load_latency_histogram(result)
+    if histogram is not None:
+        return {'avg': histogram.mean, 'p95': histogram.percentile(95), 'p99': histogram.percentile(99)}
+
+    duration = result.get('metrics', {}).get('http_req_duration', {}).get('values', {})
+    return {
+        'avg': duration.get('avg', 0),
+        'p95': duration.get('p95', duration.get('p(95)', 0)),
+        'p99': duration.get('p99', duration.get('p(99)', 0)),
+    }
+
+def combined_latency(load_results):
+    """Merge the request duration histograms of all load scenarios"""
+    histograms = [load_latency_histogram(result) for result in load_results.values()]
+    histograms = [h for h in histograms if h is not None]
+    return merge_histograms(histograms) if histograms else None
+
+def load_browser_timings(pattern='reports/browser_timings*.json'):
+    """Merge browser timing histograms written by every test worker"""
+    timings = {}
+    for file_path in sorted(glob.glob(pattern)):
+        data = load_json_results(file_path) or {}
+        for name, blob in data.get('histograms', {}).items():
+            histogram = LatencyHistogram.from_base64(blob)
+            if name in timings:
+                timings[name].merge(histogram)
+            else:
+                timings[name] = histogram
+    return timings
+
+def load_trends(store_dir=DEFAULT_STORE_DIR):
+    """Per-second series of the latest run and per-run trend of each stored scenario"""
+    store = TimeSeriesStore(store_dir)
+    trends = {}
+    for test_type in LOAD_SCENARIOS:
+        segment = store.latest(test_type)
+        if segment is not None and len(segment):
+            trends[test_type] = {'series': segment.series(), 'runs': store.run_trend(test_type)}
+    return trends
+
+def threshold_verdicts(load_results, config=None):
+    """Threshold verdict of each load scenario
+
+    Uses the verdict written during the run when there is one (it also
+    records early aborts), otherwise evaluates performance_thresholds
+    against the scenario summary.
+    """
+    verdicts = {}
+    for test_type, result in load_results.items():
+        path = verdict_path(test_type)
+        verdict = load_json_results(path) if os.path.exists(path) else None
+        if verdict is None:
+            verdict = build_verdict(evaluate_summary(result, load_thresholds(config, test_type)), test_type)
+        verdicts[test_type] = verdict
+    return verdicts
+
+def regression_comparisons(store_dir=DEFAULT_STORE_DIR, report_path=REGRESSION_REPORT, config=None):
+    """Latency regression check of each load scenario against earlier runs
+
+    Uses the report written by perf_regression.py when there is one,
+    otherwise compares the latest stored run of each scenario with a
+    rolling baseline of the runs before it.
+    """
+    report = load_json_results(report_path) if os.path.exists(report_path) else None
+    if report is not None:
+        return {comparison['scenario']: comparison for comparison in report.get('comparisons', [])}
+    store = TimeSeriesStore(store_dir)
+    settings = regression_settings(config)
+    comparisons = {}
+    for test_type in LOAD_SCENARIOS:
+        comparison = compare_stored_runs(store, test_type, settings=settings)
+        if comparison is not None:
+            comparisons[test_type] = comparison
+    return comparisons
+
+def format_duration(seconds):
+    """Suite duration in seconds, or N/A"""
+    return 'N/A' if seconds is None else f'{seconds:.1f}s'
+
+def format_threshold_value(name, value):
+    """Threshold value with its unit"""
+    if value is None:
+        return 'n/a'
+    if name == 'error_rate':
+        return f'{value * 100:.2f}%'
+    if name == 'throughput':
+        return f'{value:.1f} RPS'
+    return f'{value:.0f}ms'
+
+class ReportCache:
+    """Rendered report sections keyed by the digest of their inputs
+
+    index.json records each section's digest and a content digest of every
+    input file, memoized by size and modification time so unchanged inputs
+    are not re-hashed on every run.
+    """
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        path = os.path.join(directory, 'index.json')
+        index = load_json_results(path) if os.path.exists(path) else None
+        self.index = index if index and index.get('code') == CODE_DIGEST else {'code': CODE_DIGEST, 'sections': {}, 'files': {}}
+
+    def file_digest(self, path):
+        """SHA-256 of a file's content ('missing' when it does not exist)"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return 'missing'
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        known = self.index['files'].get(path)
+        if known and known[:2] == stamp:
+            return known[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        self.index['files'][path] = stamp + [digest.hexdigest()]
+        return digest.hexdigest()
+
+    def files_digest(self, paths):
+        """Combined digest of several files"""
+        digest = hashlib.sha256()
+        for path in sorted(set(paths)):
+            digest.update(f'{path}={self.file_digest(path)}\n'.encode())
+        return digest.hexdigest()
+
+    def get(self, name, digest):
+        """Cached section HTML, or None when its inputs changed"""
+        if self.index['sections'].get(name) != digest:
+            return None
+        try:
+            with open(os.path.join(self.directory, f'{name}.html'), 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, name, digest, html):
+        """Store a rendered section"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, f'{name}.html'), 'w', encoding='utf-8') as f:
+            f.write(html)
+        self.index['sections'][name] = digest
+
+    def save(self):
+        """Write the index"""
+        os.makedirs(self.directory, exist_ok=True)
+        write_atomically(os.path.join(self.directory, 'index.json'), json.dumps(self.index))
+
+class ReportInputs:
+    """Report section inputs, each loaded at most once and only when a section needs rendering"""
+
+    def __init__(self, history, store_dir=DEFAULT_STORE_DIR):
+        self.history = history
+        self.store_dir = store_dir
+
+    @cached_property
+    def ingested(self):
+        """Index reports/*.json into the run history, once"""
+        return self.history.ingest()
+
+    @cached_property
+    def run_history(self):
+        self.ingested
+        return load_run_history(self.history, ingest=False)
+
+    @property
+    def results(self):
+        return self.run_history[0]
+
+    @property
+    def history_trends(self):
+        return self.run_history[1]
+
+    @cached_property
+    def failures(self):
+        self.ingested  # reports/*.json are indexed before the failed tests are read
+        return failed_test_artifacts(self.history.failed_tests())
+
+    @cached_property
+    def load_results(self):
+        load_results = {}
+        for test_type in LOAD_SCENARIOS:
+            result = load_load_test_results(test_type)
+            if result:
+                load_results[test_type] = result
+        return load_results
+
+    @cached_property
+    def browser_timings(self):
+        return load_browser_timings()
+
+    @cached_property
+    def trends(self):
+        return load_trends(self.store_dir)
+
+    @cached_property
+    def verdicts(self):
+        return threshold_verdicts(self.load_results)
+
+    @cached_property
+    def regressions(self):
+        return regression_comparisons(self.store_dir)
+
+    def fingerprints(self, cache):
+        """Digest of every input source, without loading any of them"""
+        self.ingested  # the history fingerprint covers the reports/*.json indexed now
+        store = glob.glob(os.path.join(self.store_dir, '*', '*', 'meta.json'))
+        summaries = [path for test_type in LOAD_SCENARIOS for path in (
+            f'reports/{test_type}_stream_summary.json',
+            f'reports/{test_type}_test_results.json',
+            f'reports/load_test_{test_type}_results.json',
+        )]
+        return {
+            'history': self.history.fingerprint('pytest'),
+            'artifacts': cache.files_digest([manifest_path()]),
+            'load': cache.files_digest(summaries + store),
+            'browser': cache.files_digest(glob.glob('reports/browser_timings*.json')),
+            'store': cache.files_digest(store),
+            'verdicts': cache.files_digest([verdict_path(test_type) for test_type in LOAD_SCENARIOS] + [CONFIG_PATH]),
+            'regressions': cache.files_digest([REGRESSION_REPORT, CONFIG_PATH]),
+        }
+
+def write_atomically(path, content):
+    """Replace a file in one step, so a browser or watcher never reads half of it"""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temporary, path)
+
+def generate_combined_report(output=REPORT_PATH, use_cache=True, refresh=None, only_if_changed=False, verbose=True):
+    """Generate combined test report, re-rendering only the sections whose inputs changed
+
+    Args:
+        output: HTML report path
+        use_cache: Reuse cached sections (False renders everything)
+        refresh: Seconds after which an open report reloads itself (watch mode)
+        only_if_changed: Leave the report untouched when no section changed
+        verbose: Print progress
+
+    Returns:
+        Names of the sections that were rendered
+    """
+    if verbose:
+        print("Generating combined test report...")
     
-    # Calculate summary statistics
-    total_tests = 0
-    total_passed = 0
-    total_failed = 0
+    # The run history supplies the current run of every suite
+    history = RunHistory()
+    inputs = ReportInputs(history)
+    cache = ReportCache() if use_cache else None
+    fingerprints = inputs.fingerprints(cache) if cache else {}
     
-    for test_type, result in results.items():
-        if result and 'summary' in result:
-            summary = result['summary']
-            total_tests += summary.get('total', 0)
-            total_passed += summary.get('passed', 0)
-            total_failed += summary.get('failed', 0)
+    digests = section_digests(fingerprints)
     
-    pass_rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
+    fragments = []
+    rendered = []
+    for name, _, render_section in SECTIONS:
+        digest = digests[name]
+        fragment = cache.get(name, digest) if cache else None
+        if fragment is None:
+            fragment = render_section(inputs)
+            rendered.append(name)
+            if cache:
+                cache.put(name, digest, fragment)
+        fragments.append(fragment)
     
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>SwiftAssess Combined Test Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-            .container {{ max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 8px; margin-bottom: 30px; }}
-            .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }}
-            .metric-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; text-align: center; border-left: 4px solid #007bff; }}
-            .metric-value {{ font-size: 2em; font-weight: bold; color: #007bff; }}
-            .metric-label {{ color: #6c757d; margin-top: 5px; }}
-            .section {{ margin-bottom: 30px; }}
-            .section h2 {{ color: #343a40; border-bottom: 2px solid #007bff; padding-bottom: 10px; }}
-            .test-results {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }}
-            .test-card {{ background: #f8f9fa; padding: 20px; border-radius: 8px; border: 1px solid #dee2e6; }}
-            .test-card h3 {{ margin-top: 0; color: #495057; }}
-            .status-passed {{ color: #28a745; font-weight: bold; }}
-            .status-failed {{ color: #dc3545; font-weight: bold; }}
-            .status-warning {{ color: #ffc107; font-weight: bold; }}
-            .load-test {{ background: #e3f2fd; padding: 20px; border-radius: 8px; margin: 10px 0; }}
-            .load-metrics {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px; margin-top: 15px; }}
-            .load-metric {{ text-align: center; padding: 10px; background: white; border-radius: 4px; }}
-            .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #dee2e6; color: #6c757d; text-align: center; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🚀 SwiftAssess QA Test Report</h1>
-                <p>Comprehensive Test Results & Analysis</p>
-                <p>Generated on: {timestamp}</p>
-            </div>
-            
-            <div class="summary">
-                <div class="metric-card">
-                    <div class="metric-value">{total_tests}</div>
-                    <div class="metric-label">Total Tests</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{total_passed}</div>
-                    <div class="metric-label">Passed</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{total_failed}</div>
-                    <div class="metric-label">Failed</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-value">{pass_rate:.1f}%</div>
-                    <div class="metric-label">Pass Rate</div>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>📊 Functional Test Results</h2>
-                <div class="test-results">
-    """
+    if rendered or not only_if_changed or not os.path.exists(output):
+        render_to_file('combined_report.html', output, **page_context(fragments, refresh))
     
-    # Add functional test results
+    # The Excel workbook only depends on suite, load and browser results
+    excel_digest = '|'.join(fingerprints.get(d, '') for d in ('history', 'load', 'browser'))
+    if cache is None or cache.index['sections'].get('excel') != excel_digest or not os.path.exists(EXCEL_PATH):
+        try:
+            generate_excel_report(inputs.results, inputs.load_results, inputs.browser_timings)
+            if cache:
+                cache.index['sections']['excel'] = excel_digest
+        except Exception as e:
+            print(f"Error generating Excel report: {e}")
+    if cache:
+        cache.save()
+    history.close()
+    
+    if verbose:
+        print(f"Combined test report generated successfully! Re-rendered {len(rendered)}/{len(SECTIONS)} sections")
+    return rendered
+
+def watch_combined_report(output=REPORT_PATH, interval=5.0):
+    """Regenerate the report whenever an input changes, until interrupted"""
+    print(f"👀 Watching reports/ every {interval:g}s, writing {output} (Ctrl+C to stop)")
+    first = True
+    try:
+        while True:
+            # The first pass always rewrites the page so open viewers start reloading
+            rendered = generate_combined_report(output, refresh=interval, only_if_changed=not first, verbose=False)
+            first = False
+            if rendered:
+                print(f"🔄 {datetime.now():%H:%M:%S} re-rendered: {', '.join(rendered)}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+def render_summary(results):
+    """Totals across all functional suites"""
+    summaries = [result['summary'] for result in results.values() if result and 'summary' in result]
+    total = sum(summary.get('total', 0) for summary in summaries)
+    passed = sum(summary.get('passed', 0) for summary in summaries)
+    failed = sum(summary.get('failed', 0) for summary in summaries)
+    pass_rate = (passed / total * 100) if total > 0 else 0
+    return render('combined/summary.html', total=total, passed=passed, failed=failed, pass_rate=pass_rate)
+
+def render_functional_results(results, failures=([], 0)):
+    """One card per functional suite, then the failed tests with their artifacts"""
+    suites = []
     for test_type, result in results.items():
         if result and 'summary' in result:
             summary = result['summary']
-            status = 'passed' if summary.get('failed', 0) == 0 else 'failed'
-            status_class = f'status-{status}'
-            
-            html += f"""
-                    <div class="test-card">
-                        <h3>{test_type.title()} Tests</h3>
-                        <p><span class="{status_class}">{summary.get('passed', 0)} passed</span> / {summary.get('total', 0)} total</p>
-                        <p>Duration: {summary.get('duration', 'N/A')}</p>
-                        <p>Status: <span class="{status_class}">{status.upper()}</span></p>
-                    </div>
-            """
-    
-    html += """
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>⚡ Load Test Results</h2>
-    """
-    
-    # Add load test results
+            suites.append({
+                'name': test_type,
+                'status': 'passed' if summary.get('failed', 0) == 0 else 'failed',
+                'passed': summary.get('passed', 0),
+                'total': summary.get('total', 0),
+                'duration': format_duration(summary.get('duration')),
+            })
+    failed, failed_total = failures
+    return render('combined/functional.html', suites=suites, failed=failed, failed_total=failed_total)
+
+def render_run_history(history_trends):
+    """Pass rate and duration trends and flaky tests from the run history"""
+    suites = {suite: runs for suite, runs in (history_trends or {}).get('suites', {}).items() if len(runs) > 1}
+    return render('combined/run_history.html', suites=suites, flaky=history_trends['flaky'][:10] if suites else [])
+
+def render_load_results(load_results):
+    """Request, error and latency metrics of each load scenario"""
+    scenarios = []
     for test_type, result in load_results.items():
         if result and 'metrics' in result:
             metrics = result['metrics']
-            http_reqs = metrics.get('http_reqs', {}).get('values', {})
-            http_failed = metrics.get('http_req_failed', {}).get('values', {})
-            duration = metrics.get('http_req_duration', {}).get('values', {})
-            
-            total_requests = http_reqs.get('count', 0)
-            failed_requests = http_failed.get('count', 0)
-            avg_duration = duration.get('avg', 0)
-            p95_duration = duration.get('p95', 0)
-            
-            error_rate = (failed_requests / total_requests * 100) if total_requests > 0 else 0
-            
-            html += f"""
-                <div class="load-test">
-                    <h3>{test_type.title()} Load Test</h3>
-                    <div class="load-metrics">
-                        <div class="load-metric">
-                            <strong>{total_requests}</strong><br>
-                            <small>Total Requests</small>
-                        </div>
-                        <div class="load-metric">
-                            <strong>{failed_requests}</strong><br>
-                            <small>Failed Requests</small>
-                        </div>
-                        <div class="load-metric">
-                            <strong>{error_rate:.1f}%</strong><br>
-                            <small>Error Rate</small>
-                        </div>
-                        <div class="load-metric">
-                            <strong>{avg_duration:.0f}ms</strong><br>
-                            <small>Avg Response Time</small>
-                        </div>
-                        <div class="load-metric">
-                            <strong>{p95_duration:.0f}ms</strong><br>
-                            <small>95th Percentile</small>
-                        </div>
-                    </div>
-                </div>
-            """
+            total_requests = metrics.get('http_reqs', {}).get('values', {}).get('count', 0)
+            failed_requests = metrics.get('http_req_failed', {}).get('values', {}).get('count', 0)
+            scenarios.append({
+                'name': test_type,
+                'total': total_requests,
+                'failed': failed_requests,
+                'error_rate': (failed_requests / total_requests * 100) if total_requests > 0 else 0,
+                **latency_stats(result),
+            })
     
-    html += """
-            </div>
-            
-            <div class="section">
-                <h2>📈 Performance Analysis</h2>
-                <div class="test-results">
-                    <div class="test-card">
-                        <h3>Response Time Analysis</h3>
-                        <p>Average response times across all test scenarios</p>
-                        <p>Target: &lt; 2 seconds for 95th percentile</p>
-                    </div>
-                    <div class="test-card">
-                        <h3>Error Rate Analysis</h3>
-                        <p>Error rates under different load conditions</p>
-                        <p>Target: &lt; 1% error rate under normal load</p>
-                    </div>
-                    <div class="test-card">
-                        <h3>Throughput Analysis</h3>
-                        <p>Requests per second under various loads</p>
-                        <p>Target: &gt; 100 RPS under normal conditions</p>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>🔧 Recommendations</h2>
-                <ul>
-                    <li>Monitor server resources during peak load</li>
-                    <li>Implement caching strategies for static content</li>
-                    <li>Consider load balancing for high traffic scenarios</li>
-                    <li>Optimize database queries for better performance</li>
-                    <li>Implement auto-scaling for traffic spikes</li>
-                    <li>Add monitoring and alerting for performance metrics</li>
-                </ul>
-            </div>
-            
-            <div class="footer">
-                <p>SwiftAssess QA Automation & Load Testing</p>
-                <p>Generated by automated testing pipeline</p>
-            </div>
-        </div>
-    </body>
-    </html>
+    # Percentiles across every scenario come from the merged histograms
+    overall = combined_latency(load_results) if len(load_results) > 1 else None
+    return render('combined/load.html', scenarios=scenarios, overall=overall)
+
+def render_browser_timings(browser_timings):
+    """Browser timing percentiles merged across test workers"""
+    timings = [(name, histogram.summary()) for name, histogram in sorted((browser_timings or {}).items())]
+    return render('combined/browser.html', timings=timings)
+
+def render_load_trends(trends):
+    """Charts of the latest stored run and the per-run p95 trend"""
+    return render('combined/trends.html', trends=trends)
+
+def render_performance_analysis(verdicts):
+    """Threshold results per scenario and early aborts"""
+    # Threshold verdicts (performance_thresholds in config.yaml)
+    analyses = [
+        ('Response Time Analysis', 'Response time percentiles per scenario', ('p50', 'p90', 'p95', 'p99')),
+        ('Error Rate Analysis', 'Error rates under different load conditions', ('error_rate',)),
+        ('Throughput Analysis', 'Requests per second under various loads', ('throughput',)),
+    ]
+    cards = []
+    for title, description, names in analyses:
+        rows = [{
+            'scenario': test_type,
+            'value': format_threshold_value(threshold['name'], threshold['value']),
+            'ok': threshold['ok'],
+            'target': threshold['expression'].split(': ')[1],
+        } for test_type, verdict in verdicts.items() for threshold in verdict['thresholds'] if threshold['name'] in names]
+        cards.append({'title': title, 'description': description, 'rows': rows})
+    aborts = [(test_type, verdict['abort']) for test_type, verdict in verdicts.items() if verdict.get('aborted')]
+    return render('combined/performance.html', analyses=cards, aborts=aborts, evaluated=bool(verdicts))
+
+def render_regression_check(regressions):
+    """Run-over-run latency regressions"""
+    # Run-over-run regression check (scripts/perf_regression.py)
+    rows = [(test_type, name, result) for test_type, comparison in (regressions or {}).items()
+            for name, result in {'overall': comparison['overall'], **comparison['endpoints']}.items()]
+    return render('combined/regressions.html', rows=rows)
+
+def render_recommendations():
+    """Static recommendations"""
+    return render('combined/recommendations.html')
+
+def page_context(sections, refresh=None):
+    """Template context of the whole page around its rendered sections"""
+    return {
+        'sections': sections,
+        'refresh': refresh,
+        'generated_on': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+def generate_html_report(results, load_results, browser_timings=None, trends=None, verdicts=None, regressions=None,
+                         history_trends=None, refresh=None, failures=None):
+    """Generate HTML report content"""
+    if verdicts is None:
+        verdicts = threshold_verdicts(load_results)
+    inputs = SimpleNamespace(results=results, load_results=load_results, browser_timings=browser_timings, trends=trends,
+                             verdicts=verdicts, regressions=regressions, history_trends=history_trends,
+                             failures=failures or ([], 0))
+    return render('combined_report.html', **page_context(list(render_sections(inputs).values()), refresh))
+
+def section_digests(fingerprints):
+    """Cache key of every section: the digest of its name and of the inputs it depends on"""
+    return {name: hashlib.sha256('\n'.join([name, *(fingerprints.get(d, '') for d in depends)]).encode()).hexdigest()
+            for name, depends, _ in SECTIONS}
+
+def render_sections(inputs, names=None, cache=None, digests=None):
+    """Rendered HTML of the named sections (all by default), in page order
+
+    With a cache and the section digests, a section whose digest is
+    unchanged is read from the cache and any other is rendered and stored
+    in it; the caller records the digests in the index and saves it.
     """
-    
-    return html
+    fragments = {}
+    for name, _, render_section in SECTIONS:
+        if names is not None and name not in names:
+            continue
+        fragment = cache.get(name, digests[name]) if cache else None
+        if fragment is None:
+            fragment = render_section(inputs)
+            if cache:
+                cache.put(name, digests[name], fragment)
+        fragments[name] = fragment
+    return fragments
 
-def generate_excel_report(results, load_results):
-    """Generate Excel report"""
-    try:
-        # Create Excel writer
-        with pd.ExcelWriter('reports/combined_test_report.xlsx', engine='openpyxl') as writer:
-            
-            # Summary sheet
-            summary_data = []
-            for test_type, result in results.items():
-                if result and 'summary' in result:
-                    summary = result['summary']
-                    summary_data.append({
-                        'Test Type': test_type.title(),
-                        'Total Tests': summary.get('total', 0),
-                        'Passed': summary.get('passed', 0),
-                        'Failed': summary.get('failed', 0),
-                        'Pass Rate (%)': round((summary.get('passed', 0) / summary.get('total', 1) * 100), 2),
-                        'Duration (s)': summary.get('duration', 0)
-                    })
-            
-            if summary_data:
-                df_summary = pd.DataFrame(summary_data)
-                df_summary.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Load test results sheet
-            load_data = []
-            for test_type, result in load_results.items():
-                if result and 'metrics' in result:
-                    metrics = result['metrics']
-                    http_reqs = metrics.get('http_reqs', {}).get('values', {})
-                    http_failed = metrics.get('http_req_failed', {}).get('values', {})
-                    duration = metrics.get('http_req_duration', {}).get('values', {})
-                    
-                    load_data.append({
-                        'Test Type': test_type.title(),
-                        'Total Requests': http_reqs.get('count', 0),
-                        'Failed Requests': http_failed.get('count', 0),
-                        'Error Rate (%)': round((http_failed.get('count', 0) / http_reqs.get('count', 1) * 100), 2),
-                        'Avg Response Time (ms)': round(duration.get('avg', 0), 2),
-                        '95th Percentile (ms)': round(duration.get('p95', 0), 2),
-                        '99th Percentile (ms)': round(duration.get('p99', 0), 2)
-                    })
-            
-            if load_data:
-                df_load = pd.DataFrame(load_data)
-                df_load.to_excel(writer, sheet_name='Load Test Results', index=False)
+# Report sections in page order: name, inputs whose digests key the cache, renderer
+SECTIONS = [
+    ('summary', ('history',), lambda inputs: render_summary(inputs.results)),
+    ('functional', ('history', 'artifacts'), lambda inputs: render_functional_results(inputs.results, inputs.failures)),
+    ('run_history', ('history',), lambda inputs: render_run_history(inputs.history_trends)),
+    ('load', ('load',), lambda inputs: render_load_results(inputs.load_results)),
+    ('browser', ('browser',), lambda inputs: render_browser_timings(inputs.browser_timings)),
+    ('trends', ('store',), lambda inputs: render_load_trends(inputs.trends)),
+    ('performance', ('load', 'verdicts'), lambda inputs: render_performance_analysis(inputs.verdicts)),
+    ('regressions', ('regressions', 'store'), lambda inputs: render_regression_check(inputs.regressions)),
+    ('recommendations', (), lambda inputs: render_recommendations()),
+]
+
+def generate_excel_report(results, load_results, browser_timings=None, path=EXCEL_PATH):
+    """Generate Excel report (errors propagate to the caller)"""
+    with ExcelStream(path) as book:
         
-        print("Excel report generated successfully!")
+        # Summary sheet
+        summary_rows = []
+        for test_type, result in results.items():
+            if result and 'summary' in result:
+                summary = result['summary']
+                summary_rows.append([
+                    test_type.title(),
+                    summary.get('total', 0),
+                    summary.get('passed', 0),
+                    summary.get('failed', 0),
+                    round((summary.get('passed', 0) / summary.get('total', 1) * 100), 2),
+                    summary.get('duration', 0),
+                ])
+        book.write_sheet('Summary', ['Test Type', 'Total Tests', 'Passed', 'Failed', 'Pass Rate (%)', 'Duration (s)'],
+                         summary_rows)
         
-    except Exception as e:
-        print(f"Error generating Excel report: {e}")
+        # Load test results sheet
+        load_rows = []
+        for test_type, result in load_results.items():
+            if result and 'metrics' in result:
+                metrics = result['metrics']
+                total = metrics.get('http_reqs', {}).get('values', {}).get('count', 0)
+                failed = metrics.get('http_req_failed', {}).get('values', {}).get('count', 0)
+                latency = latency_stats(result)
+                load_rows.append([test_type.title(), total, failed, round(failed / (total or 1) * 100, 2),
+                                  round(latency['avg'], 2), round(latency['p95'], 2), round(latency['p99'], 2)])
+        
+        overall = combined_latency(load_results)
+        if overall is not None and len(load_results) > 1:
+            total = sum(row[1] for row in load_rows)
+            failed = sum(row[2] for row in load_rows)
+            load_rows.append(['All Scenarios (merged)', total, failed, round(failed / max(total, 1) * 100, 2),
+                              round(overall.mean, 2), round(overall.percentile(95), 2), round(overall.percentile(99), 2)])
+        if load_rows:
+            book.write_sheet('Load Test Results', ['Test Type', 'Total Requests', 'Failed Requests', 'Error Rate (%)',
+                             'Avg Response Time (ms)', '95th Percentile (ms)', '99th Percentile (ms)'], load_rows)
+        
+        # Browser timings sheet
+        if browser_timings:
+            timing_rows = []
+            for name, histogram in sorted(browser_timings.items()):
+                stats = histogram.summary()
+                timing_rows.append([name, stats['count'], round(stats['med'], 2), round(stats['p95'], 2),
+                                    round(stats['p99'], 2), round(stats['max'], 2)])
+            book.write_sheet('Browser Timings', ['Timing', 'Samples', 'Median (ms)', '95th Percentile (ms)',
+                             '99th Percentile (ms)', 'Max (ms)'], timing_rows)
+    
+    print("Excel report generated successfully!")
 
 if __name__ == "__main__":
-    generate_combined_report()
+    parser = argparse.ArgumentParser(description="Generate the combined test report")
+    parser.add_argument('--output', default=REPORT_PATH, help='HTML report path')
+    parser.add_argument('--no-cache', action='store_true', help='Render every section from scratch')
+    parser.add_argument('--watch', action='store_true', help='Keep updating the report while results come in')
+    parser.add_argument('--interval', type=float, default=5.0, help='Watch polling interval in seconds')
+    args = parser.parse_args()
+    if args.watch:
+        watch_combined_report(args.output, args.interval)
+    else:
+        generate_combined_report(args.output, use_cache=not args.no_cache)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Report orchestrator: load every input once, render all artifacts in parallel
+
+generate_combined_report.py and generate_bug_report.py each index the run
+history and re-read the same JSON artifacts before writing their HTML and
+Excel files one after the other. This script loads and normalizes the
+inputs once (suite results and trends, failed tests clustered into bugs
+with their stable IDs from the bug index, load summaries, browser timings, stored trends, threshold verdicts and
+regression checks), hands that snapshot to each worker of a process pool
+through the pool initializer, and fans the artifacts out as independent
+tasks:
+
+    combined_sections  summary, load, threshold and regression sections
+    combined_charts    run-history and load-trend chart sections
+    combined_excel     reports/combined_test_report.xlsx
+    bug_excel          reports/bug_report_<timestamp>.xlsx
+    bug_html           reports/bug_report_<timestamp>.html
+
+The section tasks share the section cache of generate_combined_report.py
+(reports/.report_cache/combined): the input digests are computed once with
+the snapshot, a task re-renders only the sections whose digest changed, and
+the parent records the new digests once all tasks are done. The parent
+stitches the combined page from the rendered sections and writes the wall
+time of every artifact to reports/report_timings.json.
+
+    python scripts/generate_reports.py
+    python scripts/generate_reports.py --workers 1   # in-process, no pool
+    python scripts/generate_reports.py --no-cache    # render every section from scratch
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.bug_index import BugIndex  # noqa: E402
+from scripts.generate_bug_report import (  # noqa: E402
+    BUG_COLUMNS,
+    build_bugs,
+    bug_report_path,
+    current_runs,
+    generate_html_bug_report,
+    track_bugs,
+    write_bug_workbook,
+)
+from scripts.generate_combined_report import (  # noqa: E402
+    EXCEL_PATH,
+    REPORT_PATH,
+    SECTIONS,
+    ReportCache,
+    ReportInputs,
+    generate_excel_report,
+    page_context,
+    render_sections,
+    section_digests,
+)
+from scripts.report_rendering import render_to_file  # noqa: E402
+from scripts.run_history import RunHistory  # noqa: E402
+
+TIMINGS_PATH = "reports/report_timings.json"
+CHART_SECTIONS = ("run_history", "trends")
+# The combined page needs both section artifacts; bug rows are only built for bug artifacts
+PAGE_ARTIFACTS = ("combined_sections", "combined_charts")
+BUG_ARTIFACTS = ("bug_excel", "bug_html")
+
+# Snapshot of the normalized inputs, installed once per worker process
+_shared: Optional[SimpleNamespace] = None
+
+
+def load_report_data(
+    history: Optional[RunHistory] = None, index: Optional[BugIndex] = None, bugs: bool = True, use_cache: bool = True
+) -> SimpleNamespace:
+    """Load and normalize every report input once
+
+    Indexes reports/*.json into the run history first (see load_run_history)
+    and, with bugs, records the run's bugs in the bug fingerprint index.
+    Without bugs the bug rows stay empty and the index is not touched.
+
+    Returns:
+        Picklable namespace with the combined report inputs, the bug rows,
+        the bugs this run resolved, the section cache with the digest of
+        every section (None without use_cache) and the output paths of this run
+    """
+    history = history or RunHistory()
+    inputs = ReportInputs(history)
+    cache = ReportCache() if use_cache else None
+    digests = section_digests(inputs.fingerprints(cache)) if cache else {}
+    results = inputs.results  # ingests reports/*.json before the failed tests are read
+    rows, resolved = [], []
+    if bugs:
+        rows = build_bugs(history.failed_tests())
+        resolved = track_bugs(rows, current_runs(history), index)
+    bug_excel = bug_report_path()
+    return SimpleNamespace(
+        results=results,
+        history_trends=inputs.history_trends,
+        failures=inputs.failures,
+        load_results=inputs.load_results,
+        browser_timings=inputs.browser_timings,
+        trends=inputs.trends,
+        verdicts=inputs.verdicts,
+        regressions=inputs.regressions,
+        bugs=rows,
+        resolved=resolved,
+        cache=cache,
+        section_digests=digests,
+        paths={
+            "combined_html": REPORT_PATH,
+            "combined_excel": EXCEL_PATH,
+            "bug_excel": bug_excel,
+            "bug_html": str(Path(bug_excel).with_suffix(".html")),
+        },
+    )
+
+
+def combined_sections(data: SimpleNamespace) -> Dict[str, str]:
+    """Render the combined report sections without charts, reusing cached ones"""
+    names = [name for name, _, _ in SECTIONS if name not in CHART_SECTIONS]
+    return render_sections(data, names, data.cache, data.section_digests)
+
+
+def combined_charts(data: SimpleNamespace) -> Dict[str, str]:
+    """Render the chart-heavy combined report sections, reusing cached ones"""
+    return render_sections(data, CHART_SECTIONS, data.cache, data.section_digests)
+
+
+def combined_excel(data: SimpleNamespace) -> str:
+    """Write the combined Excel workbook"""
+    generate_excel_report(data.results, data.load_results, data.browser_timings, path=data.paths["combined_excel"])
+    return data.paths["combined_excel"]
+
+
+def bug_excel(data: SimpleNamespace) -> str:
+    """Write the bug report workbook"""
+    write_bug_workbook(data.paths["bug_excel"], data.bugs, data.resolved)
+    return data.paths["bug_excel"]
+
+
+def bug_html(data: SimpleNamespace) -> str:
+    """Write the bug report page"""
+    return generate_html_bug_report(
+        pd.DataFrame(data.bugs, columns=BUG_COLUMNS), data.paths["bug_excel"], resolved=data.resolved
+    )
+
+
+ARTIFACTS: Dict[str, Callable[[SimpleNamespace], object]] = {
+    "combined_sections": combined_sections,
+    "combined_charts": combined_charts,
+    "combined_excel": combined_excel,
+    "bug_excel": bug_excel,
+    "bug_html": bug_html,
+}
+
+
+def _init_worker(data: SimpleNamespace):
+    """Pool initializer: receive the input snapshot once per worker"""
+    global _shared
+    _shared = data
+
+
+def _run_artifact(name: str, data: Optional[SimpleNamespace] = None) -> Dict:
+    """Render one artifact, timing it and capturing any error"""
+    start = time.perf_counter()
+    try:
+        result, error = ARTIFACTS[name](data if data is not None else _shared), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return {
+        "artifact": name,
+        "result": result,
+        "error": error,
+        "seconds": round(time.perf_counter() - start, 3),
+        "pid": os.getpid(),
+    }
+
+
+def generate_reports(
+    workers: Optional[int] = None, artifacts: Optional[List[str]] = None, verbose: bool = True, use_cache: bool = True
+) -> Dict:
+    """Load inputs once and render every report artifact
+
+    Args:
+        workers: Process pool size (default: one per artifact, capped at the
+            CPU count); 1 renders everything in this process
+        artifacts: Artifact names to render (default: all)
+        verbose: Print progress and the timing table
+        use_cache: Reuse cached combined report sections (False renders them all)
+
+    Returns:
+        Timing report: load time, per-artifact seconds, status and total
+    """
+    started = time.perf_counter()
+    names = artifacts or list(ARTIFACTS)
+    with RunHistory() as history:
+        data = load_report_data(history, bugs=any(name in BUG_ARTIFACTS for name in names), use_cache=use_cache)
+    timings = {"load": {"seconds": round(time.perf_counter() - started, 3), "status": "ok"}}
+    if verbose:
+        print(f"📥 Loaded report inputs in {timings['load']['seconds']:.2f}s ({len(data.bugs)} bug rows)")
+
+    workers = workers or min(len(names), os.cpu_count() or 1)
+    outcomes = []
+    if workers <= 1:
+        outcomes = [_run_artifact(name, data) for name in names]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+            futures = [pool.submit(_run_artifact, name) for name in names]
+            outcomes = [future.result() for future in as_completed(futures)]
+
+    sections = {}
+    for outcome in sorted(outcomes, key=lambda outcome: names.index(outcome["artifact"])):
+        timings[outcome["artifact"]] = {
+            "seconds": outcome["seconds"],
+            "status": "error" if outcome["error"] else "ok",
+            "pid": outcome["pid"],
+            **({"error": outcome["error"]} if outcome["error"] else {}),
+        }
+        if outcome["artifact"] in PAGE_ARTIFACTS and outcome["result"]:
+            sections.update(outcome["result"])
+
+    # Workers stored their sections' HTML; the index is written once, here
+    if data.cache is not None and sections:
+        data.cache.index["sections"].update({name: data.section_digests[name] for name in sections})
+        data.cache.save()
+
+    # Stitch the combined page in page order, only from a complete set of sections
+    if all(timings.get(name, {}).get("status") == "ok" for name in PAGE_ARTIFACTS):
+        start = time.perf_counter()
+        ordered = [sections[name] for name, _, _ in SECTIONS if name in sections]
+        render_to_file("combined_report.html", data.paths["combined_html"], **page_context(ordered))
+        timings["combined_html"] = {"seconds": round(time.perf_counter() - start, 3), "status": "ok"}
+
+    report = {
+        "created": time.time(),
+        "workers": workers,
+        "artifacts": timings,
+        "paths": data.paths,
+        "total_seconds": round(time.perf_counter() - started, 3),
+    }
+    os.makedirs(os.path.dirname(TIMINGS_PATH), exist_ok=True)
+    with open(TIMINGS_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if verbose:
+        print_timings(report)
+    return report
+
+
+def print_timings(report: Dict):
+    """Per-artifact timing table"""
+    print(f"\n⏱️  Report artifacts ({report['workers']} worker(s)):")
+    for name, timing in report["artifacts"].items():
+        icon = "✅" if timing["status"] == "ok" else "❌"
+        print(f"  {icon} {name:<18} {timing['seconds']:>8.2f}s  {timing.get('error', '')}")
+    print(f"  Total {report['total_seconds']:.2f}s -> {TIMINGS_PATH}")
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="Generate all HTML, Excel and bug reports from one load of the inputs")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (1 = no pool)")
+    parser.add_argument("--only", nargs="+", choices=list(ARTIFACTS), help="Render only these artifacts")
+    parser.add_argument("--no-cache", action="store_true", help="Render every combined report section from scratch")
+    args = parser.parse_args()
+
+    report = generate_reports(args.workers, args.only, use_cache=not args.no_cache)
+    failed = [name for name, timing in report["artifacts"].items() if timing["status"] != "ok"]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
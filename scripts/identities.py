@@ -0,0 +1,140 @@
+"""
+Collision-free test identities: run id + worker id + virtual user + counter
+
+Signup tests need an email nobody used before, and a random suffix stops
+being enough long before 1000 VUs: a duplicate is rejected by the app and
+shows up as a false signup failure. Every identity here is the tuple
+
+    run - worker - vu - counter
+
+in base 36, e.g. ``john.doe+k3x9q0aa-2-1f-7@example.com``. The run id is
+fixed once per run and inherited by child processes through the
+environment, the worker is the pytest-xdist or load engine process, the vu
+the virtual user and the counter counts that VU's identities in this
+process. Distinct tuples give distinct identities, so workers and VUs never
+need to coordinate.
+
+The run id is SWIFTASSESS_RUN_ID when set, else the pytest-xdist test run
+uid shared by its workers, else a random id that is then written to
+SWIFTASSESS_RUN_ID for the processes started after it. A process that starts
+several runs of its own (the load engine running baseline, stress and spike
+one after another) gives each a ``scoped_run_id``: the run id plus a random
+nonce, so the counters starting over never repeat an identity. The k6
+scripts build the same tag from ``k6/execution`` ids (tests/load/*.js).
+"""
+
+import functools
+import os
+import re
+import secrets
+import threading
+from typing import Dict, List, Optional
+
+RUN_ID_ENV = "SWIFTASSESS_RUN_ID"
+XDIST_RUN_ENV = "PYTEST_XDIST_TESTRUNUID"
+XDIST_WORKER_ENV = "PYTEST_XDIST_WORKER"
+
+RUN_ID_LENGTH = 8
+NONCE_LENGTH = 6
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def base36(number: int) -> str:
+    """Non-negative integer in base 36"""
+    if number < 0:
+        raise ValueError("Identity components are non-negative")
+    digits = []
+    while True:
+        number, digit = divmod(number, 36)
+        digits.append(_DIGITS[digit])
+        if not number:
+            return "".join(reversed(digits))
+
+
+def _normalize(run: str) -> str:
+    """Run id reduced to lower-case letters and digits, so "-" only separates components"""
+    normalized = re.sub(r"[^a-z0-9]", "", run.lower())
+    if not normalized:
+        raise ValueError(f"Run id {run!r} has no letters or digits")
+    return normalized
+
+
+def run_id() -> str:
+    """Id of the current run, shared by every process of it (see the module docstring)"""
+    run = os.environ.get(RUN_ID_ENV)
+    if run:
+        return _normalize(run)
+    xdist_run = os.environ.get(XDIST_RUN_ENV)
+    if xdist_run:
+        return _normalize(xdist_run)[:RUN_ID_LENGTH]
+    run = base36(secrets.randbits(40)).rjust(RUN_ID_LENGTH, "0")
+    os.environ[RUN_ID_ENV] = run
+    return run
+
+
+def scoped_run_id() -> str:
+    """The run id plus a fresh random nonce of NONCE_LENGTH characters, for one of several runs of a process"""
+    return run_id() + base36(secrets.randbits(30)).rjust(NONCE_LENGTH, "0")
+
+
+def worker_id() -> int:
+    """Number of the pytest-xdist worker (``gw3`` -> 3), 0 outside xdist"""
+    match = re.search(r"(\d+)$", os.environ.get(XDIST_WORKER_ENV, ""))
+    return int(match.group(1)) if match else 0
+
+
+class IdentityAllocator:
+    """Hands out identities unique across runs, workers and virtual users
+
+    Args:
+        run: Run id (default run_id())
+        worker: Worker number (default worker_id())
+
+    Two allocators of one process with the same run and worker hand out the
+    same identities; use shared_allocator() unless workers are numbered
+    explicitly (as the load engine does).
+    """
+
+    def __init__(self, run: Optional[str] = None, worker: Optional[int] = None):
+        self.run = _normalize(run) if run is not None else run_id()
+        self.worker = worker_id() if worker is None else worker
+        self._prefix = f"{self.run}-{base36(self.worker)}-"
+        self._counters: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, vu: int, count: int) -> range:
+        """The next count counter values of a VU"""
+        with self._lock:
+            start = self._counters.get(vu, 0)
+            self._counters[vu] = start + count
+        return range(start, start + count)
+
+    def token(self, vu: int = 0) -> str:
+        """Next identity of a VU, e.g. ``k3x9q0aa-2-1f-7``"""
+        return f"{self._prefix}{base36(vu)}-{base36(self._reserve(vu, 1)[0])}"
+
+    def tokens(self, count: int, vu: int = 0) -> List[str]:
+        """The next count identities of a VU, reserved at once"""
+        prefix = f"{self._prefix}{base36(vu)}-"
+        return [prefix + base36(number) for number in self._reserve(vu, count)]
+
+    def email(self, address: str, vu: int = 0) -> str:
+        """
+        A unique variant of an email address
+
+        The identity is added as a plus tag, replacing any tag the address
+        already has: ``john.doe@example.com`` -> ``john.doe+<identity>@example.com``.
+        """
+        local, domain = address.rsplit("@", 1)
+        return f"{local.split('+', 1)[0]}+{self.token(vu)}@{domain}"
+
+
+@functools.lru_cache(maxsize=None)
+def shared_allocator() -> IdentityAllocator:
+    """The process-wide allocator of the current run and worker"""
+    return IdentityAllocator()
+
+
+def unique_email(address: str, vu: int = 0) -> str:
+    """A unique variant of an email address from the process-wide allocator"""
+    return shared_allocator().email(address, vu)
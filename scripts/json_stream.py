@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for large pytest-json-report files
+
+Reruns with captured logs make pytest-json-report files hundreds of MB, and
+``json.load`` holds the whole document, every test with its captured
+output, in memory at once. PytestReportStream reads the file in chunks and
+decodes the ``tests`` array one entry at a time with
+``json.JSONDecoder.raw_decode``, keeping only the fields the reports use:
+
+    nodeid, outcome, and outcome / duration / longrepr of setup, call and teardown
+
+Every other top-level key (created, duration, exitcode, summary, ...) is
+decoded whole into ``header``, except the ``collectors`` array, which is
+skipped an entry at a time. Memory is bounded by the largest single test
+entry, not the file.
+
+    with PytestReportStream("reports/regression_results.json") as report:
+        for test in report:
+            ...
+        summary = report.header["summary"]
+"""
+
+import json
+from typing import Any, Dict, Iterator
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # characters read at a time
+
+PHASES = ("setup", "call", "teardown")
+TEST_FIELDS = ("nodeid", "outcome")
+PHASE_FIELDS = ("outcome", "duration", "longrepr")
+
+# Top-level arrays read an entry at a time and dropped
+SKIPPED_ARRAYS = ("collectors",)
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = json.decoder.WHITESPACE
+
+
+def slim_test(test: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a pytest-json-report test entry the reports use"""
+    slim = {field: test.get(field) for field in TEST_FIELDS}
+    for phase in PHASES:
+        details = test.get(phase)
+        if isinstance(details, dict):
+            slim[phase] = {field: details[field] for field in PHASE_FIELDS if field in details}
+    return slim
+
+
+class JsonChunkReader:
+    """Incremental JSON tokens and values over a text file read in chunks
+
+    Values are decoded with ``raw_decode`` from a buffer that only holds the
+    unread tail of the file; a value cut off at the end of the buffer is
+    decoded again once more of the file has been read.
+    """
+
+    def __init__(self, file, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, minimum: int = 0) -> bool:
+        """Read at least one chunk (or minimum characters) more; False at the end of the file"""
+        if self.pos >= self.chunk_size:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        data = self.file.read(max(self.chunk_size, minimum))
+        if not data:
+            self.eof = True
+            return False
+        self.text += data
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, not consumed ("" at the end of the file)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or not self._fill():
+                return self.text[self.pos:self.pos + 1]
+
+    def expect(self, characters: str) -> str:
+        """Consume the next non-whitespace character, which must be one of characters"""
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"Expected one of {characters!r}, found {character or 'end of file'!r}")
+        self.pos += 1
+        return character
+
+    def value(self) -> Any:
+        """Decode the next value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+                # A value ending exactly at the end of the buffer may be a cut-off number
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow the buffer by at least its unread size, so retries stay linear
+            self._fill(len(self.text) - self.pos)
+
+    def array(self) -> Iterator[Any]:
+        """Decode the entries of the next array one at a time"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+class PytestReportStream:
+    """Test entries of a pytest-json-report, decoded one at a time
+
+    Args:
+        path: Report file
+        chunk_size: Characters read at a time
+        slim: Yield only the fields the reports use (False: whole entries)
+
+    Attributes:
+        header: Top-level fields decoded so far (all of them once the
+            iteration finished)
+        has_tests: Whether the document had a ``tests`` array
+    """
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, slim: bool = True):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.slim = slim
+        self.header: Dict[str, Any] = {}
+        self.has_tests = False
+        self._file = None
+
+    def __enter__(self) -> "PytestReportStream":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the file of an unfinished iteration"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Test entries in file order, slimmed unless slim is False (see slim_test)
+
+        Raises:
+            ValueError: The file is not a JSON object
+        """
+        self.close()
+        self._file = open(self.path, "r", encoding="utf-8")
+        try:
+            reader = JsonChunkReader(self._file, self.chunk_size)
+            reader.expect("{")
+            if reader.peek() == "}":
+                return
+            while True:
+                key = reader.value()
+                reader.expect(":")
+                if key == "tests" and reader.peek() == "[":
+                    self.has_tests = True
+                    for test in reader.array():
+                        if isinstance(test, dict):
+                            yield slim_test(test) if self.slim else test
+                elif key in SKIPPED_ARRAYS and reader.peek() == "[":
+                    for _ in reader.array():
+                        pass
+                else:
+                    self.header[key] = reader.value()
+                if reader.expect(",}") == "}":
+                    return
+        finally:
+            self.close()
+
@@ -0,0 +1,650 @@
+#!/usr/bin/env python3
+"""
+Streaming ingestion of k6 ``--out json`` (NDJSON) results
+
+A 500-VU stress run writes gigabytes of Point lines, far too much to
+``json.load``. This module reads (or tails) the file line by line and folds
+each point into fixed-size aggregates: one per metric, one per tag value,
+per-second time buckets, and mergeable latency histograms for every trend.
+Memory depends on the number of metrics, tag values and seconds of test
+time, not on the number of points.
+
+The compact summary it writes has the same shape as a k6 handleSummary
+export (plus histograms, per-tag and per-second series), so the report
+scripts can use it instead of the raw file.
+
+    python scripts/k6_ingest.py reports/load_test_stress_results.json --scenario stress
+    python scripts/k6_ingest.py reports/load_test_stress_results.json --scenario stress --follow
+    python scripts/k6_ingest.py reports/load_test_stress_results.json --follow --dashboard
+"""
+
+import argparse
+import calendar
+import gzip
+import json
+import logging
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.latency_histogram import LatencyHistogram  # noqa: E402
+from scripts.live_dashboard import DEFAULT_PORT, LiveDashboard  # noqa: E402
+from scripts.thresholds import ThresholdEvaluator, verdict_path, write_verdict  # noqa: E402
+from scripts.timeseries_store import DEFAULT_STORE_DIR, TimelineRecorder, TimeSeriesStore  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Tags worth breaking metrics down by; high-cardinality tags such as url and vu are ignored
+DEFAULT_TAG_KEYS = ("name", "method", "status", "expected_response", "scenario", "group", "check")
+DEFAULT_MAX_SERIES = 1000
+OVERFLOW_TAG_VALUE = "__other__"
+
+# Trends that also keep a histogram per time bucket
+DEFAULT_BUCKET_HISTOGRAMS = ("http_req_duration",)
+
+# Seconds a time bucket stays open for out-of-order points before it is compacted
+LATENESS_SECONDS = 5
+
+# Points buffered before they are folded in with vectorised NumPy operations
+FLUSH_POINTS = 65536
+
+
+class MetricAggregate:
+    """Running aggregate of one k6 metric (or one tagged sub-series)"""
+
+    __slots__ = ("kind", "count", "sum", "min", "max", "last", "last_time", "passes", "histogram")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last = 0.0
+        self.last_time = -math.inf
+        self.passes = 0
+        self.histogram = LatencyHistogram() if kind == "trend" else None
+
+    def add_many(self, values: np.ndarray, last_time: float = -math.inf):
+        """
+        Fold a batch of samples into the aggregate
+
+        Args:
+            values: Sample values in arrival order
+            last_time: Timestamp of the last sample (orders gauge values across merges)
+        """
+        if not values.size:
+            return
+        self.count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if last_time >= self.last_time:
+            self.last = float(values[-1])
+            self.last_time = last_time
+        if self.kind == "rate":
+            self.passes += int(np.count_nonzero(values))
+        elif self.histogram is not None:
+            self.histogram.record_many(values)
+
+    def merge(self, other: "MetricAggregate") -> "MetricAggregate":
+        """Add another aggregate of the same metric into this one"""
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if other.last_time >= self.last_time:
+            self.last, self.last_time = other.last, other.last_time
+        self.passes += other.passes
+        if self.histogram is not None and other.histogram is not None:
+            self.histogram.merge(other.histogram)
+        return self
+
+    def values(self, duration: float) -> Dict[str, float]:
+        """k6 summary ``values`` block for the aggregate"""
+        if self.kind == "counter":
+            return {"count": self.sum, "rate": self.sum / duration if duration else 0.0}
+        if self.kind == "gauge":
+            return {"value": self.last, "min": self._finite(self.min), "max": self._finite(self.max)}
+        if self.kind == "rate":
+            return {
+                "rate": self.passes / self.count if self.count else 0.0,
+                "passes": self.passes,
+                "fails": self.count - self.passes,
+                "count": self.passes,
+            }
+        stats = self.histogram.summary()
+        stats.pop("count")
+        return stats
+
+    @staticmethod
+    def _finite(value: float) -> float:
+        return value if math.isfinite(value) else 0.0
+
+
+class K6StreamAggregator:
+    """Fold k6 NDJSON lines into per-metric, per-tag and per-second aggregates
+
+    Points are grouped by metric and by the tuple of their selected tag values
+    (a series). Only series aggregates are kept; per-metric, per-tag and
+    per-endpoint figures are merged from them when the summary is built.
+    """
+
+    def __init__(
+        self,
+        tag_keys: Iterable[str] = DEFAULT_TAG_KEYS,
+        bucket_seconds: int = 1,
+        max_series: int = DEFAULT_MAX_SERIES,
+        bucket_histograms: Iterable[str] = DEFAULT_BUCKET_HISTOGRAMS,
+    ):
+        """
+        Initialize an empty aggregator
+
+        Args:
+            tag_keys: Tags to break metrics down by
+            bucket_seconds: Width of the time buckets
+            max_series: Distinct tag combinations kept per metric (the rest fold into __other__)
+            bucket_histograms: Trend metrics that keep a histogram per time bucket
+        """
+        self.tag_keys = tuple(tag_keys)
+        self.bucket_seconds = max(int(bucket_seconds), 1)
+        self.max_series = max_series
+        self.bucket_histograms = set(bucket_histograms)
+        self._overflow = (OVERFLOW_TAG_VALUE,) * len(self.tag_keys)
+
+        self.metric_types: Dict[str, str] = {}
+        self.metric_contains: Dict[str, str] = {}
+        # (metric, tag values) -> aggregate
+        self.series: Dict[Tuple[str, Tuple], MetricAggregate] = {}
+        self._series_per_metric: Dict[str, int] = {}
+        # metric -> bucket start -> [count, sum, min, max]
+        self.buckets: Dict[str, Dict[int, List[float]]] = {}
+        # metric -> bucket start -> live histogram / compacted blob
+        self.open_histograms: Dict[str, Dict[int, LatencyHistogram]] = {}
+        self.closed_histograms: Dict[str, Dict[int, bytes]] = {}
+        # Per-endpoint requests, errors, VUs and latencies for the time-series store
+        self.timeline = TimelineRecorder(self.bucket_seconds)
+        self._name_index = self.tag_keys.index("name") if "name" in self.tag_keys else None
+        self._method_index = self.tag_keys.index("method") if "method" in self.tag_keys else None
+
+        # (metric, tag values) -> ([values], [epoch seconds])
+        self._pending: Dict[Tuple[str, Tuple], Tuple[List[float], List[float]]] = {}
+        self._pending_points = 0
+
+        self.lines = 0
+        self.points = 0
+        self.skipped = 0
+        self.first_time: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self._time_key = None
+        self._time_value = 0.0
+
+    # ----------------------------------------------------------------- input
+
+    def feed_line(self, line: str):
+        """Parse one NDJSON line and fold it in"""
+        self.lines += 1
+        line = line.strip()
+        if not line:
+            return
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            self.skipped += 1
+            return
+
+        kind = record.get("type")
+        data = record.get("data") or {}
+        if kind == "Point":
+            self.add_point(record.get("metric"), data.get("value"), data.get("time"), data.get("tags"))
+        elif kind == "Metric":
+            name = data.get("name") or record.get("metric")
+            self.metric_types[name] = data.get("type", "trend")
+            self.metric_contains[name] = data.get("contains", "default")
+        else:
+            self.skipped += 1
+
+    def feed(self, lines: Iterable[str]) -> "K6StreamAggregator":
+        """Fold an iterable of lines (a file object, a follow() generator, ...)"""
+        for line in lines:
+            self.feed_line(line)
+        self.flush()
+        return self
+
+    def add_point(self, metric: str, value: Any, timestamp: Optional[str], tags: Optional[Dict[str, str]]):
+        """
+        Buffer one metric sample
+
+        Args:
+            metric: Metric name
+            value: Sample value
+            timestamp: RFC 3339 time of the sample
+            tags: Sample tags
+        """
+        if metric is None or value is None:
+            self.skipped += 1
+            return
+        tags = tags or {}
+        key = (metric, tuple(map(tags.get, self.tag_keys)))
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = ([], [])
+        pending[0].append(value)
+        pending[1].append(self._epoch(timestamp) if timestamp else math.nan)
+        self.points += 1
+        self._pending_points += 1
+        if self._pending_points >= FLUSH_POINTS:
+            self.flush()
+
+    def flush(self):
+        """Fold all buffered points into the aggregates"""
+        by_metric: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {}
+        for (metric, tag_values), (values, epochs) in self._pending.items():
+            values = np.asarray(values, dtype=np.float64)
+            epochs = np.asarray(epochs, dtype=np.float64)
+            self._aggregate(metric, tag_values).add_many(values, float(np.nanmax(epochs, initial=-math.inf)))
+            self._record_timeline(metric, tag_values, values, epochs)
+            by_metric.setdefault(metric, []).append((values, epochs))
+        self._pending = {}
+        self._pending_points = 0
+
+        for metric, parts in by_metric.items():
+            values = np.concatenate([part[0] for part in parts])
+            epochs = np.concatenate([part[1] for part in parts])
+            timed = ~np.isnan(epochs)
+            if timed.any():
+                self._fold_buckets(metric, values[timed], epochs[timed])
+
+    def _endpoint(self, tag_values: Tuple) -> Optional[str]:
+        """Endpoint label ("METHOD name") of a series, None when it has no name tag"""
+        if self._name_index is None or not tag_values[self._name_index]:
+            return None
+        method = tag_values[self._method_index] if self._method_index is not None else None
+        return f"{method or 'GET'} {tag_values[self._name_index]}"
+
+    def _record_timeline(self, metric: str, tag_values: Tuple, values: np.ndarray, epochs: np.ndarray):
+        timed = ~np.isnan(epochs)
+        if not timed.any():
+            return
+        if metric == "vus":
+            self.timeline.record_vus(epochs[timed], values[timed])
+            return
+        endpoint = self._endpoint(tag_values) if metric in ("http_req_duration", "http_req_failed") else None
+        if endpoint is None:
+            return
+        if metric == "http_req_duration":
+            self.timeline.record_many(epochs[timed], endpoint, values[timed])
+        else:
+            self.timeline.record_errors(epochs[timed], endpoint, values[timed])
+
+    def _aggregate(self, metric: str, tag_values: Tuple) -> MetricAggregate:
+        key = (metric, tag_values)
+        aggregate = self.series.get(key)
+        if aggregate is None:
+            if self._series_per_metric.get(metric, 0) >= self.max_series:
+                key = (metric, self._overflow)
+                aggregate = self.series.get(key)
+            if aggregate is None:
+                aggregate = self.series[key] = MetricAggregate(self.metric_types.setdefault(metric, "trend"))
+                self._series_per_metric[metric] = self._series_per_metric.get(metric, 0) + 1
+        return aggregate
+
+    def _epoch(self, timestamp: str) -> float:
+        # Points arrive roughly in time order, so cache the whole-second part
+        # and only parse the fractional part for every line.
+        # k6 writes RFC 3339 with nanoseconds: 2024-05-09T14:34:45.625742514+02:00,
+        # dropping a zero fraction: 2024-05-09T14:34:45+02:00
+        if timestamp.endswith("Z"):
+            body, zone = timestamp[:-1], "Z"
+        elif len(timestamp) > 19 and timestamp[-6] in "+-" and timestamp[-3] == ":":
+            body, zone = timestamp[:-6], timestamp[-6:]
+        else:
+            body, zone = timestamp, ""
+        base = body[:19]
+        fraction = float("0" + body[19:]) if len(body) > 20 else 0.0
+        key = base + zone
+        if key != self._time_key:
+            parsed = datetime.strptime(base, "%Y-%m-%dT%H:%M:%S")
+            seconds = calendar.timegm(parsed.timetuple())
+            if zone and zone != "Z":
+                sign = -1 if zone[0] == "-" else 1
+                hours, minutes = zone[1:].split(":")
+                seconds -= sign * (int(hours) * 3600 + int(minutes) * 60)
+            self._time_key = key
+            self._time_value = float(seconds)
+        return self._time_value + fraction
+
+    def _fold_buckets(self, metric: str, values: np.ndarray, epochs: np.ndarray):
+        first, last = float(epochs.min()), float(epochs.max())
+        self.first_time = first if self.first_time is None else min(self.first_time, first)
+        self.last_time = last if self.last_time is None else max(self.last_time, last)
+
+        starts = (epochs // self.bucket_seconds).astype(np.int64) * self.bucket_seconds
+        order = np.argsort(starts, kind="stable")
+        starts, values = starts[order], values[order]
+        unique, offsets = np.unique(starts, return_index=True)
+        counts = np.diff(np.append(offsets, starts.size))
+        sums = np.add.reduceat(values, offsets)
+        mins = np.minimum.reduceat(values, offsets)
+        maxs = np.maximum.reduceat(values, offsets)
+
+        buckets = self.buckets.setdefault(metric, {})
+        for i, start in enumerate(unique.tolist()):
+            bucket = buckets.get(start)
+            if bucket is None:
+                buckets[start] = [int(counts[i]), float(sums[i]), float(mins[i]), float(maxs[i])]
+            else:
+                bucket[0] += int(counts[i])
+                bucket[1] += float(sums[i])
+                bucket[2] = min(bucket[2], float(mins[i]))
+                bucket[3] = max(bucket[3], float(maxs[i]))
+
+        if metric in self.bucket_histograms:
+            for i, start in enumerate(unique.tolist()):
+                end = offsets[i] + counts[i]
+                self._bucket_histogram(metric, start).record_many(values[offsets[i]:end])
+            self._compact(metric, int(unique[-1]) - LATENESS_SECONDS)
+
+    def _bucket_histogram(self, metric: str, start: int) -> LatencyHistogram:
+        live = self.open_histograms.setdefault(metric, {})
+        histogram = live.get(start)
+        if histogram is None:
+            closed = self.closed_histograms.setdefault(metric, {})
+            if start in closed:
+                # Late points for a compacted bucket: reopen it
+                histogram = LatencyHistogram.from_bytes(closed.pop(start))
+            else:
+                histogram = LatencyHistogram()
+            live[start] = histogram
+        return histogram
+
+    def _compact(self, metric: str, horizon: int):
+        """Serialize bucket histograms older than the horizon to compressed blobs"""
+        live = self.open_histograms.get(metric, {})
+        closed = self.closed_histograms.setdefault(metric, {})
+        for start in [s for s in live if s < horizon]:
+            closed[start] = live.pop(start).to_bytes()
+
+    # ---------------------------------------------------------------- output
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the first and last sample"""
+        if self.first_time is None:
+            return 0.0
+        return max(self.last_time - self.first_time, 1e-9)
+
+    def bucket_histograms_for(self, metric: str) -> Dict[int, LatencyHistogram]:
+        """All per-bucket histograms of a metric, keyed by bucket start (epoch seconds)"""
+        self.flush()
+        histograms = {
+            start: LatencyHistogram.from_bytes(blob)
+            for start, blob in self.closed_histograms.get(metric, {}).items()
+        }
+        histograms.update(self.open_histograms.get(metric, {}))
+        return dict(sorted(histograms.items()))
+
+    def timeseries(self, metric: str) -> List[Dict[str, float]]:
+        """Per-bucket count, sum, min, max (and p95 when a histogram is kept) of a metric"""
+        self.flush()
+        histograms = self.bucket_histograms_for(metric) if metric in self.bucket_histograms else {}
+        rows = []
+        for start, (count, total, minimum, maximum) in sorted(self.buckets.get(metric, {}).items()):
+            row = {"time": start, "count": count, "sum": total, "min": minimum, "max": maximum}
+            if start in histograms:
+                row["p95"] = histograms[start].percentile(95)
+            rows.append(row)
+        return rows
+
+    def rollup(self, group_by) -> Dict[Any, MetricAggregate]:
+        """
+        Merge series aggregates by a grouping key
+
+        Args:
+            group_by: Callable (metric, tag values) -> key, or None to skip the series
+
+        Returns:
+            Merged aggregate per key
+        """
+        self.flush()
+        merged: Dict[Any, MetricAggregate] = {}
+        for (metric, tag_values), aggregate in self.series.items():
+            key = group_by(metric, tag_values)
+            if key is None:
+                continue
+            if key not in merged:
+                merged[key] = MetricAggregate(aggregate.kind)
+            merged[key].merge(aggregate)
+        return merged
+
+    def metrics(self) -> Dict[str, MetricAggregate]:
+        """Aggregate of every metric across all tag values"""
+        return self.rollup(lambda metric, tag_values: metric)
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact k6-style summary of everything ingested so far"""
+        self.flush()
+        duration = self.duration
+        metrics = {}
+        histograms = {}
+        for name, aggregate in sorted(self.metrics().items()):
+            metrics[name] = {
+                "type": aggregate.kind,
+                "contains": self.metric_contains.get(name, "default"),
+                "values": aggregate.values(duration),
+            }
+            if aggregate.histogram is not None:
+                histograms[name] = aggregate.histogram.to_base64()
+
+        tags = {}
+        for index, tag in enumerate(self.tag_keys):
+            per_tag = self.rollup(
+                lambda metric, tag_values: (metric, tag_values[index]) if tag_values[index] else None
+            )
+            for (metric, tag_value), aggregate in sorted(per_tag.items()):
+                tags.setdefault(metric, {}).setdefault(tag, {})[tag_value] = aggregate.values(duration)
+
+        endpoints = {}
+        if self._name_index is not None:
+
+            def endpoint(metric, tag_values):
+                name = self._endpoint(tag_values) if metric.startswith("http_req") else None
+                return (name, metric) if name else None
+
+            per_endpoint = {}
+            for (name, metric), aggregate in self.rollup(endpoint).items():
+                per_endpoint.setdefault(name, {})[metric] = aggregate
+
+            for name, series in sorted(per_endpoint.items()):
+                requests = series.get("http_reqs")
+                failed = series.get("http_req_failed")
+                timing = series.get("http_req_duration")
+                endpoints[name] = {
+                    "count": int(requests.sum) if requests else (timing.count if timing else 0),
+                    "failed": failed.passes if failed else 0,
+                }
+                if timing is not None and timing.histogram is not None:
+                    endpoints[name]["http_req_duration"] = timing.values(duration)
+                    endpoints[name]["histogram"] = timing.histogram.to_base64()
+
+        return {
+            "metrics": metrics,
+            "endpoints": endpoints,
+            "histograms": histograms,
+            "tags": tags,
+            "timeseries": {metric: self.timeseries(metric) for metric in sorted(self.buckets)},
+            "state": {"testRunDurationMs": duration * 1000.0},
+            "source": {
+                "lines": self.lines,
+                "points": self.points,
+                "skipped": self.skipped,
+                "bucket_seconds": self.bucket_seconds,
+                "first_time": self.first_time,
+                "last_time": self.last_time,
+            },
+        }
+
+
+def open_results(path: str):
+    """Open a k6 NDJSON file, transparently decompressing .gz"""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Yield the lines of a finished results file"""
+    with open_results(path) as f:
+        yield from f
+
+
+def follow(path: str, poll_interval: float = 0.5, idle_timeout: Optional[float] = 30.0) -> Iterator[str]:
+    """
+    Tail a results file that k6 is still writing
+
+    Waits for the file to appear, yields only complete lines and stops once
+    no new data has arrived for ``idle_timeout`` seconds.
+
+    Args:
+        path: NDJSON file
+        poll_interval: Seconds between polls at end of file
+        idle_timeout: Seconds without new data before giving up (None = forever)
+    """
+    last_data = time.monotonic()
+    while not os.path.exists(path):
+        if idle_timeout is not None and time.monotonic() - last_data > idle_timeout:
+            return
+        time.sleep(poll_interval)
+
+    with open(path, "r", encoding="utf-8") as f:
+        pending = ""
+        while True:
+            chunk = f.readline()
+            if chunk:
+                last_data = time.monotonic()
+                pending += chunk
+                if pending.endswith("\n"):
+                    yield pending
+                    pending = ""
+                continue
+            if idle_timeout is not None and time.monotonic() - last_data > idle_timeout:
+                if pending:
+                    yield pending
+                return
+            time.sleep(poll_interval)
+
+
+def ingest_file(path: str, **options) -> K6StreamAggregator:
+    """
+    Ingest a finished k6 NDJSON file
+
+    Args:
+        path: NDJSON file (optionally .gz)
+        **options: K6StreamAggregator keyword arguments
+
+    Returns:
+        Populated aggregator
+    """
+    return K6StreamAggregator(**options).feed(read_lines(path))
+
+
+def write_summary(summary: Dict[str, Any], output: str):
+    """Write a summary atomically so readers never see a partial file"""
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    temp = f"{output}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    os.replace(temp, output)
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Stream k6 NDJSON results into a compact summary")
+    parser.add_argument("input", help="k6 --out json file (NDJSON, optionally .gz)")
+    parser.add_argument("--scenario", default=None, help="Scenario name (baseline, stress, spike)")
+    parser.add_argument("--output", default=None, help="Summary JSON path")
+    parser.add_argument("--follow", action="store_true", help="Tail the file while k6 is writing it")
+    parser.add_argument("--idle-timeout", type=float, default=30.0, help="Seconds without data before --follow stops")
+    parser.add_argument("--write-interval", type=float, default=10.0, help="Seconds between summary writes in --follow mode")
+    parser.add_argument("--bucket-seconds", type=int, default=1, help="Width of the time buckets")
+    parser.add_argument("--tags", nargs="+", default=list(DEFAULT_TAG_KEYS), help="Tags to break metrics down by")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="Time-series store directory")
+    parser.add_argument("--no-store", action="store_true", help="Do not write the per-second timeline")
+    parser.add_argument("--dashboard", action="store_true", help="Serve a live metrics dashboard (with --follow)")
+    parser.add_argument("--dashboard-port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--thresholds", action="store_true", help="Evaluate performance_thresholds over sliding windows and write a verdict"
+    )
+    args = parser.parse_args()
+    if args.dashboard and not args.follow:
+        parser.error("--dashboard requires --follow")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    scenario = args.scenario or Path(args.input).name.replace("load_test_", "").split("_")[0]
+    output = args.output or f"reports/{scenario}_stream_summary.json"
+
+    aggregator = K6StreamAggregator(tag_keys=args.tags, bucket_seconds=args.bucket_seconds)
+    # k6 cannot be stopped from here, so failures after the grace period are only reported
+    evaluator = ThresholdEvaluator.from_config(scenario=scenario, abort=False) if args.thresholds else None
+    started = time.monotonic()
+    if args.follow:
+        print(f"📡 Following {args.input} (idle timeout {args.idle_timeout:.0f}s)")
+        dashboard = LiveDashboard(port=args.dashboard_port).start_in_thread() if args.dashboard else None
+        if dashboard:
+            print(f"📊 Live dashboard: {dashboard.url}")
+        last_write = last_publish = time.monotonic()
+        try:
+            for line in follow(args.input, idle_timeout=args.idle_timeout):
+                aggregator.feed_line(line)
+                if (dashboard or evaluator) and time.monotonic() - last_publish >= 1.0:
+                    # k6 sample times, not the local clock, decide which seconds are complete
+                    aggregator.flush()
+                    if aggregator.last_time is not None:
+                        if dashboard:
+                            dashboard.publish_timeline(aggregator.timeline, now=aggregator.last_time)
+                        if evaluator:
+                            evaluator.observe(aggregator.timeline, now=aggregator.last_time)
+                    last_publish = time.monotonic()
+                if time.monotonic() - last_write >= args.write_interval:
+                    write_summary(aggregator.summary(), output)
+                    last_write = time.monotonic()
+        finally:
+            if dashboard:
+                dashboard.stop()
+    else:
+        print(f"📥 Ingesting {args.input}")
+        aggregator.feed(read_lines(args.input))
+    if evaluator and aggregator.last_time is not None:
+        # Evaluate the windows not seen while following (all of them for a finished file)
+        evaluator.observe(aggregator.timeline, now=aggregator.last_time + evaluator.cursor.delay + 2)
+
+    summary = aggregator.summary()
+    summary["scenario"] = scenario
+    if not args.no_store and len(aggregator.timeline):
+        store = TimeSeriesStore(args.store)
+        summary["timeseries_segment"] = store.write_run(
+            aggregator.timeline, scenario, source="k6", extra={"input": args.input}
+        )
+        store.downsample()
+    write_summary(summary, output)
+    if evaluator:
+        verdict = evaluator.verdict(summary, scenario)
+        write_verdict(verdict, verdict_path(scenario))
+        print(f"{'✅' if verdict['passed'] else '❌'} Thresholds {'passed' if verdict['passed'] else 'failed'}, "
+              f"verdict written to {verdict_path(scenario)}")
+
+    elapsed = time.monotonic() - started
+    print(f"✅ {aggregator.points:,} points from {aggregator.lines:,} lines in {elapsed:.1f}s "
+          f"({aggregator.skipped} skipped), summary written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Mergeable HDR-style latency histogram backed by a NumPy array
+
+Values are recorded in milliseconds and stored as integer microseconds in
+log-linear buckets (HdrHistogram layout), so memory is fixed regardless of
+how many samples are recorded and the relative error is bounded by the
+number of significant figures. Histograms with the same layout merge by
+adding their count arrays, which makes percentiles combinable across
+workers, time windows and runs.
+"""
+
+import base64
+import math
+import struct
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+_MAGIC = b"HDRH"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBxxqqqddd")
+
+DEFAULT_HIGHEST_MS = 3_600_000  # one hour
+DEFAULT_SIGNIFICANT_FIGURES = 2
+UNITS_PER_MS = 1000  # microsecond resolution
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with record, merge and percentile operations"""
+
+    def __init__(
+        self,
+        highest_ms: float = DEFAULT_HIGHEST_MS,
+        significant_figures: int = DEFAULT_SIGNIFICANT_FIGURES,
+        counts: Optional[np.ndarray] = None,
+    ):
+        """
+        Initialize an empty histogram
+
+        Args:
+            highest_ms: Largest trackable latency; larger values are clamped
+            significant_figures: Decimal precision of bucket boundaries (1-5)
+            counts: Optional preallocated int64 array (e.g. over shared memory)
+        """
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+
+        self.significant_figures = significant_figures
+        self.highest = max(int(highest_ms * UNITS_PER_MS), 2)
+
+        largest_single_unit = 2 * 10**significant_figures
+        self.sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self.sub_bucket_half_count_magnitude = self.sub_bucket_count_magnitude - 1
+        self.sub_bucket_count = 1 << self.sub_bucket_count_magnitude
+        self.sub_bucket_half_count = self.sub_bucket_count >> 1
+        self.sub_bucket_mask = self.sub_bucket_count - 1
+
+        smallest_untrackable = self.sub_bucket_count
+        bucket_count = 1
+        while smallest_untrackable <= self.highest:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self.bucket_count = bucket_count
+        self.counts_length = (bucket_count + 1) * self.sub_bucket_half_count
+
+        if counts is None:
+            counts = np.zeros(self.counts_length, dtype=np.int64)
+        elif counts.shape != (self.counts_length,) or counts.dtype != np.int64:
+            raise ValueError("counts array does not match the histogram layout")
+        self.counts = counts
+
+        self.total_count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    # ------------------------------------------------------------------ layout
+
+    def _indices(self, units: np.ndarray) -> np.ndarray:
+        """Vectorised HdrHistogram counts index for integer unit values"""
+        masked = units | self.sub_bucket_mask
+        # frexp exponent equals the bit length for integers below 2**53
+        bit_length = np.frexp(masked.astype(np.float64))[1].astype(np.int64)
+        bucket = bit_length - (self.sub_bucket_half_count_magnitude + 1)
+        sub_bucket = units >> bucket
+        return ((bucket + 1) << self.sub_bucket_half_count_magnitude) + (
+            sub_bucket - self.sub_bucket_half_count
+        )
+
+    def _index(self, units: int) -> int:
+        bucket = (units | self.sub_bucket_mask).bit_length() - (self.sub_bucket_half_count_magnitude + 1)
+        sub_bucket = units >> bucket
+        return ((bucket + 1) << self.sub_bucket_half_count_magnitude) + (
+            sub_bucket - self.sub_bucket_half_count
+        )
+
+    def _bucket_bounds(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Lowest and highest equivalent unit values of each counts index"""
+        bucket = (indices >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket = (indices & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        first = bucket < 0
+        sub_bucket = np.where(first, sub_bucket - self.sub_bucket_half_count, sub_bucket)
+        bucket = np.where(first, 0, bucket)
+        lowest = sub_bucket << bucket
+        return lowest, lowest + (np.int64(1) << bucket) - 1
+
+    # ----------------------------------------------------------------- record
+
+    def record(self, value_ms: float, count: int = 1):
+        """
+        Record a latency
+
+        Args:
+            value_ms: Latency in milliseconds
+            count: Number of occurrences
+        """
+        value_ms = max(float(value_ms), 0.0)
+        units = min(int(value_ms * UNITS_PER_MS), self.highest)
+        self.counts[self._index(units)] += count
+        self.total_count += count
+        self.sum += value_ms * count
+        if value_ms < self.min:
+            self.min = value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def record_many(self, values_ms: Iterable[float]):
+        """
+        Record many latencies at once
+
+        Args:
+            values_ms: Latencies in milliseconds
+        """
+        values = np.clip(np.asarray(values_ms, dtype=np.float64), 0.0, None)
+        if not values.size:
+            return
+        units = np.minimum((values * UNITS_PER_MS).astype(np.int64), self.highest)
+        self.counts += np.bincount(self._indices(units), minlength=self.counts_length)
+        self.total_count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """
+        Add another histogram with the same layout into this one
+
+        Args:
+            other: Histogram to merge
+
+        Returns:
+            This histogram
+        """
+        if other.counts_length != self.counts_length or other.significant_figures != self.significant_figures:
+            raise ValueError("Cannot merge histograms with different layouts")
+        self.counts += other.counts
+        self.total_count += other.total_count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self) -> "LatencyHistogram":
+        """Independent copy of this histogram"""
+        clone = LatencyHistogram(self.highest / UNITS_PER_MS, self.significant_figures, self.counts.copy())
+        clone.total_count, clone.sum, clone.min, clone.max = self.total_count, self.sum, self.min, self.max
+        return clone
+
+    def reset(self):
+        """Clear all recorded values"""
+        self.counts[:] = 0
+        self.total_count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    # ------------------------------------------------------------- statistics
+
+    @property
+    def mean(self) -> float:
+        """Exact arithmetic mean in milliseconds"""
+        return self.sum / self.total_count if self.total_count else 0.0
+
+    def percentiles(self, percentiles: Iterable[float]) -> Dict[float, float]:
+        """
+        Values at several percentiles with one pass over the counts
+
+        Args:
+            percentiles: Percentiles between 0 and 100
+
+        Returns:
+            Mapping of percentile to latency in milliseconds
+        """
+        percentiles = list(percentiles)
+        if not self.total_count:
+            return {p: 0.0 for p in percentiles}
+
+        cumulative = np.cumsum(self.counts)
+        results = {}
+        for p in percentiles:
+            if p <= 0:
+                results[p] = self.min
+                continue
+            if p >= 100:
+                results[p] = self.max
+                continue
+            rank = max(int(math.ceil(p / 100.0 * self.total_count)), 1)
+            index = int(np.searchsorted(cumulative, rank))
+            _, highest = self._bucket_bounds(np.array([index], dtype=np.int64))
+            value = float(highest[0]) / UNITS_PER_MS
+            results[p] = min(max(value, self.min), self.max)
+        return results
+
+    def percentile(self, percentile: float) -> float:
+        """Latency in milliseconds at a percentile (0-100)"""
+        return self.percentiles([percentile])[percentile]
+
+    def values(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Non-empty buckets as (representative latency in ms, count) arrays
+
+        The representative value is the bucket midpoint, suitable for
+        resampling and rank-based statistics.
+        """
+        indices = np.flatnonzero(self.counts)
+        lowest, highest = self._bucket_bounds(indices.astype(np.int64))
+        midpoints = (lowest + highest) / 2.0 / UNITS_PER_MS
+        return midpoints, self.counts[indices].copy()
+
+    @property
+    def stddev(self) -> float:
+        """Standard deviation estimated from bucket midpoints"""
+        if not self.total_count:
+            return 0.0
+        midpoints, counts = self.values()
+        variance = float(np.sum(counts * (midpoints - self.mean) ** 2)) / self.total_count
+        return math.sqrt(variance)
+
+    def summary(self) -> Dict[str, float]:
+        """Trend statistics in the same shape as a k6 summary"""
+        marks = self.percentiles([50, 90, 95, 99])
+        stats = {
+            "avg": self.mean,
+            "min": self.min if self.total_count else 0.0,
+            "med": marks[50],
+            "max": self.max,
+            "p(90)": marks[90],
+            "p(95)": marks[95],
+            "p(99)": marks[99],
+            "count": self.total_count,
+        }
+        stats["p95"] = stats["p(95)"]
+        stats["p99"] = stats["p(99)"]
+        return stats
+
+    # ---------------------------------------------------------- serialization
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary blob (header + zlib compressed counts)"""
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            self.significant_figures,
+            self.highest,
+            UNITS_PER_MS,
+            self.total_count,
+            self.sum,
+            self.min if self.total_count else 0.0,
+            self.max,
+        )
+        return header + zlib.compress(self.counts.astype("<i8").tobytes(), 6)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "LatencyHistogram":
+        """Deserialize a blob produced by to_bytes()"""
+        magic, version, figures, highest, units, total, total_sum, minimum, maximum = _HEADER.unpack_from(blob)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a latency histogram blob")
+        histogram = cls(highest / units, figures)
+        counts = np.frombuffer(zlib.decompress(blob[_HEADER.size :]), dtype="<i8")
+        histogram.counts[:] = counts
+        histogram.total_count = total
+        histogram.sum = total_sum
+        histogram.min = minimum if total else math.inf
+        histogram.max = maximum
+        return histogram
+
+    def to_base64(self) -> str:
+        """Serialized histogram as ASCII for embedding in JSON"""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def from_base64(cls, text: str) -> "LatencyHistogram":
+        """Inverse of to_base64()"""
+        return cls.from_bytes(base64.b64decode(text))
+
+    def __len__(self) -> int:
+        return self.total_count
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyHistogram(count={self.total_count}, p50={self.percentile(50):.2f}ms, "
+            f"p99={self.percentile(99):.2f}ms)"
+        )
+
+
+def merge_histograms(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    """
+    Merge any number of histograms into a new one
+
+    Args:
+        histograms: Histograms with the default layout
+
+    Returns:
+        Merged histogram (empty if none were given)
+    """
+    merged = LatencyHistogram()
+    for histogram in histograms:
+        merged.merge(histogram)
+    return merged
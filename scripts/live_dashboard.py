@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Live metrics dashboard for running load tests
+
+Serves a small web page that plots requests/s, p50/p95/p99 latency, error
+rate and active VUs per second while a run is in progress. The producer (the
+Python load engine or a k6 NDJSON tail) calls ``publish_timeline`` about once
+a second; each completed second is summarised from the run's timeline,
+encoded once and pushed to every viewer over Server-Sent Events.
+
+The server runs on its own event loop thread. Publishing only hands the
+encoded snapshot over to that loop, and every viewer has a bounded queue that
+drops its oldest snapshots when the browser falls behind, so viewers can
+never slow the load generator down.
+
+    python scripts/load_engine.py --scenario stress --dashboard
+    python scripts/k6_ingest.py reports/load_test_stress_results.json --follow --dashboard
+    open http://127.0.0.1:8765/
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.timeseries_store import TimelineCursor  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+# Seconds of history kept for viewers that connect mid-run
+HISTORY_SECONDS = 900
+
+# Snapshots buffered per viewer before the oldest are dropped
+VIEWER_QUEUE_SIZE = 30
+
+# Seconds a bucket is given to receive its last samples before it is published
+PUBLISH_DELAY = 2
+
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>SwiftAssess Live Load Test</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background-color: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px 30px; border-radius: 8px; margin-bottom: 20px; }
+        .summary { display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px; margin-bottom: 20px; }
+        .metric-card { background: #f8f9fa; padding: 15px; border-radius: 8px; text-align: center; border-left: 4px solid #007bff; }
+        .metric-value { font-size: 1.8em; font-weight: bold; color: #007bff; }
+        .metric-label { color: #6c757d; margin-top: 5px; }
+        .charts { display: grid; grid-template-columns: repeat(auto-fit, minmax(500px, 1fr)); gap: 20px; }
+        .chart { background: #f8f9fa; padding: 10px; border-radius: 8px; border: 1px solid #dee2e6; }
+        .chart h3 { margin: 0 0 5px 0; color: #495057; font-size: 1em; }
+        canvas { width: 100%; height: 180px; }
+        #status { float: right; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <span id="status">connecting...</span>
+            <h1>🚀 Live Load Test</h1>
+            <p id="elapsed">Waiting for data</p>
+        </div>
+        <div class="summary">
+            <div class="metric-card"><div class="metric-value" id="rps">-</div><div class="metric-label">Requests/s</div></div>
+            <div class="metric-card"><div class="metric-value" id="p50">-</div><div class="metric-label">p50 (ms)</div></div>
+            <div class="metric-card"><div class="metric-value" id="p95">-</div><div class="metric-label">p95 (ms)</div></div>
+            <div class="metric-card"><div class="metric-value" id="p99">-</div><div class="metric-label">p99 (ms)</div></div>
+            <div class="metric-card"><div class="metric-value" id="error_rate">-</div><div class="metric-label">Error Rate</div></div>
+            <div class="metric-card"><div class="metric-value" id="active_vus">-</div><div class="metric-label">Active VUs</div></div>
+        </div>
+        <div class="charts">
+            <div class="chart"><h3>Requests/s</h3><canvas id="chart-rps"></canvas></div>
+            <div class="chart"><h3>Latency p50 / p95 / p99 (ms)</h3><canvas id="chart-latency"></canvas></div>
+            <div class="chart"><h3>Error Rate (%)</h3><canvas id="chart-errors"></canvas></div>
+            <div class="chart"><h3>Active VUs</h3><canvas id="chart-vus"></canvas></div>
+        </div>
+    </div>
+    <script>
+        const WINDOW = 300;
+        const points = [];
+        const charts = [
+            ["chart-rps", [["rps", "#007bff"]]],
+            ["chart-latency", [["p50", "#28a745"], ["p95", "#ffc107"], ["p99", "#dc3545"]]],
+            ["chart-errors", [["error_pct", "#dc3545"]]],
+            ["chart-vus", [["active_vus", "#764ba2"]]],
+        ];
+
+        function draw(id, series) {
+            const canvas = document.getElementById(id);
+            const ctx = canvas.getContext("2d");
+            canvas.width = canvas.clientWidth;
+            canvas.height = canvas.clientHeight;
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+            let peak = 0;
+            for (const [key] of series) for (const p of points) peak = Math.max(peak, p[key]);
+            peak = peak || 1;
+            const step = canvas.width / Math.max(WINDOW - 1, 1);
+            const offset = WINDOW - points.length;
+            ctx.fillStyle = "#6c757d";
+            ctx.fillText(peak.toFixed(peak < 10 ? 2 : 0), 2, 10);
+            for (const [key, color] of series) {
+                ctx.strokeStyle = color;
+                ctx.lineWidth = 2;
+                ctx.beginPath();
+                points.forEach((p, i) => {
+                    const x = (offset + i) * step;
+                    const y = canvas.height - (p[key] / peak) * (canvas.height - 15);
+                    i ? ctx.lineTo(x, y) : ctx.moveTo(x, y);
+                });
+                ctx.stroke();
+            }
+        }
+
+        function add(snapshot) {
+            snapshot.error_pct = snapshot.error_rate * 100;
+            points.push(snapshot);
+            if (points.length > WINDOW) points.shift();
+        }
+
+        function render() {
+            const last = points[points.length - 1];
+            if (!last) return;
+            document.getElementById("rps").textContent = last.rps.toFixed(1);
+            document.getElementById("p50").textContent = last.p50.toFixed(0);
+            document.getElementById("p95").textContent = last.p95.toFixed(0);
+            document.getElementById("p99").textContent = last.p99.toFixed(0);
+            document.getElementById("error_rate").textContent = last.error_pct.toFixed(2) + "%";
+            document.getElementById("active_vus").textContent = last.active_vus;
+            document.getElementById("elapsed").textContent =
+                "Last second: " + new Date(last.time * 1000).toLocaleTimeString() +
+                " / " + last.total_requests + " requests so far";
+            for (const [id, series] of charts) draw(id, series);
+        }
+
+        const source = new EventSource("/events");
+        source.onopen = () => document.getElementById("status").textContent = "● live";
+        source.onerror = () => document.getElementById("status").textContent = "○ disconnected";
+        source.addEventListener("history", (event) => { JSON.parse(event.data).forEach(add); render(); });
+        source.onmessage = (event) => { add(JSON.parse(event.data)); render(); };
+    </script>
+</body>
+</html>
+"""
+
+
+def second_snapshot(timeline, start: int, total_requests: int = 0, active_vus: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Dashboard snapshot of one completed timeline bucket
+
+    Args:
+        timeline: TimelineRecorder of the run
+        start: Bucket start time
+        total_requests: Requests of the run so far (for the header)
+        active_vus: Current VU count (defaults to the bucket's recorded peak)
+
+    Returns:
+        Dict with time, rps, p50/p95/p99, error_rate and active_vus
+    """
+    window = timeline.window(start)
+    requests = window["requests"]
+    percentiles = window["histogram"].percentiles([50, 95, 99])
+    return {
+        "time": start,
+        "rps": requests / timeline.resolution,
+        "p50": percentiles[50],
+        "p95": percentiles[95],
+        "p99": percentiles[99],
+        "error_rate": window["errors"] / requests if requests else 0.0,
+        "active_vus": window["active_vus"] if active_vus is None else active_vus,
+        "total_requests": total_requests,
+    }
+
+
+class LiveDashboard:
+    """Asyncio HTTP server pushing per-second load snapshots to browsers over SSE"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, history: int = HISTORY_SECONDS):
+        """
+        Initialize the dashboard
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            history: Snapshots replayed to viewers that connect mid-run
+        """
+        self.host = host
+        self.port = port
+        self.history = deque(maxlen=history)
+        self.viewers: Set[asyncio.Queue] = set()
+        self.published = 0
+        self._cursor = TimelineCursor(PUBLISH_DELAY)
+        self._total_requests = 0
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """URL of the dashboard page"""
+        return f"http://{self.host}:{self.port}/"
+
+    def start_in_thread(self) -> "LiveDashboard":
+        """Run the server on a background event loop, away from the load generator's loop"""
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self._loop = loop
+            self._server = loop.run_until_complete(asyncio.start_server(self._handle_connection, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            loop.run_forever()
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="live-dashboard", daemon=True)
+        self._thread.start()
+        ready.wait()
+        logger.info(f"Live dashboard on {self.url}")
+        return self
+
+    def stop(self):
+        """Close all viewer streams and stop the server"""
+        if self._thread and self._loop:
+            self._loop.call_soon_threadsafe(self._close_viewers)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "LiveDashboard":
+        return self.start_in_thread()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # -------------------------------------------------------------- producer
+
+    def publish(self, snapshot: Dict[str, Any]):
+        """
+        Push one snapshot to every viewer (safe to call from any thread)
+
+        Args:
+            snapshot: JSON-serialisable snapshot
+        """
+        data = json.dumps(snapshot)
+        self.published += 1
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._broadcast, data)
+        else:
+            self.history.append(data)
+
+    def publish_timeline(
+        self,
+        timeline,
+        active_vus: Optional[int] = None,
+        now: Optional[float] = None,
+        delay: int = PUBLISH_DELAY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Publish every timeline bucket completed since the previous call
+
+        Args:
+            timeline: TimelineRecorder of the running test
+            active_vus: Current VU count for the newest bucket (None uses the recorded peak)
+            now: Current time on the timeline's clock (k6 sample times for a tail)
+            delay: Seconds a bucket is held back for late samples
+
+        Returns:
+            The published snapshots
+        """
+        self._cursor.delay = delay
+        starts = self._cursor.advance(timeline, now, limit=self.history.maxlen)
+        snapshots = []
+        for start in starts:
+            snapshot = second_snapshot(timeline, start, active_vus=active_vus if start == starts[-1] else None)
+            self._total_requests += snapshot["rps"] * timeline.resolution
+            snapshot["total_requests"] = int(self._total_requests)
+            self.publish(snapshot)
+            snapshots.append(snapshot)
+        return snapshots
+
+    def reset(self):
+        """Start a new run: forget the publish cursor and history"""
+        self._cursor = TimelineCursor(PUBLISH_DELAY)
+        self._total_requests = 0
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self.history.clear)
+        else:
+            self.history.clear()
+
+    # ------------------------------------------------------------ event loop
+
+    def _broadcast(self, data: str):
+        self.history.append(data)
+        for queue in self.viewers:
+            if queue.full():
+                queue.get_nowait()  # slow viewer: drop its oldest snapshot
+            queue.put_nowait(data)
+
+    def _close_viewers(self):
+        for queue in self.viewers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            path = urlsplit(parts[1]).path if len(parts) > 1 else ""
+            if path == "/events":
+                await self._stream(writer)
+            elif path == "/":
+                await self._respond(writer, 200, DASHBOARD_PAGE, "text/html")
+            elif path == "/snapshot":
+                await self._respond(writer, 200, "[" + ",".join(self.history) + "]", "application/json")
+            else:
+                await self._respond(writer, 404, "Not Found", "text/plain")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if not writer.transport.is_closing():
+                writer.close()
+
+    async def _respond(self, writer, status: int, payload: str, content_type: str):
+        body = payload.encode("utf-8")
+        reason = "OK" if status == 200 else "Not Found"
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+        )
+        writer.write(body)
+        await writer.drain()
+
+    async def _stream(self, writer):
+        queue = asyncio.Queue(maxsize=VIEWER_QUEUE_SIZE)
+        self.viewers.add(queue)
+        try:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                b"Connection: keep-alive\r\n\r\nretry: 2000\n\n"
+            )
+            writer.write(f"event: history\ndata: [{','.join(self.history)}]\n\n".encode("utf-8"))
+            await writer.drain()
+            while True:
+                data = await queue.get()
+                if data is None:
+                    break
+                writer.write(f"data: {data}\n\n".encode("utf-8"))
+                await writer.drain()
+        finally:
+            self.viewers.discard(queue)
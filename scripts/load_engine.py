@@ -0,0 +1,1072 @@
+#!/usr/bin/env python3
+"""
+Asyncio load engine for the SwiftAssess signup journey
+
+Runs the baseline, stress and spike stage profiles of the k6 scripts (or the
+``load_testing`` section of config/config.yaml) with every virtual user as a
+coroutine on pooled keep-alive httpx clients. Each VU repeats the k6 journey:
+GET /Signup, POST the form, GET /dashboard.
+
+Besides the closed-model ramping-VU executor, open-model arrival-rate
+executors start iterations on a fixed (or Poisson) schedule regardless of
+response times and measure latency from the intended start time, so a slow
+server cannot quietly lower the offered load (coordinated omission).
+
+    python scripts/load_engine.py --scenario baseline --base-url http://127.0.0.1:8089
+    python scripts/load_engine.py --executor constant-arrival-rate --rate 50 --duration 2m
+    python scripts/load_engine.py --scenario stress --dashboard   # live charts on :8765
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import ssl
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.identities import IdentityAllocator, scoped_run_id  # noqa: E402
+from scripts.latency_histogram import LatencyHistogram, merge_histograms  # noqa: E402
+from scripts.live_dashboard import DEFAULT_PORT, LiveDashboard  # noqa: E402
+from scripts.perf_config import load_config, parse_duration  # noqa: E402
+from scripts.thresholds import ThresholdEvaluator, verdict_path, write_verdict  # noqa: E402
+from scripts.timeseries_store import (  # noqa: E402
+    DEFAULT_STORE_DIR,
+    TimelineRecorder,
+    TimeSeriesStore,
+    new_run_id,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://app-stg.swiftassess.com"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# Same pool of users as the k6 scripts
+TEST_USERS = [
+    ("John", "Doe", "john.doe@example.com", "SecurePass123!"),
+    ("Jane", "Smith", "jane.smith@example.com", "TestPass456@"),
+    ("Bob", "Johnson", "bob.johnson@example.com", "MyPassword789#"),
+    ("Alice", "Brown", "alice.brown@example.com", "StrongPass123$"),
+    ("Charlie", "Wilson", "charlie.wilson@example.com", "SecureKey456%"),
+]
+
+
+@dataclass
+class Stage:
+    """One ramping stage: move linearly to ``target`` over ``duration`` seconds
+
+    ``target`` is a VU count for the ramping-VU executor and iterations per
+    second for the arrival-rate executors.
+    """
+
+    duration: float
+    target: float
+
+
+# Stage profiles and thresholds copied from options in tests/load/*.js
+STAGE_PROFILES = {
+    "baseline": [Stage(60, 10), Stage(300, 10), Stage(60, 0)],
+    "stress": [Stage(120, 100), Stage(120, 300), Stage(120, 500), Stage(600, 500), Stage(120, 0)],
+    "spike": [Stage(60, 10), Stage(30, 1000), Stage(120, 1000), Stage(60, 10), Stage(60, 0)],
+}
+
+SCENARIO_THRESHOLDS = {
+    "baseline": {"p95_ms": 2000, "error_rate": 0.01},
+    "stress": {"p95_ms": 5000, "error_rate": 0.05},
+    "spike": {"p95_ms": 10000, "error_rate": 0.10},
+}
+
+EXECUTORS = ("ramping-vus", "constant-arrival-rate", "ramping-arrival-rate")
+ARRIVAL_PROCESSES = ("constant", "poisson")
+
+# A k6 VU sleeps 4s per journey, so it completes at most ~0.25 iterations/s.
+# Used to translate the VU stage profiles into equivalent arrival rates.
+ITERATIONS_PER_VU_SECOND = 0.25
+
+# Seconds of timeline the coordinator merges for live snapshot callbacks
+LIVE_WINDOW_SECONDS = 5
+
+SCENARIO_NAMES = {
+    "baseline": "Baseline Load Test",
+    "stress": "Stress Test",
+    "spike": "Spike Test",
+}
+
+
+def stages_from_config(config: Dict[str, Any], scenario: str) -> List[Stage]:
+    """
+    Build ramp-up / steady / ramp-down stages from the load_testing config
+
+    Args:
+        config: Project configuration
+        scenario: Key of the load_testing section (baseline, stress, spike)
+
+    Returns:
+        List of stages
+    """
+    settings = config.get("load_testing", {}).get(scenario)
+    if not settings:
+        raise KeyError(f"No load_testing configuration for scenario: {scenario}")
+    users = int(settings["users"])
+    ramp_up = parse_duration(settings.get("ramp_up", 0))
+    return [
+        Stage(ramp_up, users),
+        Stage(parse_duration(settings["duration"]), users),
+        Stage(ramp_up, 0),
+    ]
+
+
+def scale_stages(stages: List[Stage], time_scale: float) -> List[Stage]:
+    """Compress or stretch stage durations (useful for short local runs)"""
+    return [Stage(stage.duration * time_scale, stage.target) for stage in stages]
+
+
+def rate_stages(stages: List[Stage], iterations_per_vu: float = ITERATIONS_PER_VU_SECOND) -> List[Stage]:
+    """Translate a ramping-VU profile into an arrival-rate profile (iterations per second)"""
+    return [Stage(stage.duration, stage.target * iterations_per_vu) for stage in stages]
+
+
+def arrival_offsets(
+    stages: List[Stage],
+    start_rate: float = 0.0,
+    poisson: bool = False,
+    rng: Optional[random.Random] = None,
+    phase: float = 0.0,
+) -> Iterator[float]:
+    """
+    Intended iteration start times of an open-model schedule
+
+    The rate moves linearly from ``start_rate`` through the stage targets.
+    Arrivals are placed where the expected cumulative count crosses
+    successive marks: evenly spaced marks for a fixed schedule, exponential
+    gaps for a Poisson process (time-rescaling of a unit-rate process).
+
+    Args:
+        stages: Rate stages (targets in iterations per second)
+        start_rate: Rate at the start of the first stage
+        poisson: Draw Poisson arrivals instead of a fixed schedule
+        rng: Random source for Poisson gaps
+        phase: Offset of the first mark in [0, 1) for fixed schedules
+
+    Yields:
+        Seconds since the start of the run, in increasing order
+    """
+    rng = rng or random.Random()
+    mark = rng.expovariate(1.0) if poisson else phase
+    cumulative = 0.0
+    offset = 0.0
+    rate = start_rate
+    for stage in stages:
+        end_rate = stage.target
+        if stage.duration <= 0:
+            rate = end_rate
+            continue
+        slope = (end_rate - rate) / stage.duration
+        area = (rate + end_rate) / 2.0 * stage.duration
+        while mark < cumulative + area:
+            remaining = mark - cumulative
+            if abs(slope) < 1e-12:
+                x = remaining / rate
+            else:
+                # Solve rate * x + slope * x^2 / 2 = remaining
+                x = (math.sqrt(max(rate * rate + 2.0 * slope * remaining, 0.0)) - rate) / slope
+            yield offset + min(x, stage.duration)
+            mark += rng.expovariate(1.0) if poisson else 1.0
+        cumulative += area
+        offset += stage.duration
+        rate = end_rate
+
+
+def target_vus(stages: List[Stage], elapsed: float) -> int:
+    """
+    Number of VUs the ramping schedule asks for at a point in time
+
+    Args:
+        stages: Stage list
+        elapsed: Seconds since the start of the run
+
+    Returns:
+        Target VU count (0 once all stages are complete)
+    """
+    previous = 0
+    start = 0.0
+    for stage in stages:
+        end = start + stage.duration
+        if elapsed < end:
+            if stage.duration <= 0:
+                return stage.target
+            progress = (elapsed - start) / stage.duration
+            return int(round(previous + (stage.target - previous) * progress))
+        previous = stage.target
+        start = end
+    return 0
+
+
+class LoadMetrics:
+    """Per-endpoint request counters, latency histograms and per-second timeline"""
+
+    def __init__(self):
+        self.requests = {}
+        self.failures = {}
+        self.latencies = {}
+        self.checks_passed = 0
+        self.checks_failed = 0
+        self.iterations = 0
+        self.dropped_iterations = 0
+        self.schedule_lag = LatencyHistogram()
+        self.timeline = TimelineRecorder()
+        self.active_vus = 0
+        self.vus_max = 0
+        self.started_at = time.time()
+        self.duration = 0.0
+
+    def record(self, name: str, duration_ms: Optional[float], failed: bool):
+        """
+        Record one HTTP request
+
+        Args:
+            name: Endpoint tag, e.g. "GET /Signup"
+            duration_ms: Request duration (None for transport errors)
+            failed: Whether the request counts towards http_req_failed
+        """
+        self.requests[name] = self.requests.get(name, 0) + 1
+        if failed:
+            self.failures[name] = self.failures.get(name, 0) + 1
+        if duration_ms is not None:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = LatencyHistogram()
+            histogram.record(duration_ms)
+        self.timeline.record(time.time(), name, duration_ms, failed, self.active_vus)
+
+    def record_check(self, passed: bool):
+        """Record the outcome of a k6 style check group"""
+        if passed:
+            self.checks_passed += 1
+        else:
+            self.checks_failed += 1
+
+    def merge(self, other: "LoadMetrics", timeline_since: Optional[float] = None):
+        """
+        Fold another worker's metrics into this one
+
+        Args:
+            other: Metrics to add
+            timeline_since: Only merge timeline buckets from this time on (live views)
+        """
+        for name, count in other.requests.items():
+            self.requests[name] = self.requests.get(name, 0) + count
+        for name, count in other.failures.items():
+            self.failures[name] = self.failures.get(name, 0) + count
+        for name, histogram in other.latencies.items():
+            self.latencies.setdefault(name, LatencyHistogram()).merge(histogram)
+        self.checks_passed += other.checks_passed
+        self.checks_failed += other.checks_failed
+        self.iterations += other.iterations
+        self.dropped_iterations += other.dropped_iterations
+        self.schedule_lag.merge(other.schedule_lag)
+        self.timeline.merge(other.timeline if timeline_since is None else other.timeline.tail(timeline_since))
+        self.active_vus += other.active_vus
+        self.vus_max += other.vus_max
+        self.started_at = min(self.started_at, other.started_at)
+        self.duration = max(self.duration, other.duration)
+
+    def snapshot(self, timeline_since: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Cumulative, picklable state sent from worker processes to the coordinator
+
+        Args:
+            timeline_since: Only include timeline buckets from this time on; older
+                buckets were already shipped and can no longer change
+        """
+        state = dict(self.__dict__)
+        state["latencies"] = {name: h.to_bytes() for name, h in self.latencies.items()}
+        state["schedule_lag"] = self.schedule_lag.to_bytes()
+        state["timeline"] = self.timeline.snapshot(timeline_since)
+        return state
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> "LoadMetrics":
+        """Rebuild metrics from snapshot()"""
+        metrics = cls()
+        metrics.__dict__.update(snapshot)
+        metrics.latencies = {
+            name: LatencyHistogram.from_bytes(blob) for name, blob in snapshot["latencies"].items()
+        }
+        metrics.schedule_lag = LatencyHistogram.from_bytes(snapshot["schedule_lag"])
+        metrics.timeline = TimelineRecorder.from_snapshot(snapshot["timeline"])
+        return metrics
+
+    @staticmethod
+    def _trend(histogram: Optional[LatencyHistogram]) -> Dict[str, float]:
+        stats = (histogram or LatencyHistogram()).summary()
+        stats.pop("count")
+        return stats
+
+    def summary(self) -> Dict[str, Any]:
+        """k6 handleSummary compatible summary of the run"""
+        total = sum(self.requests.values())
+        failed = sum(self.failures.values())
+        checks = self.checks_passed + self.checks_failed
+        duration = self.duration or 1e-9
+        all_latencies = merge_histograms(self.latencies.values())
+
+        endpoints = {}
+        for name, count in sorted(self.requests.items()):
+            endpoints[name] = {
+                "count": count,
+                "failed": self.failures.get(name, 0),
+                "http_req_duration": self._trend(self.latencies.get(name)),
+            }
+            if name in self.latencies:
+                endpoints[name]["histogram"] = self.latencies[name].to_base64()
+
+        summary = {
+            "metrics": {
+                "http_reqs": {"type": "counter", "values": {"count": total, "rate": total / duration}},
+                "http_req_failed": {
+                    "type": "rate",
+                    "values": {
+                        "rate": failed / total if total else 0.0,
+                        "passes": failed,
+                        "fails": total - failed,
+                        "count": failed,
+                    },
+                },
+                "http_req_duration": {"type": "trend", "values": self._trend(all_latencies)},
+                "errors": {
+                    "type": "rate",
+                    "values": {"rate": self.checks_failed / checks if checks else 0.0},
+                },
+                "iterations": {
+                    "type": "counter",
+                    "values": {"count": self.iterations, "rate": self.iterations / duration},
+                },
+                "vus_max": {"type": "gauge", "values": {"value": self.vus_max}},
+            },
+            "endpoints": endpoints,
+            "histograms": {"http_req_duration": all_latencies.to_base64()},
+            "state": {"testRunDurationMs": self.duration * 1000.0},
+        }
+        if self.dropped_iterations or self.schedule_lag.total_count:
+            summary["metrics"]["dropped_iterations"] = {
+                "type": "counter",
+                "values": {"count": self.dropped_iterations, "rate": self.dropped_iterations / duration},
+            }
+            summary["metrics"]["schedule_lag"] = {"type": "trend", "values": self._trend(self.schedule_lag)}
+        return summary
+
+
+def scenario_result(scenario: str, summary: Dict[str, Any], stages: List[Stage]) -> Dict[str, Any]:
+    """
+    Condense a summary into the result record used by the demo reports
+
+    Args:
+        scenario: Scenario key
+        summary: Output of LoadMetrics.summary()
+        stages: Stages that were executed
+
+    Returns:
+        Result dictionary (times in seconds, error rate in percent)
+    """
+    metrics = summary["metrics"]
+    duration = metrics["http_req_duration"]["values"]
+    error_rate = metrics["http_req_failed"]["values"]["rate"]
+    thresholds = SCENARIO_THRESHOLDS.get(scenario, SCENARIO_THRESHOLDS["baseline"])
+    passed = duration["p(95)"] < thresholds["p95_ms"] and error_rate < thresholds["error_rate"]
+    run_seconds = summary["state"]["testRunDurationMs"] / 1000.0
+    dropped = metrics.get("dropped_iterations", {}).get("values", {}).get("count", 0)
+    open_model = summary.get("engine", {}).get("executor", "ramping-vus") != "ramping-vus"
+
+    return {
+        "test_type": SCENARIO_NAMES.get(scenario, scenario.title()),
+        "users": metrics["vus_max"]["values"]["value"] if open_model else max(stage.target for stage in stages),
+        "duration": f"{run_seconds / 60:.1f} minutes",
+        "total_requests": metrics["http_reqs"]["values"]["count"],
+        "avg_response_time": round(duration["avg"] / 1000.0, 3),
+        "p95_response_time": round(duration["p(95)"] / 1000.0, 3),
+        "p99_response_time": round(duration["p(99)"] / 1000.0, 3),
+        "error_rate": round(error_rate * 100, 2),
+        "throughput": round(metrics["http_reqs"]["values"]["rate"], 1),
+        "dropped_iterations": dropped,
+        "status": "PASSED" if passed and not dropped else "WARNING",
+    }
+
+
+class LoadEngine:
+    """Ramping-VU executor with one coroutine per virtual user"""
+
+    def __init__(
+        self,
+        base_url: str,
+        stages: List[Stage],
+        think_time_scale: float = 1.0,
+        timeout: float = 60.0,
+        graceful_stop: float = 30.0,
+        seed: Optional[int] = None,
+        connections_per_client: int = 16,
+        stop_event=None,
+        worker: int = 0,
+        identity_run: Optional[str] = None,
+    ):
+        """
+        Initialize the engine
+
+        Args:
+            base_url: Target base URL (without /Signup)
+            stages: Ramping stages to execute
+            think_time_scale: Multiplier for the k6 sleep() think times
+            timeout: Per-request timeout in seconds
+            graceful_stop: Seconds running iterations may take after the last stage
+            seed: Seed for user selection
+            connections_per_client: VUs (and keep-alive connections) per pooled client
+            stop_event: threading or multiprocessing Event that ends the run early when set
+            worker: Worker process number, part of every signup email's identity
+            identity_run: Run part of every signup email's identity, shared by
+                the workers of one run (default: a new scoped_run_id, so two
+                engine runs of one process never repeat an email)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.stages = stages
+        self.think_time_scale = think_time_scale
+        self.timeout = timeout
+        self.graceful_stop = graceful_stop
+        self.connections_per_client = connections_per_client
+        self.rng = random.Random(seed)
+        self.identities = IdentityAllocator(run=identity_run or scoped_run_id(), worker=worker)
+        self.metrics = LoadMetrics()
+        self.stop_event = stop_event
+        self._target = 0
+        self._stopping = False
+
+    @property
+    def aborted(self) -> bool:
+        """Whether the run was stopped early through the stop event"""
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    @property
+    def max_vus(self) -> int:
+        """Peak VU count across all stages"""
+        return max((stage.target for stage in self.stages), default=0)
+
+    def _open_clients(self) -> List[httpx.AsyncClient]:
+        # httpcore scans its whole pool on every request, so one pool for 1000 VUs
+        # spends most of its time in pool bookkeeping. VUs are therefore sharded
+        # over small keep-alive pools that share a single SSL context.
+        per_client = self.connections_per_client
+        limits = httpx.Limits(max_connections=per_client, max_keepalive_connections=per_client)
+        ssl_context = ssl.create_default_context()
+        shards = max(int(math.ceil(self.max_vus / per_client)), 1)
+        return [
+            httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=limits,
+                timeout=self.timeout,
+                verify=ssl_context,
+                headers={"User-Agent": USER_AGENT},
+            )
+            for _ in range(shards)
+        ]
+
+    async def run(self) -> LoadMetrics:
+        """Execute all stages and return the collected metrics"""
+        total = sum(stage.duration for stage in self.stages)
+        loop = asyncio.get_running_loop()
+
+        async with contextlib.AsyncExitStack() as stack:
+            clients = [await stack.enter_async_context(c) for c in self._open_clients()]
+            start = loop.time()
+            tasks = {}
+            while True:
+                elapsed = loop.time() - start
+                if elapsed >= total or self.aborted:
+                    break
+                self._target = target_vus(self.stages, elapsed)
+                tasks = {vu_id: task for vu_id, task in tasks.items() if not task.done()}
+                for vu_id in range(1, self._target + 1):
+                    if vu_id not in tasks:
+                        client = clients[(vu_id - 1) // self.connections_per_client]
+                        tasks[vu_id] = asyncio.create_task(self._virtual_user(client, vu_id))
+                await asyncio.sleep(0.1)
+
+            self._target = 0
+            await self._drain(tasks.values())
+            self.metrics.duration = loop.time() - start
+        return self.metrics
+
+    async def _drain(self, tasks):
+        """Let running iterations finish within the graceful stop, then cancel them"""
+        self._stopping = True
+        pending = [task for task in tasks if not task.done()]
+        if pending:
+            _, still_running = await asyncio.wait(pending, timeout=self.graceful_stop)
+            for task in still_running:
+                task.cancel()
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+    async def _virtual_user(self, client: httpx.AsyncClient, vu_id: int):
+        metrics = self.metrics
+        metrics.active_vus += 1
+        metrics.vus_max = max(metrics.vus_max, metrics.active_vus)
+        try:
+            iteration = 0
+            while not self._stopping and vu_id <= self._target:
+                await self._iteration(client, vu_id, iteration)
+                self.metrics.iterations += 1
+                iteration += 1
+        finally:
+            metrics.active_vus -= 1
+
+    async def _request(self, client, method, path, name, intended=None, **kwargs):
+        # Open-model iterations time their first request from the scheduled
+        # start, so queueing behind a busy VU pool or event loop is counted.
+        started = time.perf_counter() if intended is None else intended
+        try:
+            response = await client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            logger.debug(f"{name} failed: {e}")
+            self.metrics.record(name, None, True)
+            return None, 0.0
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        self.metrics.record(name, duration_ms, response.status_code >= 400)
+        return response, duration_ms
+
+    async def _think(self, seconds: float):
+        if self.think_time_scale > 0:
+            await asyncio.sleep(seconds * self.think_time_scale)
+
+    def _signup_form(self, vu_id: int) -> Dict[str, str]:
+        first_name, last_name, email, password = self.rng.choice(TEST_USERS)
+        return {
+            "firstName": first_name,
+            "lastName": last_name,
+            "email": self.identities.email(email, vu=vu_id),
+            "password": password,
+            "confirmPassword": password,
+            "terms": "on",
+            "privacy": "on",
+        }
+
+    async def _iteration(
+        self, client: httpx.AsyncClient, vu_id: int, iteration: int, intended: Optional[float] = None
+    ):
+        # Test 1: Load signup page
+        page, duration = await self._request(
+            client, "GET", "/Signup", "GET /Signup", intended=intended
+        )
+        page_ok = (
+            page is not None
+            and page.status_code == 200
+            and ("firstName" in page.text or "signup" in page.text)
+            and duration < 2000
+        )
+        self.metrics.record_check(page_ok)
+        if not page_ok:
+            return
+
+        await self._think(1)
+
+        # Test 2: Submit signup form
+        signup, duration = await self._request(
+            client,
+            "POST",
+            "/Signup",
+            "POST /Signup",
+            data=self._signup_form(vu_id),
+            follow_redirects=False,
+        )
+        status = signup.status_code if signup is not None else 0
+        self.metrics.record_check(status in (200, 302) and duration < 3000 and status < 500)
+
+        await self._think(2)
+
+        # Test 3: Verify signup success
+        if status in (200, 302):
+            dashboard, duration = await self._request(client, "GET", "/dashboard", "GET /dashboard")
+            self.metrics.record_check(
+                dashboard is not None and dashboard.status_code == 200 and duration < 2000
+            )
+
+        await self._think(1)
+
+
+class ArrivalRateEngine(LoadEngine):
+    """Open-model executor: iterations start on a schedule, independent of response times"""
+
+    def __init__(
+        self,
+        base_url: str,
+        stages: List[Stage],
+        start_rate: Optional[float] = None,
+        arrival: str = "constant",
+        pre_allocated_vus: int = 50,
+        max_vus: Optional[int] = None,
+        phase: float = 0.0,
+        **kwargs,
+    ):
+        """
+        Initialize the engine
+
+        Args:
+            base_url: Target base URL (without /Signup)
+            stages: Rate stages, targets in iterations per second
+            start_rate: Rate at the start (defaults to the first stage target)
+            arrival: "constant" for a fixed schedule or "poisson"
+            pre_allocated_vus: VUs created up front
+            max_vus: VU budget; iterations beyond it are dropped
+            phase: Offset of the fixed schedule in [0, 1) (staggers worker processes)
+            **kwargs: LoadEngine keyword arguments
+        """
+        super().__init__(base_url, stages, **kwargs)
+        if arrival not in ARRIVAL_PROCESSES:
+            raise ValueError(f"Unknown arrival process: {arrival}")
+        if start_rate is None:
+            start_rate = stages[0].target if stages else 0.0
+        self.start_rate = start_rate
+        self.arrival = arrival
+        self.pre_allocated_vus = max(pre_allocated_vus, 1)
+        self.vu_budget = max(max_vus or self.pre_allocated_vus, self.pre_allocated_vus)
+        self.phase = phase
+        self._iterations_started = 0
+
+    @property
+    def max_vus(self) -> int:
+        """VU budget of the run"""
+        return self.vu_budget
+
+    async def run(self) -> LoadMetrics:
+        """Start iterations on schedule until the last stage ends"""
+        metrics = self.metrics
+        total = sum(stage.duration for stage in self.stages)
+        offsets = arrival_offsets(
+            self.stages, self.start_rate, self.arrival == "poisson", self.rng, self.phase
+        )
+
+        async with contextlib.AsyncExitStack() as stack:
+            clients = [await stack.enter_async_context(c) for c in self._open_clients()]
+            idle = list(range(self.pre_allocated_vus, 0, -1))
+            allocated = self.pre_allocated_vus
+            metrics.vus_max = allocated
+            tasks = set()
+            start = time.perf_counter()
+
+            for offset in offsets:
+                intended = start + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self.aborted:
+                    break
+
+                if idle:
+                    vu_id = idle.pop()
+                elif allocated < self.vu_budget:
+                    allocated += 1
+                    vu_id = allocated
+                    metrics.vus_max = allocated
+                else:
+                    metrics.dropped_iterations += 1
+                    continue
+
+                client = clients[(vu_id - 1) // self.connections_per_client]
+                task = asyncio.create_task(self._scheduled_iteration(client, vu_id, intended, idle))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            while not self.aborted and time.perf_counter() < start + total:
+                await asyncio.sleep(min(start + total - time.perf_counter(), 0.1))
+            await self._drain(list(tasks))
+            metrics.duration = time.perf_counter() - start
+        return metrics
+
+    async def _scheduled_iteration(self, client, vu_id: int, intended: float, idle: List[int]):
+        metrics = self.metrics
+        metrics.active_vus += 1
+        metrics.schedule_lag.record((time.perf_counter() - intended) * 1000.0)
+        iteration = self._iterations_started
+        self._iterations_started += 1
+        try:
+            await self._iteration(client, vu_id, iteration, intended=intended)
+            metrics.iterations += 1
+        finally:
+            metrics.active_vus -= 1
+            idle.append(vu_id)
+
+
+def partition_stages(stages: List[Stage], workers: int, index: int) -> List[Stage]:
+    """
+    Share of every stage target assigned to one worker process
+
+    Args:
+        stages: Full stage list
+        workers: Number of worker processes
+        index: Worker index (0-based)
+
+    Returns:
+        Stages whose targets sum to the original targets across all workers
+    """
+    partitioned = []
+    for stage in stages:
+        share, remainder = divmod(stage.target, workers)
+        partitioned.append(Stage(stage.duration, share + (1 if index < remainder else 0)))
+    return partitioned
+
+
+def _partition(executor: str, stages: List[Stage], options: Dict[str, Any], workers: int, index: int):
+    """Stages and engine options of one worker process"""
+    if executor == "ramping-vus":
+        return partition_stages(stages, workers, index), options
+
+    # Arrival rates and VU budgets split evenly; fixed schedules are phase
+    # shifted so the workers interleave instead of firing in lockstep.
+    options = dict(options, phase=index / workers)
+    if options.get("start_rate") is not None:
+        options["start_rate"] = options["start_rate"] / workers
+    for key in ("pre_allocated_vus", "max_vus"):
+        if options.get(key):
+            options[key] = max(int(math.ceil(options[key] / workers)), 1)
+    return [Stage(stage.duration, stage.target / workers) for stage in stages], options
+
+
+def _create_engine(executor: str, base_url: str, stages: List[Stage], **options) -> LoadEngine:
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}")
+    if executor == "ramping-vus":
+        return LoadEngine(base_url, stages, **options)
+    return ArrivalRateEngine(base_url, stages, **options)
+
+
+def _worker_main(index, executor, base_url, stages, options, queue, interval):
+    """Worker process: run one event loop and stream cumulative snapshots"""
+
+    async def run():
+        engine = _create_engine(executor, base_url, stages, worker=index, **options)
+        # Requests are bucketed at completion time, so buckets that ended before
+        # the previous report are final and need not be shipped again
+        shipped = None
+
+        def snapshot():
+            nonlocal shipped
+            since, shipped = shipped, time.time() - engine.metrics.timeline.resolution
+            return engine.metrics.snapshot(timeline_since=since)
+
+        async def report():
+            while True:
+                await asyncio.sleep(interval)
+                queue.put((index, False, snapshot()))
+
+        reporter = asyncio.create_task(report())
+        try:
+            await engine.run()
+        finally:
+            reporter.cancel()
+        queue.put((index, True, snapshot()))
+
+    try:
+        asyncio.run(run())
+    except BaseException:
+        queue.put((index, True, None))
+        raise
+
+
+def run_distributed(
+    base_url: str,
+    stages: List[Stage],
+    workers: int,
+    interval: float = 1.0,
+    on_snapshot=None,
+    executor: str = "ramping-vus",
+    **options,
+) -> LoadMetrics:
+    """
+    Fan the VUs of a run out over worker processes, one event loop per core
+
+    Workers ship cumulative metric snapshots (counters plus non-empty latency
+    buckets) every ``interval`` seconds instead of per-request records; the
+    coordinator keeps the latest snapshot per worker and merges them. Timeline
+    buckets are shipped incrementally and kept per worker.
+
+    Args:
+        base_url: Target base URL
+        stages: Full stage list (partitioned across workers)
+        workers: Number of worker processes
+        interval: Seconds between worker snapshots
+        on_snapshot: Optional callback receiving the merged LoadMetrics after each snapshot
+            (its timeline only holds the last LIVE_WINDOW_SECONDS)
+        executor: ramping-vus, constant-arrival-rate or ramping-arrival-rate
+        **options: Extra engine keyword arguments
+
+    Returns:
+        Merged metrics of all workers
+    """
+    # One identity run for all workers, fresh for every call
+    options = dict(options, identity_run=options.get("identity_run") or scoped_run_id())
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    processes = []
+    for index in range(workers):
+        worker_stages, worker_options = _partition(executor, stages, options, workers, index)
+        process = context.Process(
+            target=_worker_main,
+            args=(index, executor, base_url, worker_stages, worker_options, queue, interval),
+            name=f"load-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+
+    latest = {}
+    timelines = {}
+    finished = set()
+    while len(finished) < workers:
+        index, done, snapshot = queue.get()
+        if snapshot is None:
+            raise RuntimeError(f"Load worker {index} failed")
+        metrics = latest[index] = LoadMetrics.from_snapshot(snapshot)
+        metrics.timeline = timelines.setdefault(index, TimelineRecorder()).update(metrics.timeline)
+        if done:
+            finished.add(index)
+        if on_snapshot:
+            on_snapshot(_merge_metrics(latest.values(), time.time() - LIVE_WINDOW_SECONDS))
+
+    for process in processes:
+        process.join()
+    return _merge_metrics(latest.values())
+
+
+def _merge_metrics(parts, timeline_since: Optional[float] = None) -> LoadMetrics:
+    merged = LoadMetrics()
+    merged.started_at = math.inf
+    for part in parts:
+        merged.merge(part, timeline_since)
+    return merged
+
+
+async def _monitored(engine: LoadEngine, on_snapshot, interval: float) -> LoadMetrics:
+    """Run an engine in-process, handing its live metrics to on_snapshot every interval"""
+
+    async def report():
+        while True:
+            await asyncio.sleep(interval)
+            on_snapshot(engine.metrics)
+
+    reporter = asyncio.create_task(report())
+    try:
+        return await engine.run()
+    finally:
+        reporter.cancel()
+
+
+def scenario_stages(scenario: str, executor: str = "ramping-vus") -> List[Stage]:
+    """
+    Default stages of a scenario for an executor
+
+    Arrival-rate executors reuse the shape of the k6 VU profile, converted to
+    the iteration rate those VUs would offer (ITERATIONS_PER_VU_SECOND each);
+    the constant executor holds the peak rate for the whole profile.
+    """
+    stages = STAGE_PROFILES[scenario]
+    if executor == "ramping-vus":
+        return stages
+    stages = rate_stages(stages)
+    if executor == "constant-arrival-rate":
+        return [Stage(sum(s.duration for s in stages), max(s.target for s in stages))]
+    return stages
+
+
+def run_scenario(
+    scenario: str,
+    base_url: str = DEFAULT_BASE_URL,
+    stages: Optional[List[Stage]] = None,
+    time_scale: float = 1.0,
+    think_time_scale: float = 1.0,
+    workers: int = 1,
+    executor: str = "ramping-vus",
+    store_dir: Optional[str] = None,
+    on_snapshot=None,
+    thresholds: Optional[ThresholdEvaluator] = None,
+    **executor_options,
+) -> Dict[str, Any]:
+    """
+    Run one scenario to completion
+
+    Args:
+        scenario: baseline, stress or spike
+        base_url: Target base URL
+        stages: Explicit stages (defaults to the k6 profile of the scenario)
+        time_scale: Multiplier applied to stage durations
+        think_time_scale: Multiplier applied to think times
+        workers: Worker processes (1 runs in-process, 0 uses every core)
+        executor: ramping-vus (closed model) or an arrival-rate executor (open model)
+        store_dir: Time-series store to write the per-second timeline to (None skips it)
+        on_snapshot: Optional callback receiving the live LoadMetrics about once a second
+        thresholds: Evaluator checked every second; the run stops early when it says abort
+        **executor_options: ArrivalRateEngine options (start_rate, arrival, pre_allocated_vus, max_vus)
+
+    Returns:
+        k6 compatible summary dictionary
+    """
+    stages = scale_stages(stages or scenario_stages(scenario, executor), time_scale)
+    if executor == "ramping-arrival-rate":
+        executor_options.setdefault("start_rate", 0.0)
+
+    if executor == "ramping-vus":
+        capacity = max((stage.target for stage in stages), default=1)
+    else:
+        capacity = executor_options.get("max_vus") or executor_options.get("pre_allocated_vus") or 1
+    workers = workers or os.cpu_count() or 1
+    workers = max(min(workers, int(capacity)), 1)
+
+    options = dict(executor_options, think_time_scale=think_time_scale)
+    monitor = on_snapshot
+    if thresholds is not None:
+        stop_event = threading.Event() if workers == 1 else multiprocessing.get_context("spawn").Event()
+        options["stop_event"] = stop_event
+
+        def check_thresholds(metrics):
+            if on_snapshot:
+                on_snapshot(metrics)
+            thresholds.observe(metrics.timeline)
+            if thresholds.should_abort and not stop_event.is_set():
+                stop_event.set()
+
+        monitor = check_thresholds
+
+    if workers == 1:
+        engine = _create_engine(executor, base_url, stages, **options)
+        metrics = asyncio.run(_monitored(engine, monitor, 1.0) if monitor else engine.run())
+    else:
+        metrics = run_distributed(base_url, stages, workers, on_snapshot=monitor, executor=executor, **options)
+
+    summary = metrics.summary()
+    summary["engine"] = {
+        "scenario": scenario,
+        "executor": executor,
+        "base_url": base_url,
+        "workers": workers,
+        "stages": [{"duration": s.duration, "target": s.target} for s in stages],
+        "options": executor_options,
+    }
+    if store_dir:
+        run_id = new_run_id(scenario)
+        store = TimeSeriesStore(store_dir)
+        summary["engine"]["run_id"] = run_id
+        summary["engine"]["timeseries"] = store.write_run(
+            metrics.timeline, scenario, run_id, source="engine", extra={"executor": executor}
+        )
+        store.downsample()
+    if thresholds is not None:
+        summary["thresholds"] = thresholds.verdict(summary, scenario)
+    return summary
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Python asyncio load engine")
+    parser.add_argument("--scenario", choices=sorted(STAGE_PROFILES), default="baseline")
+    parser.add_argument("--base-url", default=os.environ.get("LOAD_BASE_URL", DEFAULT_BASE_URL))
+    parser.add_argument(
+        "--from-config",
+        action="store_true",
+        help="Use the load_testing section of config.yaml instead of the k6 stages",
+    )
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Stage duration multiplier")
+    parser.add_argument("--think-time-scale", type=float, default=1.0, help="Think time multiplier")
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Worker processes (0 = one per CPU core)"
+    )
+    parser.add_argument("--executor", choices=EXECUTORS, default="ramping-vus")
+    parser.add_argument("--rate", type=float, default=None, help="Iterations per second (arrival-rate executors)")
+    parser.add_argument("--duration", default="1m", help="Duration of a --rate run, e.g. 30s or 2m")
+    parser.add_argument("--arrival", choices=ARRIVAL_PROCESSES, default="constant")
+    parser.add_argument("--pre-allocated-vus", type=int, default=50)
+    parser.add_argument("--max-vus", type=int, default=None, help="VU budget before iterations are dropped")
+    parser.add_argument("--output", default=None, help="Summary JSON path")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="Time-series store directory")
+    parser.add_argument("--no-store", action="store_true", help="Do not write the per-second timeline")
+    parser.add_argument("--dashboard", action="store_true", help="Serve a live metrics dashboard during the run")
+    parser.add_argument("--dashboard-port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--thresholds", action="store_true", help="Evaluate performance_thresholds from config.yaml during the run"
+    )
+    parser.add_argument("--no-abort", action="store_true", help="Report threshold failures without stopping the run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    stages = stages_from_config(load_config(), args.scenario) if args.from_config else None
+    options = {}
+    if args.executor != "ramping-vus":
+        if args.rate is not None:
+            stages = [Stage(parse_duration(args.duration), args.rate)]
+            options["start_rate"] = args.rate
+        elif stages:
+            stages = rate_stages(stages)
+        options.update(
+            arrival=args.arrival, pre_allocated_vus=args.pre_allocated_vus, max_vus=args.max_vus
+        )
+
+    dashboard = None
+    if args.dashboard:
+        dashboard = LiveDashboard(port=args.dashboard_port).start_in_thread()
+        print(f"📊 Live dashboard: {dashboard.url}")
+
+    print(f"🚀 Running {args.scenario} load profile ({args.executor}) against {args.base_url}")
+    try:
+        summary = run_scenario(
+            args.scenario,
+            args.base_url,
+            stages,
+            args.time_scale,
+            args.think_time_scale,
+            args.workers,
+            args.executor,
+            None if args.no_store else args.store,
+            (lambda metrics: dashboard.publish_timeline(metrics.timeline, metrics.active_vus)) if dashboard else None,
+            ThresholdEvaluator.from_config(scenario=args.scenario, abort=not args.no_abort) if args.thresholds else None,
+            **options,
+        )
+    finally:
+        if dashboard:
+            dashboard.stop()
+
+    output = args.output or f"reports/{args.scenario}_test_results.json"
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    values = summary["metrics"]["http_req_duration"]["values"]
+    print(f"✅ {summary['metrics']['http_reqs']['values']['count']} requests, "
+          f"p95 {values['p(95)']:.0f}ms, summary written to {output}")
+    dropped = summary["metrics"].get("dropped_iterations")
+    if dropped and dropped["values"]["count"]:
+        print(f"⚠️  {dropped['values']['count']} iterations dropped: VU budget exhausted")
+    verdict = summary.get("thresholds")
+    if verdict:
+        write_verdict(verdict, verdict_path(args.scenario))
+        if verdict["aborted"]:
+            abort = verdict["abort"]
+            print(f"🛑 Aborted after {abort['elapsed_seconds']:.0f}s: {abort['expression']} observed {abort['value']:g}")
+        print(f"{'✅' if verdict['passed'] else '❌'} Thresholds {'passed' if verdict['passed'] else 'failed'}, "
+              f"verdict written to {verdict_path(args.scenario)}")
+
+
+if __name__ == "__main__":
+    main()
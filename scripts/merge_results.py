@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Merge pytest-json-report and Allure result fragments into de-duplicated runs
+
+The pipeline runs smoke, regression and unit tests in separate jobs, and
+reruns or sharded jobs add more fragments; nothing combined them, so the
+reports only saw whichever files happened to land in reports/. This tool
+merges any number of fragments into one run per suite (or one run overall):
+
+1. Each fragment is streamed (scripts/json_stream.py); every test entry is
+   spilled to a temporary file and only (nodeid, attempt time, offset,
+   outcome, duration) is kept in memory, sorted by nodeid.
+2. The sorted fragment indexes are k-way merged with a heap, so merging N
+   tests from k fragments costs O(N log k).
+3. Entries of the same nodeid are attempts of one test, ordered by the
+   fragment's ``created`` time. The last attempt decides the outcome; the
+   test keeps its ``attempts`` history and is marked ``flaky`` when an
+   earlier attempt had another outcome. An attempt that appears twice (the
+   same fragment downloaded into two places) is counted once.
+4. The merged report is written test by test, header and summary first, in
+   the pytest-json-report shape the run history ingests. A Parquet / Arrow
+   twin next to it (``smoke_results.parquet`` beside ``smoke_results.json``)
+   holds a single fragment and is deleted, so loaders read the merged JSON
+   instead (see scripts/columnar_results.py); columnar fragments are not
+   merged, the JSON fragment of the same job holds the same run.
+
+Allure results need no merging beyond collecting them: every result,
+container and attachment file has a unique name and Allure groups retries by
+historyId itself. ``--allure-output`` copies them into one directory.
+
+    python scripts/merge_results.py artifacts/ --output-dir reports --allure-output reports/allure-results
+    python scripts/merge_results.py reports/smoke_results.json reports/smoke_rerun.json -o reports/smoke_results.json
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.columnar_results import COLUMNAR_SUFFIXES  # noqa: E402
+from scripts.json_stream import PytestReportStream  # noqa: E402
+from scripts.run_history import PHASES, SKIPPED_PREFIXES, _failure_message, suite_name  # noqa: E402
+
+FAILED_OUTCOMES = ("failed", "error")
+ALLURE_SUFFIXES = ("-result.json", "-container.json")
+ALLURE_FILES = ("environment.properties", "categories.json", "executor.json")
+
+# (nodeid, created, fragment, position, offset, outcome, duration)
+Entry = Tuple[str, float, int, int, int, Optional[str], float]
+
+
+def _duration(test: Dict[str, Any]) -> float:
+    """Seconds of all phases of a test entry"""
+    return sum((test.get(phase) or {}).get("duration") or 0.0 for phase in PHASES)
+
+
+class Fragment:
+    """A pytest-json-report fragment spilled to a temporary file
+
+    Args:
+        path: Report file
+        number: Position of the fragment among the merged ones
+    """
+
+    def __init__(self, path: str, number: int):
+        self.path = path
+        self.number = number
+        self.header: Dict[str, Any] = {}
+        self.entries: List[Entry] = []
+        self.spill = tempfile.TemporaryFile()
+
+    def load(self) -> bool:
+        """Stream the fragment's tests into the spill file; False when it is not a pytest report"""
+        stream = PytestReportStream(self.path, slim=False)
+        rows = []
+        for position, test in enumerate(stream):
+            nodeid = test.get("nodeid")
+            if not nodeid:
+                continue
+            offset = self.spill.tell()
+            self.spill.write(json.dumps(test, ensure_ascii=False).encode("utf-8") + b"\n")
+            rows.append((nodeid, position, offset, test.get("outcome"), _duration(test)))
+        self.header = stream.header
+        created = self.created
+        self.entries = sorted(
+            (nodeid, created, self.number, position, offset, outcome, duration)
+            for nodeid, position, offset, outcome, duration in rows
+        )
+        return stream.has_tests
+
+    @property
+    def created(self) -> float:
+        """When the fragment's run was reported"""
+        created = self.header.get("created")
+        return float(created) if created is not None else os.path.getmtime(self.path)
+
+    def read(self, offset: int) -> Dict[str, Any]:
+        """Test entry spilled at an offset"""
+        self.spill.seek(offset)
+        return json.loads(self.spill.readline())
+
+    def close(self):
+        self.spill.close()
+
+
+def merged_attempts(fragments: Sequence[Fragment]) -> Iterable[List[Entry]]:
+    """Attempts of each test, nodeid by nodeid, k-way merged from the sorted fragment indexes"""
+    merged = heapq.merge(*(fragment.entries for fragment in fragments))
+    for _, group in itertools.groupby(merged, key=lambda entry: entry[0]):
+        attempts: List[Entry] = []
+        seen = set()
+        for entry in group:
+            # The same run seen twice (e.g. a copied artifact) is one attempt
+            key = (entry[1], entry[5], entry[6])
+            if key not in seen:
+                seen.add(key)
+                attempts.append(entry)
+        yield attempts
+
+
+def merge_reports(paths: Sequence[str], output: str) -> Optional[Dict[str, Any]]:
+    """
+    Merge pytest-json-report fragments into one report
+
+    Args:
+        paths: Fragment files; files without a tests array are ignored
+        output: Merged report path (may be one of the fragments)
+
+    Returns:
+        Header of the merged report (with its summary and fragments), or
+        None when no fragment was a pytest report; a columnar twin of the
+        output is deleted (see remove_columnar_twins)
+    """
+    fragments = []
+    try:
+        for path in paths:
+            fragment = Fragment(path, len(fragments))
+            try:
+                loaded = fragment.load()
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Skipping {path}: {e}")
+                loaded = False
+            if loaded:
+                fragments.append(fragment)
+            else:
+                fragment.close()
+        if not fragments:
+            return None
+
+        groups = list(merged_attempts(fragments))
+        summary: Dict[str, int] = {}
+        reruns = 0
+        for attempts in groups:
+            outcome = attempts[-1][5] or "unknown"
+            summary[outcome] = summary.get(outcome, 0) + 1
+            reruns += len(attempts) - 1
+        summary["total"] = len(groups)
+        if reruns:
+            summary["rerun"] = reruns
+
+        starts = [f.created - (f.header.get("duration") or 0.0) for f in fragments]
+        header = {
+            "created": max(f.created for f in fragments),
+            "duration": max(f.created for f in fragments) - min(starts),
+            "exitcode": int(any(outcome in summary for outcome in FAILED_OUTCOMES)),
+            "root": fragments[0].header.get("root"),
+            "environment": fragments[0].header.get("environment", {}),
+            "summary": summary,
+            "fragments": [
+                {"path": f.path, "created": f.created, "tests": len(f.entries)} for f in fragments
+            ],
+        }
+        _write_report(output, header, fragments, groups)
+        remove_columnar_twins(output)
+        return header
+    finally:
+        for fragment in fragments:
+            fragment.close()
+
+
+def remove_columnar_twins(output: str) -> List[str]:
+    """
+    Delete the Parquet / Arrow files of the same name as a merged report
+
+    They hold one fragment only and would otherwise be read in its place.
+
+    Returns:
+        The deleted paths
+    """
+    stem = os.path.splitext(output)[0]
+    removed = []
+    for suffix in COLUMNAR_SUFFIXES:
+        if os.path.exists(stem + suffix):
+            os.remove(stem + suffix)
+            removed.append(stem + suffix)
+    return removed
+
+
+def _write_report(output: str, header: Dict[str, Any], fragments: Sequence[Fragment], groups: Iterable[List[Entry]]):
+    """Write the header, then each merged test, without holding the tests in memory"""
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    temporary = f"{output}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header, ensure_ascii=False)[:-1])
+        f.write(', "tests": [')
+        for number, attempts in enumerate(groups):
+            bodies = [fragments[entry[2]].read(entry[4]) for entry in attempts]
+            test = bodies[-1]
+            if len(attempts) > 1:
+                test["attempts"] = [
+                    {
+                        "outcome": entry[5],
+                        "duration": entry[6],
+                        "created": entry[1],
+                        "source": fragments[entry[2]].path,
+                        "message": _failure_message(body),
+                    }
+                    for entry, body in zip(attempts, bodies)
+                ]
+                test["flaky"] = len({entry[5] for entry in attempts}) > 1 and test.get("outcome") == "passed"
+            f.write(("," if number else "") + "\n" + json.dumps(test, ensure_ascii=False))
+        f.write("\n]}\n")
+    os.replace(temporary, output)
+
+
+def find_fragments(inputs: Iterable[str]) -> List[str]:
+    """pytest-json-report files among the inputs; directories are searched for *_results.json (raw k6 output aside)"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(
+                str(path) for path in sorted(Path(item).rglob("*.json"))
+                if suite_name(str(path))[0] == "pytest"
+                and not path.name.startswith(SKIPPED_PREFIXES)
+                and not path.name.endswith(ALLURE_SUFFIXES)
+            )
+        else:
+            paths.append(item)
+    return paths
+
+
+def merge_by_suite(paths: Sequence[str], output_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Merge the fragments of each suite into ``<output_dir>/<suite>_results.json``
+
+    The suite comes from the file name (``smoke_results.json`` -> smoke), so
+    fragments of one suite from several jobs or reruns become one run.
+    """
+    suites: Dict[str, List[str]] = {}
+    for path in paths:
+        suites.setdefault(suite_name(path)[1], []).append(path)
+    merged = {}
+    for suite, suite_paths in sorted(suites.items()):
+        name = "test_results.json" if suite == "all" else f"{suite}_results.json"
+        header = merge_reports(suite_paths, os.path.join(output_dir, name))
+        if header is not None:
+            merged[suite] = header
+    return merged
+
+
+def merge_allure(inputs: Iterable[str], output: str) -> int:
+    """
+    Copy every Allure result, container and attachment file into one directory
+
+    Returns:
+        Number of files copied (files already in the output are kept)
+    """
+    os.makedirs(output, exist_ok=True)
+    output_path = os.path.abspath(output)
+    copied = 0
+    for item in inputs:
+        if not os.path.isdir(item):
+            continue
+        for root, _, names in os.walk(item):
+            if os.path.abspath(root) == output_path:
+                continue
+            for name in names:
+                if not (name.endswith(ALLURE_SUFFIXES) or "-attachment" in name or name in ALLURE_FILES):
+                    continue
+                target = os.path.join(output, name)
+                if not os.path.exists(target):
+                    shutil.copy2(os.path.join(root, name), target)
+                    copied += 1
+    return copied
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Merge pytest-json-report and Allure result fragments")
+    parser.add_argument("inputs", nargs="+", help="Result files or directories searched for *_results.json")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-o", "--output", help="Merge every fragment into this report")
+    target.add_argument("--output-dir", help="Merge the fragments of each suite into <dir>/<suite>_results.json")
+    parser.add_argument("--allure-output", help="Also collect Allure result files from the input directories here")
+    args = parser.parse_args()
+
+    paths = find_fragments(args.inputs)
+    if args.output:
+        header = merge_reports(paths, args.output)
+        merged = {args.output: header} if header else {}
+    else:
+        merged = merge_by_suite(paths, args.output_dir)
+    for name, header in merged.items():
+        summary = header["summary"]
+        print(f"✅ {name}: {summary['total']} tests from {len(header['fragments'])} fragment(s), "
+              f"{summary.get('rerun', 0)} rerun attempt(s) collapsed")
+    if args.allure_output:
+        print(f"✅ Collected {merge_allure(args.inputs, args.allure_output)} Allure file(s) into {args.allure_output}")
+    if not merged:
+        print("No pytest result fragments found")
+
+
+if __name__ == "__main__":
+    main()
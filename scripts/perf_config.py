@@ -0,0 +1,55 @@
+"""
+Shared configuration helpers for the performance tooling
+"""
+
+import re
+from typing import Any, Dict, Union
+
+import yaml
+
+CONFIG_PATH = "config/config.yaml"
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def load_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Load the project configuration
+
+    Args:
+        path: Path to the YAML configuration file
+
+    Returns:
+        Configuration dictionary (empty if the file does not exist)
+    """
+    try:
+        with open(path, "r") as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+
+
+def parse_duration(value: Union[str, int, float]) -> float:
+    """
+    Parse a k6 style duration ("30s", "2m", "1m30s", "250ms") into seconds
+
+    Args:
+        value: Duration string or a plain number of seconds
+
+    Returns:
+        Duration in seconds
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).strip().lower()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PATTERN.findall(text)
+    if not parts or "".join(n + u for n, u in parts) != text:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Statistical performance regression detection between load test runs
+
+Compares the latency distributions of a candidate run against a baseline,
+either a single earlier run or a rolling baseline merging the previous N
+stored runs of the same scenario, overall and per endpoint:
+
+* Mann-Whitney U (normal approximation with tie correction) on the full
+  distribution, with Cliff's delta as its effect size;
+* a bootstrap confidence interval of the p95 difference, so tail
+  regressions the rank test does not weigh are caught too.
+
+Both work directly on the latency histogram buckets, so million-request
+runs are compared without expanding samples. A comparison is flagged as a
+regression only when it is statistically significant *and* the effect is
+large enough to matter (``performance_regression`` in config.yaml).
+
+    python scripts/perf_regression.py                              # every stored scenario
+    python scripts/perf_regression.py --scenario stress --baseline-runs 5
+    python scripts/perf_regression.py --baseline old.json --candidate new.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.latency_histogram import LatencyHistogram, merge_histograms  # noqa: E402
+from scripts.perf_config import load_config  # noqa: E402
+from scripts.timeseries_store import DEFAULT_STORE_DIR, Segment, TimeSeriesStore  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = "reports/perf_regression.json"
+DEFAULT_SETTINGS = {
+    "alpha": 0.05,
+    "min_effect_size": 0.147,  # Cliff's delta below this is negligible
+    "min_p95_change_percent": 5,
+    "baseline_runs": 5,
+    "bootstrap_iterations": 1000,
+    "confidence": 0.95,
+    "min_samples": 20,
+}
+
+# Romano et al. thresholds for |Cliff's delta|
+EFFECT_MAGNITUDES = ((0.147, "negligible"), (0.33, "small"), (0.474, "medium"))
+
+
+@dataclass
+class RunLatency:
+    """Latency distributions of one run (or a merged baseline), overall and per endpoint"""
+
+    label: str
+    scenario: Optional[str]
+    overall: LatencyHistogram
+    endpoints: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    runs: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_summary(cls, summary: Dict[str, Any], label: str, scenario: Optional[str] = None) -> "RunLatency":
+        """
+        Read the histograms embedded in a k6_ingest, load engine or store summary
+
+        Raises:
+            ValueError: If the summary carries no latency histogram
+        """
+        blob = summary.get("histograms", {}).get("http_req_duration")
+        if not blob:
+            raise ValueError(f"{label} has no latency histogram (use a k6_ingest, load engine or store summary)")
+        endpoints = {
+            name: LatencyHistogram.from_base64(values["histogram"])
+            for name, values in summary.get("endpoints", {}).items()
+            if values.get("histogram")
+        }
+        run = summary.get("run", {})
+        scenario = scenario or run.get("scenario") or summary.get("scenario") or summary.get("engine", {}).get("scenario")
+        return cls(label, scenario, LatencyHistogram.from_base64(blob), endpoints, [run.get("run_id", label)])
+
+    @classmethod
+    def from_segment(cls, segment: Segment) -> "RunLatency":
+        """Latency distributions of a stored run"""
+        endpoints = {endpoint: segment.latency(endpoint) for endpoint in segment.endpoints}
+        run_id = segment.meta["run_id"]
+        return cls(run_id, segment.meta.get("scenario"), segment.latency(), endpoints, [run_id])
+
+    @classmethod
+    def merged(cls, runs: List["RunLatency"], label: str) -> "RunLatency":
+        """Rolling baseline: all runs' histograms merged into one distribution"""
+        endpoints: Dict[str, LatencyHistogram] = {}
+        for run in runs:
+            for name, histogram in run.endpoints.items():
+                if name in endpoints:
+                    endpoints[name].merge(histogram)
+                else:
+                    endpoints[name] = histogram.copy()
+        return cls(
+            label,
+            runs[0].scenario if runs else None,
+            merge_histograms(run.overall for run in runs),
+            endpoints,
+            [run_id for run in runs for run_id in run.runs],
+        )
+
+
+def _aligned(baseline: LatencyHistogram, candidate: LatencyHistogram):
+    """Bucket values and both count vectors over the buckets either histogram uses"""
+    if baseline.counts_length != candidate.counts_length:
+        raise ValueError("Cannot compare histograms with different layouts")
+    combined = baseline.copy().merge(candidate)
+    values, _ = combined.values()
+    used = np.flatnonzero(combined.counts)
+    return values, baseline.counts[used].astype(np.float64), candidate.counts[used].astype(np.float64)
+
+
+def mann_whitney(baseline: LatencyHistogram, candidate: LatencyHistogram) -> Dict[str, float]:
+    """
+    One-sided Mann-Whitney U test that the candidate is slower than the baseline
+
+    Each histogram bucket is a group of tied values: it gets the mid-rank
+    of its position in the pooled distribution.
+
+    Args:
+        baseline: Baseline latency histogram
+        candidate: Candidate latency histogram
+
+    Returns:
+        Dict with u, z, p_slower, p_faster, cliffs_delta and
+        prob_slower (probability a candidate request is slower than a baseline one)
+    """
+    _, base, cand = _aligned(baseline, candidate)
+    n1, n2 = base.sum(), cand.sum()
+    ties = base + cand
+    total = n1 + n2
+    midranks = np.cumsum(ties) - (ties - 1) / 2.0
+    u = float(np.sum(cand * midranks) - n2 * (n2 + 1) / 2.0)
+
+    mean = n1 * n2 / 2.0
+    tie_term = float(np.sum(ties**3 - ties)) / (total * (total - 1)) if total > 1 else 0.0
+    variance = n1 * n2 / 12.0 * ((total + 1) - tie_term)
+    if variance > 0:
+        z_slower = (u - mean - 0.5) / math.sqrt(variance)
+        z_faster = (u - mean + 0.5) / math.sqrt(variance)
+        p_slower = 0.5 * math.erfc(z_slower / math.sqrt(2))
+        p_faster = 0.5 * math.erfc(-z_faster / math.sqrt(2))
+        z = (u - mean) / math.sqrt(variance)
+    else:
+        z, p_slower, p_faster = 0.0, 1.0, 1.0
+
+    prob_slower = u / (n1 * n2)
+    return {
+        "u": u,
+        "z": z,
+        "p_slower": p_slower,
+        "p_faster": p_faster,
+        "prob_slower": prob_slower,
+        "cliffs_delta": 2.0 * prob_slower - 1.0,
+    }
+
+
+def bootstrap_percentile_difference(
+    baseline: LatencyHistogram,
+    candidate: LatencyHistogram,
+    percentile: float = 95,
+    iterations: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = 0,
+) -> Dict[str, float]:
+    """
+    Bootstrap confidence interval of the candidate minus baseline percentile
+
+    Resampling a histogram is a multinomial draw over its bucket counts, so
+    all iterations are generated at once as a (iterations, buckets) matrix.
+
+    Args:
+        baseline: Baseline latency histogram
+        candidate: Candidate latency histogram
+        percentile: Percentile to compare (0-100)
+        iterations: Number of bootstrap resamples
+        confidence: Confidence level of the interval
+        seed: Random seed (fixed by default so reports are reproducible)
+
+    Returns:
+        Dict with baseline, candidate, difference, ci_low and ci_high in ms
+    """
+    values, base, cand = _aligned(baseline, candidate)
+    rng = np.random.default_rng(seed)
+
+    def resampled(counts: np.ndarray) -> np.ndarray:
+        n = int(counts.sum())
+        draws = rng.multinomial(n, counts / n, size=iterations)
+        rank = max(int(math.ceil(percentile / 100.0 * n)), 1)
+        return values[np.argmax(np.cumsum(draws, axis=1) >= rank, axis=1)]
+
+    differences = resampled(cand) - resampled(base)
+    tail = (1.0 - confidence) / 2.0 * 100
+    low, high = np.percentile(differences, [tail, 100 - tail])
+    base_value, cand_value = baseline.percentile(percentile), candidate.percentile(percentile)
+    return {
+        "baseline": base_value,
+        "candidate": cand_value,
+        "difference": cand_value - base_value,
+        "ci_low": float(low),
+        "ci_high": float(high),
+    }
+
+
+def effect_magnitude(delta: float) -> str:
+    """Verbal magnitude of a Cliff's delta"""
+    for limit, name in EFFECT_MAGNITUDES:
+        if abs(delta) < limit:
+            return name
+    return "large"
+
+
+def compare_histograms(
+    baseline: LatencyHistogram, candidate: LatencyHistogram, settings: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Compare two latency distributions
+
+    A regression needs statistical significance and a relevant effect:
+    either the rank test is significant with a non-negligible Cliff's
+    delta, or the whole p95 confidence interval lies above the minimum
+    p95 change. Improvements are detected the same way in reverse.
+
+    Args:
+        baseline: Baseline latency histogram
+        candidate: Candidate latency histogram
+        settings: Overrides of DEFAULT_SETTINGS
+
+    Returns:
+        Comparison with status (regression, improvement, no_change, insufficient_data),
+        the reasons for it, test statistics and effect sizes
+    """
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    result: Dict[str, Any] = {
+        "baseline_count": baseline.total_count,
+        "candidate_count": candidate.total_count,
+        "status": "insufficient_data",
+        "reasons": [],
+    }
+    if min(baseline.total_count, candidate.total_count) < settings["min_samples"]:
+        return result
+
+    test = mann_whitney(baseline, candidate)
+    p95 = bootstrap_percentile_difference(
+        baseline, candidate, 95, int(settings["bootstrap_iterations"]), float(settings["confidence"])
+    )
+    tolerance = p95["baseline"] * float(settings["min_p95_change_percent"]) / 100.0
+    delta = test["cliffs_delta"]
+    alpha = float(settings["alpha"])
+    min_effect = float(settings["min_effect_size"])
+
+    slower, faster = [], []
+    if test["p_slower"] < alpha and delta >= min_effect:
+        slower.append(f"distribution shifted up (p={test['p_slower']:.2g}, Cliff's delta {delta:+.2f})")
+    if p95["ci_low"] > tolerance:
+        slower.append(f"p95 +{p95['difference']:.0f}ms (CI {p95['ci_low']:+.0f}..{p95['ci_high']:+.0f}ms)")
+    if test["p_faster"] < alpha and delta <= -min_effect:
+        faster.append(f"distribution shifted down (p={test['p_faster']:.2g}, Cliff's delta {delta:+.2f})")
+    if p95["ci_high"] < -tolerance:
+        faster.append(f"p95 {p95['difference']:.0f}ms (CI {p95['ci_low']:+.0f}..{p95['ci_high']:+.0f}ms)")
+
+    result.update({
+        "status": "regression" if slower else "improvement" if faster else "no_change",
+        "reasons": slower or faster,
+        "mann_whitney": test,
+        "effect_size": {
+            "cliffs_delta": delta,
+            "magnitude": effect_magnitude(delta),
+            "prob_slower": test["prob_slower"],
+            "p95_change_percent": p95["difference"] / p95["baseline"] * 100.0 if p95["baseline"] else None,
+            "median_change_ms": candidate.percentile(50) - baseline.percentile(50),
+        },
+        "p95": p95,
+    })
+    return result
+
+
+def compare_runs(baseline: RunLatency, candidate: RunLatency, settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Compare two runs overall and for every endpoint both of them hit
+
+    Returns:
+        Dict with scenario, baseline and candidate run ids, overall and
+        per-endpoint comparisons, and the names of regressed comparisons
+    """
+    overall = compare_histograms(baseline.overall, candidate.overall, settings)
+    endpoints = {
+        name: compare_histograms(baseline.endpoints[name], histogram, settings)
+        for name, histogram in sorted(candidate.endpoints.items())
+        if name in baseline.endpoints
+    }
+    regressions = [name for name, result in endpoints.items() if result["status"] == "regression"]
+    if overall["status"] == "regression":
+        regressions.insert(0, "overall")
+    return {
+        "scenario": candidate.scenario or baseline.scenario,
+        "baseline": {"label": baseline.label, "runs": baseline.runs},
+        "candidate": {"label": candidate.label, "runs": candidate.runs},
+        "overall": overall,
+        "endpoints": endpoints,
+        "regressions": regressions,
+    }
+
+
+def regression_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """``performance_regression`` settings from config.yaml over the defaults"""
+    config = load_config() if config is None else config
+    return {**DEFAULT_SETTINGS, **(config.get("performance_regression") or {})}
+
+
+def compare_stored_runs(
+    store: TimeSeriesStore,
+    scenario: str,
+    baseline_runs: Optional[int] = None,
+    settings: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Latest stored run of a scenario against a rolling baseline of the runs before it
+
+    Args:
+        store: Time-series store
+        scenario: Scenario name
+        baseline_runs: Number of earlier runs merged into the baseline
+        settings: Comparison settings
+
+    Returns:
+        Comparison, or None when the scenario has fewer than two runs
+    """
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    count = int(baseline_runs or settings["baseline_runs"])
+    segments = store.segments(scenario)
+    if len(segments) < 2:
+        return None
+    candidate = RunLatency.from_segment(segments[-1])
+    previous = [RunLatency.from_segment(segment) for segment in segments[-count - 1 : -1]]
+    baseline = RunLatency.merged(previous, f"rolling baseline of {len(previous)} run(s)")
+    return compare_runs(baseline, candidate, settings)
+
+
+def build_report(comparisons: Iterable[Dict[str, Any]], settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Report JSON of all comparisons"""
+    comparisons = list(comparisons)
+    return {
+        "passed": not any(comparison["regressions"] for comparison in comparisons),
+        "settings": settings,
+        "comparisons": comparisons,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def load_run(source: str, store: TimeSeriesStore, scenario: Optional[str] = None) -> RunLatency:
+    """A run from a summary JSON file or a stored run id"""
+    if os.path.exists(source):
+        with open(source, "r") as f:
+            return RunLatency.from_summary(json.load(f), source, scenario)
+    for segment in store.segments(scenario):
+        if segment.meta["run_id"] == source:
+            return RunLatency.from_segment(segment)
+    raise ValueError(f"{source} is neither a summary file nor a stored run id")
+
+
+def main():
+    """Command line entry point: compare runs and exit 1 on a regression"""
+    parser = argparse.ArgumentParser(description="Detect statistically significant latency regressions between runs")
+    parser.add_argument("--baseline", default=None, help="Baseline summary JSON or stored run id")
+    parser.add_argument("--candidate", default=None, help="Candidate summary JSON or stored run id")
+    parser.add_argument("--scenario", action="append", default=None, help="Stored scenario(s) to check (default: all)")
+    parser.add_argument("--baseline-runs", type=int, default=None, help="Earlier runs merged into the rolling baseline")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="Time-series store directory")
+    parser.add_argument("--alpha", type=float, default=None, help="Significance level")
+    parser.add_argument("--config", default="config/config.yaml", help="Configuration file")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Report JSON path")
+    parser.add_argument("--no-fail", action="store_true", help="Exit 0 even when a regression is found")
+    args = parser.parse_args()
+
+    settings = regression_settings(load_config(args.config))
+    if args.alpha is not None:
+        settings["alpha"] = args.alpha
+    if args.baseline_runs is not None:
+        settings["baseline_runs"] = args.baseline_runs
+    store = TimeSeriesStore(args.store)
+
+    if args.baseline or args.candidate:
+        if not (args.baseline and args.candidate):
+            parser.error("--baseline and --candidate must be given together")
+        scenario = args.scenario[0] if args.scenario else None
+        comparisons = [
+            compare_runs(load_run(args.baseline, store, scenario), load_run(args.candidate, store, scenario), settings)
+        ]
+    else:
+        scenarios = args.scenario or sorted({segment.meta["scenario"] for segment in store.segments()})
+        comparisons = []
+        for scenario in scenarios:
+            comparison = compare_stored_runs(store, scenario, settings=settings)
+            if comparison is None:
+                print(f"⚠️ {scenario}: fewer than two stored runs, nothing to compare")
+            else:
+                comparisons.append(comparison)
+
+    report = build_report(comparisons, settings)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for comparison in comparisons:
+        results = {"overall": comparison["overall"], **comparison["endpoints"]}
+        print(f"📊 {comparison['scenario']}: {comparison['candidate']['label']} vs {comparison['baseline']['label']}")
+        for name, result in results.items():
+            icon = {"regression": "❌", "improvement": "🚀", "no_change": "✅"}.get(result["status"], "⚠️")
+            detail = "; ".join(result["reasons"]) or result["status"].replace("_", " ")
+            print(f"   {icon} {name}: {detail}")
+    print(f"{'✅ No regressions' if report['passed'] else '❌ Regressions found'}: report written to {args.output}")
+    if not report["passed"] and not args.no_fail:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
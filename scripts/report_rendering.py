@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Shared HTML rendering for every report generator
+
+Pages are Jinja2 templates in scripts/templates/. The environment, and with
+it every compiled template, is created once per process, and pages are
+written to disk as the template produces them, in buffered chunks, so a
+report with tens of thousands of rows is never held as one string.
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from markupsafe import Markup, escape
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+CHUNK_SIZE = 64 * 1024
+
+
+def svg_line_chart(values, label, color="#007bff", width=520, height=110) -> Markup:
+    """Inline SVG polyline of a numeric series, scaled to its own maximum"""
+    values = [float(v) for v in values]
+    if not values:
+        return Markup("")
+    peak = max(values) or 1.0
+    step = width / max(len(values) - 1, 1)
+    points = " ".join(f"{i * step:.1f},{height - v / peak * (height - 10):.1f}" for i, v in enumerate(values))
+    return Markup(
+        f'<svg viewBox="0 0 {width} {height + 20}" width="100%" preserveAspectRatio="none" role="img" '
+        f'aria-label="{escape(label)}">'
+        f'<polyline fill="none" stroke="{escape(color)}" stroke-width="2" points="{points}"/>'
+        f'<text x="0" y="{height + 16}" font-size="11" fill="#6c757d">{escape(label)} (max {peak:,.0f})</text></svg>'
+    )
+
+
+@lru_cache(maxsize=None)
+def environment() -> Environment:
+    """Template environment shared by all reports in this process
+
+    Templates are compiled on first use and kept; auto_reload is off so
+    later renders do not stat the template files again.
+    """
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=select_autoescape(["html"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        auto_reload=False,
+    )
+    env.globals["line_chart"] = svg_line_chart
+    return env
+
+
+def get_template(name: str) -> Template:
+    """Compiled template by path relative to scripts/templates"""
+    return environment().get_template(name)
+
+
+def render(name: str, **context) -> str:
+    """Render a template to a string (for small pages and page sections)"""
+    return get_template(name).render(**context)
+
+
+def stream(name: str, **context) -> Iterator[str]:
+    """Render a template as chunks of roughly CHUNK_SIZE characters"""
+    buffer, size = [], 0
+    for piece in get_template(name).generate(**context):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def render_to_file(name: str, path: str, **context) -> str:
+    """Stream a rendered template into a file
+
+    The page is written to a temporary file and moved into place, so a
+    browser or watcher never reads half a report.
+
+    Args:
+        name: Template path relative to scripts/templates
+        path: Output file
+        **context: Template variables
+
+    Returns:
+        The output path
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        for chunk in stream(name, **context):
+            f.write(chunk)
+    os.replace(temporary, path)
+    return path
+
+
+def templates_digest() -> str:
+    """SHA-256 over every template file, for caches of rendered output"""
+    digest = hashlib.sha256()
+    for path in sorted(TEMPLATE_DIR.rglob("*")):
+        if not path.is_file():
+            continue
+        digest.update(str(path.relative_to(TEMPLATE_DIR)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
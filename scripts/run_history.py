@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+SQLite run-history index over the JSON artifacts in reports/
+
+``reports/`` only ever holds the latest run of each suite. This module
+upserts every pytest-json-report (or its columnar Parquet / Arrow twin, see
+scripts/columnar_results.py), load test summary (k6 handleSummary,
+k6_ingest, load engine) and other JSON result into an indexed local SQLite
+database, so report scripts query the current run and trends over the last
+N runs instead of re-reading a fixed list of files:
+
+    runs           one row per ingested artifact (suite, kind, counts, duration)
+    tests          one row per pytest node id
+    outcomes       outcome and failure message of a test in a run
+    durations      setup / call / teardown seconds of a test in a run
+    load_metrics   requests, error rate, throughput and percentiles per endpoint
+
+Artifacts are keyed by their own run identity (pytest-json-report
+``created``, the engine / store run id), so ingesting the same file twice updates
+the run instead of duplicating it; unchanged files are skipped by size and
+modification time.
+
+    python scripts/run_history.py ingest                 # every reports/*.json
+    python scripts/run_history.py trend --suite smoke --last 10
+    python scripts/run_history.py load-trend --scenario stress --metric p95
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.columnar_results import is_columnar, read_results, read_run, result_files  # noqa: E402
+from scripts.json_stream import PytestReportStream  # noqa: E402
+from scripts.perf_config import load_config  # noqa: E402
+from scripts.thresholds import summary_stats  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE = "reports/run_history.db"
+DEFAULT_PATTERN = "reports/*.json"
+DEFAULT_DIRECTORY = "reports"
+
+# Raw k6 NDJSON output is summarized by k6_ingest.py, not indexed here
+SKIPPED_PREFIXES = ("load_test_",)
+
+LOAD_SUFFIXES = ("_stream_summary", "_test_results")
+PHASES = ("setup", "call", "teardown")
+PERCENTILES = {"p50": 50, "p90": 90, "p95": 95, "p99": 99}
+INSERT_BATCH = 1000  # tests inserted per executemany while a report streams in
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_stamp TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL,
+    total INTEGER,
+    passed INTEGER,
+    failed INTEGER,
+    skipped INTEGER,
+    errors INTEGER,
+    exitcode INTEGER,
+    payload TEXT,
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_suite_started ON runs (kind, suite, started_at);
+CREATE INDEX IF NOT EXISTS runs_source ON runs (source, source_stamp);
+
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    nodeid TEXT NOT NULL UNIQUE,
+    file TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS outcomes (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    test_id INTEGER NOT NULL REFERENCES tests (id),
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    message TEXT,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS outcomes_test ON outcomes (test_id, outcome);
+CREATE INDEX IF NOT EXISTS outcomes_outcome ON outcomes (outcome, run_id);
+
+CREATE TABLE IF NOT EXISTS durations (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    test_id INTEGER NOT NULL REFERENCES tests (id),
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, test_id, phase)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS durations_test ON durations (test_id, phase);
+
+CREATE TABLE IF NOT EXISTS load_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, endpoint, metric)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS load_metrics_metric ON load_metrics (metric, endpoint);
+"""
+
+RUN_COLUMNS = (
+    "run_key", "kind", "suite", "source", "source_stamp", "started_at", "duration",
+    "total", "passed", "failed", "skipped", "errors", "exitcode", "payload", "ingested_at",
+)
+
+
+def suite_name(path: str) -> Tuple[str, str]:
+    """
+    Default kind and suite of an artifact from its file name
+
+    ``smoke_results.json`` is the pytest suite ``smoke``,
+    ``stress_stream_summary.json`` the load scenario ``stress``.
+    """
+    stem = Path(path).stem
+    for suffix in LOAD_SUFFIXES:
+        if stem.endswith(suffix):
+            return "load", stem[: -len(suffix)]
+    if stem == "test_results":
+        return "pytest", "all"  # pytest.ini's default --json-report-file
+    if stem.endswith("_results"):
+        return "pytest", stem[: -len("_results")]
+    return "custom", stem
+
+
+def _failure_message(test: Dict[str, Any]) -> Optional[str]:
+    """longrepr of the first phase that did not pass"""
+    for phase in PHASES:
+        details = test.get(phase) or {}
+        if details.get("outcome") not in (None, "passed") and details.get("longrepr"):
+            return details["longrepr"]
+    return None
+
+
+def load_metric_rows(summary: Dict[str, Any]) -> List[Tuple[str, str, Optional[float]]]:
+    """
+    (endpoint, metric, value) rows of a k6-style summary; "" is the whole run
+
+    Percentiles come from the embedded histograms when there are any, otherwise
+    from the summary's trend values.
+    """
+    stats = summary_stats(summary)
+    requests, errors, seconds = stats["requests"], stats["errors"], stats["seconds"]
+    rate = summary.get("metrics", {}).get("http_reqs", {}).get("values", {}).get("rate")
+    rows = [
+        ("", "requests", requests),
+        ("", "errors", errors),
+        ("", "error_rate", errors / requests if requests else 0.0),
+        ("", "rps", requests / seconds if seconds else rate),
+        ("", "duration_s", seconds),
+    ]
+    histogram = stats.get("histogram")
+    if histogram is not None:
+        values = histogram.percentiles(PERCENTILES.values())
+        rows += [("", name, values[p]) for name, p in PERCENTILES.items()]
+        rows += [("", "avg", histogram.mean), ("", "max", histogram.max if histogram.total_count else 0.0)]
+    else:
+        rows += [("", name, value) for name, value in stats["percentiles"].items()]
+        trend = summary.get("metrics", {}).get("http_req_duration", {}).get("values", {})
+        rows += [("", "avg", trend.get("avg")), ("", "max", trend.get("max"))]
+
+    for endpoint, values in summary.get("endpoints", {}).items():
+        count = values.get("count", 0)
+        failed = values.get("failed", 0)
+        trend = values.get("http_req_duration", {})
+        rows += [
+            (endpoint, "requests", count),
+            (endpoint, "errors", failed),
+            (endpoint, "error_rate", failed / count if count else 0.0),
+        ]
+        rows += [
+            (endpoint, name, trend.get(f"p({p})", trend.get("med") if p == 50 else trend.get(name)))
+            for name, p in PERCENTILES.items()
+        ]
+        rows.append((endpoint, "avg", trend.get("avg")))
+    return rows
+
+
+class RunHistory:
+    """Indexed SQLite history of test and load runs"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and create) the history database
+
+        Args:
+            path: Database file (default from the run_history section of config.yaml)
+        """
+        if path is None:
+            path = load_config().get("run_history", {}).get("database", DEFAULT_DATABASE)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database"""
+        self.connection.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --------------------------------------------------------------- ingest
+
+    def ingest(self, paths: Optional[Iterable[str]] = None) -> int:
+        """
+        Upsert artifacts into the history
+
+        Args:
+            paths: JSON or columnar files (default: every reports/*.json, with a
+                columnar file read instead of the JSON file of the same name)
+
+        Returns:
+            Number of artifacts (re)indexed; unchanged files are skipped
+        """
+        paths = result_files(DEFAULT_DIRECTORY) if paths is None else list(paths)
+        indexed = 0
+        for path in paths:
+            try:
+                indexed += self.ingest_file(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping {path}: {e}")
+        return indexed
+
+    def ingest_file(self, path: str, suite: Optional[str] = None) -> bool:
+        """
+        Upsert one artifact
+
+        Args:
+            path: pytest-json-report or its columnar twin, load summary or other JSON result file
+            suite: Suite / scenario name (default from the file name)
+
+        Returns:
+            False when the file was skipped (raw k6 output or unchanged since the last ingest)
+        """
+        if Path(path).name.startswith(SKIPPED_PREFIXES):
+            return False
+        stat = os.stat(path)
+        stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+        source = os.path.normpath(path)
+        if self.connection.execute(
+            "SELECT 1 FROM runs WHERE source = ? AND source_stamp = ?", (source, stamp)
+        ).fetchone():
+            return False
+
+        kind, default_suite = suite_name(path)
+        suite = suite or default_suite
+        if is_columnar(path):
+            with self.connection:
+                self._ingest_columnar(path, suite, source, stamp, stat.st_mtime)
+            return True
+
+        # pytest-json-report tests are streamed one at a time once the header is known
+        stream = PytestReportStream(path)
+        tests = iter(stream)
+        complete = True
+        try:
+            first = next(tests, None)
+        except ValueError:
+            first, complete = None, False  # not a JSON object (or not JSON); json.load decides below
+        header = stream.header
+        if stream.has_tests and "summary" in header and "created" in header:
+            with self.connection:
+                self._ingest_pytest(header, suite, source, stamp, stat.st_mtime,
+                                    tests=itertools.chain([first] if first else [], tests))
+            return True
+        tests.close()
+
+        if stream.has_tests or not complete:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+        else:
+            document = header  # the whole document was read into the header
+        if isinstance(document, dict) and isinstance(document.get("tests"), list) and "summary" in document:
+            kind = "pytest"
+        elif isinstance(document, dict) and "http_reqs" in document.get("metrics", {}):
+            kind = "load"
+        else:
+            kind = "custom"
+
+        with self.connection:
+            if kind == "pytest":
+                self._ingest_pytest(document, suite, source, stamp, stat.st_mtime)
+            elif kind == "load":
+                self._ingest_load(document, suite, source, stamp, stat.st_mtime)
+            else:
+                self._upsert_run({
+                    "run_key": f"custom:{suite}:{source}",
+                    "kind": "custom",
+                    "suite": suite,
+                    "source": source,
+                    "source_stamp": stamp,
+                    "started_at": stat.st_mtime,
+                    "payload": json.dumps(document),
+                })
+        return True
+
+    def _upsert_run(self, run: Dict[str, Any]) -> int:
+        """Insert or update a run, dropping the rows it had from an earlier ingest"""
+        run = {column: run.get(column) for column in RUN_COLUMNS}
+        run["ingested_at"] = time.time()
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in RUN_COLUMNS[1:])
+        self.connection.execute(
+            f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) VALUES ({', '.join('?' * len(RUN_COLUMNS))}) "
+            f"ON CONFLICT (run_key) DO UPDATE SET {assignments}",
+            tuple(run.values()),
+        )
+        run_id = self.connection.execute("SELECT id FROM runs WHERE run_key = ?", (run["run_key"],)).fetchone()[0]
+        for table in ("outcomes", "durations", "load_metrics"):
+            self.connection.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+        return run_id
+
+    def _test_ids(self, nodeids: List[str]) -> Dict[str, int]:
+        """Ids of the given node ids, inserting new tests"""
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO tests (nodeid, file, name) VALUES (?, ?, ?)",
+            ((nodeid, nodeid.split("::", 1)[0], nodeid.rsplit("::", 1)[-1]) for nodeid in nodeids),
+        )
+        ids = {}
+        for start in range(0, len(nodeids), 500):
+            chunk = nodeids[start : start + 500]
+            query = f"SELECT nodeid, id FROM tests WHERE nodeid IN ({', '.join('?' * len(chunk))})"
+            ids.update(self.connection.execute(query, chunk).fetchall())
+        return ids
+
+    def _ingest_pytest(self, report: Dict[str, Any], suite: str, source: str, stamp: str, mtime: float,
+                       tests: Optional[Iterable[Dict[str, Any]]] = None):
+        """Ingest a pytest-json-report; tests may be streamed separately from the header"""
+        rows = (
+            (
+                test["nodeid"],
+                test.get("outcome", "unknown"),
+                [(test.get(phase) or {}).get("duration") for phase in PHASES],
+                _failure_message(test),
+            )
+            for test in (report["tests"] if tests is None else tests)
+            if test.get("nodeid")
+        )
+        self._store_pytest_run(report, rows, suite, source, stamp, mtime)
+
+    def _ingest_columnar(self, path: str, suite: str, source: str, stamp: str, mtime: float):
+        """Ingest a columnar results file, reading only the columns the history keeps"""
+        durations = [f"{phase}_duration" for phase in PHASES]
+        columns = read_results(path, ["nodeid", "outcome", *durations, "message"]).to_pydict()
+        tests = zip(columns["nodeid"], columns["outcome"], zip(*(columns[d] for d in durations)), columns["message"])
+        self._store_pytest_run(read_run(path), tests, suite, source, stamp, mtime)
+
+    def _store_pytest_run(self, report: Dict[str, Any], tests: Iterable[Tuple[str, str, Sequence[Optional[float]], Optional[str]]],
+                          suite: str, source: str, stamp: str, mtime: float):
+        """
+        Upsert a pytest run, inserting its tests in batches as they are read
+
+        Args:
+            report: Run header (created, duration, exitcode, summary)
+            tests: (nodeid, outcome, setup / call / teardown seconds, failure message) per test
+        """
+        summary = report.get("summary", {})
+        created = report.get("created", mtime)
+        run_id = self._upsert_run({
+            "run_key": f"pytest:{suite}:{created}",
+            "kind": "pytest",
+            "suite": suite,
+            "source": source,
+            "source_stamp": stamp,
+            "started_at": created,
+            "duration": report.get("duration"),
+            "total": summary.get("total", 0),
+            "passed": summary.get("passed", 0),
+            "failed": summary.get("failed", 0),
+            "skipped": summary.get("skipped", 0),
+            "errors": summary.get("error", 0),
+            "exitcode": report.get("exitcode"),
+        })
+
+        tests = iter(tests)
+        while True:
+            batch = list(itertools.islice(tests, INSERT_BATCH))
+            if not batch:
+                break
+            ids = self._test_ids([nodeid for nodeid, _, _, _ in batch])
+            outcomes, durations = [], []
+            for nodeid, outcome, seconds, message in batch:
+                test_id = ids[nodeid]
+                phases = [(phase, value) for phase, value in zip(PHASES, seconds) if value is not None]
+                outcomes.append((run_id, test_id, outcome, sum(s for _, s in phases), message))
+                durations.extend((run_id, test_id, phase, seconds) for phase, seconds in phases)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO outcomes (run_id, test_id, outcome, duration, message) VALUES (?, ?, ?, ?, ?)",
+                outcomes,
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO durations (run_id, test_id, phase, seconds) VALUES (?, ?, ?, ?)", durations
+            )
+
+    def _ingest_load(self, summary: Dict[str, Any], suite: str, source: str, stamp: str, mtime: float):
+        run = summary.get("run", {})
+        engine = summary.get("engine", {})
+        suite = run.get("scenario") or engine.get("scenario") or suite
+        started = run.get("started_at", mtime)
+        key = run.get("run_id") or engine.get("run_id") or f"{source}@{started}"
+        run_id = self._upsert_run({
+            "run_key": f"load:{suite}:{key}",
+            "kind": "load",
+            "suite": suite,
+            "source": source,
+            "source_stamp": stamp,
+            "started_at": started,
+            "duration": summary.get("state", {}).get("testRunDurationMs", 0) / 1000.0,
+        })
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO load_metrics (run_id, endpoint, metric, value) VALUES (?, ?, ?, ?)",
+            ((run_id, endpoint, metric, value) for endpoint, metric, value in load_metric_rows(summary)),
+        )
+
+    # ---------------------------------------------------------------- query
+
+    def fingerprint(self, kind: str = "pytest") -> str:
+        """Changes whenever a run of this kind is ingested or updated (for caching what is rendered from it)"""
+        count, latest = self.connection.execute(
+            "SELECT COUNT(*), MAX(ingested_at) FROM runs WHERE kind = ?", (kind,)
+        ).fetchone()
+        return f"{count}:{latest}"
+
+    def suites(self, kind: str = "pytest") -> List[str]:
+        """Suite (or scenario) names with at least one run"""
+        rows = self.connection.execute("SELECT DISTINCT suite FROM runs WHERE kind = ? ORDER BY suite", (kind,))
+        return [row[0] for row in rows]
+
+    def latest_run(self, suite: str, kind: str = "pytest") -> Optional[Dict[str, Any]]:
+        """Most recent run of a suite"""
+        row = self.connection.execute(
+            "SELECT * FROM runs WHERE kind = ? AND suite = ? ORDER BY started_at DESC LIMIT 1", (kind, suite)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def current_results(self, kind: str = "pytest") -> Dict[str, Dict[str, Any]]:
+        """
+        Latest run of every suite in the shape of a pytest-json-report summary
+
+        Returns:
+            Suite name to {"run_id", "run_key", "created", "duration",
+            "summary": {passed, failed, skipped, total, duration}}
+        """
+        rows = self.connection.execute(
+            """
+            SELECT * FROM runs AS r
+            WHERE kind = ? AND started_at = (SELECT MAX(started_at) FROM runs WHERE kind = r.kind AND suite = r.suite)
+            ORDER BY suite
+            """,
+            (kind,),
+        )
+        results = {}
+        for row in rows:
+            results[row["suite"]] = {
+                "run_id": row["id"],
+                "run_key": row["run_key"],
+                "created": row["started_at"],
+                "duration": row["duration"],
+                "summary": {
+                    "passed": row["passed"],
+                    "failed": row["failed"],
+                    "skipped": row["skipped"],
+                    "total": row["total"],
+                    "duration": row["duration"],
+                },
+            }
+        return results
+
+    def failed_tests(self, run_ids: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Failed tests of the given runs (default: the latest run of every suite)
+
+        Returns:
+            Rows with suite, source, nodeid, outcome, message and duration
+        """
+        if run_ids is None:
+            run_ids = [result["run_id"] for result in self.current_results().values()]
+        run_ids = list(run_ids)
+        if not run_ids:
+            return []
+        rows = self.connection.execute(
+            f"""
+            SELECT r.suite, r.source, t.nodeid, o.outcome, o.message, o.duration
+            FROM outcomes AS o JOIN tests AS t ON t.id = o.test_id JOIN runs AS r ON r.id = o.run_id
+            WHERE o.run_id IN ({', '.join('?' * len(run_ids))}) AND o.outcome IN ('failed', 'error')
+            ORDER BY r.suite, t.nodeid
+            """,
+            run_ids,
+        )
+        return [dict(row) for row in rows]
+
+    def suite_trend(self, suite: str, last: int = 10) -> List[Dict[str, Any]]:
+        """Totals, pass rate and duration of the last N runs of a suite, oldest first"""
+        rows = self.connection.execute(
+            """
+            SELECT id, started_at, duration, total, passed, failed, skipped FROM runs
+            WHERE kind = 'pytest' AND suite = ? ORDER BY started_at DESC LIMIT ?
+            """,
+            (suite, last),
+        ).fetchall()
+        trend = []
+        for row in reversed(rows):
+            run = dict(row)
+            run["pass_rate"] = run["passed"] / run["total"] * 100.0 if run["total"] else 0.0
+            trend.append(run)
+        return trend
+
+    def test_history(self, nodeid: str, last: int = 10) -> List[Dict[str, Any]]:
+        """Outcome and duration of one test in its last N runs, oldest first"""
+        rows = self.connection.execute(
+            """
+            SELECT r.id AS run_id, r.suite, r.started_at, o.outcome, o.duration
+            FROM tests AS t JOIN outcomes AS o ON o.test_id = t.id JOIN runs AS r ON r.id = o.run_id
+            WHERE t.nodeid = ? ORDER BY r.started_at DESC LIMIT ?
+            """,
+            (nodeid, last),
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def flaky_tests(self, last: int = 10) -> List[Dict[str, Any]]:
+        """Tests that both passed and failed within the last N runs of their suite"""
+        rows = self.connection.execute(
+            """
+            WITH recent AS (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (PARTITION BY suite ORDER BY started_at DESC) AS position
+                    FROM runs WHERE kind = 'pytest'
+                ) WHERE position <= ?
+            )
+            SELECT t.nodeid, SUM(o.outcome = 'passed') AS passed, SUM(o.outcome IN ('failed', 'error')) AS failed
+            FROM outcomes AS o JOIN tests AS t ON t.id = o.test_id
+            WHERE o.run_id IN (SELECT id FROM recent)
+            GROUP BY t.nodeid HAVING passed > 0 AND failed > 0
+            ORDER BY failed DESC, t.nodeid
+            """,
+            (last,),
+        )
+        return [dict(row) for row in rows]
+
+    def slowest_tests(self, run_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """The slowest tests of a run by total duration"""
+        rows = self.connection.execute(
+            """
+            SELECT t.nodeid, o.outcome, o.duration FROM outcomes AS o JOIN tests AS t ON t.id = o.test_id
+            WHERE o.run_id = ? ORDER BY o.duration DESC LIMIT ?
+            """,
+            (run_id, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def load_trend(self, scenario: str, metric: str = "p95", endpoint: str = "", last: int = 10) -> List[Dict[str, Any]]:
+        """One metric of the last N load runs of a scenario, oldest first"""
+        rows = self.connection.execute(
+            """
+            SELECT r.id AS run_id, r.run_key, r.started_at, m.value
+            FROM runs AS r JOIN load_metrics AS m ON m.run_id = r.id
+            WHERE r.kind = 'load' AND r.suite = ? AND m.endpoint = ? AND m.metric = ?
+            ORDER BY r.started_at DESC LIMIT ?
+            """,
+            (scenario, endpoint, metric, last),
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+
+def main():
+    """Command line entry point: ingest artifacts or print trends"""
+    parser = argparse.ArgumentParser(description="Index test and load results in a SQLite run history")
+    parser.add_argument("--database", default=None, help="History database (default from config.yaml)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Upsert JSON artifacts")
+    ingest.add_argument("paths", nargs="*", help=f"Files to ingest (default: {DEFAULT_PATTERN}, columnar files preferred)")
+
+    trend = commands.add_parser("trend", help="Pass rate of the last runs of a suite")
+    trend.add_argument("--suite", required=True)
+    trend.add_argument("--last", type=int, default=10)
+
+    load = commands.add_parser("load-trend", help="A load metric over the last runs of a scenario")
+    load.add_argument("--scenario", required=True)
+    load.add_argument("--metric", default="p95")
+    load.add_argument("--endpoint", default="", help="Endpoint tag (default: whole run)")
+    load.add_argument("--last", type=int, default=10)
+
+    flaky = commands.add_parser("flaky", help="Tests with mixed outcomes in recent runs")
+    flaky.add_argument("--last", type=int, default=10)
+    args = parser.parse_args()
+
+    with RunHistory(args.database) as history:
+        if args.command == "ingest":
+            started = time.perf_counter()
+            indexed = history.ingest(args.paths or None)
+            print(f"✅ Indexed {indexed} artifact(s) into {history.path} in {(time.perf_counter() - started) * 1000:.0f}ms")
+        elif args.command == "trend":
+            for run in history.suite_trend(args.suite, args.last):
+                print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(run['started_at']))}  "
+                      f"{run['passed']}/{run['total']} passed ({run['pass_rate']:.1f}%)  {run['duration'] or 0:.1f}s")
+        elif args.command == "load-trend":
+            for run in history.load_trend(args.scenario, args.metric, args.endpoint, args.last):
+                value = "n/a" if run["value"] is None else f"{run['value']:g}"
+                print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(run['started_at']))}  {args.metric}={value}")
+        else:
+            for test in history.flaky_tests(args.last):
+                print(f"⚠️ {test['nodeid']}: {test['passed']} passed / {test['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
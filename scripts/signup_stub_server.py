@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the SwiftAssess signup flow with scriptable fault injection
+
+Serves GET /Signup, POST /Signup and GET /dashboard so load and functional
+runs can target a local server instead of staging. Fault profiles are read
+from the ``fault_injection`` section of config/config.yaml and can be
+switched at runtime through the ``/__faults`` control endpoint:
+
+    curl http://127.0.0.1:8089/__faults
+    curl -X POST "http://127.0.0.1:8089/__faults?profile=stress_degradation"
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import random
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.perf_config import load_config, parse_duration  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+CONTROL_PATH = "/__faults"
+DEFAULT_PROFILE = "healthy"
+REQUIRED_FIELDS = ["firstName", "lastName", "email", "password", "confirmPassword"]
+
+# z-score of the 95th percentile, used to derive lognormal sigma from p95/median
+_Z95 = 1.6448536269514722
+
+_REASONS = {
+    200: "OK",
+    302: "Found",
+    400: "Bad Request",
+    404: "Not Found",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+SIGNUP_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>SwiftAssess Signup</title></head>
+<body>
+    <h1>Create your SwiftAssess account</h1>
+    <form id="signupForm" method="post" action="/Signup">
+        <input id="firstName" name="firstName" type="text">
+        <input id="lastName" name="lastName" type="text">
+        <input id="email" name="email" type="email">
+        <input id="password" name="password" type="password">
+        <input id="confirmPassword" name="confirmPassword" type="password">
+        <input id="terms" name="terms" type="checkbox">
+        <input id="privacy" name="privacy" type="checkbox">
+        <button id="signupButton" type="submit">Sign up</button>
+    </form>
+</body>
+</html>
+"""
+
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>SwiftAssess Dashboard</title></head>
+<body><div class="success-message">Welcome to SwiftAssess</div></body>
+</html>
+"""
+
+
+class LatencyDistribution:
+    """Sample request latencies (in seconds) from a configured distribution"""
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None):
+        spec = spec or {}
+        self.kind = spec.get("distribution", "constant")
+        self.spec = spec
+
+        if self.kind == "lognormal":
+            median = float(spec.get("median_ms", 100))
+            p95 = float(spec.get("p95_ms", median * 2))
+            self._mu = math.log(median)
+            self._sigma = max(math.log(p95 / median), 0.0) / _Z95
+        elif self.kind not in ("constant", "uniform", "normal", "exponential"):
+            raise ValueError(f"Unsupported latency distribution: {self.kind}")
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds"""
+        spec = self.spec
+        if self.kind == "constant":
+            value = float(spec.get("value_ms", 0))
+        elif self.kind == "uniform":
+            value = rng.uniform(float(spec.get("min_ms", 0)), float(spec.get("max_ms", 0)))
+        elif self.kind == "normal":
+            value = rng.gauss(float(spec.get("mean_ms", 0)), float(spec.get("stddev_ms", 0)))
+        elif self.kind == "exponential":
+            mean = float(spec.get("mean_ms", 0))
+            value = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        else:
+            value = rng.lognormvariate(self._mu, self._sigma)
+        return max(value, 0.0) / 1000.0
+
+
+class FaultProfile:
+    """A named set of faults applied to the signup endpoints"""
+
+    def __init__(self, name: str, spec: Optional[Dict[str, Any]] = None, seed: int = 0):
+        spec = spec or {}
+        self.name = name
+        self.spec = spec
+        self.rng = random.Random(f"{seed}:{name}")
+
+        self.latency = {
+            endpoint: LatencyDistribution(dist)
+            for endpoint, dist in (spec.get("latency") or {}).items()
+        }
+
+        error_rate = spec.get("error_rate") or {}
+        self.error_start = float(error_rate.get("start", error_rate.get("rate", 0.0)))
+        self.error_end = float(error_rate.get("end", self.error_start))
+        self.error_ramp = parse_duration(error_rate.get("ramp", 0))
+        self.error_status = int(error_rate.get("status", 503))
+
+        self.reset_rate = float((spec.get("connection_reset") or {}).get("rate", 0.0))
+
+        slow_body = spec.get("slow_body") or {}
+        self.slow_body_rate = float(slow_body.get("rate", 0.0))
+        self.slow_body_chunk = int(slow_body.get("chunk_bytes", 256))
+        self.slow_body_interval = float(slow_body.get("interval_ms", 50)) / 1000.0
+
+        brownout = spec.get("brownout") or {}
+        self.brownout_period = parse_duration(brownout.get("period", 0))
+        self.brownout_duration = parse_duration(brownout.get("duration", 0))
+        self.brownout_latency = float(brownout.get("extra_latency_ms", 0)) / 1000.0
+        self.brownout_error_rate = float(brownout.get("error_rate", 0.0))
+        self.brownout_status = int(brownout.get("status", 503))
+
+    def in_brownout(self, elapsed: float) -> bool:
+        """Check whether the periodic brownout window is active"""
+        if self.brownout_period <= 0 or self.brownout_duration <= 0:
+            return False
+        return (elapsed % self.brownout_period) < self.brownout_duration
+
+    def error_rate_at(self, elapsed: float) -> float:
+        """Error rate on the configured ramp at the given elapsed time"""
+        if self.error_ramp <= 0:
+            return self.error_end
+        progress = min(elapsed / self.error_ramp, 1.0)
+        return self.error_start + (self.error_end - self.error_start) * progress
+
+    def should_reset(self) -> bool:
+        """Decide whether to drop the connection without a response"""
+        return self.reset_rate > 0 and self.rng.random() < self.reset_rate
+
+    def latency_for(self, method: str, path: str, elapsed: float) -> float:
+        """Injected latency in seconds for an endpoint"""
+        distribution = (
+            self.latency.get(f"{method} {path}")
+            or self.latency.get(path)
+            or self.latency.get("default")
+        )
+        delay = distribution.sample(self.rng) if distribution else 0.0
+        if self.in_brownout(elapsed):
+            delay += self.brownout_latency
+        return delay
+
+    def error_for(self, elapsed: float) -> Optional[int]:
+        """Status code of an injected error, or None to serve normally"""
+        if self.in_brownout(elapsed) and self.rng.random() < self.brownout_error_rate:
+            return self.brownout_status
+        rate = self.error_rate_at(elapsed)
+        if rate > 0 and self.rng.random() < rate:
+            return self.error_status
+        return None
+
+    def should_trickle(self) -> bool:
+        """Decide whether to send the response body slowly"""
+        return self.slow_body_rate > 0 and self.rng.random() < self.slow_body_rate
+
+
+class SignupStubServer:
+    """Asyncio HTTP/1.1 server that imitates the signup journey"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8089,
+        config: Optional[Dict[str, Any]] = None,
+        profile: Optional[str] = None,
+    ):
+        """
+        Initialize the stand-in server
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            config: Project configuration (loaded from config.yaml if omitted)
+            profile: Fault profile to start with (overrides active_profile)
+        """
+        self.host = host
+        self.port = port
+        self.config = config if config is not None else load_config()
+        faults = self.config.get("fault_injection", {}) or {}
+        self.profiles = faults.get("profiles", {}) or {}
+        self.seed = int(faults.get("seed", 0))
+        self.profile = FaultProfile(DEFAULT_PROFILE)
+        self._activated_at = 0.0
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._process = None
+        self.set_profile(profile or faults.get("active_profile", DEFAULT_PROFILE))
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the running server"""
+        return f"http://{self.host}:{self.port}"
+
+    def set_profile(self, name: str):
+        """
+        Activate a fault profile and restart its clock
+
+        Args:
+            name: Profile name from config.yaml (``healthy`` is always available)
+        """
+        if name not in self.profiles and name != DEFAULT_PROFILE:
+            raise KeyError(f"Unknown fault profile: {name}")
+        self.profile = FaultProfile(name, self.profiles.get(name), self.seed)
+        self._activated_at = self._now()
+        logger.info(f"Fault profile activated: {name}")
+
+    def _now(self) -> float:
+        loop = self._loop
+        return loop.time() if loop else 0.0
+
+    async def start(self):
+        """Start listening on the configured address"""
+        self._loop = asyncio.get_running_loop()
+        self._activated_at = self._now()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, backlog=4096
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Signup stand-in listening on {self.base_url}")
+
+    async def serve_forever(self):
+        """Start the server and block until cancelled"""
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "SignupStubServer":
+        """Run the server on a background event loop (used by tests and demos)"""
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start())
+            ready.set()
+            loop.run_forever()
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="signup-stub", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def start_in_process(self) -> "SignupStubServer":
+        """
+        Run the server in a child process so it does not share the GIL with
+        the load generator (used by the demos)
+        """
+        ports = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve_in_child,
+            args=(self.host, self.port, self.config, self.profile.name, ports),
+            name="signup-stub",
+            daemon=True,
+        )
+        self._process.start()
+        self.port = ports.get(timeout=30)
+        return self
+
+    def stop(self):
+        """Stop a server started with start_in_thread or start_in_process"""
+        if self._thread and self._loop:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._process:
+            self._process.terminate()
+            self._process.join(timeout=5)
+            self._process = None
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                keep_alive = await self._dispatch(*request, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            if not writer.transport.is_closing():
+                writer.close()
+
+    async def _read_request(self, reader) -> Optional[Tuple[str, str, Dict[str, str], bytes, bool]]:
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        method, target, version = request_line.decode("latin-1").split()
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length") or 0)
+        body = await reader.readexactly(length) if length else b""
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        return method.upper(), target, headers, body, keep_alive
+
+    async def _dispatch(self, method, target, headers, body, keep_alive, writer) -> bool:
+        url = urlsplit(target)
+        if url.path == CONTROL_PATH:
+            status, payload, extra = self._control(method, url.query, body)
+            await self._respond(writer, status, payload, keep_alive, "application/json", extra)
+            return keep_alive
+
+        profile = self.profile
+        elapsed = self._now() - self._activated_at
+
+        if profile.should_reset():
+            writer.transport.abort()
+            return False
+
+        delay = profile.latency_for(method, url.path, elapsed)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        error_status = profile.error_for(elapsed)
+        if error_status is not None:
+            status, payload, extra = error_status, f"Injected fault ({profile.name})", {}
+        else:
+            status, payload, extra = self._route(method, url.path, headers, body)
+
+        trickle = profile.should_trickle()
+        await self._respond(writer, status, payload, keep_alive, "text/html", extra, trickle)
+        return keep_alive
+
+    def _route(self, method, path, headers, body) -> Tuple[int, str, Dict[str, str]]:
+        if path.lower() == "/signup" and method == "GET":
+            return 200, SIGNUP_PAGE, {}
+        if path.lower() == "/signup" and method == "POST":
+            form = parse_qs(body.decode("utf-8", "replace"))
+            missing = [field for field in REQUIRED_FIELDS if not form.get(field, [""])[0]]
+            if missing:
+                return 400, f"Missing fields: {', '.join(missing)}", {}
+            if form["password"][0] != form["confirmPassword"][0]:
+                return 400, "Passwords do not match", {}
+            return 302, "", {"Location": "/dashboard"}
+        if path.lower() == "/dashboard" and method == "GET":
+            return 200, DASHBOARD_PAGE, {}
+        return 404, "Not Found", {}
+
+    def _control(self, method, query, body) -> Tuple[int, str, Dict[str, str]]:
+        if method in ("POST", "PUT"):
+            name = parse_qs(query).get("profile", [None])[0]
+            if name is None and body:
+                try:
+                    name = json.loads(body).get("profile")
+                except (ValueError, AttributeError):
+                    name = None
+            try:
+                self.set_profile(name)
+            except KeyError as e:
+                return 404, json.dumps({"error": str(e)}), {}
+        elif method != "GET":
+            return 400, json.dumps({"error": f"Unsupported method: {method}"}), {}
+
+        state = {
+            "active_profile": self.profile.name,
+            "elapsed": round(self._now() - self._activated_at, 3),
+            "profiles": sorted(set(self.profiles) | {DEFAULT_PROFILE}),
+        }
+        return 200, json.dumps(state), {}
+
+    async def _respond(self, writer, status, payload, keep_alive, content_type, extra=None, trickle=False):
+        body = payload.encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}",
+            f"Content-Type: {content_type}; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head.extend(f"{name}: {value}" for name, value in (extra or {}).items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+
+        if not trickle:
+            writer.write(body)
+            await writer.drain()
+            return
+
+        profile = self.profile
+        for offset in range(0, len(body), profile.slow_body_chunk):
+            await writer.drain()
+            await asyncio.sleep(profile.slow_body_interval)
+            writer.write(body[offset : offset + profile.slow_body_chunk])
+        await writer.drain()
+
+
+def _serve_in_child(host, port, config, profile, ports):
+    server = SignupStubServer(host, port, config, profile)
+
+    async def serve():
+        await server.start()
+        ports.put(server.port)
+        async with server._server:
+            await server._server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    """Run the stand-in server from the command line"""
+    parser = argparse.ArgumentParser(description="Local SwiftAssess signup stand-in")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8089, help="Port to bind")
+    parser.add_argument("--profile", default=None, help="Fault profile from config.yaml")
+    parser.add_argument("--config", default="config/config.yaml", help="Configuration file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    server = SignupStubServer(args.host, args.port, load_config(args.config), args.profile)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+(function () {
+    var data = window.BUG_REPORT_DATA;
+    var columns = data.columns;
+    var rows = data.data;
+    var ROW_HEIGHT = 37;
+    var OVERSCAN = 10;
+    var RANKS = {Critical: 0, High: 1, Medium: 2, Low: 3};
+    var LINKS = {'Screenshot': 'screenshot', 'DOM Snapshot': 'DOM', 'Log': 'log'};
+    var collator = new Intl.Collator(undefined, {numeric: true});
+    var index = {};
+    columns.forEach(function (column, i) { index[column] = i; });
+    var searched = ['Test Name', 'Affected Tests', 'Error Message'].filter(function (column) { return column in index; });
+
+    var viewport = document.getElementById('bug-viewport');
+    var body = document.getElementById('bug-rows');
+    var counter = document.getElementById('bug-count');
+    var search = document.getElementById('bug-search');
+    var selects = document.querySelectorAll('#bug-filters select');
+    var headers = document.querySelectorAll('#bug-table th');
+    var view = rows;
+    var sortColumn = -1;
+    var sortDirection = 1;
+    var pending = false;
+
+    function compare(a, b) {
+        if (a in RANKS && b in RANKS) {
+            return RANKS[a] - RANKS[b];
+        }
+        return collator.compare(a, b);
+    }
+
+    function filterRows() {
+        var active = [];
+        selects.forEach(function (select) {
+            if (select.value) {
+                active.push([index[select.dataset.column], select.value]);
+            }
+        });
+        var text = search.value.trim().toLowerCase();
+        view = rows.filter(function (row) {
+            for (var i = 0; i < active.length; i++) {
+                if (row[active[i][0]] !== active[i][1]) {
+                    return false;
+                }
+            }
+            return !text || searched.some(function (column) {
+                return row[index[column]].toLowerCase().indexOf(text) >= 0;
+            });
+        });
+        if (sortColumn >= 0) {
+            view.sort(function (a, b) { return sortDirection * compare(a[sortColumn], b[sortColumn]); });
+        }
+        counter.textContent = view.length + ' of ' + rows.length + ' bugs';
+        viewport.scrollTop = 0;
+        draw();
+    }
+
+    function spacer(height) {
+        var row = document.createElement('tr');
+        var cell = document.createElement('td');
+        cell.colSpan = columns.length;
+        cell.className = 'bug-spacer';
+        cell.style.height = height + 'px';
+        row.appendChild(cell);
+        return row;
+    }
+
+    function renderRow(row) {
+        var tr = document.createElement('tr');
+        row.forEach(function (value, i) {
+            var td = document.createElement('td');
+            var column = columns[i];
+            if (column === 'Priority' || column === 'Severity' || column === 'Bug Status') {
+                var span = document.createElement('span');
+                span.className = column.toLowerCase().replace(' ', '-') + '-' + value.toLowerCase();
+                span.textContent = value;
+                td.appendChild(span);
+            } else if (column in LINKS && value !== 'N/A') {
+                var link = document.createElement('a');
+                link.href = value;
+                link.target = '_blank';
+                link.textContent = LINKS[column];
+                link.title = value;
+                td.appendChild(link);
+            } else {
+                td.textContent = value;
+                td.title = value;
+            }
+            tr.appendChild(td);
+        });
+        return tr;
+    }
+
+    function draw() {
+        pending = false;
+        var fragment = document.createDocumentFragment();
+        if (!view.length) {
+            var empty = document.createElement('tr');
+            var cell = document.createElement('td');
+            cell.colSpan = columns.length;
+            cell.className = 'bug-empty';
+            cell.textContent = rows.length ? 'No bugs match the filters.' : '🎉 No bugs found! All tests passed successfully.';
+            empty.appendChild(cell);
+            fragment.appendChild(empty);
+        } else {
+            var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            var last = Math.min(view.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            fragment.appendChild(spacer(first * ROW_HEIGHT));
+            for (var i = first; i < last; i++) {
+                fragment.appendChild(renderRow(view[i]));
+            }
+            fragment.appendChild(spacer((view.length - last) * ROW_HEIGHT));
+        }
+        body.replaceChildren(fragment);
+    }
+
+    viewport.addEventListener('scroll', function () {
+        if (!pending) {
+            pending = true;
+            window.requestAnimationFrame(draw);
+        }
+    });
+    selects.forEach(function (select) { select.addEventListener('change', filterRows); });
+    search.addEventListener('input', filterRows);
+    headers.forEach(function (header, i) {
+        header.addEventListener('click', function () {
+            sortDirection = sortColumn === i ? -sortDirection : 1;
+            sortColumn = i;
+            headers.forEach(function (other) { other.removeAttribute('aria-sort'); });
+            header.setAttribute('aria-sort', sortDirection > 0 ? 'ascending' : 'descending');
+            filterRows();
+        });
+    });
+    filterRows();
+})();
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Threshold evaluation for load test runs
+
+Turns the ``performance_thresholds`` section of config/config.yaml
+(p50/p95/p99 response time, minimum throughput, maximum error rate, with
+optional per-scenario overrides) into k6-style threshold expressions and
+evaluates them two ways:
+
+* continuously, over a sliding window of the per-second timeline while a
+  run is streaming, aborting the run once an ``abort_on_fail`` threshold
+  fails after the grace period;
+* once, over the final summary of a run, for the pass/fail verdict.
+
+The verdict is written as JSON next to the other reports:
+
+    python scripts/thresholds.py reports/stress_test_results.json --scenario stress
+    python scripts/load_engine.py --scenario stress --thresholds
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.latency_histogram import LatencyHistogram, merge_histograms  # noqa: E402
+from scripts.perf_config import load_config, parse_duration  # noqa: E402
+from scripts.timeseries_store import TimelineCursor  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = "1m"
+DEFAULT_GRACE_PERIOD = "1m"
+DEFAULT_MIN_REQUESTS = 20
+
+PERCENTILES = {"p50": 50, "p90": 90, "p95": 95, "p99": 99}
+
+
+@dataclass
+class Threshold:
+    """One pass/fail criterion, e.g. p(95)<2000 on http_req_duration"""
+
+    name: str
+    metric: str
+    stat: str
+    operator: str
+    limit: float
+
+    @property
+    def expression(self) -> str:
+        """k6 threshold expression"""
+        return f"{self.metric}: {self.stat}{self.operator}{self.limit:g}"
+
+    def value(self, stats: Dict[str, Any]) -> Optional[float]:
+        """
+        Observed value of this threshold
+
+        Args:
+            stats: Dict with requests, errors, seconds and histogram (or precomputed values)
+
+        Returns:
+            The value, or None when there is nothing to measure
+        """
+        requests = stats.get("requests", 0)
+        if not requests:
+            return None
+        if self.name in PERCENTILES:
+            values = stats.get("percentiles", {})
+            if self.name in values:
+                return values[self.name]
+            histogram = stats.get("histogram")
+            return histogram.percentile(PERCENTILES[self.name]) if histogram is not None and histogram.total_count else None
+        if self.name == "throughput":
+            return requests / stats["seconds"] if stats.get("seconds") else None
+        return stats.get("errors", 0) / requests
+
+    def passes(self, value: Optional[float]) -> bool:
+        """Whether a value satisfies the threshold (no data passes)"""
+        if value is None:
+            return True
+        return value >= self.limit if self.operator == ">=" else value < self.limit
+
+
+def _merged_settings(config: Dict[str, Any], scenario: Optional[str]) -> Dict[str, Any]:
+    settings = dict(config.get("performance_thresholds") or {})
+    overrides = (settings.pop("scenarios", None) or {}).get(scenario) or {}
+    for key, value in overrides.items():
+        if isinstance(value, dict):
+            settings[key] = dict(settings.get(key) or {}, **value)
+        else:
+            settings[key] = value
+    return settings
+
+
+def load_thresholds(config: Optional[Dict[str, Any]] = None, scenario: Optional[str] = None) -> List[Threshold]:
+    """
+    Thresholds configured for a scenario
+
+    Args:
+        config: Project configuration (loaded from config.yaml if omitted)
+        scenario: Scenario whose overrides apply (baseline, stress, spike)
+
+    Returns:
+        Threshold list (response time percentiles, throughput, error rate)
+    """
+    settings = _merged_settings(load_config() if config is None else config, scenario)
+    thresholds = []
+    for name, limit in (settings.get("response_time") or {}).items():
+        if name in PERCENTILES:
+            stat = f"p({PERCENTILES[name]})"
+            thresholds.append(Threshold(name, "http_req_duration", stat, "<", float(limit)))
+    minimum = (settings.get("throughput") or {}).get("min")
+    if minimum is not None:
+        thresholds.append(Threshold("throughput", "http_reqs", "rate", ">=", float(minimum)))
+    maximum = (settings.get("error_rate") or {}).get("max")
+    if maximum is not None:
+        # Configured in percent, evaluated as a rate like http_req_failed
+        thresholds.append(Threshold("error_rate", "http_req_failed", "rate", "<", float(maximum) / 100.0))
+    return thresholds
+
+
+def summary_stats(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Requests, errors, duration and latency of a k6-style summary
+
+    Works with k6 handleSummary exports, k6_ingest stream summaries, load
+    engine summaries and time-series store segments.
+    """
+    metrics = summary.get("metrics", {})
+    requests = metrics.get("http_reqs", {}).get("values", {}).get("count", 0)
+    failed = metrics.get("http_req_failed", {}).get("values", {})
+    errors = failed.get("passes", failed.get("rate", 0) * requests)
+    seconds = summary.get("state", {}).get("testRunDurationMs", 0) / 1000.0
+    stats = {"requests": requests, "errors": errors, "seconds": seconds}
+
+    blob = summary.get("histograms", {}).get("http_req_duration")
+    if blob:
+        stats["histogram"] = LatencyHistogram.from_base64(blob)
+    else:
+        trend = metrics.get("http_req_duration", {}).get("values", {})
+        stats["percentiles"] = {
+            name: trend.get(f"p({p})", trend.get(name, trend.get("med") if p == 50 else None))
+            for name, p in PERCENTILES.items()
+        }
+    return stats
+
+
+def evaluate_summary(summary: Dict[str, Any], thresholds: Iterable[Threshold]) -> List[Dict[str, Any]]:
+    """
+    Evaluate thresholds against a run summary
+
+    Args:
+        summary: k6-style summary
+        thresholds: Thresholds to check
+
+    Returns:
+        One result per threshold: name, expression, limit, value, ok
+    """
+    stats = summary_stats(summary)
+    results = []
+    for threshold in thresholds:
+        value = threshold.value(stats)
+        results.append({
+            "name": threshold.name,
+            "expression": threshold.expression,
+            "limit": threshold.limit,
+            "value": value,
+            "ok": threshold.passes(value),
+        })
+    return results
+
+
+class ThresholdEvaluator:
+    """Evaluate thresholds over a sliding window of a streaming run's timeline"""
+
+    def __init__(
+        self,
+        thresholds: List[Threshold],
+        window: float = 60.0,
+        grace_period: float = 60.0,
+        min_requests: int = DEFAULT_MIN_REQUESTS,
+        abort_on_fail: Iterable[str] = (),
+        delay: float = 2,
+    ):
+        """
+        Initialize the evaluator
+
+        Args:
+            thresholds: Thresholds to evaluate
+            window: Sliding window length in seconds
+            grace_period: Seconds from the start of the run before a failure may abort it
+            min_requests: Windows with fewer requests are not evaluated
+            abort_on_fail: Names of thresholds that abort the run when they fail
+            delay: Seconds a timeline bucket is held back for late samples
+        """
+        self.thresholds = thresholds
+        self.window = window
+        self.grace_period = grace_period
+        self.min_requests = min_requests
+        self.abort_on_fail = set(abort_on_fail)
+        self.cursor = TimelineCursor(delay)
+        self.buckets = deque()
+        self.started_at: Optional[int] = None
+        self.evaluations = 0
+        self.aborted: Optional[Dict[str, Any]] = None
+        self.state = {
+            threshold.name: {"window_failures": 0, "first_failed_at": None, "worst_window_value": None}
+            for threshold in thresholds
+        }
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[Dict[str, Any]] = None, scenario: Optional[str] = None, abort: bool = True
+    ) -> "ThresholdEvaluator":
+        """
+        Build an evaluator from ``performance_thresholds``
+
+        Args:
+            config: Project configuration (loaded from config.yaml if omitted)
+            scenario: Scenario whose overrides apply
+            abort: Honour ``evaluation.abort_on_fail`` (False only reports)
+        """
+        config = load_config() if config is None else config
+        evaluation = _merged_settings(config, scenario).get("evaluation") or {}
+        return cls(
+            load_thresholds(config, scenario),
+            window=parse_duration(evaluation.get("window", DEFAULT_WINDOW)),
+            grace_period=parse_duration(evaluation.get("grace_period", DEFAULT_GRACE_PERIOD)),
+            min_requests=int(evaluation.get("min_requests", DEFAULT_MIN_REQUESTS)),
+            abort_on_fail=(evaluation.get("abort_on_fail") or ()) if abort else (),
+        )
+
+    @property
+    def should_abort(self) -> bool:
+        """Whether an abort_on_fail threshold failed after the grace period"""
+        return self.aborted is not None
+
+    def observe(self, timeline, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Consume newly completed timeline buckets, sliding the window one bucket at a time
+
+        Args:
+            timeline: TimelineRecorder of the running test (a recent tail is enough)
+            now: Current time on the timeline's clock
+
+        Returns:
+            Results of the newest window (empty when it was not evaluated)
+        """
+        results = []
+        for start in self.cursor.advance(timeline, now):
+            window = timeline.window(start)
+            if self.started_at is None:
+                if not window["requests"]:
+                    continue
+                self.started_at = start
+            self.buckets.append((start, window))
+            end = start + timeline.resolution
+            while self.buckets[0][0] < end - self.window:
+                self.buckets.popleft()
+            results = self._evaluate(end, timeline.resolution)
+        return results
+
+    def _evaluate(self, end: float, resolution: int) -> List[Dict[str, Any]]:
+        requests = sum(window["requests"] for _, window in self.buckets)
+        if requests < self.min_requests:
+            return []
+        stats = {
+            "requests": requests,
+            "errors": sum(window["errors"] for _, window in self.buckets),
+            "seconds": len(self.buckets) * resolution,
+            "histogram": merge_histograms(window["histogram"] for _, window in self.buckets),
+        }
+        self.evaluations += 1
+        elapsed = end - self.started_at
+        results = []
+        for threshold in self.thresholds:
+            value = threshold.value(stats)
+            ok = threshold.passes(value)
+            results.append({"name": threshold.name, "value": value, "ok": ok, "window_end": end})
+            if ok:
+                continue
+            state = self.state[threshold.name]
+            state["window_failures"] += 1
+            if state["first_failed_at"] is None:
+                state["first_failed_at"] = end
+            worst = state["worst_window_value"]
+            if worst is None or (value < worst if threshold.operator == ">=" else value > worst):
+                state["worst_window_value"] = value
+            if self.aborted is None and threshold.name in self.abort_on_fail and elapsed >= self.grace_period:
+                self.aborted = {
+                    "threshold": threshold.name,
+                    "expression": threshold.expression,
+                    "value": value,
+                    "at": end,
+                    "elapsed_seconds": elapsed,
+                }
+                logger.warning(f"Threshold {threshold.expression} failed ({value:g}) after {elapsed:.0f}s: aborting")
+        return results
+
+    def verdict(self, summary: Optional[Dict[str, Any]] = None, scenario: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Machine-readable pass/fail verdict of the run
+
+        Args:
+            summary: Final run summary (its whole-run values decide pass/fail)
+            scenario: Scenario name recorded in the verdict
+
+        Returns:
+            Verdict dictionary
+        """
+        return build_verdict(
+            evaluate_summary(summary or {}, self.thresholds),
+            scenario,
+            window_state=self.state,
+            aborted=self.aborted,
+            evaluation={
+                "window_seconds": self.window,
+                "grace_period_seconds": self.grace_period,
+                "window_evaluations": self.evaluations,
+                "abort_on_fail": sorted(self.abort_on_fail),
+            },
+        )
+
+
+def build_verdict(
+    results: List[Dict[str, Any]],
+    scenario: Optional[str] = None,
+    window_state: Optional[Dict[str, Dict[str, Any]]] = None,
+    aborted: Optional[Dict[str, Any]] = None,
+    evaluation: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Assemble the verdict JSON from final results and streaming state"""
+    for result in results:
+        result.update((window_state or {}).get(result["name"], {}))
+    return {
+        "scenario": scenario,
+        "passed": all(result["ok"] for result in results) and aborted is None,
+        "aborted": aborted is not None,
+        "abort": aborted,
+        "thresholds": results,
+        "evaluation": evaluation or {},
+        "evaluated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def write_verdict(verdict: Dict[str, Any], output: str):
+    """Write a verdict JSON file"""
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(verdict, f, indent=2)
+
+
+def verdict_path(scenario: str) -> str:
+    """Default verdict location of a scenario"""
+    return f"reports/{scenario}_threshold_verdict.json"
+
+
+def main():
+    """Command line entry point: evaluate a finished run's summary"""
+    parser = argparse.ArgumentParser(description="Evaluate performance thresholds against a load test summary")
+    parser.add_argument("summary", help="k6 / load engine / k6_ingest summary JSON")
+    parser.add_argument("--scenario", default=None, help="Scenario for per-scenario overrides")
+    parser.add_argument("--config", default="config/config.yaml", help="Configuration file")
+    parser.add_argument("--output", default=None, help="Verdict JSON path")
+    parser.add_argument("--no-fail", action="store_true", help="Exit 0 even when a threshold fails")
+    args = parser.parse_args()
+
+    with open(args.summary, "r") as f:
+        summary = json.load(f)
+    scenario = args.scenario or summary.get("scenario") or summary.get("engine", {}).get("scenario")
+    verdict = build_verdict(evaluate_summary(summary, load_thresholds(load_config(args.config), scenario)), scenario)
+    output = args.output or verdict_path(scenario or "load")
+    write_verdict(verdict, output)
+
+    for result in verdict["thresholds"]:
+        value = "n/a" if result["value"] is None else f"{result['value']:g}"
+        print(f"{'✅' if result['ok'] else '❌'} {result['expression']} (observed {value})")
+    print(f"{'✅ PASSED' if verdict['passed'] else '❌ FAILED'}: verdict written to {output}")
+    if not verdict["passed"] and not args.no_fail:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
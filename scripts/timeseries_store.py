@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+"""
+Columnar time-series store for load test results
+
+Every load run (Python engine or ingested k6 output) is kept as one segment
+of per-second buckets per endpoint tag: requests, errors, active VUs and a
+latency histogram. A segment is a directory of NumPy ``.npy`` columns plus a
+concatenated histogram blob file with an offsets column, so readers can
+memory-map it and slice without copying or re-parsing raw output.
+
+Segments older than ``downsample_after_days`` are rewritten at per-minute
+resolution (requests and errors summed, VUs maxed, histograms merged).
+
+    reports/timeseries/<scenario>/<run_id>-1s/
+        meta.json  time.npy  endpoint.npy  requests.npy  errors.npy
+        active_vus.npy  histogram_offsets.npy  histograms.bin
+
+    python scripts/timeseries_store.py list
+    python scripts/timeseries_store.py downsample --days 7
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.latency_histogram import LatencyHistogram, merge_histograms  # noqa: E402
+from scripts.perf_config import load_config  # noqa: E402
+
+DEFAULT_STORE_DIR = "reports/timeseries"
+DEFAULT_DOWNSAMPLE_AFTER_DAYS = 7
+DOWNSAMPLED_RESOLUTION = 60
+
+# Seconds a bucket histogram stays live for late samples before it is compressed
+LATENESS_SECONDS = 5
+
+COLUMNS = ("time", "endpoint", "requests", "errors", "active_vus", "histogram_offsets")
+
+
+def new_run_id(scenario: str) -> str:
+    """Sortable run identifier, e.g. 20240509-143045-stress"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{scenario}"
+
+
+class TimelineBucket:
+    """Counters and latency histogram of one endpoint in one time bucket"""
+
+    __slots__ = ("requests", "errors", "histogram", "blob")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.histogram: Optional[LatencyHistogram] = None
+        self.blob: Optional[bytes] = None
+
+    def live_histogram(self) -> LatencyHistogram:
+        """Histogram to record into, decompressing a compacted blob if needed"""
+        if self.histogram is None:
+            self.histogram = LatencyHistogram.from_bytes(self.blob) if self.blob else LatencyHistogram()
+            self.blob = None
+        return self.histogram
+
+    def compact(self):
+        """Replace the live histogram with its compressed blob"""
+        if self.histogram is not None:
+            self.blob = self.histogram.to_bytes()
+            self.histogram = None
+
+    def to_bytes(self) -> bytes:
+        """Serialized histogram (empty histogram when nothing was timed)"""
+        if self.histogram is not None:
+            return self.histogram.to_bytes()
+        return self.blob or LatencyHistogram().to_bytes()
+
+
+class TimelineRecorder:
+    """Record per-bucket, per-endpoint request counts, errors, VUs and latencies"""
+
+    def __init__(self, resolution: int = 1):
+        """
+        Initialize an empty timeline
+
+        Args:
+            resolution: Bucket width in seconds
+        """
+        self.resolution = max(int(resolution), 1)
+        self.buckets: Dict[Tuple[int, str], TimelineBucket] = {}
+        self.endpoints = set()
+        self.vus: Dict[int, int] = {}
+        self._live = set()
+        self._newest = -math.inf
+
+    def _bucket(self, start: int, endpoint: str) -> TimelineBucket:
+        key = (start, endpoint)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TimelineBucket()
+            self.endpoints.add(endpoint)
+        if start > self._newest:
+            self._newest = start
+            self._compact(start - LATENESS_SECONDS)
+        return bucket
+
+    def _compact(self, horizon: float):
+        for key in [key for key in self._live if key[0] < horizon]:
+            self.buckets[key].compact()
+            self._live.discard(key)
+
+    def _start(self, epoch: float) -> int:
+        return int(epoch // self.resolution) * self.resolution
+
+    def record(
+        self,
+        epoch: float,
+        endpoint: str,
+        duration_ms: Optional[float] = None,
+        failed: bool = False,
+        active_vus: Optional[int] = None,
+    ):
+        """
+        Record one request
+
+        Args:
+            epoch: Unix time of the request
+            endpoint: Endpoint tag, e.g. "GET /Signup"
+            duration_ms: Request duration (None when the request never completed)
+            failed: Whether the request counts as an error
+            active_vus: VUs active at that moment
+        """
+        start = self._start(epoch)
+        bucket = self._bucket(start, endpoint)
+        bucket.requests += 1
+        if failed:
+            bucket.errors += 1
+        if duration_ms is not None:
+            bucket.live_histogram().record(duration_ms)
+            self._live.add((start, endpoint))
+        if active_vus is not None and active_vus > self.vus.get(start, 0):
+            self.vus[start] = active_vus
+
+    def record_many(self, epochs: np.ndarray, endpoint: str, durations_ms: np.ndarray):
+        """
+        Record a batch of timed requests of one endpoint
+
+        Args:
+            epochs: Unix times
+            endpoint: Endpoint tag
+            durations_ms: Request durations
+        """
+        for start, selection in self._group(epochs):
+            bucket = self._bucket(start, endpoint)
+            bucket.requests += int(selection.size)
+            bucket.live_histogram().record_many(durations_ms[selection])
+            self._live.add((start, endpoint))
+
+    def record_errors(self, epochs: np.ndarray, endpoint: str, failed: np.ndarray):
+        """Add error flags (non-zero = failed) of one endpoint"""
+        for start, selection in self._group(epochs):
+            self._bucket(start, endpoint).errors += int(np.count_nonzero(failed[selection]))
+
+    def record_vus(self, epochs: np.ndarray, values: np.ndarray):
+        """Track the peak active VU gauge per bucket"""
+        for start, selection in self._group(epochs):
+            peak = int(values[selection].max())
+            if peak > self.vus.get(start, 0):
+                self.vus[start] = peak
+
+    def _group(self, epochs: np.ndarray):
+        starts = (np.asarray(epochs, dtype=np.float64) // self.resolution).astype(np.int64) * self.resolution
+        order = np.argsort(starts, kind="stable")
+        unique, offsets = np.unique(starts[order], return_index=True)
+        bounds = np.append(offsets, starts.size)
+        for i, start in enumerate(unique.tolist()):
+            yield start, order[bounds[i] : bounds[i + 1]]
+
+    def merge(self, other: "TimelineRecorder") -> "TimelineRecorder":
+        """
+        Add a parallel recorder (another worker) into this one
+
+        Args:
+            other: Recorder with the same resolution
+
+        Returns:
+            This recorder
+        """
+        for (start, endpoint), theirs in other.buckets.items():
+            bucket = self._bucket(start, endpoint)
+            bucket.requests += theirs.requests
+            bucket.errors += theirs.errors
+            if theirs.histogram is not None or theirs.blob:
+                histogram = theirs.histogram or LatencyHistogram.from_bytes(theirs.blob)
+                bucket.live_histogram().merge(histogram)
+                bucket.compact()
+        for start, vus in other.vus.items():
+            self.vus[start] = self.vus.get(start, 0) + vus
+        return self
+
+    def update(self, other: "TimelineRecorder") -> "TimelineRecorder":
+        """
+        Replace buckets with newer versions of the same recorder's buckets
+
+        Used by the coordinator to apply a worker's incremental snapshot.
+
+        Args:
+            other: Recorder holding the re-sent buckets
+
+        Returns:
+            This recorder
+        """
+        self.buckets.update(other.buckets)
+        self.endpoints.update(other.endpoints)
+        self.vus.update(other.vus)
+        return self
+
+    def tail(self, since: float) -> "TimelineRecorder":
+        """Read-only view of the buckets starting at or after ``since`` (buckets are shared)"""
+        recorder = TimelineRecorder(self.resolution)
+        recorder.buckets = {key: bucket for key, bucket in self.buckets.items() if key[0] >= since}
+        recorder.endpoints = {key[1] for key in recorder.buckets}
+        recorder.vus = {start: vus for start, vus in self.vus.items() if start >= since}
+        return recorder
+
+    def window(self, start: int) -> Dict[str, Any]:
+        """
+        Totals of one bucket across all endpoints
+
+        Args:
+            start: Bucket start time
+
+        Returns:
+            Dict with requests, errors, active_vus and the merged latency histogram
+        """
+        requests = errors = 0
+        histogram = LatencyHistogram()
+        for endpoint in self.endpoints:
+            bucket = self.buckets.get((start, endpoint))
+            if bucket is None:
+                continue
+            requests += bucket.requests
+            errors += bucket.errors
+            if bucket.histogram is not None:
+                histogram.merge(bucket.histogram)
+            elif bucket.blob:
+                histogram.merge(LatencyHistogram.from_bytes(bucket.blob))
+        return {"requests": requests, "errors": errors, "active_vus": self.vus.get(start, 0), "histogram": histogram}
+
+    def rows(self, since: Optional[float] = None) -> Iterable[Tuple[int, str, int, int, int, bytes]]:
+        """(time, endpoint, requests, errors, active VUs, histogram blob) in time order
+
+        Args:
+            since: Only buckets starting at or after this time
+        """
+        items = self.buckets.items()
+        if since is not None:
+            items = [(key, bucket) for key, bucket in items if key[0] >= since]
+        for (start, endpoint), bucket in sorted(items):
+            yield start, endpoint, bucket.requests, bucket.errors, self.vus.get(start, 0), bucket.to_bytes()
+
+    def snapshot(self, since: Optional[float] = None) -> Dict[str, Any]:
+        """Picklable form for shipping between processes (optionally only recent buckets)"""
+        return {"resolution": self.resolution, "rows": list(self.rows(since))}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> "TimelineRecorder":
+        """Rebuild a recorder from snapshot()"""
+        recorder = cls(snapshot["resolution"])
+        for start, endpoint, requests, errors, vus, blob in snapshot["rows"]:
+            bucket = recorder.buckets[(start, endpoint)] = TimelineBucket()
+            recorder.endpoints.add(endpoint)
+            bucket.requests, bucket.errors, bucket.blob = requests, errors, blob
+            if vus:
+                recorder.vus[start] = max(recorder.vus.get(start, 0), vus)
+        return recorder
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+
+class TimelineCursor:
+    """Hands out the buckets of a growing timeline once each, as they complete"""
+
+    def __init__(self, delay: float = 2):
+        """
+        Initialize the cursor
+
+        Args:
+            delay: Seconds a bucket is held back for samples that arrive late
+        """
+        self.delay = delay
+        self.position: Optional[int] = None
+
+    def advance(self, timeline: TimelineRecorder, now: Optional[float] = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Bucket starts completed since the previous call
+
+        Args:
+            timeline: Recorder of the running test
+            now: Current time on the timeline's clock (defaults to the local clock)
+            limit: Maximum buckets returned on the first call (the newest ones)
+
+        Returns:
+            Bucket start times in order
+        """
+        now = time.time() if now is None else now
+        resolution = timeline.resolution
+        complete = int((now - self.delay) // resolution) * resolution - resolution
+        if self.position is None:
+            if not timeline.buckets:
+                return []
+            first = min(key[0] for key in timeline.buckets)
+            if limit:
+                first = max(first, complete - (limit - 1) * resolution)
+        else:
+            first = self.position + resolution
+        self.position = max(complete, first - resolution)
+        return list(range(first, complete + 1, resolution))
+
+
+class Segment:
+    """Memory-mapped, read-only view of one stored run"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), "r") as f:
+            self.meta = json.load(f)
+        self.endpoints: List[str] = self.meta["endpoints"]
+        self.resolution: int = self.meta["resolution"]
+        rows = self.meta["rows"]
+        for column in COLUMNS:
+            array = np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r") if rows else np.zeros(
+                1 if column == "histogram_offsets" else 0, dtype=np.int64
+            )
+            setattr(self, column, array)
+        blob_path = os.path.join(path, "histograms.bin")
+        self.blobs = np.memmap(blob_path, dtype=np.uint8, mode="r") if os.path.getsize(blob_path) else b""
+
+    def __len__(self) -> int:
+        return int(self.meta["rows"])
+
+    def close(self):
+        """Drop the memory maps so the segment files can be removed (required on Windows)"""
+        for column in COLUMNS:
+            setattr(self, column, None)
+        self.blobs = b""
+
+    def histogram(self, row: int) -> LatencyHistogram:
+        """Latency histogram of one row (decoded straight from the mapped blob file)"""
+        start, end = int(self.histogram_offsets[row]), int(self.histogram_offsets[row + 1])
+        return LatencyHistogram.from_bytes(bytes(self.blobs[start:end]))
+
+    def _rows(self, endpoint: Optional[str]) -> np.ndarray:
+        if endpoint is None:
+            return np.arange(len(self))
+        if endpoint not in self.endpoints:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(np.asarray(self.endpoint) == self.endpoints.index(endpoint))
+
+    def latency(self, endpoint: Optional[str] = None) -> LatencyHistogram:
+        """Merged latency histogram of the whole run (or one endpoint)"""
+        return merge_histograms(self.histogram(row) for row in self._rows(endpoint))
+
+    def series(self, endpoint: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Per-bucket series across endpoints (or for one endpoint)
+
+        Returns:
+            Dict of equally long arrays: time, requests, rps, errors, active_vus, p95_ms
+        """
+        rows = self._rows(endpoint)
+        times = np.asarray(self.time)[rows]
+        unique, inverse = np.unique(times, return_inverse=True)
+        requests = np.bincount(inverse, weights=np.asarray(self.requests)[rows], minlength=unique.size)
+        errors = np.bincount(inverse, weights=np.asarray(self.errors)[rows], minlength=unique.size)
+        vus = np.zeros(unique.size, dtype=np.int64)
+        np.maximum.at(vus, inverse, np.asarray(self.active_vus)[rows])
+
+        p95 = np.zeros(unique.size)
+        for i in range(unique.size):
+            p95[i] = merge_histograms(self.histogram(row) for row in rows[inverse == i]).percentile(95)
+
+        return {
+            "time": unique,
+            "requests": requests.astype(np.int64),
+            "rps": requests / self.resolution,
+            "errors": errors.astype(np.int64),
+            "active_vus": vus,
+            "p95_ms": p95,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """k6-style summary of the run, for reports that expect summary JSON"""
+        total = int(np.sum(self.requests))
+        failed = int(np.sum(self.errors))
+        times = np.asarray(self.time)
+        duration = float(times.max() - times.min() + self.resolution) if len(self) else 0.0
+        latency = self.latency()
+        trend = latency.summary()
+        trend.pop("count")
+
+        endpoints = {}
+        for endpoint in self.endpoints:
+            rows = self._rows(endpoint)
+            histogram = self.latency(endpoint)
+            values = histogram.summary()
+            values.pop("count")
+            endpoints[endpoint] = {
+                "count": int(np.sum(np.asarray(self.requests)[rows])),
+                "failed": int(np.sum(np.asarray(self.errors)[rows])),
+                "http_req_duration": values,
+                "histogram": histogram.to_base64(),
+            }
+
+        return {
+            "metrics": {
+                "http_reqs": {"type": "counter", "values": {"count": total, "rate": total / duration if duration else 0.0}},
+                "http_req_failed": {
+                    "type": "rate",
+                    "values": {"rate": failed / total if total else 0.0, "passes": failed, "fails": total - failed, "count": failed},
+                },
+                "http_req_duration": {"type": "trend", "values": trend},
+                "vus_max": {"type": "gauge", "values": {"value": int(np.max(self.active_vus)) if len(self) else 0}},
+            },
+            "endpoints": endpoints,
+            "histograms": {"http_req_duration": latency.to_base64()},
+            "state": {"testRunDurationMs": duration * 1000.0},
+            "run": dict(self.meta),
+        }
+
+
+class TimeSeriesStore:
+    """Directory of run segments with per-second and downsampled per-minute data"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, downsample_after_days: Optional[float] = None):
+        """
+        Initialize the store
+
+        Args:
+            root: Store directory
+            downsample_after_days: Age after which runs are kept per minute (default from config)
+        """
+        settings = load_config().get("timeseries", {}) if downsample_after_days is None else {}
+        self.root = root
+        self.downsample_after_days = float(
+            settings.get("downsample_after_days", DEFAULT_DOWNSAMPLE_AFTER_DAYS)
+            if downsample_after_days is None
+            else downsample_after_days
+        )
+
+    def write_run(
+        self,
+        timeline: TimelineRecorder,
+        scenario: str,
+        run_id: Optional[str] = None,
+        source: str = "engine",
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Persist a run as a new segment
+
+        Args:
+            timeline: Recorded buckets
+            scenario: Scenario name
+            run_id: Run identifier (generated when omitted)
+            source: Producer of the data (engine, k6)
+            extra: Additional metadata
+
+        Returns:
+            Segment directory
+        """
+        run_id = run_id or new_run_id(scenario)
+        rows = list(timeline.rows())
+        started = rows[0][0] if rows else time.time()
+        meta = {
+            "run_id": run_id,
+            "scenario": scenario,
+            "source": source,
+            "resolution": timeline.resolution,
+            "started_at": started,
+            "created_at": time.time(),
+            **(extra or {}),
+        }
+        return self._write_segment(meta, rows)
+
+    def _write_segment(self, meta: Dict[str, Any], rows: List[Tuple]) -> str:
+        endpoints = sorted({row[1] for row in rows})
+        index = {endpoint: i for i, endpoint in enumerate(endpoints)}
+        meta = dict(meta, endpoints=endpoints, rows=len(rows))
+
+        name = f"{meta['run_id']}-{meta['resolution']}s"
+        directory = os.path.join(self.root, meta["scenario"])
+        final = os.path.join(directory, name)
+        staging = os.path.join(directory, f".{name}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        blobs = [row[5] for row in rows]
+        columns = {
+            "time": np.array([row[0] for row in rows], dtype=np.int64),
+            "endpoint": np.array([index[row[1]] for row in rows], dtype=np.int32),
+            "requests": np.array([row[2] for row in rows], dtype=np.int64),
+            "errors": np.array([row[3] for row in rows], dtype=np.int64),
+            "active_vus": np.array([row[4] for row in rows], dtype=np.int32),
+            "histogram_offsets": np.concatenate(([0], np.cumsum([len(b) for b in blobs]))).astype(np.int64),
+        }
+        for column, array in columns.items():
+            np.save(os.path.join(staging, f"{column}.npy"), array)
+        with open(os.path.join(staging, "histograms.bin"), "wb") as f:
+            for blob in blobs:
+                f.write(blob)
+        with open(os.path.join(staging, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(staging, final)
+        return final
+
+    def segments(self, scenario: Optional[str] = None) -> List[Segment]:
+        """All segments (optionally of one scenario), oldest run first"""
+        if not os.path.isdir(self.root):
+            return []
+        scenarios = [scenario] if scenario else sorted(os.listdir(self.root))
+        segments = []
+        for name in scenarios:
+            directory = os.path.join(self.root, name)
+            if not os.path.isdir(directory):
+                continue
+            for entry in sorted(os.listdir(directory)):
+                path = os.path.join(directory, entry)
+                if not entry.startswith(".") and os.path.exists(os.path.join(path, "meta.json")):
+                    segments.append(Segment(path))
+        return sorted(segments, key=lambda s: (s.meta["started_at"], s.meta["run_id"]))
+
+    def latest(self, scenario: str) -> Optional[Segment]:
+        """Most recent run of a scenario"""
+        segments = self.segments(scenario)
+        return segments[-1] if segments else None
+
+    def run_trend(self, scenario: str) -> List[Dict[str, Any]]:
+        """One row per stored run of a scenario: start time, requests, error rate, p95"""
+        trend = []
+        for segment in self.segments(scenario):
+            total = int(np.sum(segment.requests))
+            latency = segment.latency()
+            trend.append({
+                "run_id": segment.meta["run_id"],
+                "started_at": segment.meta["started_at"],
+                "requests": total,
+                "error_rate": int(np.sum(segment.errors)) / total if total else 0.0,
+                "p95_ms": latency.percentile(95),
+                "p99_ms": latency.percentile(99),
+                "resolution": segment.resolution,
+            })
+        return trend
+
+    def downsample(self, now: Optional[float] = None) -> List[str]:
+        """
+        Rewrite per-second segments older than the retention window per minute
+
+        Args:
+            now: Reference time (defaults to the current time)
+
+        Returns:
+            Paths of the rewritten segments
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.downsample_after_days * 86400
+        rewritten = []
+        for segment in self.segments():
+            if segment.resolution >= DOWNSAMPLED_RESOLUTION or segment.meta["started_at"] >= cutoff:
+                continue
+            rewritten.append(self._downsample_segment(segment))
+        return rewritten
+
+    def _downsample_segment(self, segment: Segment) -> str:
+        resolution = DOWNSAMPLED_RESOLUTION
+        minutes = (np.asarray(segment.time) // resolution) * resolution
+        endpoint_ids = np.array(segment.endpoint)
+
+        # Peak VUs per minute (VUs are shared by all endpoints of a bucket)
+        vus = {}
+        for minute, value in zip(minutes.tolist(), np.asarray(segment.active_vus).tolist()):
+            vus[minute] = max(vus.get(minute, 0), value)
+
+        rows = []
+        keys = sorted(set(zip(minutes.tolist(), endpoint_ids.tolist())))
+        for minute, endpoint_id in keys:
+            selection = np.flatnonzero((minutes == minute) & (endpoint_ids == endpoint_id))
+            histogram = merge_histograms(segment.histogram(row) for row in selection)
+            rows.append((
+                minute,
+                segment.endpoints[endpoint_id],
+                int(np.sum(np.asarray(segment.requests)[selection])),
+                int(np.sum(np.asarray(segment.errors)[selection])),
+                vus[minute],
+                histogram.to_bytes(),
+            ))
+
+        meta = {k: v for k, v in segment.meta.items() if k not in ("endpoints", "rows")}
+        meta.update(resolution=resolution, downsampled_at=time.time())
+        path = self._write_segment(meta, rows)
+        segment.close()
+        shutil.rmtree(segment.path, ignore_errors=True)
+        return path
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Load test time-series store")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help="Store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List stored runs")
+    downsample = commands.add_parser("downsample", help="Downsample old runs to per-minute buckets")
+    downsample.add_argument("--days", type=float, default=None, help="Age in days (default from config)")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        store = TimeSeriesStore(args.store)
+        for segment in store.segments():
+            meta = segment.meta
+            started = datetime.fromtimestamp(meta["started_at"]).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"{meta['scenario']:<10} {meta['run_id']:<28} {started}  "
+                  f"{segment.resolution:>3}s  {len(segment):>6} rows  {int(np.sum(segment.requests)):>9} requests")
+    else:
+        store = TimeSeriesStore(args.store, args.days)
+        rewritten = store.downsample()
+        print(f"✅ Downsampled {len(rewritten)} run(s) older than {store.downsample_after_days:g} days")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Bulk signup user data sampled with NumPy from Faker's provider lists
+
+Building users one at a time costs a handful of Faker calls each (and a new
+``Faker()`` per test costs far more). BulkUserGenerator reads Faker's name
+and domain lists once, then draws whole blocks of users at a time: names and
+domains are sampled by their Faker frequency weights and passwords are built
+as character matrices, so a million users take about four seconds. A block
+is columnar (one array per field); ``stream`` yields the rows of successive
+blocks for runs too large to hold.
+
+    generator = BulkUserGenerator(seed=7)
+    block = generator.block(1_000_000)           # {"first_name": array([...]), ...}
+    for user in generator.stream(5_000_000):     # one dict per user
+        ...
+
+Emails carry an identity of scripts/identities.py, so they are unique
+across runs, workers and generators. The per-test path shares one Faker
+instance per locale (``shared_faker``).
+
+A block can be exported as a k6 dataset (read by tests/load/*.js through
+USERS_FILE, which re-tag every email with the k6 run's identity):
+
+    python scripts/user_data.py --count 100000 --output reports/k6_users.json
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+from faker import Faker
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.identities import IdentityAllocator, shared_allocator  # noqa: E402
+
+DEFAULT_LOCALE = "en_US"
+DEFAULT_BATCH_SIZE = 100_000
+PASSWORD_LENGTH = 12
+EMAIL_PREFIX = "loadtest"
+
+# Character classes of a strong password; one of each is guaranteed
+PASSWORD_CLASSES = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "abcdefghijklmnopqrstuvwxyz",
+    "0123456789",
+    "!@#$%^&*()_+-=[]{}|;:,.<>?",
+)
+PASSWORD_FILL = PASSWORD_CLASSES[0] + PASSWORD_CLASSES[1] + PASSWORD_CLASSES[2]
+
+USER_FIELDS = ("first_name", "last_name", "email", "password")
+
+# Field names of the k6 scripts' user objects
+K6_FIELDS = {"first_name": "firstName", "last_name": "lastName", "email": "email", "password": "password"}
+
+
+@functools.lru_cache(maxsize=None)
+def shared_faker(locale: str = DEFAULT_LOCALE) -> Faker:
+    """Process-wide Faker instance of a locale, created on first use"""
+    return Faker(locale)
+
+
+def _provider_list(fake: Faker, name: str):
+    """A list (or frequency-weighted dict) attribute of the locale's providers"""
+    for provider in fake.get_providers():
+        if hasattr(provider, name):
+            return getattr(provider, name)
+    raise AttributeError(f"No Faker provider has {name!r}")
+
+
+def _weighted(values) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Values as an array, with normalized sampling weights when Faker weights them"""
+    if isinstance(values, dict):
+        weights = np.fromiter(values.values(), dtype=np.float64, count=len(values))
+        return np.array(list(values)), weights / weights.sum()
+    return np.array(list(values)), None
+
+
+@functools.lru_cache(maxsize=None)
+def name_pools(locale: str = DEFAULT_LOCALE) -> Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """First names, last names and reserved email domains of a locale, loaded once"""
+    fake = shared_faker(locale)
+    return {
+        "first_name": _weighted(_provider_list(fake, "first_names")),
+        "last_name": _weighted(_provider_list(fake, "last_names")),
+        "domain": _weighted(_provider_list(fake, "safe_domain_names")),
+    }
+
+
+def _email_part(names: np.ndarray) -> np.ndarray:
+    """Lower-case names with anything but letters and digits removed"""
+    return np.array(["".join(c for c in name.lower() if c.isalnum()) or "user" for name in names])
+
+
+class BulkUserGenerator:
+    """Vectorized generator of valid signup users
+
+    Args:
+        seed: Seed of the NumPy generator (None: fresh entropy)
+        locale: Faker locale of the name and domain lists
+        password_length: Length of every password (at least 4)
+        prefix: First part of every email address
+        allocator: Identity allocator of the emails (default: the process-wide one)
+        vu: Virtual user the identities are allocated to
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        locale: str = DEFAULT_LOCALE,
+        password_length: int = PASSWORD_LENGTH,
+        prefix: str = EMAIL_PREFIX,
+        allocator: Optional[IdentityAllocator] = None,
+        vu: int = 0,
+    ):
+        if password_length < len(PASSWORD_CLASSES):
+            raise ValueError(f"password_length must be at least {len(PASSWORD_CLASSES)}")
+        self.rng = np.random.default_rng(seed)
+        self.pools = name_pools(locale)
+        self.email_parts = {
+            field: _email_part(self.pools[field][0]) for field in ("first_name", "last_name")
+        }
+        self.password_length = password_length
+        self.prefix = prefix
+        self.allocator = allocator or shared_allocator()
+        self.vu = vu
+
+    def _sample(self, field: str, count: int) -> np.ndarray:
+        """Indexes into a pool, drawn by the pool's weights"""
+        values, weights = self.pools[field]
+        return self.rng.choice(len(values), size=count, p=weights)
+
+    def passwords(self, count: int) -> np.ndarray:
+        """
+        Strong passwords, one per row
+
+        Every password holds an upper-case letter, a lower-case letter, a digit
+        and a special character, at shuffled positions.
+        """
+        length = self.password_length
+        fill = np.array(list(PASSWORD_FILL))
+        characters = fill[self.rng.integers(len(fill), size=(count, length))]
+        for column, chars in enumerate(PASSWORD_CLASSES):
+            pool = np.array(list(chars))
+            characters[:, column] = pool[self.rng.integers(len(pool), size=count)]
+        # Shuffle each row by sorting random keys
+        order = np.argsort(self.rng.random((count, length)), axis=1)
+        characters = np.ascontiguousarray(np.take_along_axis(characters, order, axis=1))
+        return characters.view(f"<U{length}").ravel()
+
+    def emails(self, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+        """Emails tagged with freshly allocated identities"""
+        count = len(first)
+        domains = self.pools["domain"][0][self._sample("domain", count)]
+        # One f-string per row beats chained np.char.add calls by about 6x
+        return np.array([
+            f"{self.prefix}_{first_name}.{last_name}+{token}@{domain}"
+            for first_name, last_name, token, domain in zip(
+                self.email_parts["first_name"][first].tolist(),
+                self.email_parts["last_name"][last].tolist(),
+                self.allocator.tokens(count, self.vu),
+                domains.tolist(),
+            )
+        ])
+
+    def block(self, count: int) -> Dict[str, np.ndarray]:
+        """
+        A block of users as columns
+
+        Returns:
+            first_name, last_name, email and password arrays of count entries
+        """
+        first = self._sample("first_name", count)
+        last = self._sample("last_name", count)
+        block = {
+            "first_name": self.pools["first_name"][0][first],
+            "last_name": self.pools["last_name"][0][last],
+            "email": self.emails(first, last),
+            "password": self.passwords(count),
+        }
+        return block
+
+    def stream(self, count: int, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, str]]:
+        """Users one dict at a time, generated a block of batch_size at a time"""
+        remaining = count
+        while remaining > 0:
+            block = self.block(min(batch_size, remaining))
+            remaining -= len(block["email"])
+            for row in zip(*(block[field].tolist() for field in USER_FIELDS)):
+                yield dict(zip(USER_FIELDS, row))
+
+
+def export_k6_users(path: str, count: int, seed: Optional[int] = None) -> str:
+    """
+    Write users as the JSON array the k6 scripts load through USERS_FILE
+
+    Returns:
+        The written path
+    """
+    block = BulkUserGenerator(seed=seed).block(count)
+    columns = {K6_FIELDS[field]: block[field].tolist() for field in USER_FIELDS}
+    columns["confirmPassword"] = columns["password"]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([dict(zip(columns, row)) for row in zip(*columns.values())], f)
+    return path
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Export generated signup users as a k6 dataset")
+    parser.add_argument("--count", type=int, default=10_000, help="Number of users")
+    parser.add_argument("--output", default="reports/k6_users.json", help="Dataset path")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the names and passwords")
+    args = parser.parse_args()
+
+    export_k6_users(args.output, args.count, args.seed)
+    print(f"✅ Wrote {args.count} users to {args.output} (run {shared_allocator().run})")
+
+
+if __name__ == "__main__":
+    main()
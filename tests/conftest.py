@@ -31,3 +31,32 @@ def browser(request):
 def headless(request):
     """Fixture to get headless mode from command line"""
     return request.config.getoption("--headless")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Persist browser timing histograms collected by the page objects"""
+    from tests.functional.utils.test_helpers import get_browser_timings
+
+    timings = get_browser_timings()
+    if timings.histograms:
+        timings.save()
+
+
+# Tests whose failure log was written in this session; later failed phases are appended to it
+_logged_tests = set()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keep the failure and captured output of failed tests as a log artifact"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed:
+        from scripts.artifact_manifest import save_test_log
+
+        sections = [f"===== {report.when} =====", report.longreprtext] + [
+            f"----- {title} -----\n{content}" for title, content in report.sections
+        ]
+        append = report.nodeid in _logged_tests
+        _logged_tests.add(report.nodeid)
+        save_test_log(report.nodeid, "\n\n".join(sections), report.outcome, append=append)
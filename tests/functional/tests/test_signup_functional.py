@@ -72,8 +72,8 @@ class TestSignupFunctional:
 
         except Exception as e:
             # Capture screenshot on failure
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Valid signup test failed: {e}")
             raise
@@ -110,8 +110,8 @@ class TestSignupFunctional:
             self.logger.info("Empty first name validation test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Empty first name validation test failed: {e}")
             raise
@@ -144,8 +144,8 @@ class TestSignupFunctional:
             self.logger.info("Empty last name validation test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Empty last name validation test failed: {e}")
             raise
@@ -176,8 +176,8 @@ class TestSignupFunctional:
             self.logger.info("Invalid email validation test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Invalid email validation test failed: {e}")
             raise
@@ -208,8 +208,8 @@ class TestSignupFunctional:
             self.logger.info("Weak password validation test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Weak password validation test failed: {e}")
             raise
@@ -243,8 +243,8 @@ class TestSignupFunctional:
             self.logger.info("Mismatched passwords validation test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Mismatched passwords validation test failed: {e}")
             raise
@@ -275,8 +275,8 @@ class TestSignupFunctional:
             self.logger.info("Terms and conditions required test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Terms and conditions required test failed: {e}")
             raise
@@ -307,8 +307,8 @@ class TestSignupFunctional:
             self.logger.info("Privacy policy required test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Privacy policy required test failed: {e}")
             raise
@@ -340,8 +340,8 @@ class TestSignupFunctional:
             self.logger.info("Duplicate email handling test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Duplicate email handling test failed: {e}")
             raise
@@ -368,8 +368,8 @@ class TestSignupFunctional:
             self.logger.info("Form field requirements test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Form field requirements test failed: {e}")
             raise
@@ -397,8 +397,8 @@ class TestSignupFunctional:
             self.logger.info("Password strength indicator test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Password strength indicator test failed: {e}")
             raise
@@ -444,8 +444,8 @@ class TestSignupFunctional:
             self.logger.info("Form clear functionality test passed")
 
         except Exception as e:
-            self.screenshot_manager.capture_screenshot(
-                self.signup_page.driver, test_name, "failed"
+            self.screenshot_manager.capture_failure(
+                self.signup_page.driver, test_name
             )
             self.logger.error(f"Form clear functionality test failed: {e}")
             raise
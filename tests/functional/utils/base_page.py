@@ -28,6 +28,8 @@ from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
 import os
 from datetime import datetime
+from scripts.artifact_manifest import record_artifact
+from tests.functional.utils.test_helpers import get_browser_timings
 
 
 class BasePage:
@@ -329,12 +331,21 @@ class BasePage:
         self.actions.move_to_element(element).perform()
         self.logger.info(f"Hovered over element: {locator}")
 
-    def take_screenshot(self, filename=None):
+    def _artifact_path(self, filename):
+        """Path of an artifact file in the configured screenshot directory"""
+        screenshot_dir = self.config.get("screenshots", {}).get(
+            "directory", "screenshots"
+        )
+        os.makedirs(screenshot_dir, exist_ok=True)
+        return os.path.join(screenshot_dir, filename)
+
+    def take_screenshot(self, filename=None, status=None):
         """
-        Take screenshot
+        Take screenshot and record it in the artifact manifest
 
         Args:
             filename: Screenshot filename
+            status: Test status the screenshot documents (e.g. "failed")
 
         Returns:
             Screenshot path
@@ -343,16 +354,34 @@ class BasePage:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"screenshot_{timestamp}.png"
 
-        screenshot_dir = self.config.get("screenshots", {}).get(
-            "directory", "screenshots"
-        )
-        os.makedirs(screenshot_dir, exist_ok=True)
-
-        screenshot_path = os.path.join(screenshot_dir, filename)
+        screenshot_path = self._artifact_path(filename)
         self.driver.save_screenshot(screenshot_path)
+        record_artifact(screenshot_path, "screenshot", status=status)
         self.logger.info(f"Screenshot saved: {screenshot_path}")
         return screenshot_path
 
+    def save_dom_snapshot(self, filename=None, status=None):
+        """
+        Save the page source and record it in the artifact manifest
+
+        Args:
+            filename: Snapshot filename
+            status: Test status the snapshot documents (e.g. "failed")
+
+        Returns:
+            Snapshot path
+        """
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"dom_{timestamp}.html"
+
+        snapshot_path = self._artifact_path(filename)
+        with open(snapshot_path, "w", encoding="utf-8") as f:
+            f.write(self.driver.page_source)
+        record_artifact(snapshot_path, "dom", status=status)
+        self.logger.info(f"DOM snapshot saved: {snapshot_path}")
+        return snapshot_path
+
     def get_page_title(self):
         """Get page title"""
         return self.driver.title
@@ -368,7 +397,11 @@ class BasePage:
         Args:
             url: URL to navigate to
         """
+        started = time.perf_counter()
         self.driver.get(url)
+        get_browser_timings().record_navigation(
+            self.driver, (time.perf_counter() - started) * 1000.0
+        )
         self.logger.info(f"Navigated to: {url}")
 
     def refresh_page(self):
@@ -9,15 +9,20 @@ import random
 import string
 import logging
 from datetime import datetime
-from faker import Faker
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from scripts.artifact_manifest import record_artifact
+from scripts.identities import unique_email
+from scripts.latency_histogram import LatencyHistogram
+from scripts.report_rendering import render, render_to_file
+from scripts.user_data import BulkUserGenerator, shared_faker
 
 
 class TestDataGenerator:
     """Generate test data for SwiftAssess testing"""
 
     def __init__(self):
-        self.fake = Faker()
+        self.fake = shared_faker()
         self.logger = logging.getLogger(__name__)
 
     def generate_valid_user_data(self) -> Dict[str, Any]:
@@ -25,7 +30,7 @@ class TestDataGenerator:
         return {
             "first_name": self.fake.first_name(),
             "last_name": self.fake.last_name(),
-            "email": self.fake.email(),
+            "email": unique_email(self.fake.email()),
             "password": self._generate_strong_password(),
             "confirm_password": "",  # Will be set to same as password
             "accept_terms": True,
@@ -37,7 +42,7 @@ class TestDataGenerator:
         base_data = {
             "first_name": self.fake.first_name(),
             "last_name": self.fake.last_name(),
-            "email": self.fake.email(),
+            "email": unique_email(self.fake.email()),
             "password": self._generate_strong_password(),
             "confirm_password": "",
             "accept_terms": True,
@@ -78,13 +83,13 @@ class TestDataGenerator:
         )
         return "".join(random.sample(password, len(password)))
 
-    def generate_bulk_user_data(self, count: int) -> List[Dict[str, Any]]:
-        """Generate bulk user data for load testing"""
+    def generate_bulk_user_data(self, count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Generate bulk user data for load testing (see scripts/user_data.py)"""
         users = []
-        for _ in range(count):
-            user = self.generate_valid_user_data()
-            # Ensure unique emails
-            user["email"] = f"loadtest_{random.randint(10000, 99999)}@example.com"
+        for user in BulkUserGenerator(seed=seed).stream(count):
+            user["confirm_password"] = user["password"]
+            user["accept_terms"] = True
+            user["accept_privacy"] = True
             users.append(user)
         return users
 
@@ -135,21 +140,28 @@ class TestDataManager:
 
 
 class ScreenshotManager:
-    """Manage screenshot capture and storage"""
+    """Manage screenshot capture and storage
+
+    Every capture is recorded in the artifact manifest under the running
+    test's nodeid, so the reports can link it (see scripts/artifact_manifest.py).
+    """
 
     def __init__(self, screenshot_dir: str = "screenshots"):
         self.screenshot_dir = screenshot_dir
         self.logger = logging.getLogger(__name__)
         os.makedirs(screenshot_dir, exist_ok=True)
 
+    def _artifact_path(self, test_name: str, status: str, suffix: str) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        return os.path.join(self.screenshot_dir, f"{test_name}_{status}{suffix}_{timestamp}")
+
     def capture_screenshot(self, driver, test_name: str, status: str = "info"):
         """Capture screenshot with timestamp and test info"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-        filename = f"{test_name}_{status}_{timestamp}.png"
-        filepath = os.path.join(self.screenshot_dir, filename)
+        filepath = self._artifact_path(test_name, status, "") + ".png"
 
         try:
             driver.save_screenshot(filepath)
+            record_artifact(filepath, "screenshot", status=status)
             self.logger.info(f"Screenshot captured: {filepath}")
             return filepath
         except Exception as e:
@@ -160,18 +172,112 @@ class ScreenshotManager:
         self, driver, element, test_name: str, status: str = "info"
     ):
         """Capture screenshot of specific element"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-        filename = f"{test_name}_{status}_element_{timestamp}.png"
-        filepath = os.path.join(self.screenshot_dir, filename)
+        filepath = self._artifact_path(test_name, status, "_element") + ".png"
 
         try:
             element.screenshot(filepath)
+            record_artifact(filepath, "screenshot", status=status)
             self.logger.info(f"Element screenshot captured: {filepath}")
             return filepath
         except Exception as e:
             self.logger.error(f"Failed to capture element screenshot: {e}")
             return None
 
+    def capture_dom_snapshot(self, driver, test_name: str, status: str = "info"):
+        """Save the page source with timestamp and test info"""
+        filepath = self._artifact_path(test_name, status, "_dom") + ".html"
+
+        try:
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(driver.page_source)
+            record_artifact(filepath, "dom", status=status)
+            self.logger.info(f"DOM snapshot captured: {filepath}")
+            return filepath
+        except Exception as e:
+            self.logger.error(f"Failed to capture DOM snapshot: {e}")
+            return None
+
+    def capture_failure(self, driver, test_name: str):
+        """Capture the screenshot and DOM snapshot of a failed test"""
+        return {
+            "screenshot": self.capture_screenshot(driver, test_name, "failed"),
+            "dom": self.capture_dom_snapshot(driver, test_name, "failed"),
+        }
+
+
+class BrowserTimingCollector:
+    """Collect browser page timings into mergeable latency histograms"""
+
+    # Navigation Timing Level 2 milestones, relative to the navigation start
+    NAVIGATION_TIMING_SCRIPT = """
+        const entry = performance.getEntriesByType('navigation')[0];
+        if (!entry) { return null; }
+        return {
+            ttfb: entry.responseStart,
+            dom_content_loaded: entry.domContentLoadedEventEnd,
+            page_load: entry.loadEventEnd,
+        };
+    """
+
+    def __init__(self, report_dir: str = "reports"):
+        self.report_dir = report_dir
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def record(self, name: str, duration_ms: float):
+        """Record one timing in milliseconds under the given metric name"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(duration_ms)
+
+    def record_navigation(self, driver, navigation_ms: float):
+        """Record the wall-clock navigation time and the browser's own milestones"""
+        self.record("navigation", navigation_ms)
+        try:
+            milestones = driver.execute_script(self.NAVIGATION_TIMING_SCRIPT)
+        except Exception as e:
+            self.logger.debug(f"Navigation timing unavailable: {e}")
+            return
+        for name, value in (milestones or {}).items():
+            if value and value > 0:
+                self.record(name, value)
+
+    def save(self, filename: Optional[str] = None) -> str:
+        """
+        Write the histograms to a JSON file the report generators can merge
+
+        Args:
+            filename: Output file name (one file per xdist worker by default)
+
+        Returns:
+            Path of the written file
+        """
+        if not filename:
+            worker = os.environ.get("PYTEST_XDIST_WORKER")
+            filename = f"browser_timings.{worker}.json" if worker else "browser_timings.json"
+
+        os.makedirs(self.report_dir, exist_ok=True)
+        filepath = os.path.join(self.report_dir, filename)
+        payload = {
+            "generated_at": datetime.now().isoformat(),
+            "histograms": {name: h.to_base64() for name, h in self.histograms.items()},
+            "summary": {name: h.summary() for name, h in self.histograms.items()},
+        }
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+
+        self.logger.info(f"Browser timings saved: {filepath}")
+        return filepath
+
+
+_browser_timings = BrowserTimingCollector()
+
+
+def get_browser_timings() -> BrowserTimingCollector:
+    """Process-wide browser timing collector shared by all page objects"""
+    return _browser_timings
+
 
 class RetryMechanism:
     """Implement retry mechanism for flaky tests"""
@@ -219,79 +325,30 @@ class TestReportGenerator:
 
         filepath = os.path.join(self.report_dir, filename)
 
-        html_content = self._generate_html_content(test_results)
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        render_to_file("test_report.html", filepath, **self._report_context(test_results))
 
         self.logger.info(f"HTML report generated: {filepath}")
         return filepath
 
-    def _generate_html_content(self, test_results: List[Dict]) -> str:
-        """Generate HTML content for test report"""
+    def _report_context(self, test_results: List[Dict]) -> Dict[str, Any]:
+        """Template variables of the test report"""
         total_tests = len(test_results)
         passed_tests = len([r for r in test_results if r.get("status") == "PASSED"])
         failed_tests = len([r for r in test_results if r.get("status") == "FAILED"])
-        pass_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>SwiftAssess Test Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background-color: #f0f0f0; padding: 20px; border-radius: 5px; }}
-                .summary {{ margin: 20px 0; }}
-                .test-case {{ margin: 10px 0; padding: 10px; border: 1px solid #ddd; border-radius: 3px; }}
-                .passed {{ background-color: #d4edda; }}
-                .failed {{ background-color: #f8d7da; }}
-                .screenshot {{ max-width: 300px; margin: 10px 0; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>SwiftAssess Test Report</h1>
-                <p>Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-            </div>
-            
-            <div class="summary">
-                <h2>Test Summary</h2>
-                <p><strong>Total Tests:</strong> {total_tests}</p>
-                <p><strong>Passed:</strong> {passed_tests}</p>
-                <p><strong>Failed:</strong> {failed_tests}</p>
-                <p><strong>Pass Rate:</strong> {pass_rate:.1f}%</p>
-            </div>
-            
-            <div class="test-results">
-                <h2>Test Results</h2>
-        """
-
-        for result in test_results:
-            status_class = "passed" if result.get("status") == "PASSED" else "failed"
-            html += f"""
-                <div class="test-case {status_class}">
-                    <h3>{result.get('name', 'Unknown Test')}</h3>
-                    <p><strong>Status:</strong> {result.get('status', 'UNKNOWN')}</p>
-                    <p><strong>Duration:</strong> {result.get('duration', 'N/A')}s</p>
-                    <p><strong>Description:</strong> {result.get('description', 'No description')}</p>
-            """
-
-            if result.get("error"):
-                html += f"<p><strong>Error:</strong> {result.get('error')}</p>"
-
-            if result.get("screenshot"):
-                html += f'<img src="{result.get("screenshot")}" class="screenshot" alt="Screenshot">'
-
-            html += "</div>"
-
-        html += """
-            </div>
-        </body>
-        </html>
-        """
+        return {
+            "generated_on": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "summary": {
+                "total": total_tests,
+                "passed": passed_tests,
+                "failed": failed_tests,
+                "pass_rate": (passed_tests / total_tests * 100) if total_tests > 0 else 0,
+            },
+            "results": test_results,
+        }
 
-        return html
+    def _generate_html_content(self, test_results: List[Dict]) -> str:
+        """Generate HTML content for test report"""
+        return render("test_report.html", **self._report_context(test_results))
 
 
 class DeviceManager:
@@ -6,6 +6,8 @@
 import http from 'k6/http';
 import { check, sleep } from 'k6';
 import { Rate, Trend } from 'k6/metrics';
+import { SharedArray } from 'k6/data';
+import exec from 'k6/execution';
 
 // Custom metrics
 const errorRate = new Rate('errors');
@@ -28,7 +30,7 @@ export const options = {
 };
 
 // Test data
-const testUsers = [
+const fallbackUsers = [
   {
     firstName: 'John',
     lastName: 'Doe',
@@ -66,17 +68,36 @@ const testUsers = [
   }
 ];
 
+// Generated users (python scripts/user_data.py --output <file>), loaded once and shared by all VUs
+const testUsers = __ENV.USERS_FILE
+  ? new SharedArray('users', () => JSON.parse(open(__ENV.USERS_FILE)))
+  : fallbackUsers;
+
 // Base URL
 const BASE_URL = 'https://app-stg.swiftassess.com';
 
-export default function () {
-  // Select random user data
-  const user = testUsers[Math.floor(Math.random() * testUsers.length)];
-  
-  // Add unique timestamp to email to avoid duplicates
-  const timestamp = Date.now();
-  const randomSuffix = Math.floor(Math.random() * 100000);
-  const uniqueEmail = user.email.replace('@', `+${timestamp}${randomSuffix}@`);
+// Run id shared by every VU: SWIFTASSESS_RUN_ID as in scripts/identities.py, else made once
+// here, plus a nonce per test run like scoped_run_id, so scripts run one after another in
+// the same pipeline run never repeat an email
+export function setup() {
+  const run = (__ENV.SWIFTASSESS_RUN_ID || Date.now().toString(36)).toLowerCase().replace(/[^a-z0-9]/g, '');
+  const nonce = Math.floor(Math.random() * 36 ** 6).toString(36).padStart(6, '0');
+  return { runId: run + nonce };
+}
+
+// run-worker-vu-counter identity of scripts/identities.py; k6 VU ids are unique across
+// the whole test (and its instances), so the worker part is always 0
+function taggedEmail(email, runId) {
+  const tag = [0, exec.vu.idInTest, exec.vu.iterationInScenario].map((n) => n.toString(36)).join('-');
+  const [local, domain] = email.split('@');
+  return `${local.split('+')[0]}+${runId}-${tag}@${domain}`;
+}
+
+export default function (data) {
+  // Each iteration takes the next user, re-tagged with this test run's identity, so a
+  // dataset can be reused across runs without repeating an email
+  const user = testUsers[exec.scenario.iterationInTest % testUsers.length];
+  const uniqueEmail = taggedEmail(user.email, data.runId);
   
   // Test 1: Load signup page
   console.log(`[VU ${__VU}] Loading signup page...`);
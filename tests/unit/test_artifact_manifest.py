@@ -0,0 +1,102 @@
+"""
+Unit tests for the test artifact manifest
+"""
+
+import os
+
+import pytest
+
+from scripts.artifact_manifest import ArtifactIndex, current_nodeid, load_artifact_index, record_artifact, save_test_log
+from scripts.generate_combined_report import failed_test_artifacts
+from scripts.identities import RUN_ID_ENV, run_id
+
+NODEID = "tests/functional/tests/test_signup.py::TestSignup::test_signup_valid"
+
+
+def entry(kind, path, status="failed", time=1.0, nodeid=NODEID, run="run1"):
+    """Manifest entry"""
+    return {"nodeid": nodeid, "kind": kind, "path": path, "status": status, "time": time, "run": run}
+
+
+class TestRecordArtifact:
+    """Tests for appending artifacts while tests run"""
+
+    @pytest.mark.unit
+    def test_entries_are_keyed_by_the_running_test(self, tmp_path, monkeypatch):
+        """Captures are recorded under the running test's nodeid and read back by kind; a later failed phase is appended"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv(RUN_ID_ENV, "")
+        manifest = "reports/artifacts.jsonl"
+
+        recorded = record_artifact("screenshots/shot.png", "screenshot", status="failed", manifest=manifest)
+        record_artifact("screenshots/page.html", "dom", nodeid=NODEID, status="failed", manifest=manifest)
+        log = save_test_log(NODEID, "AssertionError: signup button missing", directory="reports/logs", manifest=manifest)
+        save_test_log(NODEID, "teardown: driver gone", directory="reports/logs", manifest=manifest, append=True)
+        with open(manifest, "a") as f:
+            f.write('{"nodeid": "cut short')
+
+        index = load_artifact_index(manifest)
+
+        assert recorded["nodeid"] == current_nodeid() == os.environ["PYTEST_CURRENT_TEST"].rsplit(" ", 1)[0]
+        assert recorded["run"] == run_id()
+        assert index.path(recorded["nodeid"]) == os.path.join("screenshots", "shot.png")
+        assert index.artifacts(NODEID) == {"dom": os.path.join("screenshots", "page.html"), "log": log}
+        assert open(log).read() == "AssertionError: signup button missing\n\nteardown: driver gone"
+        with open(manifest) as f:
+            assert sum('"kind":"log"' in line for line in f) == 1
+        with pytest.raises(ValueError):
+            record_artifact("video.mp4", "video", manifest=manifest)
+
+    @pytest.mark.unit
+    def test_no_test_no_entry(self, tmp_path, monkeypatch):
+        """Captures outside a test are not recorded"""
+        monkeypatch.delenv("PYTEST_CURRENT_TEST")
+
+        assert record_artifact("shot.png", manifest=str(tmp_path / "artifacts.jsonl")) is None
+        assert not (tmp_path / "artifacts.jsonl").exists()
+
+
+class TestArtifactIndex:
+    """Tests for resolving the artifacts of a failed test"""
+
+    @pytest.mark.unit
+    def test_failure_captures_win(self):
+        """A failure capture beats later informational ones, and the latest failure capture wins"""
+        index = ArtifactIndex([
+            entry("screenshot", "screenshots/first_failed.png", time=1.0),
+            entry("screenshot", "screenshots/second_failed.png", time=2.0),
+            entry("screenshot", "screenshots/after_info.png", status="info", time=3.0),
+        ])
+
+        assert index.path(NODEID) == "screenshots/second_failed.png"
+        assert index.path(NODEID, "log") is None and index.path("tests/other.py::test_x") is None
+
+    @pytest.mark.unit
+    def test_latest_run_of_each_test(self):
+        """A test's artifacts come from its latest run, and other tests keep theirs"""
+        other = "tests/functional/tests/test_login.py::test_login"
+        index = ArtifactIndex([
+            entry("screenshot", "screenshots/old_failed.png", run="run1"),
+            entry("log", "reports/logs/old.log", run="run1"),
+            entry("screenshot", "screenshots/login_failed.png", nodeid=other, run="run1"),
+            entry("screenshot", "screenshots/new_info.png", status="info", time=2.0, run="run2"),
+            entry("screenshot", "screenshots/late_write.png", time=3.0, run="run1"),
+        ])
+
+        assert index.artifacts(NODEID) == {"screenshot": "screenshots/new_info.png"}
+        assert index.path(other) == "screenshots/login_failed.png"
+
+    @pytest.mark.unit
+    def test_combined_report_links(self):
+        """Failed tests link their artifacts relative to the report and are capped"""
+        failures = [
+            {"suite": "smoke", "nodeid": NODEID, "message": "self = <...>\nE   AssertionError: button missing"},
+            {"suite": "smoke", "nodeid": "tests/test_title.py::test_title", "message": None},
+        ]
+        index = ArtifactIndex([entry("screenshot", "screenshots/shot.png"), entry("log", "reports/logs/signup.log")])
+
+        rows, total = failed_test_artifacts(failures, index, limit=1, base="reports")
+
+        assert total == 2 and len(rows) == 1
+        assert rows[0]["message"] == "E   AssertionError: button missing"
+        assert rows[0]["links"] == {"screenshot": "../screenshots/shot.png", "log": "logs/signup.log"}
@@ -0,0 +1,126 @@
+"""
+Unit tests for the persistent bug fingerprint index
+"""
+
+import time
+
+import pytest
+
+from scripts.bug_index import BugIndex
+from scripts.generate_bug_report import track_bugs
+
+
+def cluster(*signatures, occurrences=1, title=None):
+    """Failure cluster as the bug report hands it to the index"""
+    return {"signatures": list(signatures), "occurrences": occurrences, "title": title}
+
+
+def bug_rows(*signatures, suites=("smoke",)):
+    """Bug report rows with one failure each, in the suite at the same position (or the last suite)"""
+    return [{"Bug ID": f"BUG-{i:03d}", "Test Name": f"test_{s}", "Error Message": f"Error {s}", "Occurrences": 1,
+             "Signatures": [s], "Suites": {suites[min(i, len(suites)) - 1]: 1}} for i, s in enumerate(signatures, 1)]
+
+
+def run(suite, created):
+    """Latest run of a suite as current_runs lists it"""
+    return {"suite": suite, "key": f"pytest:{suite}:{created}", "created": created}
+
+
+@pytest.fixture
+def index():
+    """In-memory bug index"""
+    with BugIndex(":memory:") as bug_index:
+        yield bug_index
+
+
+class TestBugIndex:
+    """Tests for stable IDs and bug status across runs"""
+
+    @pytest.mark.unit
+    def test_ids_are_stable_across_runs(self, index):
+        """A signature keeps its bug ID, and a drifted cluster keeps the ID of any signature it shares"""
+        first = index.ingest("run-1", [cluster("aaa", occurrences=3, title="test_signup"), cluster("bbb")], seen_at=100)
+        second = index.ingest("run-2", [cluster("ccc"), cluster("bbb", "ddd", occurrences=2)], seen_at=200)
+
+        assert [bug["label"] for bug in first["bugs"]] == ["BUG-001", "BUG-002"]
+        assert [bug["label"] for bug in second["bugs"]] == ["BUG-003", "BUG-002"]
+        assert [bug["status"] for bug in second["bugs"]] == ["new", "recurring"]
+        assert [bug["label"] for bug in second["resolved"]] == ["BUG-001"]
+        assert second["resolved"][0]["title"] == "test_signup" and second["resolved"][0]["last_seen_at"] == 100
+
+        recurring = index.bug(2)
+        assert recurring["signatures"] == ["bbb", "ddd"] and recurring["occurrences"] == 3
+        assert recurring["first_seen_run"] == "run-1" and recurring["last_seen_run"] == "run-2"
+
+    @pytest.mark.unit
+    def test_reingesting_a_run_replaces_it(self, index):
+        """The same run ingested twice is counted once, and a bug that fails again after resolving recurs"""
+        index.ingest("run-1", [cluster("aaa", occurrences=2)], seen_at=100)
+        index.ingest("run-2", [], seen_at=200)
+        assert index.bugs("resolved")[0]["resolved_run"] == "run-2"
+
+        index.ingest("run-3", [cluster("aaa", occurrences=4)], seen_at=300)
+        again = index.ingest("run-3", [cluster("aaa", occurrences=4)], seen_at=300)
+
+        bug = again["bugs"][0]
+        assert bug["status"] == "recurring" and bug["runs_seen"] == 2 and bug["occurrences"] == 6
+        assert again["resolved"] == []
+
+    @pytest.mark.unit
+    def test_thousands_of_failures(self, index):
+        """Ingesting a run with 5,000 clusters over a populated index stays fast"""
+        index.ingest("run-1", [cluster(f"sig-{i}", f"alt-{i}") for i in range(5000)], seen_at=100)
+
+        start = time.perf_counter()
+        result = index.ingest("run-2", [cluster(f"alt-{i}", f"new-{i}") for i in range(2500, 7500)], seen_at=200)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 2.0
+        assert sum(bug["status"] == "recurring" for bug in result["bugs"]) == 2500
+        assert len(result["resolved"]) == 2500 and len(index.bugs()) == 7500
+
+
+class TestTrackBugs:
+    """Tests for stable IDs on bug report rows"""
+
+    @pytest.mark.unit
+    def test_rows_get_index_ids(self, index):
+        """Bug rows take their ID, status and history from the index; resolved bugs are listed"""
+        track_bugs(bug_rows("aaa", "bbb"), [run("smoke", 100)], index)
+        rows = bug_rows("bbb", "ccc")
+        resolved = track_bugs(rows, [run("smoke", 200)], index)
+
+        assert [(row["Bug ID"], row["Bug Status"], row["Runs Seen"]) for row in rows] == [
+            ("BUG-002", "Recurring", 2), ("BUG-003", "New", 1),
+        ]
+        assert [(bug["Bug ID"], bug["Test Name"]) for bug in resolved] == [("BUG-001", "test_aaa")]
+        assert track_bugs(rows, [], index) == []
+
+    @pytest.mark.unit
+    def test_new_bug_in_two_suites_at_once(self, index):
+        """A bug failing in two suites of the same run is new, and recurs in the next run"""
+        rows = [{**bug_rows("aaa")[0], "Suites": {"smoke": 1, "regression": 2}}]
+        track_bugs(rows, [run("smoke", 100), run("regression", 101)], index)
+
+        assert (rows[0]["Bug ID"], rows[0]["Bug Status"]) == ("BUG-001", "New")
+
+        rows = [{**bug_rows("aaa")[0], "Suites": {"smoke": 1}}]
+        track_bugs(rows, [run("regression", 101), run("smoke", 200)], index)
+        assert rows[0]["Bug Status"] == "Recurring"
+
+    @pytest.mark.unit
+    def test_suite_rerun_tracks_only_that_suite(self, index):
+        """Rerunning one suite records its run alone and leaves the other suites' bugs as they were"""
+        track_bugs(bug_rows("aaa", "bbb", suites=("smoke", "regression")), [run("smoke", 100), run("regression", 110)], index)
+        rows = bug_rows("aaa", "bbb", suites=("smoke", "regression"))
+        resolved = track_bugs(rows, [run("regression", 110), run("smoke", 200)], index)
+
+        assert [(row["Bug ID"], row["Bug Status"], row["Runs Seen"]) for row in rows] == [
+            ("BUG-001", "Recurring", 2), ("BUG-002", "New", 1),
+        ]
+        assert index.bug(2)["occurrences"] == 1 and resolved == []
+
+        rows = bug_rows("bbb", suites=("regression",))
+        resolved = track_bugs(rows, [run("regression", 110), run("smoke", 300)], index)
+        assert [(row["Bug ID"], row["Bug Status"]) for row in rows] == [("BUG-002", "New")]
+        assert [bug["Bug ID"] for bug in resolved] == ["BUG-001"]
@@ -0,0 +1,108 @@
+"""
+Unit tests for the rule-driven bug classification
+"""
+
+import time
+
+import pandas as pd
+import pytest
+
+from scripts.artifact_manifest import ArtifactIndex
+from scripts.bug_rules import RULES_PATH, BugClassifier
+from scripts.generate_bug_report import extract_failed_tests
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    """Classifier compiled from the shipped rule file"""
+    return BugClassifier.from_file(RULES_PATH)
+
+
+class TestBugClassifier:
+    """Tests for the compiled rules"""
+
+    @pytest.mark.unit
+    def test_first_matching_rule_wins(self, classifier):
+        """Rule order decides, not the position of the keyword in the text"""
+        fields = classifier.classify(pd.DataFrame({
+            "message": ["Validation message missing: Unable to submit", "TimeoutError", None, "Looks broken"],
+            "test_name": [
+                "tests/test_form.py::test_signup_valid_user[firefox]",
+                "tests/test_form.py::test_email_validation_mobile",
+                "tests/test_devices.py::test_tablet_layout_edge",
+                "tests/test_load.py::test_homepage",
+            ],
+        }))
+
+        assert list(fields["priority"]) == ["High", "Low", "Low", "Low"]
+        assert list(fields["severity"]) == ["Low", "Critical", "Low", "High"]
+        assert list(fields["category"]) == ["Signup Functionality", "Input Validation", "Device Compatibility", "Performance"]
+        assert list(fields["expected_result"])[:2] == [
+            "User should be successfully signed up and redirected to dashboard",
+            "Appropriate validation error messages should be displayed",
+        ]
+        assert list(fields["browser"]) == ["Firefox", "Chrome", "Edge", "Chrome"]
+        assert list(fields["device"]) == ["Desktop", "Mobile", "Tablet", "Desktop"]
+
+    @pytest.mark.unit
+    def test_custom_rules(self):
+        """Custom rule files add fields and regexes without code changes"""
+        classifier = BugClassifier({
+            "owner": {
+                "source": "message",
+                "default": "qa",
+                "rules": [
+                    {"value": "payments", "regex": [r"HTTP 5\d\d from /api/pay"]},
+                    {"value": "frontend", "keywords": ["ElementNotInteractable"]},
+                ],
+            },
+        })
+
+        fields = classifier.classify(pd.DataFrame({
+            "message": ["http 502 from /api/pay/confirm", "elementnotinteractable: #submit", "HTTP 404 from /api/pay"],
+        }))
+
+        assert list(fields["owner"]) == ["payments", "frontend", "qa"]
+        with pytest.raises(ValueError):
+            BugClassifier({"owner": {"rules": [{"value": "x", "regex": ["("]}]}})
+
+    @pytest.mark.unit
+    def test_classifies_100k_failures_quickly(self, classifier):
+        """100k failures of 1,000 tests are classified column-wise in well under a second"""
+        names = ["signup_valid", "email_validation", "mobile_layout", "tablet_edge", "load_home", "page_title_firefox"]
+        failures = pd.DataFrame({
+            "message": [f"AssertionError: field {i % 1000} missing, request timeout" for i in range(100_000)],
+            "test_name": [f"tests/test_{i % 1000}.py::test_{names[i % len(names)]}" for i in range(100_000)],
+        })
+
+        start = time.perf_counter()
+        fields = classifier.classify(failures)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert len(fields) == 100_000 and set(fields["priority"]) == {"Medium"}
+
+
+class TestExtractFailedTests:
+    """Tests for bug rows built from the run history"""
+
+    @pytest.mark.unit
+    def test_bug_rows(self):
+        """Bug rows carry the classified fields and artifacts and fall back for empty messages"""
+        artifacts = ArtifactIndex([{"nodeid": "tests/test_signup.py::test_signup_mobile", "kind": "screenshot",
+                                    "path": "screenshots/test_signup_mobile_failed_20240509_100001_123.png",
+                                    "status": "failed", "time": 1.0}])
+        bugs = extract_failed_tests([
+            {"suite": "smoke", "source": "smoke_results.json", "nodeid": "tests/test_signup.py::test_signup_mobile",
+             "outcome": "failed", "message": "Cannot click signup: element not working", "duration": 1.5},
+            {"suite": "smoke", "source": "smoke_results.json", "nodeid": "tests/test_title.py::test_title",
+             "outcome": "error", "message": None, "duration": None},
+        ], artifacts=artifacts)
+
+        assert bugs[0]["Priority"] == "High" and bugs[0]["Severity"] == "High"
+        assert bugs[0]["Category"] == "Signup Functionality" and bugs[0]["Device"] == "Mobile"
+        assert bugs[0]["Screenshot"] == "screenshots/test_signup_mobile_failed_20240509_100001_123.png"
+        assert bugs[0]["Log"] == bugs[1]["Screenshot"] == "N/A"
+        assert bugs[1]["Error Message"] == "No error message" and bugs[1]["Actual Result"] == "Test failed"
+        assert bugs[1]["Duration"] is None and bugs[1]["Severity"] == "Low"
+        assert extract_failed_tests([]) == []
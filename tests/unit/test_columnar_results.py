@@ -0,0 +1,160 @@
+"""
+Unit tests for the columnar (Parquet / Arrow IPC) test results
+"""
+
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from _pytest.reports import TestReport
+
+from scripts import columnar_results
+from scripts.columnar_results import ColumnarResults, option_given, prefer_columnar, read_results, read_run
+from scripts.run_history import RunHistory
+
+NODEID = "tests/functional/tests/test_signup.py::TestSignup::test_signup_valid"
+
+
+@pytest.fixture
+def pyarrow():
+    """pyarrow, or skip"""
+    return pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Empty project directory with a reports folder"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("reports")
+    return tmp_path
+
+
+def report(nodeid, when, outcome, longrepr=None, duration=0.5, keywords=("unit",)):
+    """Phase report as pytest hands it to the plugin"""
+    return TestReport(nodeid, (nodeid, 1, nodeid), {keyword: 1 for keyword in keywords}, outcome, longrepr, when,
+                      duration=duration)
+
+
+def run_plugin(path):
+    """Plugin fed a rerun failure, a pass and a setup skip"""
+    plugin = ColumnarResults(path, markers=["unit", "smoke", "mobile", "firefox"], browser="chrome")
+    for attempt in ("rerun", "failed"):
+        plugin.pytest_runtest_logreport(report(NODEID, "setup", "passed", keywords=("unit", "mobile", "TestSignup")))
+        plugin.pytest_runtest_logreport(report(NODEID, "call", attempt, f"E   AssertionError: {attempt} at 0x7f3a2c",
+                                               keywords=("unit", "mobile", "TestSignup")))
+        plugin.pytest_runtest_logreport(report(NODEID, "teardown", "passed", duration=0.25))
+    plugin.pytest_runtest_logreport(report("tests/test_page.py::test_title_firefox", "setup", "passed",
+                                           keywords=("firefox", "smoke")))
+    plugin.pytest_runtest_logreport(report("tests/test_page.py::test_title_firefox", "call", "passed", duration=1.0))
+    plugin.pytest_runtest_logreport(report("tests/test_page.py::test_skipped", "setup", "skipped",
+                                           ("test_page.py", 3, "Skipped: no device")))
+    return plugin.write(exitcode=1)
+
+
+class TestColumnarResults:
+    """Tests for writing and reading the columnar file"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("name", ["results.parquet", "results.arrow"])
+    def test_one_row_per_test(self, pyarrow, workspace, name):
+        """Reruns are replaced by the last attempt; markers, signature and artifacts are columns"""
+        with open("reports/artifacts.jsonl", "w") as f:
+            f.write(json.dumps({"nodeid": NODEID, "kind": "screenshot", "path": "screenshots/shot.png",
+                                "status": "failed", "time": 1.0}) + "\n")
+
+        path = run_plugin(f"reports/{name}")
+        rows = read_results(path).to_pylist()
+        run = read_run(path)
+
+        assert [row["outcome"] for row in rows] == ["failed", "passed", "skipped"]
+        assert rows[0]["markers"] == ["mobile", "unit"] and rows[0]["device"] == "Mobile"
+        assert rows[0]["browser"] == "Chrome" and rows[1]["browser"] == "Firefox"
+        assert rows[0]["duration"] == 1.25 and rows[0]["call_duration"] == 0.5
+        assert rows[0]["message"].startswith("E   AssertionError: failed") and len(rows[0]["signature"]) == 16
+        assert rows[0]["screenshot"] == "screenshots/shot.png" and rows[1]["screenshot"] is None
+        assert rows[2]["message"] is not None and rows[1]["message"] is None
+        assert run["exitcode"] == 1 and run["summary"] == {"failed": 1, "passed": 1, "skipped": 1, "total": 3}
+        assert read_results(path, ["nodeid", "outcome"]).column_names == ["nodeid", "outcome"]
+
+    @pytest.mark.unit
+    def test_history_prefers_columnar(self, pyarrow, workspace):
+        """The run history reads the columnar file instead of the JSON report of the same run"""
+        with open("reports/smoke_results.json", "w") as f:
+            json.dump({"created": 1, "summary": {"total": 0}, "tests": []}, f)
+        os.utime("reports/smoke_results.json", (1, 1))
+        run_plugin("reports/smoke_results.parquet")
+
+        with RunHistory(":memory:") as history:
+            assert history.ingest() == 1
+            results = history.current_results()
+            failed = history.failed_tests()
+
+        assert results["smoke"]["summary"]["total"] == 3
+        assert [test["nodeid"] for test in failed] == [NODEID]
+        assert failed[0]["message"].startswith("E   AssertionError: failed")
+
+    @pytest.mark.unit
+    def test_created_at_session_end(self, monkeypatch):
+        """created is taken at session end as in pytest-json-report, and --browser counts only when given"""
+        plugin = ColumnarResults("reports/results.parquet")
+        monkeypatch.setattr(plugin, "write", lambda exitcode: None)
+        plugin.pytest_sessionstart(None)
+        finished = time.time()
+        plugin.pytest_sessionfinish(None, 0)
+
+        assert plugin.created >= finished
+
+        def config(*args):
+            return SimpleNamespace(getini=lambda name: [], invocation_params=SimpleNamespace(args=args))
+
+        monkeypatch.delenv("PYTEST_ADDOPTS", raising=False)
+        assert option_given(config("--browser=firefox"), "--browser")
+        assert option_given(config("--browser", "edge"), "--browser")
+        assert not option_given(config("--browsers", "-v"), "--browser")
+
+
+def write_twins(json_created, json_mtime, columnar_created, columnar_mtime):
+    """smoke_results.json and a smoke_results.parquet stand-in with the given created and mtime"""
+    with open("reports/smoke_results.json", "w") as f:
+        json.dump({"created": json_created, "summary": {"total": 0}, "tests": []}, f)
+    with open("reports/smoke_results.parquet", "w") as f:
+        json.dump({"created": columnar_created}, f)
+    os.utime("reports/smoke_results.json", (json_mtime, json_mtime))
+    os.utime("reports/smoke_results.parquet", (columnar_mtime, columnar_mtime))
+    return ["reports/smoke_results.json", "reports/smoke_results.parquet", "reports/stress_test_results.json"]
+
+
+class TestPreferColumnar:
+    """Tests for picking the result files to load"""
+
+    @pytest.fixture
+    def columnar(self, workspace, monkeypatch):
+        """pyarrow reported installed, with run metadata read from the JSON stand-in"""
+        def read_run(path):
+            with open(path) as f:
+                return json.load(f)
+
+        monkeypatch.setattr(columnar_results, "columnar_available", lambda: True)
+        monkeypatch.setattr(columnar_results, "read_run", read_run)
+
+    @pytest.mark.unit
+    def test_json_without_pyarrow(self, columnar, monkeypatch):
+        """A columnar file replaces its older JSON twin, and is ignored without pyarrow"""
+        paths = write_twins(100, 1000, 100, 1001)
+
+        assert prefer_columnar(paths) == ["reports/smoke_results.parquet", "reports/stress_test_results.json"]
+
+        monkeypatch.setattr(columnar_results, "columnar_available", lambda: False)
+        assert prefer_columnar(paths) == ["reports/smoke_results.json", "reports/stress_test_results.json"]
+
+    @pytest.mark.unit
+    def test_rewritten_json_wins(self, columnar):
+        """A JSON file rewritten after its columnar twin is read instead, unless both hold the same run"""
+        assert prefer_columnar(write_twins(500, 2000, 100, 1000)) == [
+            "reports/smoke_results.json", "reports/stress_test_results.json",
+        ]
+        assert prefer_columnar(write_twins(100.4, 1001, 100, 1000)) == [
+            "reports/smoke_results.parquet", "reports/stress_test_results.json",
+        ]
@@ -0,0 +1,90 @@
+"""
+Unit tests for the constant-memory Excel export
+"""
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from scripts.excel_export import ExcelStream, GroupTally
+from scripts.generate_bug_report import BUG_COLUMNS, write_bug_workbook
+
+
+def sheet_rows(path, title):
+    """All rows of a sheet as tuples"""
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return list(workbook[title].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+class TestExcelStream:
+    """Tests for the write-only workbook"""
+
+    @pytest.mark.unit
+    def test_rows_stream_from_a_generator(self, tmp_path):
+        """Generator rows are written once, with control characters removed"""
+        path = str(tmp_path / "out" / "report.xlsx")
+        rows = ((f"test_{i}", i, "AssertionError: \x1b[31mred\x1b[0m") for i in range(500))
+
+        with ExcelStream(path) as book:
+            assert book.write_sheet("Results", ["Test", "Index", "Message"], rows) == 500
+
+        written = sheet_rows(path, "Results")
+        assert written[0] == ("Test", "Index", "Message")
+        assert written[500] == ("test_499", 499, "AssertionError: [31mred[0m")
+
+    @pytest.mark.unit
+    def test_failed_export_leaves_no_workbook(self, tmp_path):
+        """An error while streaming does not replace the previous workbook"""
+        path = tmp_path / "report.xlsx"
+
+        def rows():
+            yield ["ok"]
+            raise RuntimeError("source went away")
+
+        with pytest.raises(RuntimeError):
+            with ExcelStream(str(path)) as book:
+                book.write_sheet("Results", ["Test"], rows())
+        assert not path.exists()
+
+
+class TestBugWorkbook:
+    """Tests for summaries tallied while bug rows are written"""
+
+    @pytest.mark.unit
+    def test_summaries_match_group_by(self):
+        """Single-pass tallies equal the pandas aggregations they replace"""
+        bugs = [{"Category": c, "Priority": p, "Severity": s}
+                for c, p, s in zip("ABCAB" * 20, ["High", "Low", "Medium", "High"] * 25, ["Critical", "Low"] * 50)]
+        tally = GroupTally("Category", {
+            "Total Bugs": None,
+            "High Priority": lambda bug: bug["Priority"] == "High",
+            "Critical Severity": lambda bug: bug["Severity"] == "Critical",
+        })
+        for bug in bugs:
+            tally.add(bug)
+
+        df = pd.DataFrame(bugs)
+        expected = df.groupby("Category").agg(
+            total=("Priority", "size"),
+            high=("Priority", lambda x: (x == "High").sum()),
+            critical=("Severity", lambda x: (x == "Critical").sum()),
+        )
+        assert tally.rows() == [[category, *map(int, row)] for category, row in expected.iterrows()]
+
+    @pytest.mark.unit
+    def test_bug_workbook_sheets(self, tmp_path):
+        """The bug sheet keeps the column order and each summary is sorted"""
+        bugs = ({"Bug ID": f"BUG-{i:03d}", "Category": "Signup Functionality", "Priority": ["High", "Low", "Low"][i % 3],
+                 "Severity": "Critical", "Duration": 1.5} for i in range(30))
+        path = str(tmp_path / "bug_report.xlsx")
+
+        assert write_bug_workbook(path, bugs) == 30
+
+        report = sheet_rows(path, "Bug Report")
+        assert list(report[0]) == BUG_COLUMNS
+        assert report[1][0] == "BUG-000" and report[1][BUG_COLUMNS.index("Duration")] == 1.5
+        assert sheet_rows(path, "Summary by Priority")[1:] == [("Low", 20), ("High", 10)]
+        assert sheet_rows(path, "Summary by Category")[1:] == [("Signup Functionality", 30, 10, 30)]
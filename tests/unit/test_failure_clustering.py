@@ -0,0 +1,96 @@
+"""
+Unit tests for failure clustering
+"""
+
+import pytest
+
+from scripts.failure_clustering import DEFAULT_SETTINGS, cluster_failures, failure_frames, normalize_failure
+from scripts.generate_bug_report import build_bugs
+
+LONGREPR = """self = <tests.functional.tests.test_{module}.TestSignup object at {address}>
+
+    def test_{name}(self):
+>       page.fill_email("{email}")
+
+tests/functional/tests/test_{module}.py:{line}:
+_ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _ _
+tests/functional/pages/signup_page.py:88: in fill_email
+    self.find(self.EMAIL).send_keys(value)
+tests/functional/pages/base_page.py:41: in {helper}
+    return WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(locator))
+E   selenium.common.exceptions.{error}: Message: session {session}
+E   Stacktrace:
+E   #0 {address} <unknown>
+
+/usr/lib/python3/site-packages/selenium/webdriver/support/wait.py:95: {error}"""
+
+
+def longrepr(i, module="signup", helper="find", error="TimeoutException"):
+    """Selenium traceback with run-specific addresses, emails and ids"""
+    return LONGREPR.format(
+        module=module, name=f"case_{i}", address=hex(0x7F00000000 + i * 4099), email=f"qa+{i}@example.com",
+        line=20 + i, helper=helper, error=error, session=f"{i:08x}deadbeef",
+    )
+
+
+class TestNormalization:
+    """Tests for the traceback signature input"""
+
+    @pytest.mark.unit
+    def test_run_specific_values_are_replaced(self):
+        """Addresses, timestamps, emails, uuids and ids do not leak into the signature"""
+        text = normalize_failure(
+            "user qa+17@example.com at 2024-05-09T10:00:01.5Z id 123e4567-e89b-12d3-a456-426614174000 "
+            "obj 0x7f3a2c session 5f2b9c0d1e took 12.5s, tests/a.py:42 line 7"
+        )
+
+        assert text == ("user <email> at <timestamp> id <uuid> obj <address> session <id> took <n>s, "
+                        "tests/a.py:<line> line <line>")
+
+    @pytest.mark.unit
+    def test_frames_drop_test_source(self):
+        """Only frame locations and E lines of a traceback are kept"""
+        frames = failure_frames(longrepr(1))
+
+        assert frames[:3] == [
+            "tests/functional/tests/test_signup.py:<line>:",
+            "tests/functional/pages/signup_page.py:<line>: in fill_email",
+            "tests/functional/pages/base_page.py:<line>: in find",
+        ]
+        assert "E #0 <address> <unknown>" in frames
+        assert failure_frames("AssertionError: signup button missing") == ["AssertionError: signup button missing"]
+
+
+class TestClusterFailures:
+    """Tests for grouping failures by root cause"""
+
+    @pytest.mark.unit
+    def test_near_duplicates_merge(self):
+        """The same broken locator reached from different test modules is one cluster"""
+        messages = [longrepr(i, module=["signup", "login", "profile"][i % 3]) for i in range(30)]
+        messages += [longrepr(99, helper="click", error="StaleElementReferenceException"), "assert 500 == 200", None]
+
+        clusters = cluster_failures(messages, DEFAULT_SETTINGS)
+
+        assert [len(cluster) for cluster in clusters] == [30, 1, 1, 1]
+        assert len(clusters[0].signatures) == 3 and clusters[0].representative == 0
+        assert sorted(i for cluster in clusters for i in cluster.members) == list(range(33))
+
+    @pytest.mark.unit
+    def test_one_bug_per_cluster(self):
+        """Bug rows carry the member count, examples and signature of their cluster"""
+        failures = [
+            {"suite": "smoke", "source": "smoke_results.json", "nodeid": f"tests/test_signup.py::test_case_{i}",
+             "outcome": "failed", "message": longrepr(i), "duration": 1.0}
+            for i in range(5)
+        ]
+        failures.append({"suite": "smoke", "source": "smoke_results.json", "nodeid": "tests/test_title.py::test_title",
+                         "outcome": "failed", "message": "AssertionError: title", "duration": 0.1})
+
+        bugs = build_bugs(failures)
+
+        assert [bug["Bug ID"] for bug in bugs] == ["BUG-001", "BUG-002"]
+        assert bugs[0]["Occurrences"] == 5 and bugs[0]["Test Name"] == "tests/test_signup.py::test_case_0"
+        assert bugs[0]["Affected Tests"].endswith("test_case_2 (+2 more)")
+        assert bugs[1]["Occurrences"] == 1 and bugs[1]["Affected Tests"] == "tests/test_title.py::test_title"
+        assert len(bugs[0]["Signature"]) == 16
@@ -0,0 +1,75 @@
+"""
+Unit tests for incremental combined report generation
+"""
+
+import json
+import os
+
+import pytest
+
+from scripts.generate_combined_report import CACHE_DIR, REPORT_PATH, ReportCache, generate_combined_report
+
+
+def write_suite(name, passed, failed, created):
+    """Write a minimal pytest-json-report for a suite"""
+    report = {
+        "created": created,
+        "duration": 3.0,
+        "summary": {"passed": passed, "failed": failed, "total": passed + failed},
+        "tests": [],
+    }
+    with open(f"reports/{name}_results.json", "w") as f:
+        json.dump(report, f)
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Empty project directory with a reports folder"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("reports")
+    write_suite("smoke", 4, 0, 1_715_248_800)
+    return tmp_path
+
+
+class TestReportCache:
+    """Tests for content digests of report inputs"""
+
+    @pytest.mark.unit
+    def test_digest_follows_content(self, workspace):
+        """A file is re-hashed only when it changes, and missing files have a stable digest"""
+        cache = ReportCache()
+        first = cache.files_digest(["reports/smoke_results.json", "reports/absent.json"])
+        assert cache.files_digest(["reports/absent.json", "reports/smoke_results.json"]) == first
+
+        write_suite("smoke", 3, 1, 1_715_248_800)
+        os.utime("reports/smoke_results.json", ns=(1, 1))
+        assert cache.files_digest(["reports/smoke_results.json", "reports/absent.json"]) != first
+
+
+class TestIncrementalReport:
+    """Tests for re-rendering only the sections whose inputs changed"""
+
+    @pytest.mark.unit
+    def test_only_changed_sections_are_rendered(self, workspace):
+        """A finished suite re-renders the functional sections and nothing else"""
+        assert len(generate_combined_report(verbose=False)) == 9
+        assert generate_combined_report(verbose=False) == []
+
+        write_suite("regression", 9, 1, 1_715_252_400)
+        rendered = generate_combined_report(verbose=False)
+
+        assert rendered == ["summary", "functional", "run_history"]
+        with open(REPORT_PATH, encoding="utf-8") as f:
+            html = f.read()
+        assert "Regression Tests" in html and "Smoke Tests" in html
+        assert ">14</div>" in html  # total across both suites
+
+    @pytest.mark.unit
+    def test_unchanged_report_is_left_alone(self, workspace):
+        """Watch passes do not rewrite the report when nothing changed"""
+        generate_combined_report(verbose=False)
+        before = os.stat(REPORT_PATH).st_mtime_ns
+
+        assert generate_combined_report(refresh=5, only_if_changed=True, verbose=False) == []
+        assert os.stat(REPORT_PATH).st_mtime_ns == before
+        assert os.path.exists(os.path.join(CACHE_DIR, "index.json"))
@@ -0,0 +1,99 @@
+"""
+Unit tests for the parallel report orchestrator
+"""
+
+import json
+import os
+
+import pytest
+
+from scripts import generate_combined_report as combined_report
+from scripts import generate_reports as orchestrator
+from scripts.bug_index import DEFAULT_DATABASE as BUG_INDEX_PATH
+from scripts.generate_reports import ARTIFACTS, PAGE_ARTIFACTS, TIMINGS_PATH, generate_reports
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Project directory with one suite that has a failed test"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("reports")
+    tests = [
+        {"nodeid": "tests/functional/tests/test_signup.py::TestSignup::test_signup_valid", "outcome": "failed",
+         "call": {"duration": 1.0, "outcome": "failed", "longrepr": "AssertionError: signup button missing"}},
+        {"nodeid": "tests/functional/tests/test_signup.py::TestSignup::test_page_loads", "outcome": "passed",
+         "call": {"duration": 0.5, "outcome": "passed"}},
+    ]
+    report = {"created": 1_715_248_800, "duration": 2.0, "summary": {"passed": 1, "failed": 1, "total": 2}, "tests": tests}
+    with open("reports/smoke_results.json", "w") as f:
+        json.dump(report, f)
+    return tmp_path
+
+
+class TestGenerateReports:
+    """Tests for loading once and fanning artifacts out"""
+
+    @pytest.mark.unit
+    def test_all_artifacts_in_process(self, workspace):
+        """Every artifact is written and timed from a single load of the inputs"""
+        report = generate_reports(workers=1, verbose=False)
+
+        assert list(report["artifacts"]) == ["load", *ARTIFACTS, "combined_html"]
+        assert all(timing["status"] == "ok" for timing in report["artifacts"].values())
+        for path in report["paths"].values():
+            assert os.path.exists(path)
+        with open(report["paths"]["combined_html"], encoding="utf-8") as f:
+            html = f.read()
+        assert html.index("Functional Test Results") < html.index("Recommendations")
+        with open(report["paths"]["bug_html"], encoding="utf-8") as f:
+            assert "signup button missing" in f.read()
+        with open(TIMINGS_PATH) as f:
+            assert json.load(f)["workers"] == 1
+
+    @pytest.mark.unit
+    def test_process_pool(self, workspace):
+        """Workers render from the snapshot handed to the pool initializer"""
+        report = generate_reports(workers=2, artifacts=["combined_sections", "bug_excel"], verbose=False)
+
+        timings = report["artifacts"]
+        assert timings["combined_sections"]["status"] == timings["bug_excel"]["status"] == "ok"
+        assert timings["combined_sections"]["pid"] != os.getpid()
+        assert os.path.exists(report["paths"]["bug_excel"])
+        assert not os.path.exists(report["paths"]["combined_excel"])
+        assert "combined_html" not in timings and not os.path.exists(report["paths"]["combined_html"])
+
+    @pytest.mark.unit
+    def test_sections_come_from_the_cache(self, workspace, monkeypatch):
+        """Sections whose inputs did not change are read from the section cache instead of re-rendered"""
+        first = generate_reports(workers=2, artifacts=list(PAGE_ARTIFACTS), verbose=False)
+
+        def broken(*args, **kwargs):
+            raise AssertionError("summary re-rendered")
+
+        monkeypatch.setattr(combined_report, "render_summary", broken)
+        second = generate_reports(workers=1, artifacts=list(PAGE_ARTIFACTS), verbose=False)
+
+        assert first["artifacts"]["combined_html"]["status"] == second["artifacts"]["combined_html"]["status"] == "ok"
+        assert generate_reports(workers=1, artifacts=list(PAGE_ARTIFACTS), verbose=False,
+                                use_cache=False)["artifacts"]["combined_sections"]["status"] == "error"
+
+    @pytest.mark.unit
+    def test_partial_run_leaves_page_and_bug_index(self, workspace):
+        """One section artifact does not overwrite the page, and no bug artifact means no bug tracking"""
+        report = generate_reports(workers=1, artifacts=["combined_charts"], verbose=False)
+
+        assert report["artifacts"]["combined_charts"]["status"] == "ok"
+        assert not os.path.exists(report["paths"]["combined_html"])
+        assert not os.path.exists(BUG_INDEX_PATH)
+
+    @pytest.mark.unit
+    def test_excel_error_reported(self, workspace, monkeypatch):
+        """A failing workbook shows up as an error in the timings"""
+        def broken(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(orchestrator, "generate_excel_report", broken)
+        report = generate_reports(workers=1, artifacts=["combined_excel"], verbose=False)
+
+        timing = report["artifacts"]["combined_excel"]
+        assert timing["status"] == "error" and timing["error"] == "OSError: disk full"
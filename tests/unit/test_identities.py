@@ -0,0 +1,89 @@
+"""
+Unit tests for the unique identity allocator
+"""
+
+import threading
+
+import pytest
+
+from scripts import identities
+from scripts.identities import IdentityAllocator, base36, run_id, scoped_run_id, worker_id
+from scripts.load_engine import LoadEngine
+
+
+class TestIdentityAllocator:
+    """Tests for identities unique across runs, workers and virtual users"""
+
+    @pytest.mark.unit
+    def test_tokens_encode_run_worker_vu_counter(self):
+        """Identities are run-worker-vu-counter in base 36, counted per VU"""
+        allocator = IdentityAllocator("Build #42", worker=3)
+
+        assert allocator.token(vu=40) == "build42-3-14-0"
+        assert allocator.token(vu=40) == "build42-3-14-1"
+        assert allocator.token() == "build42-3-0-0"
+        assert allocator.tokens(3, vu=40) == ["build42-3-14-2", "build42-3-14-3", "build42-3-14-4"]
+        assert base36(36 ** 3) == "1000"
+
+    @pytest.mark.unit
+    def test_unique_across_workers_vus_and_threads(self):
+        """Workers, VUs and threads sharing an allocator never get the same identity"""
+        allocators = [IdentityAllocator("run", worker) for worker in range(4)]
+        tokens = []
+
+        def allocate(allocator):
+            for vu in range(50):
+                tokens.extend(allocator.token(vu) for _ in range(20))
+
+        threads = [threading.Thread(target=allocate, args=(a,)) for a in allocators for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(tokens) == 8 * 50 * 20
+        assert len(set(tokens)) == len(tokens)
+
+    @pytest.mark.unit
+    def test_email_replaces_plus_tag(self):
+        """The identity becomes the address's plus tag"""
+        allocator = IdentityAllocator("r", 0)
+
+        assert allocator.email("john.doe@example.com", vu=1) == "john.doe+r-0-1-0@example.com"
+        assert allocator.email("john.doe+old@example.com", vu=1) == "john.doe+r-0-1-1@example.com"
+
+    @pytest.mark.unit
+    def test_run_and_worker_from_environment(self, monkeypatch):
+        """The run id comes from the environment, is created once, and xdist names the worker"""
+        monkeypatch.setenv(identities.RUN_ID_ENV, "")  # restored after the test, as run_id() sets it
+        monkeypatch.setenv(identities.XDIST_RUN_ENV, "9F2C61D0A4B34E7C")
+        monkeypatch.setenv(identities.XDIST_WORKER_ENV, "gw7")
+        assert run_id() == "9f2c61d0" and worker_id() == 7
+
+        monkeypatch.delenv(identities.XDIST_RUN_ENV)
+        monkeypatch.delenv(identities.XDIST_WORKER_ENV)
+        created = run_id()
+        assert len(created) == 8 and run_id() == created and worker_id() == 0
+
+        scoped = scoped_run_id()
+        assert scoped.startswith(created) and len(scoped) == 14 and scoped_run_id() != scoped
+
+    @pytest.mark.unit
+    def test_load_engine_emails(self):
+        """Signup forms of the workers of one run are unique per worker and VU, even for the same base user"""
+        engines = [LoadEngine("http://127.0.0.1:1", [], seed=1, worker=worker, identity_run="run") for worker in range(2)]
+
+        emails = [engine._signup_form(vu)["email"] for engine in engines for vu in (1, 2) for _ in range(100)]
+
+        assert len(set(emails)) == 400
+
+    @pytest.mark.unit
+    def test_engine_runs_of_one_process(self, monkeypatch):
+        """Two engine runs of one process (baseline, then stress) never repeat an email"""
+        monkeypatch.setenv(identities.RUN_ID_ENV, "demo")
+        baseline, stress = (LoadEngine("http://127.0.0.1:1", [], seed=1, worker=0) for _ in range(2))
+
+        emails = [{engine._signup_form(vu)["email"] for vu in (1, 2) for _ in range(100)} for engine in (baseline, stress)]
+
+        assert len(emails[0]) == len(emails[1]) == 200
+        assert not emails[0] & emails[1]
@@ -0,0 +1,97 @@
+"""
+Unit tests for the streaming pytest-json-report reader
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from scripts.json_stream import PytestReportStream, slim_test
+from scripts.run_history import RunHistory
+
+
+def pytest_report(count, output=""):
+    """pytest-json-report with every third test failing and captured output on each"""
+    tests = []
+    for i in range(count):
+        failed = i % 3 == 0
+        tests.append({
+            "nodeid": f"tests/test_signup.py::test_case_{i}",
+            "lineno": i,
+            "keywords": ["test_case", "unit"],
+            "outcome": "failed" if failed else "passed",
+            "setup": {"duration": 0.001 * i, "outcome": "passed"},
+            "call": {
+                "duration": 1e-7 * i + 12345.678,
+                "outcome": "failed" if failed else "passed",
+                "stdout": output,
+                **({"longrepr": f"E   AssertionError: \"naïve\" \\ {i} ✗"} if failed else {}),
+            },
+            "teardown": {"duration": 0.5, "outcome": "passed"},
+        })
+    return {
+        "created": 1_715_248_800.25,
+        "duration": 42.0,
+        "exitcode": 1,
+        "root": "/work",
+        "environment": {"Python": "3.11"},
+        "summary": {"passed": count - len(tests[::3]), "failed": len(tests[::3]), "total": count},
+        "collectors": [{"nodeid": "", "outcome": "passed", "result": [{"nodeid": f"t{i}"} for i in range(count)]}],
+        "tests": tests,
+        "warnings": [{"message": "deprecated"}],
+    }
+
+
+class TestPytestReportStream:
+    """Tests for decoding test entries one at a time"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_same_as_json_load(self, tmp_path, chunk_size):
+        """Tests and header match json.load whatever the chunk boundaries cut through"""
+        report = pytest_report(30, output="captured\nlog ✓")
+        path = tmp_path / "results.json"
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+        with PytestReportStream(str(path), chunk_size=chunk_size) as stream:
+            tests = list(stream)
+
+        assert tests == [slim_test(test) for test in report["tests"]]
+        assert "stdout" not in tests[0]["call"] and tests[0]["call"]["longrepr"].endswith("\\ 0 ✗")
+        assert stream.has_tests and set(stream.header) == set(report) - {"collectors", "tests"}
+        assert stream.header["summary"] == report["summary"]
+
+    @pytest.mark.unit
+    def test_memory_stays_flat(self, tmp_path):
+        """A 25 MB report is read with a few MB of memory"""
+        path = tmp_path / "results.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(pytest_report(500, output="x" * 50_000), f)
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in PytestReportStream(str(path)))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == 500
+        assert peak < 8_000_000
+
+    @pytest.mark.unit
+    def test_history_ingests_streamed_reports(self, tmp_path):
+        """The run history streams pytest reports and still reads other JSON whole"""
+        report_path = tmp_path / "smoke_results.json"
+        report_path.write_text(json.dumps(pytest_report(9)), encoding="utf-8")
+        other_path = tmp_path / "notes.json"
+        other_path.write_text(json.dumps([1, 2, 3]), encoding="utf-8")
+
+        with RunHistory(":memory:") as history:
+            assert history.ingest([str(report_path), str(other_path)]) == 2
+            failed = history.failed_tests()
+            results = history.current_results()
+
+        assert [test["nodeid"] for test in failed] == [f"tests/test_signup.py::test_case_{i}" for i in (0, 3, 6)]
+        assert failed[1]["message"] == 'E   AssertionError: "naïve" \\ 3 ✗'
+        assert results["smoke"]["summary"]["total"] == 9 and results["smoke"]["created"] == 1_715_248_800.25
@@ -0,0 +1,186 @@
+"""
+Unit tests for streaming k6 NDJSON ingestion
+"""
+
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+from scripts.k6_ingest import OVERFLOW_TAG_VALUE, K6StreamAggregator, follow, ingest_file
+
+METRICS = {
+    "http_reqs": "counter",
+    "http_req_duration": "trend",
+    "http_req_failed": "rate",
+    "vus": "gauge",
+}
+
+
+def metric_line(name):
+    """k6 Metric declaration line"""
+    data = {"name": name, "type": METRICS[name], "contains": "default", "thresholds": [], "submetrics": None}
+    return json.dumps({"type": "Metric", "data": data, "metric": name})
+
+
+def point_line(name, value, second, tags=None, fraction="000000000"):
+    """k6 Point line at 12:00:<second> UTC+02:00"""
+    data = {"time": f"2024-05-09T12:00:{second:02d}.{fraction}+02:00", "value": value, "tags": tags or {}}
+    return json.dumps({"type": "Point", "data": data, "metric": name})
+
+
+def request_lines(second, duration, name="https://app/Signup", method="GET", status="200", failed=0):
+    """The three points k6 emits for one HTTP request"""
+    tags = {"name": name, "method": method, "status": status, "url": name, "scenario": "default"}
+    return [
+        point_line("http_reqs", 1, second, tags),
+        point_line("http_req_duration", duration, second, tags),
+        point_line("http_req_failed", failed, second, tags),
+    ]
+
+
+@pytest.fixture
+def results_file(tmp_path):
+    """Small NDJSON file with two endpoints over three seconds"""
+    lines = [metric_line(name) for name in METRICS]
+    for second in range(3):
+        for i in range(100):
+            lines += request_lines(second, 100 + i)
+        lines += request_lines(second, 500, method="POST", status="500", failed=1)
+        lines.append(point_line("vus", 10 + second, second))
+    lines.append("not json")
+    path = tmp_path / "load_test_baseline_results.json"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestK6StreamAggregator:
+    """Tests for folding k6 points into a compact summary"""
+
+    @pytest.mark.unit
+    def test_summary_matches_k6_shape(self, results_file):
+        """Counters, rates, gauges and trends come out as k6 summary values"""
+        summary = ingest_file(str(results_file)).summary()
+        metrics = summary["metrics"]
+
+        assert metrics["http_reqs"]["values"]["count"] == 303
+        assert metrics["http_req_failed"]["values"]["count"] == 3
+        assert metrics["http_req_failed"]["values"]["rate"] == pytest.approx(3 / 303)
+        assert metrics["vus"]["values"] == {"value": 12, "min": 10, "max": 12}
+        assert metrics["http_req_duration"]["values"]["p(95)"] == pytest.approx(195, rel=0.01)
+        assert "http_req_duration" in summary["histograms"]
+        assert summary["source"]["skipped"] == 1
+
+    @pytest.mark.unit
+    def test_breakdown_by_tag_and_endpoint(self, results_file):
+        """Points are broken down per tag value and per method + name"""
+        summary = ingest_file(str(results_file)).summary()
+
+        statuses = summary["tags"]["http_reqs"]["status"]
+        assert statuses["200"]["count"] == 300
+        assert statuses["500"]["count"] == 3
+        assert "url" not in summary["tags"]["http_reqs"]
+
+        post = summary["endpoints"]["POST https://app/Signup"]
+        assert post["count"] == 3
+        assert post["failed"] == 3
+        assert post["http_req_duration"]["max"] == 500
+
+    @pytest.mark.unit
+    def test_per_second_buckets(self, results_file):
+        """Each second gets count, sum, min, max and a p95 from its histogram"""
+        rows = ingest_file(str(results_file)).timeseries("http_req_duration")
+
+        assert [row["count"] for row in rows] == [101, 101, 101]
+        assert rows[1]["time"] - rows[0]["time"] == 1
+        assert rows[0]["time"] == 1715248800
+        assert rows[0]["min"] == 100
+        assert rows[0]["max"] == 500
+        assert rows[0]["p95"] == pytest.approx(195, rel=0.01)
+
+    @pytest.mark.unit
+    def test_timeline_for_store(self, results_file):
+        """Requests, errors, latencies and VUs are bucketed per endpoint for the store"""
+        rows = list(ingest_file(str(results_file)).timeline.rows())
+
+        assert len(rows) == 6
+        assert rows[0][:5] == (1715248800, "GET https://app/Signup", 100, 0, 10)
+        assert rows[5][:5] == (1715248802, "POST https://app/Signup", 1, 1, 12)
+
+    @pytest.mark.unit
+    def test_late_points_reopen_compacted_buckets(self):
+        """Out-of-order points still land in their own second"""
+        aggregator = K6StreamAggregator()
+        aggregator.add_point("http_req_duration", 10, "2024-05-09T10:00:00Z", {})
+        aggregator.flush()
+        aggregator.add_point("http_req_duration", 20, "2024-05-09T10:00:30Z", {})
+        aggregator.flush()
+        aggregator.add_point("http_req_duration", 30, "2024-05-09T10:00:00.5Z", {})
+
+        histograms = aggregator.bucket_histograms_for("http_req_duration")
+        assert [h.total_count for h in histograms.values()] == [2, 1]
+
+    @pytest.mark.unit
+    def test_offset_without_fraction(self):
+        """A whole-second timestamp with a numeric offset lands in the same second as its fractional neighbours"""
+        aggregator = K6StreamAggregator()
+        aggregator.add_point("http_req_duration", 10, "2024-05-09T14:34:45+02:00", {})
+        aggregator.add_point("http_req_duration", 20, "2024-05-09T14:34:45.5+02:00", {})
+        aggregator.add_point("http_req_duration", 30, "2024-05-09T12:34:46-00:00", {})
+
+        histograms = aggregator.bucket_histograms_for("http_req_duration")
+        assert {start: h.total_count for start, h in histograms.items()} == {1715258085: 2, 1715258086: 1}
+
+    @pytest.mark.unit
+    def test_series_cardinality_is_bounded(self):
+        """Tag combinations beyond the limit fold into an overflow series"""
+        aggregator = K6StreamAggregator(max_series=5)
+        aggregator.feed_line(metric_line("http_reqs"))
+        for i in range(50):
+            aggregator.add_point("http_reqs", 1, "2024-05-09T10:00:00Z", {"name": f"https://app/{i}"})
+        summary = aggregator.summary()
+
+        names = summary["tags"]["http_reqs"]["name"]
+        assert len(aggregator.series) == 6
+        assert names[OVERFLOW_TAG_VALUE]["count"] == 45
+        assert summary["metrics"]["http_reqs"]["values"]["count"] == 50
+
+    @pytest.mark.unit
+    def test_gzip_input(self, results_file, tmp_path):
+        """Compressed result files are read transparently"""
+        compressed = tmp_path / "results.json.gz"
+        with gzip.open(compressed, "wt") as f:
+            f.write(results_file.read_text())
+        assert ingest_file(str(compressed)).summary()["metrics"]["http_reqs"]["values"]["count"] == 303
+
+
+class TestFollow:
+    """Tests for tailing a file that is still being written"""
+
+    @pytest.mark.unit
+    def test_follow_yields_complete_lines_as_they_arrive(self, tmp_path):
+        """Lines appended after start are picked up, partial lines wait for their newline"""
+        path = tmp_path / "live.json"
+
+        def writer():
+            time.sleep(0.1)
+            with open(path, "w") as f:
+                f.write(metric_line("http_reqs") + "\n")
+                f.flush()
+                line = point_line("http_reqs", 1, 0)
+                f.write(line[:20])
+                f.flush()
+                time.sleep(0.1)
+                f.write(line[20:] + "\n")
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        lines = list(follow(str(path), poll_interval=0.02, idle_timeout=0.5))
+        thread.join()
+
+        assert len(lines) == 2
+        assert all(line.endswith("\n") for line in lines)
+        aggregator = K6StreamAggregator().feed(lines)
+        assert aggregator.summary()["metrics"]["http_reqs"]["values"]["count"] == 1
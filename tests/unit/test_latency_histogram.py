@@ -0,0 +1,85 @@
+"""
+Unit tests for the mergeable latency histogram
+"""
+
+import numpy as np
+import pytest
+
+from scripts.latency_histogram import LatencyHistogram, merge_histograms
+
+
+@pytest.fixture
+def samples():
+    """Lognormal latencies resembling a real response time distribution"""
+    return np.random.default_rng(42).lognormal(mean=5.0, sigma=1.0, size=50_000)
+
+
+class TestLatencyHistogram:
+    """Tests for recording, percentiles, merging and serialization"""
+
+    @pytest.mark.unit
+    def test_percentiles_within_relative_error(self, samples):
+        """Percentiles stay within the 2 significant figure bucket width"""
+        histogram = LatencyHistogram()
+        histogram.record_many(samples)
+        for p in (50, 90, 95, 99, 99.9):
+            assert histogram.percentile(p) == pytest.approx(np.percentile(samples, p), rel=0.01)
+        assert histogram.percentile(100) == samples.max()
+        assert histogram.percentile(0) == samples.min()
+        assert histogram.mean == pytest.approx(samples.mean())
+
+    @pytest.mark.unit
+    def test_record_and_record_many_agree(self, samples):
+        """Scalar and vectorised recording land in the same buckets"""
+        scalar = LatencyHistogram()
+        for value in samples[:1000]:
+            scalar.record(value)
+        vector = LatencyHistogram()
+        vector.record_many(samples[:1000])
+        assert np.array_equal(scalar.counts, vector.counts)
+
+    @pytest.mark.unit
+    def test_merge_equals_single_histogram(self, samples):
+        """Merging shards gives the same percentiles as recording everything once"""
+        whole = LatencyHistogram()
+        whole.record_many(samples)
+        shards = []
+        for part in np.array_split(samples, 4):
+            shard = LatencyHistogram()
+            shard.record_many(part)
+            shards.append(shard)
+
+        merged = merge_histograms(shards)
+        assert merged.total_count == whole.total_count
+        assert merged.percentiles([50, 95, 99]) == whole.percentiles([50, 95, 99])
+
+    @pytest.mark.unit
+    def test_serialization_roundtrip(self, samples):
+        """Binary and base64 blobs restore the full histogram"""
+        histogram = LatencyHistogram()
+        histogram.record_many(samples)
+        blob = histogram.to_bytes()
+        assert len(blob) < 8 * 1024
+
+        restored = LatencyHistogram.from_base64(histogram.to_base64())
+        assert np.array_equal(restored.counts, histogram.counts)
+        assert restored.summary() == histogram.summary()
+
+        with pytest.raises(ValueError):
+            LatencyHistogram.from_bytes(b"x" * len(blob))
+
+    @pytest.mark.unit
+    def test_out_of_range_values_are_clamped(self):
+        """Values above the trackable range are counted rather than dropped"""
+        histogram = LatencyHistogram(highest_ms=1000)
+        histogram.record(-1)
+        histogram.record(5000)
+        assert histogram.total_count == 2
+        assert histogram.percentile(50) == 0.0
+        assert histogram.percentile(100) == 5000
+
+    @pytest.mark.unit
+    def test_layout_mismatch_rejected(self):
+        """Histograms with different precision cannot be merged"""
+        with pytest.raises(ValueError):
+            LatencyHistogram(significant_figures=2).merge(LatencyHistogram(significant_figures=3))
@@ -0,0 +1,147 @@
+"""
+Unit tests for the live load test dashboard
+"""
+
+import asyncio
+import json
+import socket
+import threading
+
+import httpx
+import pytest
+
+from scripts.live_dashboard import VIEWER_QUEUE_SIZE, LiveDashboard, second_snapshot
+from scripts.load_engine import Stage, run_scenario
+from scripts.signup_stub_server import SignupStubServer
+from scripts.timeseries_store import TimelineRecorder
+
+START = 1_715_248_800
+
+
+@pytest.fixture
+def timeline():
+    """Ten seconds of 100 requests each, every tenth one failed"""
+    recorder = TimelineRecorder()
+    for second in range(10):
+        for i in range(100):
+            recorder.record(START + second + i / 100, "GET /Signup", 100 + i, i % 10 == 0, active_vus=5)
+    return recorder
+
+
+@pytest.fixture
+def dashboard():
+    """Dashboard on a free port"""
+    with LiveDashboard(port=0) as server:
+        yield server
+
+
+def read_events(port, count):
+    """Open an SSE stream and return the first ``count`` events as (name, data)"""
+    events = []
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        buffer = b""
+        while len(events) < count:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+            while b"\n\n" in buffer and len(events) < count:
+                block, buffer = buffer.split(b"\n\n", 1)
+                fields = dict(line.split(": ", 1) for line in block.decode().splitlines() if ": " in line)
+                if "data" in fields:
+                    events.append((fields.get("event", "message"), fields["data"]))
+    return events
+
+
+class TestSecondSnapshot:
+    """Tests for summarising timeline buckets for the dashboard"""
+
+    @pytest.mark.unit
+    def test_snapshot_values(self, timeline):
+        """Each completed second becomes rps, percentiles, error rate and VUs"""
+        snapshot = second_snapshot(timeline, START + 3)
+        assert snapshot["rps"] == 100
+        assert snapshot["error_rate"] == pytest.approx(0.1)
+        assert snapshot["p50"] == pytest.approx(150, rel=0.01)
+        assert snapshot["p99"] == pytest.approx(199, rel=0.01)
+        assert snapshot["active_vus"] == 5
+
+    @pytest.mark.unit
+    def test_publish_timeline_publishes_each_second_once(self, timeline):
+        """Only completed seconds are published, and never twice"""
+        dashboard = LiveDashboard()
+        first = dashboard.publish_timeline(timeline, now=START + 6.5, delay=2)
+        second = dashboard.publish_timeline(timeline, now=START + 8.5, delay=2)
+
+        assert [s["time"] - START for s in first] == [0, 1, 2, 3]
+        assert [s["time"] - START for s in second] == [4, 5]
+        assert second[-1]["total_requests"] == 600
+
+
+class TestLiveDashboard:
+    """Tests for serving the page and streaming snapshots to viewers"""
+
+    @pytest.mark.unit
+    def test_page_and_history(self, dashboard, timeline):
+        """The page is served and late viewers get the history first"""
+        dashboard.publish_timeline(timeline, now=START + 5.5, delay=2)
+        assert "EventSource" in httpx.get(dashboard.url).text
+
+        name, data = read_events(dashboard.port, 1)[0]
+        assert name == "history"
+        assert [s["time"] - START for s in json.loads(data)] == [0, 1, 2]
+
+    @pytest.mark.unit
+    def test_multiple_viewers_receive_snapshots(self, dashboard):
+        """Every connected viewer gets every published snapshot"""
+        results = {}
+
+        def viewer(key):
+            results[key] = read_events(dashboard.port, 3)
+
+        threads = [threading.Thread(target=viewer, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        while len(dashboard.viewers) < 3:
+            pass
+        for i in range(2):
+            dashboard.publish({"time": i})
+        for thread in threads:
+            thread.join(timeout=5)
+
+        for events in results.values():
+            assert [json.loads(data) for _, data in events[1:]] == [{"time": 0}, {"time": 1}]
+
+    @pytest.mark.unit
+    def test_slow_viewer_queue_is_bounded(self, dashboard):
+        """A viewer that stops reading only keeps the newest snapshots"""
+        queue = asyncio.Queue(maxsize=VIEWER_QUEUE_SIZE)
+        dashboard.viewers.add(queue)
+        for i in range(VIEWER_QUEUE_SIZE * 3):
+            dashboard._broadcast(json.dumps({"time": i}))
+        assert queue.qsize() == VIEWER_QUEUE_SIZE
+        assert json.loads(queue.get_nowait()) == {"time": VIEWER_QUEUE_SIZE * 2}
+
+
+class TestEngineSnapshots:
+    """Tests for the engine's live snapshot callback"""
+
+    @pytest.mark.unit
+    def test_run_scenario_reports_live_metrics(self):
+        """run_scenario hands its live metrics to the callback every second"""
+        server = SignupStubServer(port=0, config={}).start_in_thread()
+        seen = []
+        try:
+            run_scenario(
+                "baseline",
+                server.base_url,
+                [Stage(2.5, 2)],
+                think_time_scale=0.01,
+                on_snapshot=lambda metrics: seen.append(sum(b.requests for b in metrics.timeline.buckets.values())),
+            )
+        finally:
+            server.stop()
+
+        assert len(seen) >= 2
+        assert seen[-1] > seen[0] >= 0
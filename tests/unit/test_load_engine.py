@@ -0,0 +1,251 @@
+"""
+Unit tests for the Python asyncio load engine
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+
+from scripts.latency_histogram import LatencyHistogram
+from scripts.load_engine import (
+    ArrivalRateEngine,
+    LoadEngine,
+    LoadMetrics,
+    Stage,
+    arrival_offsets,
+    partition_stages,
+    run_distributed,
+    scenario_result,
+    stages_from_config,
+    target_vus,
+)
+from scripts.signup_stub_server import SignupStubServer
+
+
+class TestStages:
+    """Tests for stage scheduling"""
+
+    @pytest.mark.unit
+    def test_target_vus_interpolates_linearly(self):
+        """Ramping stages interpolate between targets like k6 ramping-vus"""
+        stages = [Stage(10, 100), Stage(10, 100), Stage(10, 0)]
+        assert target_vus(stages, 0) == 0
+        assert target_vus(stages, 5) == 50
+        assert target_vus(stages, 15) == 100
+        assert target_vus(stages, 25) == 50
+        assert target_vus(stages, 30) == 0
+
+    @pytest.mark.unit
+    def test_stages_from_config(self):
+        """load_testing settings become ramp-up, steady and ramp-down stages"""
+        config = {"load_testing": {"spike": {"users": 1000, "duration": "5m", "ramp_up": "30s"}}}
+        assert stages_from_config(config, "spike") == [
+            Stage(30, 1000),
+            Stage(300, 1000),
+            Stage(30, 0),
+        ]
+        with pytest.raises(KeyError):
+            stages_from_config(config, "soak")
+
+    @pytest.mark.unit
+    def test_partition_stages_preserves_totals(self):
+        """VUs are split across workers without losing the remainder"""
+        stages = [Stage(30, 10), Stage(60, 1000), Stage(30, 0)]
+        parts = [partition_stages(stages, 3, index) for index in range(3)]
+        assert [part[0].target for part in parts] == [4, 3, 3]
+        for position, stage in enumerate(stages):
+            assert sum(part[position].target for part in parts) == stage.target
+            assert all(part[position].duration == stage.duration for part in parts)
+
+
+class TestLoadMetrics:
+    """Tests for metric aggregation"""
+
+    @pytest.mark.unit
+    def test_summary_is_k6_compatible(self):
+        """Summaries expose the keys the report scripts read"""
+        metrics = LoadMetrics()
+        for value in range(1, 101):
+            metrics.record("GET /Signup", float(value), failed=value > 98)
+        metrics.record("POST /Signup", None, failed=True)
+        metrics.duration = 10.0
+
+        summary = metrics.summary()
+        values = summary["metrics"]
+        assert values["http_reqs"]["values"]["count"] == 101
+        assert values["http_req_failed"]["values"]["count"] == 3
+        assert values["http_req_duration"]["values"]["p95"] == pytest.approx(95.0, rel=0.01)
+        assert values["http_req_duration"]["values"]["avg"] == pytest.approx(50.5)
+        assert summary["endpoints"]["POST /Signup"]["failed"] == 1
+
+        result = scenario_result("baseline", summary, [Stage(1, 10)])
+        assert result["users"] == 10
+        assert result["error_rate"] == pytest.approx(2.97)
+        assert result["status"] == "WARNING"
+
+
+    @pytest.mark.unit
+    def test_snapshots_merge_across_workers(self):
+        """Worker snapshots round-trip and merge into the same totals"""
+        first, second = LoadMetrics(), LoadMetrics()
+        for value in range(1, 51):
+            first.record("GET /Signup", float(value), failed=False)
+            second.record("GET /Signup", float(value + 50), failed=value == 50)
+        first.vus_max, second.vus_max = 5, 5
+
+        merged = LoadMetrics.from_snapshot(first.snapshot())
+        merged.merge(LoadMetrics.from_snapshot(second.snapshot()))
+
+        histogram = merged.latencies["GET /Signup"]
+        assert histogram.total_count == 100
+        assert histogram.percentile(50) == pytest.approx(50, rel=0.01)
+        assert histogram.percentile(100) == 100
+        assert merged.failures == {"GET /Signup": 1}
+        assert merged.vus_max == 10
+
+    @pytest.mark.unit
+    def test_summary_embeds_mergeable_histograms(self):
+        """Summaries carry serialized histograms that reproduce their percentiles"""
+        metrics = LoadMetrics()
+        for value in range(1, 201):
+            metrics.record("GET /Signup", float(value), failed=False)
+        summary = metrics.summary()
+
+        histogram = LatencyHistogram.from_base64(summary["histograms"]["http_req_duration"])
+        trend = summary["metrics"]["http_req_duration"]["values"]
+        assert histogram.total_count == 200
+        assert histogram.percentile(95) == trend["p(95)"]
+        assert "histogram" in summary["endpoints"]["GET /Signup"]
+
+
+class TestArrivalSchedule:
+    """Tests for open-model arrival schedules"""
+
+    @pytest.mark.unit
+    def test_constant_schedule_is_evenly_spaced(self):
+        """A constant rate starts one iteration every 1/rate seconds"""
+        offsets = list(arrival_offsets([Stage(10, 5)], start_rate=5))
+        assert len(offsets) == 50
+        assert offsets[:3] == pytest.approx([0.0, 0.2, 0.4])
+
+    @pytest.mark.unit
+    def test_ramping_schedule_follows_area_under_rate(self):
+        """Arrivals during a ramp match the integral of the rate"""
+        offsets = list(arrival_offsets([Stage(10, 10), Stage(10, 10)], start_rate=0))
+        assert len(offsets) == 50 + 100
+        assert sum(1 for t in offsets if t < 10) == 50
+        assert offsets == sorted(offsets)
+
+    @pytest.mark.unit
+    def test_poisson_schedule_has_expected_count(self):
+        """Poisson arrivals average the configured rate"""
+        offsets = list(
+            arrival_offsets([Stage(100, 20)], start_rate=20, poisson=True, rng=random.Random(3))
+        )
+        assert len(offsets) == pytest.approx(2000, rel=0.05)
+        gaps = [b - a for a, b in zip(offsets, offsets[1:])]
+        assert max(gaps) > 5 * min(gaps)
+
+
+class TestLoadEngine:
+    """End-to-end run against the local stand-in"""
+
+    @pytest.mark.unit
+    def test_journey_against_stand_in(self):
+        """Every VU walks the signup journey with no failures"""
+        server = SignupStubServer(port=0, config={}).start_in_thread()
+        try:
+            engine = LoadEngine(
+                server.base_url, [Stage(0.2, 20), Stage(0.5, 20)], think_time_scale=0.01
+            )
+            summary = asyncio.run(engine.run()).summary()
+        finally:
+            server.stop()
+
+        endpoints = summary["endpoints"]
+        assert set(endpoints) == {"GET /Signup", "POST /Signup", "GET /dashboard"}
+        assert summary["metrics"]["http_req_failed"]["values"]["count"] == 0
+        assert summary["metrics"]["vus_max"]["values"]["value"] == 20
+        assert summary["metrics"]["errors"]["values"]["rate"] == 0
+
+    @pytest.mark.unit
+    def test_distributed_run_merges_worker_snapshots(self):
+        """VUs are partitioned over worker processes and snapshots are merged"""
+        server = SignupStubServer(port=0, config={}).start_in_thread()
+        snapshots = []
+        try:
+            metrics = run_distributed(
+                server.base_url,
+                [Stage(0.2, 6), Stage(1.0, 6)],
+                workers=2,
+                interval=0.2,
+                on_snapshot=snapshots.append,
+                think_time_scale=0.01,
+            )
+        finally:
+            server.stop()
+
+        assert snapshots
+        assert metrics.vus_max == 6
+        assert metrics.requests["GET /Signup"] > 0
+        assert sum(metrics.failures.values()) == 0
+
+    @pytest.mark.unit
+    def test_arrival_rate_run_against_stand_in(self):
+        """Iterations start on schedule and no iterations are dropped with enough VUs"""
+        server = SignupStubServer(port=0, config={}).start_in_thread()
+        try:
+            engine = ArrivalRateEngine(
+                server.base_url, [Stage(1.0, 20)], pre_allocated_vus=5, max_vus=20, think_time_scale=0
+            )
+            summary = asyncio.run(engine.run()).summary()
+        finally:
+            server.stop()
+
+        assert summary["metrics"]["iterations"]["values"]["count"] == 20
+        assert summary["metrics"]["dropped_iterations"]["values"]["count"] == 0
+        assert summary["metrics"]["http_req_failed"]["values"]["count"] == 0
+        assert summary["metrics"]["schedule_lag"]["values"]["p(95)"] < 500
+
+    @pytest.mark.unit
+    def test_exhausted_vu_budget_drops_iterations(self):
+        """Arrivals that find every VU busy are counted as dropped, not delayed"""
+        config = {
+            "fault_injection": {
+                "profiles": {"slow": {"latency": {"default": {"value_ms": 400}}}},
+            }
+        }
+        server = SignupStubServer(port=0, config=config, profile="slow").start_in_thread()
+        try:
+            engine = ArrivalRateEngine(
+                server.base_url, [Stage(0.5, 20)], pre_allocated_vus=2, think_time_scale=0
+            )
+            metrics = asyncio.run(engine.run())
+        finally:
+            server.stop()
+
+        assert metrics.vus_max == 2
+        assert metrics.dropped_iterations >= 5
+        assert metrics.iterations + metrics.dropped_iterations == 10
+
+    @pytest.mark.unit
+    def test_latency_is_measured_from_intended_start(self):
+        """Requests that start late include the scheduling delay in their latency"""
+        server = SignupStubServer(port=0, config={}).start_in_thread()
+
+        async def late_request():
+            engine = ArrivalRateEngine(server.base_url, [Stage(1, 1)])
+            async with engine._open_clients()[0] as client:
+                await engine._request(
+                    client, "GET", "/Signup", "GET /Signup", intended=time.perf_counter() - 0.5
+                )
+            return engine.metrics
+
+        try:
+            metrics = asyncio.run(late_request())
+        finally:
+            server.stop()
+
+        assert metrics.latencies["GET /Signup"].percentile(50) >= 500
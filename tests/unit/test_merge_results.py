@@ -0,0 +1,118 @@
+"""
+Unit tests for merging result fragments
+"""
+
+import json
+
+import pytest
+
+from scripts.merge_results import find_fragments, merge_allure, merge_by_suite, merge_reports
+from scripts.run_history import RunHistory
+
+
+def report_test(name, outcome, duration=0.5):
+    """pytest-json-report test entry"""
+    call = {"duration": duration, "outcome": outcome, "stdout": "captured"}
+    if outcome == "failed":
+        call["longrepr"] = f"E   AssertionError: {name}"
+    return {"nodeid": f"tests/test_signup.py::{name}", "outcome": outcome, "keywords": ["unit"], "call": call}
+
+
+def write_fragment(path, created, tests):
+    """Write a pytest-json-report fragment"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    summary = {"total": len(tests)}
+    for test in tests:
+        summary[test["outcome"]] = summary.get(test["outcome"], 0) + 1
+    path.write_text(json.dumps({"created": created, "duration": 10.0, "exitcode": 0, "summary": summary,
+                                "tests": tests}), encoding="utf-8")
+    return str(path)
+
+
+class TestMergeReports:
+    """Tests for collapsing fragments into one run"""
+
+    @pytest.mark.unit
+    def test_reruns_collapse_to_final_outcome(self, tmp_path):
+        """The last attempt decides the outcome and earlier attempts are kept as history"""
+        first = write_fragment(tmp_path / "a" / "smoke_results.json", 100.0,
+                               [report_test("test_a", "failed"), report_test("test_b", "passed")])
+        second = write_fragment(tmp_path / "b" / "smoke_results.json", 200.0,
+                                [report_test("test_a", "passed", 0.25), report_test("test_c", "failed")])
+        output = tmp_path / "merged.json"
+
+        header = merge_reports([second, first], str(output))
+        merged = json.loads(output.read_text(encoding="utf-8"))
+
+        tests = {test["nodeid"].split("::")[1]: test for test in merged["tests"]}
+        assert list(tests) == ["test_a", "test_b", "test_c"]
+        assert tests["test_a"]["outcome"] == "passed" and tests["test_a"]["flaky"] is True
+        assert [a["outcome"] for a in tests["test_a"]["attempts"]] == ["failed", "passed"]
+        assert tests["test_a"]["attempts"][0]["message"] == "E   AssertionError: test_a"
+        assert tests["test_a"]["call"]["stdout"] == "captured" and "attempts" not in tests["test_b"]
+        assert header["summary"] == {"passed": 2, "failed": 1, "total": 3, "rerun": 1}
+        assert merged["summary"] == header["summary"] and merged["exitcode"] == 1
+        assert merged["created"] == 200.0 and merged["duration"] == 110.0
+
+    @pytest.mark.unit
+    def test_same_fragment_twice_is_one_attempt(self, tmp_path):
+        """A fragment downloaded into two places does not count as a rerun"""
+        tests = [report_test("test_a", "passed"), report_test("test_b", "failed")]
+        paths = [write_fragment(tmp_path / name / "unit_results.json", 100.0, tests) for name in ("a", "b")]
+
+        header = merge_reports(paths, str(tmp_path / "merged.json"))
+
+        assert header["summary"] == {"passed": 1, "failed": 1, "total": 2}
+        assert "attempts" not in json.loads((tmp_path / "merged.json").read_text())["tests"][0]
+
+    @pytest.mark.unit
+    def test_per_suite_output_feeds_history(self, tmp_path):
+        """Fragments are merged per suite, stale columnar twins are removed and the merged files are ingested"""
+        artifacts = tmp_path / "artifacts"
+        write_fragment(artifacts / "smoke-test-reports" / "smoke_results.json", 100.0, [report_test("test_a", "failed")])
+        write_fragment(artifacts / "smoke-rerun" / "smoke_results.json", 200.0, [report_test("test_a", "passed")])
+        write_fragment(artifacts / "unit-test-reports" / "unit_results.json", 150.0, [report_test("test_b", "passed")])
+        (artifacts / "unit-test-reports" / "load_test_baseline_results.json").write_text('{"type": "Point"}\n')
+        (artifacts / "unit-test-reports" / "stress_test_results.json").write_text("{}")
+
+        (tmp_path / "reports").mkdir()
+        (tmp_path / "reports" / "smoke_results.parquet").write_bytes(b"PAR1 of one fragment")
+
+        paths = find_fragments([str(artifacts)])
+        merged = merge_by_suite(paths, str(tmp_path / "reports"))
+
+        assert len(paths) == 3 and sorted(merged) == ["smoke", "unit"]
+        assert not (tmp_path / "reports" / "smoke_results.parquet").exists()
+        with RunHistory(":memory:") as history:
+            assert history.ingest([str(tmp_path / "reports" / "smoke_results.json")]) == 1
+            results = history.current_results()
+            assert history.failed_tests() == []
+        assert results["smoke"]["summary"]["total"] == 1 and results["smoke"]["summary"]["passed"] == 1
+
+    @pytest.mark.unit
+    def test_no_pytest_fragments(self, tmp_path):
+        """Files that are not pytest reports are skipped and nothing is written"""
+        other = tmp_path / "notes_results.json"
+        other.write_text(json.dumps({"created": 1}))
+
+        assert merge_reports([str(other)], str(tmp_path / "merged.json")) is None
+        assert not (tmp_path / "merged.json").exists()
+
+
+class TestMergeAllure:
+    """Tests for collecting Allure results"""
+
+    @pytest.mark.unit
+    def test_copies_results_once(self, tmp_path):
+        """Result, container and attachment files are copied without overwriting"""
+        source = tmp_path / "artifacts" / "smoke-test-reports" / "allure-results" / "smoke"
+        source.mkdir(parents=True)
+        for name in ("1-result.json", "2-container.json", "3-attachment.png", "environment.properties", "x.txt"):
+            (source / name).write_text(name)
+        output = tmp_path / "reports" / "allure-results"
+
+        assert merge_allure([str(tmp_path / "artifacts")], str(output)) == 4
+        assert merge_allure([str(tmp_path / "artifacts")], str(output)) == 0
+        assert sorted(p.name for p in output.iterdir()) == [
+            "1-result.json", "2-container.json", "3-attachment.png", "environment.properties"
+        ]
@@ -0,0 +1,129 @@
+"""
+Unit tests for statistical performance regression detection
+"""
+
+import numpy as np
+import pytest
+
+from scripts.latency_histogram import LatencyHistogram
+from scripts.perf_regression import (
+    RunLatency,
+    bootstrap_percentile_difference,
+    compare_histograms,
+    compare_stored_runs,
+    mann_whitney,
+)
+from scripts.timeseries_store import TimelineRecorder, TimeSeriesStore
+
+START = 1_715_248_800
+
+
+def histogram(values):
+    """Histogram of the given latencies"""
+    recorded = LatencyHistogram()
+    recorded.record_many(values)
+    return recorded
+
+
+@pytest.fixture
+def rng():
+    """Seeded random generator"""
+    return np.random.default_rng(7)
+
+
+class TestStatistics:
+    """Tests for the histogram-based rank test and bootstrap"""
+
+    @pytest.mark.unit
+    def test_mann_whitney_matches_pairwise_count(self, rng):
+        """U equals the number of slower candidate/baseline pairs (ties counted half)"""
+        baseline = np.round(rng.normal(100, 10, 200))
+        candidate = np.round(rng.normal(104, 10, 200))
+        pairs = (candidate[:, None] > baseline[None, :]).sum() + 0.5 * (candidate[:, None] == baseline[None, :]).sum()
+
+        test = mann_whitney(histogram(baseline), histogram(candidate))
+
+        assert test["u"] == pytest.approx(pairs, rel=0.01)
+        assert test["cliffs_delta"] == pytest.approx(2 * pairs / 200**2 - 1, abs=0.02)
+        assert test["p_slower"] < 0.05 < test["p_faster"]
+
+    @pytest.mark.unit
+    def test_bootstrap_interval_contains_true_difference(self, rng):
+        """The p95 interval brackets the shift between two distributions"""
+        baseline = histogram(rng.normal(200, 20, 20000))
+        candidate = histogram(rng.normal(250, 20, 20000))
+
+        p95 = bootstrap_percentile_difference(baseline, candidate)
+
+        assert p95["ci_low"] <= 50 <= p95["ci_high"]
+        assert p95["difference"] == pytest.approx(50, abs=5)
+
+
+class TestCompareHistograms:
+    """Tests for regression classification"""
+
+    @pytest.mark.unit
+    def test_same_distribution_is_no_change(self, rng):
+        """Two samples of one distribution are not flagged"""
+        result = compare_histograms(histogram(rng.lognormal(5, 0.4, 20000)), histogram(rng.lognormal(5, 0.4, 20000)))
+        assert result["status"] == "no_change"
+        assert result["effect_size"]["magnitude"] == "negligible"
+
+    @pytest.mark.unit
+    def test_shift_and_tail_regressions(self, rng):
+        """A whole-distribution shift and a tail-only slowdown are both regressions"""
+        baseline = histogram(rng.normal(100, 5, 20000))
+        shifted = compare_histograms(baseline, histogram(rng.normal(115, 5, 20000)))
+        tail = compare_histograms(
+            baseline, histogram(np.concatenate([rng.normal(100, 5, 18500), rng.normal(400, 20, 1500)]))
+        )
+        faster = compare_histograms(baseline, histogram(rng.normal(80, 5, 20000)))
+
+        assert shifted["status"] == "regression"
+        assert shifted["effect_size"]["magnitude"] == "large"
+        assert tail["status"] == "regression"
+        assert tail["effect_size"]["magnitude"] == "negligible"
+        assert tail["reasons"][0].startswith("p95 +")
+        assert faster["status"] == "improvement"
+
+    @pytest.mark.unit
+    def test_small_samples_are_not_judged(self):
+        """Runs below min_samples are reported as insufficient data"""
+        result = compare_histograms(histogram([100] * 5), histogram([900] * 5))
+        assert result["status"] == "insufficient_data"
+
+
+class TestStoredRuns:
+    """Tests for comparing the latest stored run with a rolling baseline"""
+
+    @pytest.mark.unit
+    def test_rolling_baseline_flags_regressed_endpoint(self, tmp_path, rng):
+        """Only the endpoint that got slower is reported as regressed"""
+        store = TimeSeriesStore(str(tmp_path), downsample_after_days=7)
+        for run in range(4):
+            slow = 1.5 if run == 3 else 1.0
+            timeline = TimelineRecorder()
+            timeline.record_many(np.full(2000, START + run * 600.0), "GET /Signup", rng.normal(100, 10, 2000))
+            timeline.record_many(np.full(2000, START + run * 600.0), "POST /Signup", rng.normal(200, 10, 2000) * slow)
+            store.write_run(timeline, "stress", run_id=f"run-{run}")
+
+        comparison = compare_stored_runs(store, "stress", baseline_runs=2)
+
+        assert comparison["baseline"]["runs"] == ["run-1", "run-2"]
+        assert comparison["candidate"]["label"] == "run-3"
+        assert comparison["regressions"] == ["overall", "POST /Signup"]
+        assert comparison["endpoints"]["GET /Signup"]["status"] == "no_change"
+
+    @pytest.mark.unit
+    def test_summary_round_trip(self, tmp_path, rng):
+        """Store segment summaries carry enough to be compared as files"""
+        store = TimeSeriesStore(str(tmp_path), downsample_after_days=7)
+        timeline = TimelineRecorder()
+        timeline.record_many(np.full(500, float(START)), "GET /Signup", rng.normal(100, 10, 500))
+        store.write_run(timeline, "baseline", run_id="only")
+
+        run = RunLatency.from_summary(store.latest("baseline").summary(), "file.json")
+
+        assert run.scenario == "baseline"
+        assert run.runs == ["only"]
+        assert run.endpoints["GET /Signup"].total_count == 500
@@ -0,0 +1,112 @@
+"""
+Unit tests for the shared report rendering layer
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from scripts.generate_bug_report import MESSAGE_LENGTH, generate_html_bug_report
+from scripts.report_rendering import CHUNK_SIZE, get_template, render, render_to_file, stream
+
+
+def bug_frame(rows):
+    """Bug report rows as generate_bug_report builds them"""
+    return pd.DataFrame({
+        "Bug ID": [f"BUG-{i:05d}" for i in range(rows)],
+        "Test Name": [f"tests/functional/tests/test_signup.py::TestSignup::test_{i}" for i in range(rows)],
+        "Category": "Signup Functionality",
+        "Priority": ["High", "Low"] * (rows // 2),
+        "Severity": "Critical",
+        "Browser": "Chrome",
+        "Device": "Desktop",
+        "Error Message": "AssertionError: <div> not found " + "x" * 200,
+    })
+
+
+class TestRendering:
+    """Tests for compiled, streamed templates"""
+
+    @pytest.mark.unit
+    def test_templates_are_compiled_once(self):
+        """The same compiled template is returned on every lookup"""
+        assert get_template("bug_report.html") is get_template("bug_report.html")
+
+    @pytest.mark.unit
+    def test_values_are_escaped(self):
+        """Test names and messages cannot inject markup"""
+        html = render("test_report.html", generated_on="now", summary={"total": 1, "passed": 0, "failed": 1,
+                      "pass_rate": 0.0}, results=[{"name": "<script>x</script>", "status": "FAILED"}])
+        assert "&lt;script&gt;x&lt;/script&gt;" in html
+        assert "<script>" not in html
+
+    @pytest.mark.unit
+    def test_rows_are_consumed_while_streaming(self):
+        """The first chunk is produced before the row generator is exhausted"""
+        consumed = []
+
+        def results():
+            for i in range(5000):
+                consumed.append(i)
+                yield f"test_{i}", i % 2 == 0
+
+        chunks = stream("browser_test_report.html", generated_on="now", title="t", heading="h", results=results(),
+                        total=5000, passed=2500, pass_rate=50.0, intro="", checks=[], note="")
+        first = next(chunks)
+
+        assert len(first) >= CHUNK_SIZE
+        assert len(consumed) < 5000
+        assert sum(map(len, chunks)) > 0 and len(consumed) == 5000
+
+    @pytest.mark.unit
+    def test_render_to_file_creates_directory(self, tmp_path):
+        """Missing output directories are created and no temporary file is left behind"""
+        path = render_to_file("browser_test_report.html", str(tmp_path / "nested" / "report.html"), generated_on="now",
+                              title="t", heading="h", results=[], total=0, passed=0, pass_rate=0.0, intro="",
+                              checks=[], note="")
+        assert os.listdir(tmp_path / "nested") == ["report.html"]
+        with open(path, encoding="utf-8") as f:
+            assert "<title>t</title>" in f.read()
+
+
+class TestBugReport:
+    """Tests for the virtualized bug report page"""
+
+    @staticmethod
+    def embedded_data(html):
+        """Bug table JSON embedded in the page"""
+        start = html.index("window.BUG_REPORT_DATA = ") + len("window.BUG_REPORT_DATA = ")
+        return json.loads(html[start:html.index(";</script>", start)])
+
+    @pytest.mark.unit
+    def test_small_table_is_embedded(self, tmp_path):
+        """Rows are embedded as compact JSON with filter options, not as table rows"""
+        path = generate_html_bug_report(bug_frame(10), str(tmp_path / "bug_report_1.xlsx"))
+
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        data = self.embedded_data(html)
+        assert path.endswith("bug_report_1.html")
+        message = data["columns"].index("Error Message")
+        assert data["columns"][-1] == "Log" and len(data["data"]) == 10
+        assert data["data"][9][0] == "BUG-00009" and data["data"][9][data["columns"].index("Priority")] == "Low"
+        assert len(data["data"][0][message]) == MESSAGE_LENGTH
+        assert "<div> not found" not in html and "\\u003cdiv> not found" in html
+        assert '<option>High</option>' in html and '<option>Low</option>' in html
+        assert 'href="bug_report_1.xlsx"' in html
+        assert not os.path.exists(f"{path}.tmp")
+
+    @pytest.mark.unit
+    def test_large_table_goes_to_sidecar(self, tmp_path):
+        """Tables above the embed limit are loaded from a .data.js file next to the page"""
+        path = generate_html_bug_report(bug_frame(50_000), str(tmp_path / "bug_report_2.xlsx"), embed_limit=1000)
+
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        with open(tmp_path / "bug_report_2.data.js", encoding="utf-8") as f:
+            sidecar = f.read()
+        assert '<script src="bug_report_2.data.js"></script>' in html
+        assert len(html) < 50_000
+        assert len(self.embedded_data(sidecar.replace(";\n", ";</script>"))["data"]) == 50_000
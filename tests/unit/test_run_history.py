@@ -0,0 +1,130 @@
+"""
+Unit tests for the SQLite run-history index
+"""
+
+import json
+import os
+
+import pytest
+
+from scripts.latency_histogram import LatencyHistogram
+from scripts.run_history import RunHistory, suite_name
+
+CREATED = 1_715_248_800.0
+
+
+def pytest_report(created, outcomes):
+    """pytest-json-report document with one test per (name, outcome)"""
+    tests = []
+    for name, outcome in outcomes.items():
+        call = {"duration": 0.5, "outcome": outcome}
+        if outcome == "failed":
+            call["longrepr"] = f"AssertionError: {name} broke"
+        tests.append({
+            "nodeid": f"tests/functional/tests/test_signup.py::TestSignup::{name}",
+            "outcome": outcome,
+            "setup": {"duration": 0.25, "outcome": "passed"},
+            "call": call,
+            "teardown": {"duration": 0.25, "outcome": "passed"},
+        })
+    summary = {"total": len(tests), "collected": len(tests)}
+    for outcome in outcomes.values():
+        summary[outcome] = summary.get(outcome, 0) + 1
+    return {"created": created, "duration": 12.5, "exitcode": 0, "summary": summary, "tests": tests}
+
+
+def write_json(path, document, mtime=None):
+    """Write a JSON artifact, optionally backdating it"""
+    with open(path, "w") as f:
+        json.dump(document, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+@pytest.fixture
+def history():
+    """In-memory history database"""
+    with RunHistory(":memory:") as db:
+        yield db
+
+
+class TestIngest:
+    """Tests for upserting artifacts"""
+
+    @pytest.mark.unit
+    def test_suite_names(self):
+        """Suites and kinds follow the report file naming"""
+        assert suite_name("reports/smoke_results.json") == ("pytest", "smoke")
+        assert suite_name("reports/test_results.json") == ("pytest", "all")
+        assert suite_name("reports/stress_stream_summary.json") == ("load", "stress")
+        assert suite_name("reports/spike_test_results.json") == ("load", "spike")
+        assert suite_name("reports/perf_regression.json") == ("custom", "perf_regression")
+
+    @pytest.mark.unit
+    def test_reingest_updates_instead_of_duplicating(self, history, tmp_path):
+        """The same run ingested twice stays one run; an unchanged file is skipped"""
+        path = write_json(tmp_path / "smoke_results.json", pytest_report(CREATED, {"test_a": "passed"}), CREATED)
+        assert history.ingest_file(path)
+        assert not history.ingest_file(path)
+
+        write_json(path, pytest_report(CREATED, {"test_a": "failed"}), CREATED + 60)
+        assert history.ingest_file(path)
+
+        current = history.current_results()["smoke"]
+        assert current["summary"]["failed"] == 1
+        assert history.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+        assert history.connection.execute("SELECT COUNT(*) FROM durations").fetchone()[0] == 3
+
+    @pytest.mark.unit
+    def test_load_summary_metrics(self, history, tmp_path):
+        """Load summaries become whole-run and per-endpoint metrics"""
+        latency = LatencyHistogram()
+        latency.record_many(range(1, 1001))
+        summary = {
+            "metrics": {
+                "http_reqs": {"values": {"count": 1000, "rate": 50.0}},
+                "http_req_failed": {"values": {"rate": 0.01, "passes": 10}},
+            },
+            "histograms": {"http_req_duration": latency.to_base64()},
+            "endpoints": {"POST /Signup": {"count": 1000, "failed": 10, "http_req_duration": latency.summary()}},
+            "state": {"testRunDurationMs": 20_000},
+            "run": {"run_id": "20240509-100000-stress", "scenario": "stress", "started_at": CREATED},
+        }
+        history.ingest([write_json(tmp_path / "stress_stream_summary.json", summary), str(tmp_path / "missing.json")])
+
+        trend = history.load_trend("stress", "p95")
+        assert trend[0]["value"] == pytest.approx(950, rel=0.01)
+        assert history.load_trend("stress", "rps")[0]["value"] == 50
+        assert history.load_trend("stress", "p50", endpoint="POST /Signup")[0]["value"] == pytest.approx(500, rel=0.01)
+
+
+class TestQueries:
+    """Tests for current-run and trend queries"""
+
+    @pytest.fixture
+    def runs(self, history, tmp_path):
+        """Five smoke runs where test_b fails every other run"""
+        for i in range(5):
+            report = pytest_report(CREATED + i * 3600, {"test_a": "passed", "test_b": "failed" if i % 2 else "passed"})
+            history.ingest_file(write_json(tmp_path / "smoke_results.json", report, CREATED + i * 3600))
+        return history
+
+    @pytest.mark.unit
+    def test_trend_and_current_run(self, runs):
+        """Trends are oldest first and the current run is the latest"""
+        trend = runs.suite_trend("smoke", last=3)
+        assert [run["pass_rate"] for run in trend] == [100.0, 50.0, 100.0]
+        assert runs.current_results()["smoke"]["created"] == CREATED + 4 * 3600
+
+    @pytest.mark.unit
+    def test_failures_and_flaky_tests(self, runs, tmp_path):
+        """Failed tests of the current run and tests that flip between runs"""
+        report = pytest_report(CREATED + 5 * 3600, {"test_a": "passed", "test_b": "failed"})
+        runs.ingest_file(write_json(tmp_path / "smoke_results.json", report, CREATED + 5 * 3600))
+
+        failures = runs.failed_tests()
+        assert [failure["nodeid"].rsplit("::", 1)[1] for failure in failures] == ["test_b"]
+        assert failures[0]["message"] == "AssertionError: test_b broke"
+        assert failures[0]["duration"] == 1.0
+        assert [(t["passed"], t["failed"]) for t in runs.flaky_tests(last=4)] == [(2, 2)]
@@ -0,0 +1,130 @@
+"""
+Unit tests for the local signup stand-in and its fault profiles
+"""
+
+import random
+
+import httpx
+import pytest
+
+from scripts.signup_stub_server import FaultProfile, LatencyDistribution, SignupStubServer
+
+CONFIG = {
+    "fault_injection": {
+        "active_profile": "healthy",
+        "seed": 7,
+        "profiles": {
+            "always_down": {"error_rate": {"rate": 1.0, "status": 503}},
+            "resets": {"connection_reset": {"rate": 1.0}},
+            "trickle": {"slow_body": {"rate": 1.0, "chunk_bytes": 64, "interval_ms": 1}},
+        },
+    }
+}
+
+
+@pytest.fixture
+def server():
+    """Stand-in server on a free port, stopped after the test"""
+    stub = SignupStubServer(port=0, config=CONFIG).start_in_thread()
+    yield stub
+    stub.stop()
+
+
+class TestSignupStubServer:
+    """Tests for the HTTP behaviour of the stand-in"""
+
+    @pytest.mark.unit
+    def test_signup_journey(self, server):
+        """Signup page, form submission and dashboard behave like the real flow"""
+        form = {
+            "firstName": "John",
+            "lastName": "Doe",
+            "email": "john.doe@example.com",
+            "password": "SecurePass123!",
+            "confirmPassword": "SecurePass123!",
+        }
+        with httpx.Client(base_url=server.base_url) as client:
+            page = client.get("/Signup")
+            assert page.status_code == 200
+            assert "firstName" in page.text
+
+            submit = client.post("/Signup", data=form)
+            assert submit.status_code == 302
+            assert submit.headers["location"] == "/dashboard"
+
+            assert client.get("/dashboard").status_code == 200
+            assert client.post("/Signup", data={"firstName": "John"}).status_code == 400
+
+    @pytest.mark.unit
+    def test_switch_profile_through_control_endpoint(self, server):
+        """Profiles can be listed and switched at runtime"""
+        with httpx.Client(base_url=server.base_url) as client:
+            state = client.get("/__faults").json()
+            assert state["active_profile"] == "healthy"
+            assert "always_down" in state["profiles"]
+
+            assert client.post("/__faults", params={"profile": "always_down"}).status_code == 200
+            assert client.get("/Signup").status_code == 503
+
+            assert client.put("/__faults", json={"profile": "missing"}).status_code == 404
+            assert client.get("/__faults").json()["active_profile"] == "always_down"
+
+    @pytest.mark.unit
+    def test_connection_reset_and_slow_body(self, server):
+        """Reset profiles drop the connection, trickle profiles still deliver the body"""
+        server.set_profile("resets")
+        with httpx.Client(base_url=server.base_url) as client:
+            with pytest.raises(httpx.TransportError):
+                client.get("/Signup")
+
+        server.set_profile("trickle")
+        with httpx.Client(base_url=server.base_url) as client:
+            assert "signupForm" in client.get("/Signup").text
+
+    @pytest.mark.unit
+    def test_unknown_profile_rejected(self):
+        """Selecting a profile that is not configured raises KeyError"""
+        with pytest.raises(KeyError):
+            SignupStubServer(config=CONFIG, profile="does_not_exist")
+
+
+class TestFaultProfile:
+    """Tests for fault profile arithmetic"""
+
+    @pytest.mark.unit
+    def test_error_rate_ramp(self):
+        """Error rate ramps linearly and then holds"""
+        profile = FaultProfile("ramp", {"error_rate": {"start": 0.0, "end": 0.1, "ramp": "10s"}})
+        assert profile.error_rate_at(0) == 0.0
+        assert profile.error_rate_at(5) == pytest.approx(0.05)
+        assert profile.error_rate_at(60) == pytest.approx(0.1)
+
+    @pytest.mark.unit
+    def test_brownout_window(self):
+        """Brownouts repeat every period for the configured duration"""
+        profile = FaultProfile(
+            "brownout", {"brownout": {"period": "1m", "duration": "10s", "extra_latency_ms": 500}}
+        )
+        assert profile.in_brownout(5)
+        assert not profile.in_brownout(30)
+        assert profile.in_brownout(65)
+        assert profile.latency_for("GET", "/Signup", 65) == pytest.approx(0.5)
+
+    @pytest.mark.unit
+    def test_lognormal_distribution_matches_percentiles(self):
+        """Lognormal latency is parameterised by its median and p95"""
+        distribution = LatencyDistribution(
+            {"distribution": "lognormal", "median_ms": 100, "p95_ms": 400}
+        )
+        rng = random.Random(1)
+        samples = sorted(distribution.sample(rng) for _ in range(20000))
+        assert samples[10000] == pytest.approx(0.1, rel=0.05)
+        assert samples[19000] == pytest.approx(0.4, rel=0.1)
+
+    @pytest.mark.unit
+    def test_profiles_are_seeded(self):
+        """The same seed yields the same fault sequence"""
+        spec = {"error_rate": {"rate": 0.5}}
+        first = FaultProfile("p", spec, seed=3)
+        second = FaultProfile("p", spec, seed=3)
+        assert [first.error_for(0) for _ in range(50)] == [second.error_for(0) for _ in range(50)]
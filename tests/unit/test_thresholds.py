@@ -0,0 +1,140 @@
+"""
+Unit tests for threshold evaluation and early abort
+"""
+
+import time
+
+import pytest
+
+from scripts.latency_histogram import LatencyHistogram
+from scripts.load_engine import Stage, run_scenario
+from scripts.signup_stub_server import SignupStubServer
+from scripts.thresholds import ThresholdEvaluator, evaluate_summary, load_thresholds
+from scripts.timeseries_store import TimelineRecorder
+
+START = 1_715_248_800
+
+CONFIG = {
+    "performance_thresholds": {
+        "response_time": {"p50": 1000, "p95": 2000, "p99": 3000},
+        "throughput": {"min": 100},
+        "error_rate": {"max": 1},
+        "scenarios": {"stress": {"response_time": {"p95": 5000}, "error_rate": {"max": 5}}},
+        "evaluation": {"window": "10s", "grace_period": "30s", "min_requests": 20, "abort_on_fail": ["error_rate"]},
+    }
+}
+
+
+def timeline_with_errors(seconds, failing_from):
+    """200 requests/s at 100-299ms; every request fails from ``failing_from`` on"""
+    recorder = TimelineRecorder()
+    for second in range(seconds):
+        for i in range(200):
+            recorder.record(START + second + i / 200, "GET /Signup", 100 + i, second >= failing_from)
+    return recorder
+
+
+class TestLoadThresholds:
+    """Tests for reading performance_thresholds"""
+
+    @pytest.mark.unit
+    def test_expressions_and_scenario_overrides(self):
+        """Config limits become k6 expressions, scenario overrides replace single limits"""
+        baseline = {t.name: t.expression for t in load_thresholds(CONFIG, "baseline")}
+        stress = {t.name: t.expression for t in load_thresholds(CONFIG, "stress")}
+
+        assert baseline == {
+            "p50": "http_req_duration: p(50)<1000",
+            "p95": "http_req_duration: p(95)<2000",
+            "p99": "http_req_duration: p(99)<3000",
+            "throughput": "http_reqs: rate>=100",
+            "error_rate": "http_req_failed: rate<0.01",
+        }
+        assert stress["p95"] == "http_req_duration: p(95)<5000"
+        assert stress["error_rate"] == "http_req_failed: rate<0.05"
+        assert stress["p99"] == baseline["p99"]
+
+    @pytest.mark.unit
+    def test_evaluate_summary(self):
+        """Whole-run values come from the embedded histogram and k6 metrics"""
+        histogram = LatencyHistogram()
+        histogram.record_many(range(1000, 3000))
+        summary = {
+            "metrics": {
+                "http_reqs": {"values": {"count": 2000, "rate": 50.0}},
+                "http_req_failed": {"values": {"rate": 0.005, "passes": 10}},
+            },
+            "histograms": {"http_req_duration": histogram.to_base64()},
+            "state": {"testRunDurationMs": 40_000},
+        }
+        results = {r["name"]: r for r in evaluate_summary(summary, load_thresholds(CONFIG))}
+
+        assert results["p50"]["value"] == pytest.approx(2000, rel=0.01)
+        assert not results["p50"]["ok"]
+        assert results["p95"]["ok"] is False
+        assert results["throughput"]["value"] == 50
+        assert not results["throughput"]["ok"]
+        assert results["error_rate"]["ok"]
+
+
+class TestThresholdEvaluator:
+    """Tests for sliding-window evaluation and abort-on-fail"""
+
+    @pytest.mark.unit
+    def test_abort_waits_for_grace_period(self):
+        """A run that fails from the start is only aborted once the grace period is over"""
+        evaluator = ThresholdEvaluator.from_config(CONFIG)
+        timeline = timeline_with_errors(60, failing_from=0)
+
+        for second in range(1, 60):
+            evaluator.observe(timeline, now=START + second + 2)
+            if evaluator.should_abort:
+                break
+
+        assert evaluator.aborted["threshold"] == "error_rate"
+        assert evaluator.aborted["elapsed_seconds"] == 30
+        assert evaluator.state["error_rate"]["first_failed_at"] == START + 1
+
+    @pytest.mark.unit
+    def test_report_only_mode_records_window_failures(self):
+        """Without abort_on_fail, failing windows are only recorded for the verdict"""
+        evaluator = ThresholdEvaluator.from_config(CONFIG, abort=False)
+        timeline = timeline_with_errors(40, failing_from=10)
+
+        results = evaluator.observe(timeline, now=START + 40 + 2)
+        errors = next(r for r in results if r["name"] == "error_rate")
+
+        assert not errors["ok"]
+        assert evaluator.state["error_rate"]["first_failed_at"] == START + 11
+        assert evaluator.state["p95"]["window_failures"] == 0
+        assert not evaluator.should_abort
+
+        verdict = evaluator.verdict(scenario="baseline")
+        assert verdict["passed"]  # no summary: nothing measured for the whole run
+        assert verdict["thresholds"][-1]["window_failures"] > 0
+
+
+class TestEngineAbort:
+    """Tests for stopping the load engine when thresholds fail"""
+
+    @pytest.mark.unit
+    def test_failing_run_is_aborted(self):
+        """A broken target stops a long run soon after the grace period"""
+        config = {"fault_injection": {"profiles": {"down": {"error_rate": {"rate": 1.0, "status": 503}}}}}
+        server = SignupStubServer(port=0, config=config, profile="down").start_in_thread()
+        evaluator = ThresholdEvaluator(
+            load_thresholds(CONFIG), window=2, grace_period=2, min_requests=1, abort_on_fail=["error_rate"]
+        )
+        started = time.monotonic()
+        try:
+            summary = run_scenario(
+                "baseline", server.base_url, [Stage(60, 5)], think_time_scale=0.01, thresholds=evaluator
+            )
+        finally:
+            server.stop()
+
+        assert time.monotonic() - started < 20
+        verdict = summary["thresholds"]
+        assert verdict["aborted"]
+        assert not verdict["passed"]
+        assert verdict["abort"]["threshold"] == "error_rate"
@@ -0,0 +1,106 @@
+"""
+Unit tests for the columnar load test time-series store
+"""
+
+import numpy as np
+import pytest
+
+from scripts.timeseries_store import TimelineRecorder, TimeSeriesStore
+
+START = 1_715_248_800  # 2024-05-09 10:00:00 UTC
+
+
+@pytest.fixture
+def timeline():
+    """Two endpoints over three seconds, one failed POST per second"""
+    recorder = TimelineRecorder()
+    for second in range(3):
+        for i in range(100):
+            recorder.record(START + second + i / 100, "GET /Signup", 100 + i, active_vus=10 + second)
+        recorder.record(START + second + 0.5, "POST /Signup", 500, failed=True, active_vus=10 + second)
+    return recorder
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty store with a one day downsampling window"""
+    return TimeSeriesStore(str(tmp_path / "timeseries"), downsample_after_days=1)
+
+
+class TestTimelineRecorder:
+    """Tests for bucketing requests per second and endpoint"""
+
+    @pytest.mark.unit
+    def test_buckets_per_second_and_endpoint(self, timeline):
+        """Each (second, endpoint) pair gets its own counters and VU peak"""
+        rows = list(timeline.rows())
+        assert len(rows) == 6
+        assert rows[0][:5] == (START, "GET /Signup", 100, 0, 10)
+        assert rows[1][:5] == (START, "POST /Signup", 1, 1, 10)
+
+    @pytest.mark.unit
+    def test_merge_adds_parallel_workers(self, timeline):
+        """Merging a worker's snapshot adds requests and VUs per bucket"""
+        merged = TimelineRecorder.from_snapshot(timeline.snapshot()).merge(timeline)
+        rows = list(merged.rows())
+        assert rows[0][2] == 200
+        assert rows[0][4] == 20
+
+    @pytest.mark.unit
+    def test_record_many_matches_record(self, timeline):
+        """Batch recording (k6 ingest) produces the same buckets"""
+        batch = TimelineRecorder()
+        epochs = np.array([START + s + i / 100 for s in range(3) for i in range(100)])
+        batch.record_many(epochs, "GET /Signup", np.tile(np.arange(100, 200), 3))
+        expected = [row for row in timeline.rows() if row[1] == "GET /Signup"]
+        assert [row[2] for row in batch.rows()] == [row[2] for row in expected]
+
+
+class TestTimeSeriesStore:
+    """Tests for segment files, memory-mapped reads and downsampling"""
+
+    @pytest.mark.unit
+    def test_round_trip_is_memory_mapped(self, timeline, store):
+        """Stored columns are mapped from disk and summarise like the recorder"""
+        store.write_run(timeline, "stress", "run-1")
+        segment = store.latest("stress")
+
+        assert isinstance(segment.requests, np.memmap)
+        assert len(segment) == 6
+        series = segment.series()
+        assert series["requests"].tolist() == [101, 101, 101]
+        assert series["errors"].tolist() == [1, 1, 1]
+        assert series["active_vus"].tolist() == [10, 11, 12]
+        assert series["p95_ms"][0] == pytest.approx(195, rel=0.01)
+
+        summary = segment.summary()
+        assert summary["metrics"]["http_reqs"]["values"]["count"] == 303
+        assert summary["endpoints"]["POST /Signup"]["failed"] == 3
+
+    @pytest.mark.unit
+    def test_old_runs_are_downsampled_per_minute(self, timeline, store):
+        """Runs past the window collapse to one row per minute and endpoint"""
+        store.write_run(timeline, "stress", "run-1")
+        before = store.latest("stress").latency()
+
+        rewritten = store.downsample(now=START + 2 * 86400)
+        segment = store.latest("stress")
+
+        assert len(rewritten) == 1
+        assert len(store.segments()) == 1
+        assert segment.resolution == 60
+        assert len(segment) == 2
+        assert segment.series()["active_vus"].tolist() == [12]
+        assert segment.latency().percentile(95) == before.percentile(95)
+        assert store.downsample(now=START + 2 * 86400) == []
+
+    @pytest.mark.unit
+    def test_recent_runs_are_kept_per_second(self, timeline, store):
+        """Runs inside the window are left untouched and listed per run"""
+        store.write_run(timeline, "stress", "run-1")
+        store.write_run(timeline, "stress", "run-2")
+
+        assert store.downsample(now=START + 3600) == []
+        trend = store.run_trend("stress")
+        assert [run["run_id"] for run in trend] == ["run-1", "run-2"]
+        assert trend[0]["error_rate"] == pytest.approx(3 / 303)
@@ -0,0 +1,69 @@
+"""
+Unit tests for the bulk user data generator
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from scripts.identities import IdentityAllocator
+from scripts.user_data import PASSWORD_CLASSES, BulkUserGenerator, export_k6_users, shared_faker
+
+
+class TestBulkUserGenerator:
+    """Tests for columnar blocks and streamed users"""
+
+    @pytest.mark.unit
+    def test_block_is_valid_and_unique(self):
+        """Every password is strong and every email unique and well formed"""
+        block = BulkUserGenerator(seed=3).block(20_000)
+
+        assert set(block) == {"first_name", "last_name", "email", "password"}
+        assert all(len(column) == 20_000 for column in block.values())
+        assert len(np.unique(block["email"])) == 20_000
+        assert all(email.startswith("loadtest_") and email.endswith((".com", ".net", ".org"))
+                   for email in block["email"][:1000])
+        for password in block["password"][:1000]:
+            assert len(password) == 12
+            assert all(any(c in chars for c in password) for chars in PASSWORD_CLASSES)
+
+    @pytest.mark.unit
+    def test_seeded_and_streamed(self):
+        """A seed repeats the users, and emails carry identities allocated across blocks"""
+        first = list(BulkUserGenerator(seed=5, allocator=IdentityAllocator("run1", 0)).stream(250, batch_size=100))
+        second = list(BulkUserGenerator(seed=5, allocator=IdentityAllocator("run1", 0)).stream(250, batch_size=100))
+
+        assert first == second and len(first) == 250
+        assert len({user["email"] for user in first}) == 250
+        assert first[-1]["email"].split("@")[0].endswith("+run1-0-0-6x")  # 249 in base 36
+
+    @pytest.mark.unit
+    def test_generators_share_identities(self):
+        """Two generators of one process never hand out the same email"""
+        emails = [BulkUserGenerator(seed=1).block(500)["email"] for _ in range(2)]
+
+        assert len(np.unique(np.concatenate(emails))) == 1000
+
+    @pytest.mark.unit
+    def test_k6_export(self, tmp_path):
+        """The k6 dataset has the scripts' field names and a matching confirmPassword"""
+        path = export_k6_users(str(tmp_path / "users.json"), 3, seed=2)
+
+        with open(path, encoding="utf-8") as f:
+            users = json.load(f)
+        assert len(users) == 3
+        assert set(users[0]) == {"firstName", "lastName", "email", "password", "confirmPassword"}
+        assert all(user["confirmPassword"] == user["password"] for user in users)
+
+    @pytest.mark.unit
+    def test_shared_faker(self):
+        """The Faker instance of a locale is created once per process"""
+        assert shared_faker() is shared_faker()
+        assert shared_faker("de_DE") is not shared_faker()
+
+    @pytest.mark.unit
+    def test_short_password_rejected(self):
+        """A password too short for every character class is refused"""
+        with pytest.raises(ValueError):
+            BulkUserGenerator(password_length=3)
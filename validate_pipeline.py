@@ -194,6 +194,7 @@ class PipelineValidator:
         print("✓ Checking script files...")
         
         script_files = [
+            "scripts/generate_reports.py",
             "scripts/generate_combined_report.py",
             "scripts/generate_bug_report.py"
         ]